@@ -0,0 +1,52 @@
+"""Benchmark of native client output line splitting, without a server.
+
+Feeds output of known size to ``pssh.native._ssh2._read_output`` in chunks
+the size of libssh2 channel reads and reports throughput for output with
+many short lines and for output that is a single very long line.
+"""
+
+import argparse
+import time
+
+from pssh.native._ssh2 import _read_output
+
+
+CHUNK_SIZE = 32 * 1024
+
+
+def _reader(chunk, num_chunks):
+    chunks = iter([chunk] * num_chunks + [b''])
+
+    def read_func():
+        data = next(chunks)
+        return len(data), data
+    return read_func
+
+
+def run(name, chunk, total_size):
+    num_chunks = max(total_size // len(chunk), 1)
+    start = time.time()
+    lines = 0
+    for _ in _read_output(None, _reader(chunk, num_chunks)):
+        lines += 1
+    duration = time.time() - start
+    size_mb = num_chunks * len(chunk) / 1024.0 / 1024.0
+    print("%-12s %8.1f MB %10d lines %8.3fs %10.1f MB/s" % (
+        name, size_mb, lines, duration, size_mb / duration))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=256,
+                        help="Output size in MB for each benchmark")
+    parser.add_argument('--long-line-size', type=int, default=64,
+                        help="Size in MB of single long line")
+    args = parser.parse_args()
+    line = b'x' * 79 + b'\n'
+    short_lines = line * (CHUNK_SIZE // len(line))
+    run('short lines', short_lines, args.size * 1024 * 1024)
+    run('long line', b'x' * CHUNK_SIZE, args.long_line_size * 1024 * 1024)
+
+
+if __name__ == '__main__':
+    main()
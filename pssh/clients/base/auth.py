@@ -0,0 +1,175 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Cache of authentication methods that succeeded per host"""
+
+import atexit
+import json
+import logging
+import os
+import weakref
+from fnmatch import fnmatch
+from threading import Lock
+
+
+logger = logging.getLogger(__name__)
+_PATTERN_CHARS = frozenset('*?[')
+
+
+def _save_at_exit(cache_ref):
+    cache = cache_ref()
+    if cache is not None:
+        cache.save()
+
+
+class AuthCache(object):
+    """Authentication method, and identity file if any, that last succeeded
+    for each user and host.
+
+    Clients try the cached method first and fall back to trying all
+    authentication methods if it fails, saving the round trips of failed
+    authentication attempts with other methods and identities.
+
+    Entries may also be added for host patterns, like ``web*.example.com``,
+    which are used for matching hosts without an entry of their own.
+
+    Methods are ``agent``, ``identity`` and ``password``.
+
+    When ``path`` is set, entries are loaded from and saved to that file as
+    JSON. Changed entries are saved on ``save``, which parallel clients call
+    once per run, and on garbage collection or interpreter exit.
+    """
+
+    METHODS = ('agent', 'identity', 'password')
+
+    def __init__(self, path=None):
+        """
+        :param path: (Optional) File to load entries from, if it exists, and
+          save entries to. Defaults to not saving entries.
+        :type path: str
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self._entries = {}
+        # Entries of host patterns, matched against hosts without an entry
+        # of their own
+        self._patterns = {}
+        self._dirty = False
+        # Clients authenticate in native threads
+        self._lock = Lock()
+        if self.path is not None:
+            if os.path.isfile(self.path):
+                self._load()
+            atexit.register(_save_at_exit, weakref.ref(self))
+
+    def __del__(self):
+        try:
+            self.save()
+        except Exception:
+            pass
+
+    def get(self, user, host):
+        """Get cached method for user and host, or matching host pattern.
+
+        :rtype: tuple(method, identity) or ``None``
+        """
+        key = self._key(user, host)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                for pattern, _entry in self._patterns.items():
+                    if fnmatch(key, pattern):
+                        entry = _entry
+                        break
+        if entry is None:
+            return
+        identity = entry.get('identity')
+        if identity is not None:
+            identity = os.path.expanduser(identity)
+        return entry['method'], identity
+
+    def set(self, user, host, method, identity=None):
+        """Cache method, and identity file for ``identity`` method, for user
+        and host or host pattern.
+
+        :raises: :py:class:`ValueError` on unknown method.
+        """
+        if method not in self.METHODS:
+            raise ValueError("Unknown authentication method %s" % (method,))
+        entry = {'method': method}
+        if identity is not None:
+            entry['identity'] = identity
+        key = self._key(user, host)
+        with self._lock:
+            if self._entries.get(key) == entry:
+                return
+            self._entries[key] = entry
+            if self._is_pattern(key):
+                self._patterns[key] = entry
+            self._dirty = True
+
+    def remove(self, user, host):
+        """Remove cached method for user and host."""
+        key = self._key(user, host)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._patterns.pop(key, None)
+                self._dirty = True
+
+    def save(self):
+        """Save entries to file, if ``path`` is set and entries have changed
+        since last saved."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        if not self._save(entries):
+            with self._lock:
+                self._dirty = True
+
+    @staticmethod
+    def _key(user, host):
+        return '%s@%s' % (user, host)
+
+    @staticmethod
+    def _is_pattern(key):
+        return not _PATTERN_CHARS.isdisjoint(key)
+
+    def _load(self):
+        try:
+            with open(self.path) as fh:
+                self._entries = json.load(fh)
+            self._patterns = dict(
+                (key, entry) for key, entry in self._entries.items()
+                if self._is_pattern(key))
+        except (IOError, OSError, ValueError) as ex:
+            logger.error("Could not load authentication cache from %s - %s",
+                         self.path, ex)
+
+    def _save(self, entries):
+        tmp_path = '%s.tmp' % (self.path,)
+        try:
+            with open(tmp_path, 'w') as fh:
+                json.dump(entries, fh, indent=1, sort_keys=True)
+            os.rename(tmp_path, self.path)
+        except (IOError, OSError) as ex:
+            logger.error("Could not save authentication cache to %s - %s",
+                         self.path, ex)
+            return False
+        return True
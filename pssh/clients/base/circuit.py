@@ -0,0 +1,158 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Per host circuit breaker for connection failures"""
+
+import logging
+from contextlib import contextmanager
+from time import time
+
+from ...exceptions import CircuitOpenError, DeadlineTimeout
+
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _no_guard():
+    """Context manager for connecting to host without a circuit breaker"""
+    yield
+
+
+class CircuitBreaker(object):
+    """Skip connecting to hosts that have recently failed to connect
+    repeatedly.
+
+    A host's circuit opens after ``failure_threshold`` consecutive failures to
+    connect and authenticate. While open, connecting to that host fails
+    straight away with :py:class:`pssh.exceptions.CircuitOpenError` rather
+    than spending time on connection attempts and retries. Once ``cooldown``
+    seconds have passed the circuit is half open - one connection attempt is
+    let through as a probe, closing the circuit if it succeeds and opening it
+    again for another cool down if it fails.
+
+    Deadline timeouts do not count as failures.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=3, cooldown=60):
+        """
+        :param failure_threshold: Number of consecutive failures after which
+          host's circuit opens.
+        :type failure_threshold: int
+        :param cooldown: Seconds to fail connecting to host straight away for
+          once its circuit has opened.
+        :type cooldown: float
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._hosts = {}
+
+    def state(self, host):
+        """Current state of host's circuit - one of ``CLOSED``, ``OPEN`` or
+        ``HALF_OPEN``."""
+        host_state = self._hosts.get(host)
+        if host_state is None or host_state['opened'] is None:
+            return self.CLOSED
+        if host_state['probing'] or \
+           time() - host_state['opened'] >= self.cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def stats(self):
+        """Consecutive failures and circuit state of hosts that have failed.
+
+        :rtype: dict of host to dict of ``failures`` and ``state``
+        """
+        return dict((host, {'failures': host_state['failures'],
+                            'state': self.state(host)})
+                    for host, host_state in self._hosts.items())
+
+    def reset(self, host=None):
+        """Close circuit of host, or all hosts if no host given."""
+        if host is None:
+            self._hosts.clear()
+            return
+        self._hosts.pop(host, None)
+
+    def check(self, host):
+        """Check host can be connected to, marking connection attempt as
+        probe if circuit is half open.
+
+        :raises: :py:class:`pssh.exceptions.CircuitOpenError` if host's
+          circuit is open or another connection attempt is probing it.
+        """
+        state = self.state(host)
+        if state == self.CLOSED:
+            return
+        host_state = self._hosts[host]
+        if state == self.OPEN or host_state['probing']:
+            ex = CircuitOpenError(
+                "Circuit open for host %s after %s consecutive failures",
+                host, host_state['failures'])
+            ex.host = host
+            raise ex
+        logger.debug("Circuit half open for host %s - probing", host)
+        host_state['probing'] = True
+
+    def success(self, host):
+        """Record successful connection, closing host's circuit."""
+        if self._hosts.pop(host, None) is not None:
+            logger.debug("Circuit closed for host %s", host)
+
+    def failure(self, host):
+        """Record failed connection, opening host's circuit if failure
+        threshold is reached or connection attempt was a probe."""
+        host_state = self._hosts.setdefault(
+            host, {'failures': 0, 'opened': None, 'probing': False})
+        host_state['failures'] += 1
+        if host_state['probing'] or \
+           host_state['failures'] >= self.failure_threshold:
+            logger.debug("Circuit opened for host %s after %s failures",
+                         host, host_state['failures'])
+            host_state['opened'] = time()
+        host_state['probing'] = False
+
+    @contextmanager
+    def guard(self, host):
+        """Context manager for connecting to host through circuit breaker.
+
+        :raises: :py:class:`pssh.exceptions.CircuitOpenError` as per
+          ``check``.
+        """
+        self.check(host)
+        try:
+            yield
+        except DeadlineTimeout:
+            # Stopped by parallel client rather than failed
+            self._end_probe(host)
+            raise
+        except Exception:
+            self.failure(host)
+            raise
+        except BaseException:
+            self._end_probe(host)
+            raise
+        self.success(host)
+
+    def _end_probe(self, host):
+        host_state = self._hosts.get(host)
+        if host_state is not None:
+            host_state['probing'] = False
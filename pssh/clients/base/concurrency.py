@@ -0,0 +1,458 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Concurrency limiters for connection establishment"""
+
+import logging
+import socket
+from threading import Lock
+from time import time
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from gevent import sleep
+from gevent.event import Event
+from gevent.lock import BoundedSemaphore
+from gevent.threadpool import ThreadPool
+
+from ...exceptions import AuthenticationException, UnknownHostException, \
+    PKeyFileError, DeadlineTimeout
+
+
+logger = logging.getLogger(__name__)
+# File descriptors kept free for uses other than SSH connections
+_FD_RESERVE = 32
+
+
+def _max_fd_limit(max_limit=None):
+    """Maximum concurrency allowed by open file descriptor limit of process,
+    or ``max_limit`` if lower."""
+    if resource is None:
+        return max_limit
+    soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft_limit == resource.RLIM_INFINITY:
+        return max_limit
+    fd_limit = max(soft_limit - _FD_RESERVE, 1)
+    if max_limit is None:
+        return fd_limit
+    return min(max_limit, fd_limit)
+
+
+class AdaptiveLimiter(object):
+    """Additive increase, multiplicative decrease (AIMD) concurrency limiter.
+
+    Concurrency limit is increased by one for every ``limit`` number of
+    successful attempts - roughly one per round of attempts - while attempts
+    succeed within ``latency_threshold``. Limit is multiplied by
+    ``backoff_factor`` on failed or slow attempts, at most once per
+    ``backoff_interval`` seconds so that a burst of failures from the same
+    round of attempts only backs off once.
+
+    Authentication, DNS and private key errors are not caused by load on
+    the remote end and do not cause back off. Neither do attempts killed or
+    stopped at a deadline, which have no outcome.
+
+    Current limit is available as ``limit`` and ``stats`` returns a dictionary
+    of current limit, attempts in flight and success and failure counters.
+    """
+
+    NON_CONGESTION_ERRORS = (AuthenticationException, UnknownHostException,
+                             PKeyFileError)
+
+    def __init__(self, initial_limit=10, min_limit=1, max_limit=None,
+                 backoff_factor=0.5, latency_threshold=None,
+                 backoff_interval=1):
+        """
+        :param initial_limit: Concurrency limit to start with.
+        :type initial_limit: int
+        :param min_limit: Limit will not be backed off to less than this.
+        :type min_limit: int
+        :param max_limit: (Optional) Limit will not be increased to more than
+          this. Maximum is also capped by the process' open file descriptor
+          limit.
+        :type max_limit: int
+        :param backoff_factor: Factor to multiply limit by on failures.
+        :type backoff_factor: float
+        :param latency_threshold: (Optional) Attempts taking longer than this
+          many seconds are treated as failures for the purpose of adjusting
+          limit. Defaults to only backing off on errors.
+        :type latency_threshold: float
+        :param backoff_interval: Minimum number of seconds between back offs.
+        :type backoff_interval: float
+        """
+        self.min_limit = min_limit
+        self.max_limit = _max_fd_limit(max_limit)
+        self.backoff_factor = backoff_factor
+        self.latency_threshold = latency_threshold
+        self.backoff_interval = backoff_interval
+        self._limit = float(max(initial_limit, min_limit))
+        if self.max_limit is not None:
+            self._limit = min(self._limit, self.max_limit)
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self._last_backoff = 0
+        self._slot_free = Event()
+
+    @property
+    def limit(self):
+        """Current concurrency limit"""
+        return int(self._limit)
+
+    def stats(self):
+        """Current limit and counters.
+
+        :rtype: dict
+        """
+        return {'limit': self.limit,
+                'in_flight': self.in_flight,
+                'successes': self.successes,
+                'failures': self.failures}
+
+    def acquire(self):
+        """Wait until an attempt can be made within current limit."""
+        while self.in_flight >= self.limit:
+            self._slot_free.clear()
+            self._slot_free.wait()
+        self.in_flight += 1
+
+    def release(self, latency=None, exception=None):
+        """Release attempt and adjust limit according to its outcome.
+
+        :param latency: Seconds the attempt took.
+        :type latency: float
+        :param exception: Exception raised by attempt, if any.
+        :type exception: :py:class:`Exception`
+        """
+        self.in_flight -= 1
+        if exception is not None and \
+           isinstance(exception, self.NON_CONGESTION_ERRORS):
+            pass
+        elif exception is not None or (
+                self.latency_threshold is not None and latency is not None
+                and latency > self.latency_threshold):
+            self.failures += 1
+            self._backoff()
+        else:
+            self.successes += 1
+            self._increase()
+        self._slot_free.set()
+
+    def run(self, func, *args, **kwargs):
+        """Run function within limit, adjusting limit according to its
+        outcome and duration."""
+        self.acquire()
+        start = time()
+        try:
+            result = func(*args, **kwargs)
+        except DeadlineTimeout:
+            # Stopped by client at deadline rather than failed
+            self._free_slot()
+            raise
+        except Exception as ex:
+            self.release(latency=time() - start, exception=ex)
+            raise
+        except BaseException:
+            # Killed or timed out attempts free their slot without
+            # adjusting limit, having no outcome
+            self._free_slot()
+            raise
+        self.release(latency=time() - start)
+        return result
+
+    def _free_slot(self):
+        self.in_flight -= 1
+        self._slot_free.set()
+
+    def _increase(self):
+        self._limit += 1.0 / self._limit
+        if self.max_limit is not None:
+            self._limit = min(self._limit, self.max_limit)
+
+    def _backoff(self):
+        now = time()
+        if now - self._last_backoff < self.backoff_interval:
+            return
+        self._last_backoff = now
+        self._limit = max(self._limit * self.backoff_factor, self.min_limit)
+        logger.debug("Backed off concurrency limit to %s", self.limit)
+
+
+class _Unlimited(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class StageLimits(object):
+    """Separate concurrency limits for each stage of running commands on
+    hosts - TCP connection, SSH handshake and authentication, and command
+    execution on a channel.
+
+    Each stage is a semaphore with its own queue of waiting hosts. Hosts
+    that have finished a stage move on to the next one without waiting on
+    hosts queued for other stages. Stages with no limit set are unlimited.
+    """
+
+    def __init__(self, connect=None, auth=None, execute=None):
+        """
+        :param connect: (Optional) Maximum number of concurrent TCP
+          connection attempts.
+        :type connect: int
+        :param auth: (Optional) Maximum number of concurrent SSH handshakes
+          and authentications - the CPU heavy part of connecting.
+        :type auth: int
+        :param execute: (Optional) Maximum number of concurrent channel open
+          and execute requests.
+        :type execute: int
+        """
+        self.connect = self._stage(connect)
+        self.auth = self._stage(auth)
+        self.execute = self._stage(execute)
+
+    @staticmethod
+    def _stage(limit):
+        if not limit:
+            return _Unlimited()
+        return BoundedSemaphore(limit)
+
+
+_NO_STAGE_LIMITS = StageLimits()
+
+
+class AuthExecutor(object):
+    """Dedicated thread pool for SSH handshakes and authentication.
+
+    Handshakes and authentication are CPU heavy and are run in native threads
+    so that they do not block the event loop. By default they share gevent's
+    hub thread pool with DNS resolution and other blocking calls, limiting
+    them to that pool's size. An executor of its own allows them to be sized
+    separately.
+
+    Number of queued and running calls, completed calls and time spent waiting
+    for a free thread are available via ``stats``.
+    """
+
+    def __init__(self, size):
+        """
+        :param size: Number of threads.
+        :type size: int
+        """
+        self.size = size
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.wait_time = 0
+        self.max_wait_time = 0
+        self._pool = ThreadPool(size)
+        # Counters are updated from pool threads as well
+        self._lock = Lock()
+
+    def stats(self):
+        """Current queue depth and counters.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {'size': self.size,
+                    'queued': self.queued,
+                    'running': self.running,
+                    'completed': self.completed,
+                    'wait_time': self.wait_time,
+                    'max_wait_time': self.max_wait_time}
+
+    def spawn(self, func, *args, **kwargs):
+        """Run function in a thread of the pool once one is free.
+
+        :rtype: :py:class:`gevent.threadpool.ThreadResult` to get function's
+          result from.
+        """
+        with self._lock:
+            self.queued += 1
+        return self._pool.spawn(self._run, time(), func, args, kwargs)
+
+    def apply(self, func, *args, **kwargs):
+        """Run function in a thread of the pool and return its result,
+        waiting for a free thread if none are available."""
+        return self.spawn(func, *args, **kwargs).get()
+
+    def _run(self, submitted, func, args, kwargs):
+        wait_time = time() - submitted
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def close(self):
+        """Stop pool threads."""
+        self._pool.kill()
+
+
+class TokenBucket(object):
+    """Token bucket rate limit of ``rate`` tokens per second with up to
+    ``burst`` tokens available at once.
+
+    Tokens are reserved in order of requests, so callers wait in turn rather
+    than competing for each new token. Safe to use from multiple threads.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: Tokens added per second.
+        :type rate: float
+        :param burst: (Optional) Maximum number of tokens available at once.
+          Defaults to ``rate``, with a minimum of one.
+        :type burst: float
+        """
+        self.rate = rate
+        self.burst = burst if burst else max(rate, 1)
+        self._tokens = self.burst
+        self._updated = time()
+        self._lock = Lock()
+
+    def reserve(self):
+        """Take a token, returning seconds to wait before using it.
+
+        :rtype: float
+        """
+        with self._lock:
+            now = time()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / float(self.rate)
+
+
+class ConnectRateLimiter(object):
+    """Rate limit of new connection attempts, overall and per subnet of
+    target address.
+
+    Limits bursts of new connections, through a proxy host or to hosts
+    behind the same load balancer or firewall, that would otherwise be
+    dropped by servers limiting concurrent unauthenticated connections, like
+    OpenSSH's ``MaxStartups``, and retried.
+
+    The same limiter may be used by any number of clients, including clients
+    running in other threads like the proxy tunnel.
+
+    Number of attempts, attempts that were delayed and total seconds
+    delayed are available via ``stats``.
+    """
+
+    def __init__(self, rate=None, burst=None, subnet_rate=None,
+                 subnet_burst=None, ipv4_prefix=24, ipv6_prefix=64):
+        """
+        :param rate: (Optional) Maximum new connection attempts per second
+          overall. Defaults to no overall limit.
+        :type rate: float
+        :param burst: (Optional) Number of attempts allowed at once before
+          ``rate`` applies. Defaults to ``rate``.
+        :type burst: float
+        :param subnet_rate: (Optional) Maximum new connection attempts per
+          second per subnet. Defaults to no per subnet limit.
+        :type subnet_rate: float
+        :param subnet_burst: (Optional) Number of attempts per subnet allowed
+          at once before ``subnet_rate`` applies. Defaults to
+          ``subnet_rate``.
+        :type subnet_burst: float
+        :param ipv4_prefix: Prefix length of IPv4 subnets.
+        :type ipv4_prefix: int
+        :param ipv6_prefix: Prefix length of IPv6 subnets.
+        :type ipv6_prefix: int
+        """
+        self.subnet_rate = subnet_rate
+        self.subnet_burst = subnet_burst
+        self.ipv4_prefix = ipv4_prefix
+        self.ipv6_prefix = ipv6_prefix
+        self.attempts = 0
+        self.delayed = 0
+        self.wait_time = 0
+        self._bucket = TokenBucket(rate, burst=burst) if rate else None
+        self._subnet_buckets = {}
+        self._lock = Lock()
+
+    def stats(self):
+        """Attempt counters.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {'attempts': self.attempts,
+                    'delayed': self.delayed,
+                    'wait_time': self.wait_time}
+
+    def acquire(self, address):
+        """Wait until a new connection attempt to address is allowed.
+
+        :param address: IP address to connect to. Host names are limited by
+          name rather than subnet.
+        :type address: str
+        """
+        delay = 0
+        if self._bucket is not None:
+            delay = self._bucket.reserve()
+        subnet_bucket = self._subnet_bucket(address)
+        if subnet_bucket is not None:
+            delay = max(delay, subnet_bucket.reserve())
+        with self._lock:
+            self.attempts += 1
+            if delay:
+                self.delayed += 1
+                self.wait_time += delay
+        if delay:
+            logger.debug("Delaying connection to %s by %.3fs", address, delay)
+            sleep(delay)
+
+    def _subnet_bucket(self, address):
+        if not self.subnet_rate:
+            return
+        subnet = self._subnet(address)
+        with self._lock:
+            bucket = self._subnet_buckets.get(subnet)
+            if bucket is None:
+                bucket = self._subnet_buckets[subnet] = TokenBucket(
+                    self.subnet_rate, burst=self.subnet_burst)
+        return bucket
+
+    def _subnet(self, address):
+        for family, prefix in ((socket.AF_INET, self.ipv4_prefix),
+                               (socket.AF_INET6, self.ipv6_prefix)):
+            try:
+                packed = bytearray(socket.inet_pton(family, address))
+            except (socket.error, ValueError):
+                continue
+            full_bytes, bits = divmod(prefix, 8)
+            masked = packed[:full_bytes]
+            if bits and full_bytes < len(packed):
+                masked.append(packed[full_bytes] & (0xff << (8 - bits)) & 0xff)
+            return family, bytes(masked)
+        return address
@@ -20,15 +20,32 @@
 import string
 import random
 import logging
+import weakref
+from collections import OrderedDict
+from functools import partial
+from math import ceil
+from time import time
 
 import gevent.pool
 
 from warnings import warn
-from gevent import joinall
+from gevent import joinall, getcurrent, spawn, spawn_later, socket, \
+    Timeout as GTimeout
+from gevent.event import Event
 from gevent.hub import Hub
+from gevent.lock import RLock
 
+from .auth import AuthCache
+from .circuit import _no_guard
+from .concurrency import AdaptiveLimiter, StageLimits, AuthExecutor, \
+    _max_fd_limit
+from .resolver import DNSCache
+from .retry import RetryPolicy
+from .sessions import SessionPool
+from ..common import SourceAddressPool
 from ...constants import DEFAULT_RETRIES, RETRY_DELAY
-from ...exceptions import HostArgumentException, Timeout
+from ...exceptions import HostArgumentException, Timeout, RollingAbortError, \
+    ProxyError, DeadlineTimeout
 from ...output import HostOutput
 
 
@@ -45,6 +62,35 @@ except NameError:
     xrange = range
 
 
+class _HostLock(object):
+    """Lock for key in ``locks``, shared by all greenlets using the key at the
+    same time and removed from ``locks`` once none hold or wait on it."""
+
+    def __init__(self, locks, key):
+        self._locks = locks
+        self._key = key
+
+    def __enter__(self):
+        entry = self._locks.setdefault(self._key, [RLock(), 0])
+        entry[1] += 1
+        try:
+            entry[0].acquire()
+        except BaseException:
+            self._unref(entry)
+            raise
+        return self
+
+    def __exit__(self, *args):
+        entry = self._locks[self._key]
+        entry[0].release()
+        self._unref(entry)
+
+    def _unref(self, entry):
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._locks[self._key]
+
+
 class BaseParallelSSHClient(object):
     """Parallel client base class."""
 
@@ -53,7 +99,14 @@ class BaseParallelSSHClient(object):
                  num_retries=DEFAULT_RETRIES,
                  timeout=120, pool_size=10,
                  host_config=None, retry_delay=RETRY_DELAY,
-                 identity_auth=True):
+                 identity_auth=True, adaptive_concurrency=False,
+                 connect_concurrency=None, auth_concurrency=None,
+                 exec_concurrency=None, max_sessions=None,
+                 session_idle_timeout=None, dns_cache_ttl=None,
+                 retry_policy=None, auth_threads=None, remember_auth=False,
+                 auth_cache_file=None, circuit_breaker=None,
+                 session_registry=None, connect_rate_limiter=None,
+                 socket_options=None, source_addresses=None):
         if isinstance(hosts, str) or isinstance(hosts, bytes):
             raise TypeError(
                 "Hosts must be list or other iterable, not string. "
@@ -68,20 +121,61 @@ class BaseParallelSSHClient(object):
         self.pkey = pkey
         self.num_retries = num_retries
         self.timeout = timeout
+        if max_sessions is not None and max_sessions < pool_size:
+            raise ValueError(
+                "Maximum number of sessions must not be lower than pool size")
         # To hold host clients
         self.host_clients = {}
-        self._host_clients = {}
+        self.session_pool = SessionPool(
+            max_size=max_sessions, idle_timeout=session_idle_timeout,
+            on_evict=self._evict_client)
+        self._host_clients = self.session_pool
         self.host_config = host_config if host_config else {}
         self.retry_delay = retry_delay
         self.cmds = None
         self.identity_auth = identity_auth
+        self.connect_limiter = AdaptiveLimiter(
+            initial_limit=min(10, pool_size), max_limit=pool_size) \
+            if adaptive_concurrency else None
+        self.stage_limits = StageLimits(
+            connect=connect_concurrency, auth=auth_concurrency,
+            execute=exec_concurrency)
+        self.dns_cache = DNSCache(ttl=dns_cache_ttl) \
+            if dns_cache_ttl else None
+        self.retry_policy = retry_policy if retry_policy is not None \
+            else RetryPolicy(retry_delay=retry_delay)
+        self.auth_executor = AuthExecutor(auth_threads) \
+            if auth_threads else None
+        self.auth_cache = AuthCache(path=auth_cache_file) \
+            if remember_auth or auth_cache_file else None
+        self.circuit_breaker = circuit_breaker
+        self.session_registry = session_registry
+        self.connect_rate_limiter = connect_rate_limiter
+        self.socket_options = socket_options
+        self.source_addresses = SourceAddressPool(source_addresses) \
+            if source_addresses else None
+        self._host_locks = {}
+        self._output_pins = {}
+        self._released_pins = []
+        # Pool greenlets holding pool slots of greenlets they wait on
+        self._slot_greenlets = {}
 
     def run_command(self, command, user=None, stop_on_errors=True,
                     host_args=None, use_pty=False, shell=None,
                     encoding='utf-8', return_list=False,
                     *args, **kwargs):
         greenlet_timeout = kwargs.pop('greenlet_timeout', None)
-        if host_args:
+        deadline = kwargs.pop('deadline', None)
+        self._start_run()
+        if deadline is not None:
+            host_cmds = self._host_commands(self.hosts, command, host_args)
+            cmds = self._spawn_with_deadline(
+                deadline, self._run_command,
+                ((host, (host_i, host, _command) + args)
+                 for host_i, host, _command in host_cmds),
+                user=user, encoding=encoding, use_pty=use_pty, shell=shell,
+                **kwargs)
+        elif host_args:
             try:
                 cmds = [self.pool.spawn(
                     self._run_command, host_i, host,
@@ -102,10 +196,484 @@ class BaseParallelSSHClient(object):
                     for host_i, host in enumerate(self.hosts)]
         self.cmds = cmds
         joinall(cmds, raise_error=False, timeout=greenlet_timeout)
+        self._end_run()
         return self._get_output_from_cmds(cmds, stop_on_errors=stop_on_errors,
                                           timeout=greenlet_timeout,
                                           return_list=return_list)
 
+    def _spawn_with_deadline(self, deadline, func, host_func_args, **kwargs):
+        """Spawn ``func`` in pool for each ``(host, func_args)`` and return
+        list of greenlets in the same order.
+
+        Hosts for which no pool slot became free by ``deadline`` seconds from
+        now are not started and greenlets still running at deadline are
+        killed. Greenlets of either raise
+        :py:class:`pssh.exceptions.DeadlineTimeout`.
+
+        Errors from ``host_func_args``, like on missing host arguments, are
+        raised before any greenlet is spawned."""
+        host_func_args = list(host_func_args)
+        end = time() + deadline
+        cmds = []
+        hosts = []
+        for host, func_args in host_func_args:
+            remaining = end - time()
+            if remaining > 0 and self.pool.wait_available(timeout=remaining):
+                cmds.append(self.pool.spawn(func, *func_args, **kwargs))
+            else:
+                cmds.append(spawn(self._raise_deadline, host, deadline))
+            hosts.append(host)
+        spawn_later(max(end - time(), 0), self._kill_at_deadline,
+                    cmds, hosts, deadline)
+        return cmds
+
+    def _deadline_timeout(self, host, deadline):
+        ex = DeadlineTimeout(
+            "Deadline of %s sec(s) reached before host finished" % (
+                deadline,))
+        ex.host = host
+        return ex
+
+    def _raise_deadline(self, host, deadline):
+        raise self._deadline_timeout(host, deadline)
+
+    def _kill_at_deadline(self, cmds, hosts, deadline):
+        for cmd, host in zip(cmds, hosts):
+            if not cmd.ready():
+                logger.debug("Deadline reached for host %s - killing", host)
+                cmd.kill(exception=self._deadline_timeout(host, deadline),
+                         block=False)
+
+    def imap_run_command(self, command, sudo=False, user=None,
+                         stop_on_errors=True, use_pty=False, host_args=None,
+                         shell=None, encoding='utf-8', timeout=None,
+                         greenlet_timeout=None, hosts=None):
+        """Run command on all hosts in parallel, honoring self.pool_size,
+        and yield output for each host as soon as it is available.
+
+        Unlike ``run_command``, which returns only once all hosts have
+        connected and started executing the command, this function returns a
+        generator that yields a :py:class:`pssh.output.HostOutput` for each
+        host as soon as the command has been started on that host. Output
+        reading and processing of hosts that are ready can therefor overlap
+        with connection establishment to the rest of the hosts.
+
+        Hosts are dispatched lazily - a host is only taken from ``hosts`` once
+        a pool slot becomes free and no more than ``self.pool_size`` host
+        outputs are buffered waiting to be consumed. Memory used for
+        dispatching is therefor bounded by pool size rather than the number of
+        hosts, as long as output is consumed as it is yielded.
+
+        Clients of hosts from ``hosts`` are not kept by the parallel client
+        once their output has been yielded. They are disconnected once their
+        host output is no longer referenced, so that memory used for them is
+        bounded by the number of host outputs kept by the caller.
+
+        Output is yielded in the order in which hosts become ready, which is
+        not necessarily the order of hosts.
+
+        When the generator is stopped early, by raising on errors or by the
+        caller no longer iterating and closing it, no more hosts are
+        dispatched and hosts already dispatched whose output has not been
+        yielded are stopped.
+
+        Parameters are as per ``run_command``.
+
+        :param greenlet_timeout: (Optional) Maximum number of seconds to wait
+          for the next host output to become available. Raises
+          :py:class:`gevent.Timeout` if reached.
+        :type greenlet_timeout: float
+        :param hosts: (Optional) Iterable of hosts to run command on, instead
+          of ``self.hosts``. May be any iterable, including a generator, which
+          will only be consumed as pool slots become free.
+        :type hosts: iterable(str)
+
+        :rtype: generator of :py:class:`pssh.output.HostOutput`
+
+        :raises: Exceptions from hosts as per ``run_command`` when
+          ``stop_on_errors`` is ``True``, in which case no more output is
+          yielded.
+        :raises: :py:class:`pssh.exceptions.HostArgumentException` on number of
+          host arguments being less than number of hosts, once the first host
+          without arguments is reached.
+        """
+        keep_clients = hosts is None
+        if keep_clients:
+            hosts = self.hosts
+        self._start_run(resolve_hosts=keep_clients)
+        run_cmd = partial(
+            self._run_command_output, sudo=sudo, user=user, shell=shell,
+            use_pty=use_pty, encoding=encoding, timeout=timeout)
+        host_cmds = self._host_commands(hosts, command, host_args)
+        if not keep_clients:
+            # Clients of hosts not in self.hosts are not kept by host index
+            host_cmds = ((None, host, _command)
+                         for _, host, _command in host_cmds)
+        # Hosts dispatched but not yet yielded, stopped when stopped early
+        tasks = gevent.pool.Group()
+        stopped = Event()
+
+        def _run_host(host_cmd):
+            if stopped.is_set():
+                return
+            tasks.add(getcurrent())
+            return run_cmd(host_cmd)
+        results = self.pool.imap_unordered(
+            _run_host, host_cmds, maxsize=self.pool_size)
+        try:
+            while True:
+                with GTimeout(greenlet_timeout):
+                    try:
+                        host_out = next(results)
+                    except StopIteration:
+                        self._end_run()
+                        return
+                if stop_on_errors and host_out.exception is not None:
+                    raise host_out.exception
+                yield host_out
+                if not keep_clients:
+                    self._drop_client((None, host_out.host))
+        finally:
+            stopped.set()
+            results.kill()
+            tasks.kill()
+            if not keep_clients:
+                for host_key in self._host_clients.keys():
+                    if host_key[0] is None:
+                        self._drop_client(host_key)
+
+    def _host_commands(self, hosts, command, host_args=None):
+        """Generator of (host_i, host, command) for hosts, formatting
+        command with host arguments if any"""
+        for host_i, host in enumerate(hosts):
+            if not host_args:
+                yield host_i, host, command
+                continue
+            try:
+                yield host_i, host, command % host_args[host_i]
+            except IndexError:
+                raise HostArgumentException(
+                    "Number of host arguments provided does not match "
+                    "number of hosts ")
+
+    def _run_command_output(self, host_cmd, **kwargs):
+        """Run command on host and return its output, with any exception
+        raised added to host output"""
+        host_i, host, command = host_cmd
+        # Run in own greenlet, like run_command, so that host output does not
+        # reference the greenlet returning it, and is released as soon as it
+        # is no longer used - see _run_command.
+        cmd = spawn(self._run_command, host_i, host, command, **kwargs)
+        self._slot_greenlets[cmd] = getcurrent()
+        try:
+            (channel, host, stdout, stderr, stdin), _client = cmd.get()
+        except Exception as ex:
+            return HostOutput(host, cmd, None, None, None, None,
+                              None, exception=ex)
+        finally:
+            cmd.kill()
+            del self._slot_greenlets[cmd]
+        return HostOutput(host, cmd, channel, stdout, stderr, stdin, _client)
+
+    def connect_all(self, stop_on_errors=True, callback=None):
+        """Connect and authenticate to all hosts in parallel, honoring
+        self.pool_size, without running any commands.
+
+        Clients are kept for use by subsequent functions like
+        ``run_command``, which then only need to open a channel and execute
+        on already authenticated sessions. Hosts already connected to are
+        not reconnected.
+
+        :param stop_on_errors: (Optional) Raise exception from first host, in
+          host order, that failed to connect once all hosts have been
+          attempted. Defaults to ``True``.
+        :type stop_on_errors: bool
+        :param callback: (Optional) Function to call with
+          ``(host_i, host, result)`` as each host finishes, where ``result``
+          is as per returned list. May be used for progress reporting.
+        :type callback: function
+
+        :rtype: list of SSH client or exception raised when connecting for
+          each host, in the same order as ``self.hosts``.
+        :raises: :py:class:`ValueError` when there are more hosts than
+          ``max_sessions``, as not all clients could be kept.
+        """
+        hosts = list(self.hosts)
+        max_sessions = self.session_pool.max_size
+        if max_sessions is not None and len(hosts) > max_sessions:
+            raise ValueError(
+                "Cannot keep clients of %s hosts with maximum of %s "
+                "sessions" % (len(hosts), max_sessions))
+        self._start_run()
+        results = [None for _ in hosts]
+        for host_i, result in self.pool.imap_unordered(
+                self._connect_host, enumerate(hosts)):
+            results[host_i] = result
+            if callback is not None:
+                callback(host_i, hosts[host_i], result)
+        self._end_run()
+        if stop_on_errors:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def _connect_host(self, host_i_host):
+        host_i, host = host_i_host
+        try:
+            return host_i, self._make_ssh_client(host_i, host)
+        except Exception as ex:
+            ex.host = host
+            logger.error("Failed to connect to host %s - %s", host, ex)
+            return host_i, ex
+
+    def probe(self, timeout=2, read_banner=False, concurrency=1000,
+              exclude_unreachable=False):
+        """Check which hosts accept TCP connections on their SSH port,
+        connecting to all hosts concurrently with a short timeout and without
+        SSH handshake or authentication.
+
+        Hosts that are down otherwise hold a pool slot for the full connection
+        ``timeout`` and retries when running commands. Probing first allows
+        them to be left out of runs.
+
+        :param timeout: Seconds to wait for each host to resolve, connect and,
+          if enabled, send its SSH banner.
+        :type timeout: float
+        :param read_banner: (Optional) Also require hosts to send an SSH
+          protocol banner, rather than only accept connections.
+        :type read_banner: bool
+        :param concurrency: (Optional) Maximum number of concurrent
+          connections. Capped at open file descriptor limit of process.
+        :type concurrency: int
+        :param exclude_unreachable: (Optional) Remove unreachable hosts from
+          ``self.hosts`` so that subsequent functions only run on reachable
+          hosts. Clients of removed hosts are disconnected and clients of
+          remaining hosts are kept.
+        :type exclude_unreachable: bool
+
+        :rtype: tuple(set, set) of reachable and unreachable hosts
+
+        :raises: :py:class:`pssh.exceptions.ProxyError` when using a proxy
+          host, as hosts behind it cannot be connected to directly.
+        """
+        if not self._can_probe():
+            raise ProxyError("Hosts cannot be probed when using a proxy host")
+        hosts = list(OrderedDict.fromkeys(self.hosts))
+        pool = gevent.pool.Pool(size=_max_fd_limit(concurrency))
+        results = pool.map(
+            partial(self._probe_host, timeout=timeout,
+                    read_banner=read_banner), hosts)
+        reachable = set(host for host, result in zip(hosts, results)
+                        if result)
+        unreachable = set(hosts) - reachable
+        if unreachable:
+            logger.error("%s of %s hosts are unreachable",
+                         len(unreachable), len(hosts))
+        if exclude_unreachable:
+            self._exclude_hosts(unreachable)
+        return reachable, unreachable
+
+    def _exclude_hosts(self, excluded):
+        """Remove hosts from ``self.hosts``, disconnecting their clients and
+        re-keying clients of remaining hosts by their new position."""
+        hosts = []
+        host_keys = {}
+        for host_i, host in enumerate(self.hosts):
+            host_key = (host_i, host)
+            if host in excluded:
+                client = self._host_clients.pop(host_key, None)
+                if client is not None:
+                    self._evict_client(host_key, client)
+                continue
+            host_keys[host_key] = (len(hosts), host)
+            hosts.append(host)
+        self._rekey_clients(host_keys)
+        self.hosts = hosts
+
+    def _rekey_clients(self, host_keys):
+        """Change keys of kept clients as per ``host_keys`` mapping of current
+        to new keys."""
+        self._host_clients.rekey(host_keys)
+        for ref, host_key in list(self._output_pins.items()):
+            self._output_pins[ref] = host_keys.get(host_key, host_key)
+
+    def _can_probe(self):
+        return True
+
+    def _probe_host(self, host, timeout=2, read_banner=False):
+        """Check host accepts TCP connections, and sends SSH banner if
+        ``read_banner`` is set, within ``timeout``"""
+        _, port, _, _ = self._get_host_config_values(host)
+        port = port if port else 22
+        sock = None
+        timer = GTimeout(timeout)
+        timer.start()
+        try:
+            if self.dns_cache is not None:
+                addresses = self.dns_cache.resolve(host, port)
+            else:
+                addresses = [(family, address) for family, _, _, _, address
+                             in socket.getaddrinfo(
+                                 host, port, 0, socket.SOCK_STREAM)]
+            error = None
+            for family, address in addresses:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                try:
+                    self._bind_source_address(sock, family)
+                    sock.connect(address)
+                except Exception as ex:
+                    sock.close()
+                    sock = None
+                    error = ex
+                    continue
+                break
+            if sock is None:
+                raise error
+            if read_banner:
+                self._read_banner(sock)
+        except GTimeout as ex:
+            if ex is not timer:
+                raise
+            logger.debug("Timed out probing host %s", host)
+            return False
+        except Exception as ex:
+            logger.debug("Host %s is unreachable - %s", host, ex)
+            return False
+        finally:
+            timer.cancel()
+            if sock is not None:
+                sock.close()
+        return True
+
+    def _bind_source_address(self, sock, family):
+        if self.source_addresses is None:
+            return
+        source = self.source_addresses.get(family)
+        if source is not None:
+            sock.bind((source, 0))
+
+    @staticmethod
+    def _read_banner(sock):
+        """Read from socket until SSH banner line is received. Servers may
+        send other lines before it."""
+        data = b''
+        while b'SSH-' not in data:
+            if len(data) > 8192:
+                raise ValueError("No SSH banner received")
+            _data = sock.recv(1024)
+            if not _data:
+                raise ValueError("Connection closed before SSH banner")
+            data += _data
+
+    def rolling_run_command(self, command, batch_size=0.1, canary_size=None,
+                            max_failure_rate=0, sudo=False, user=None,
+                            use_pty=False, host_args=None, shell=None,
+                            encoding='utf-8', timeout=None):
+        """Run command on hosts in consecutive batches, waiting for all
+        commands in a batch to finish before starting the next batch, and stop
+        once the failure rate of hosts run on so far is over
+        ``max_failure_rate``.
+
+        A host has failed if running the command on it raised an exception or
+        the command's exit code is not zero.
+
+        Hosts not run on because of the failure rate being crossed have a
+        :py:class:`pssh.exceptions.RollingAbortError` as their host output's
+        exception.
+
+        Other parameters are as per ``run_command``.
+
+        :param batch_size: Number of hosts per batch, or fraction of all hosts
+          if less than one. Defaults to 10% of hosts.
+        :type batch_size: int or float
+        :param canary_size: (Optional) Number of hosts, or fraction of all
+          hosts if less than one, to run on in a first batch on their own
+          before continuing with batches of ``batch_size``.
+        :type canary_size: int or float
+        :param max_failure_rate: Maximum fraction of failed hosts out of
+          hosts run on so far for batches to continue. Defaults to ``0`` -
+          any failure stops the run.
+        :type max_failure_rate: float
+
+        :rtype: list(:py:class:`pssh.output.HostOutput`) in the same order as
+          ``self.hosts``. Output of hosts that were run on is read to
+          completion, with ``stdout`` and ``stderr`` as lists of lines.
+
+        :raises: :py:class:`pssh.exceptions.HostArgumentException` on number of
+          host arguments not matching number of hosts.
+        """
+        self._start_run()
+        hosts = list(self.hosts)
+        host_cmds = list(self._host_commands(hosts, command, host_args))
+        run_cmd = partial(
+            self._run_rolling_host, sudo=sudo, user=user, shell=shell,
+            use_pty=use_pty, encoding=encoding, timeout=timeout)
+        output = [None for _ in hosts]
+        run = failed = 0
+        batches = self._rolling_batches(len(hosts), batch_size, canary_size)
+        for batch in batches:
+            for host_i, host_out in self.pool.imap_unordered(
+                    run_cmd, (host_cmds[host_i] for host_i in batch)):
+                output[host_i] = host_out
+                run += 1
+                if host_out.exception is not None or host_out.exit_code != 0:
+                    failed += 1
+            if float(failed) / run > max_failure_rate:
+                logger.error("Rolling run failure rate of %s/%s hosts is over "
+                             "%s - stopping", failed, run, max_failure_rate)
+                break
+        for host_i, host in enumerate(hosts):
+            if output[host_i] is not None:
+                continue
+            ex = RollingAbortError(
+                "Host not run on - rolling run stopped with %s of %s hosts "
+                "failed" % (failed, run))
+            ex.host = host
+            output[host_i] = HostOutput(host, None, None, None, None, None,
+                                        None, exception=ex)
+        self._end_run()
+        return output
+
+    def _rolling_batches(self, num_hosts, batch_size, canary_size=None):
+        """Generator of lists of host indices per batch of rolling run"""
+        def _size(size):
+            if size < 1:
+                size = ceil(size * num_hosts)
+            return max(int(size), 1)
+        start = 0
+        if canary_size and num_hosts:
+            start = min(_size(canary_size), num_hosts)
+            yield list(range(start))
+        batch_size = _size(batch_size)
+        for batch_start in range(start, num_hosts, batch_size):
+            yield list(range(batch_start,
+                             min(batch_start + batch_size, num_hosts)))
+
+    def _run_rolling_host(self, host_cmd, encoding='utf-8', **kwargs):
+        """Run command on host and wait for it to finish, reading its output
+        into lists so that output larger than the channel's window does not
+        stop the command from finishing."""
+        host_out = self._run_command_output(
+            host_cmd, encoding=encoding, **kwargs)
+        if host_out.exception is None:
+            stdout = []
+            stderr = []
+            readers = [spawn(stdout.extend, host_out.stdout),
+                       spawn(stderr.extend, host_out.stderr)]
+            try:
+                joinall(readers, raise_error=True)
+                host_out.client.wait_finished(host_out.channel)
+            except Exception as ex:
+                ex.host = host_out.host
+                host_out.exception = ex
+            finally:
+                for reader in readers:
+                    reader.kill()
+            host_out.stdout = stdout
+            host_out.stderr = stderr
+        return host_cmd[0], host_out
+
     def _get_output_from_cmds(self, cmds, stop_on_errors=False, timeout=None,
                               return_list=False):
         if not return_list:
@@ -211,17 +779,38 @@ class BaseParallelSSHClient(object):
     def _run_command(self, host_i, host, command, sudo=False, user=None,
                      shell=None, use_pty=False,
                      encoding='utf-8', timeout=None):
-        """Make SSHClient if needed, run command on host"""
+        """Make SSHClient if needed, run command on host.
+
+        Host's client is kept pinned in session pool for as long as the
+        greenlet running this, referenced by host output, is."""
+        self._pin_until_released((host_i, host), getcurrent())
         try:
             _client = self._make_ssh_client(host_i, host)
-            return _client.run_command(
-                command, sudo=sudo, user=user, shell=shell,
-                use_pty=use_pty, encoding=encoding, timeout=timeout), _client
+            with self.stage_limits.execute:
+                return _client.run_command(
+                    command, sudo=sudo, user=user, shell=shell,
+                    use_pty=use_pty, encoding=encoding,
+                    timeout=timeout), _client
         except Exception as ex:
             ex.host = host
             logger.error("Failed to run on host %s - %s", host, ex)
             raise ex
 
+    def _pin_until_released(self, host_key, cmd):
+        """Pin host key in session pool until greenlet ``cmd`` is no longer
+        referenced."""
+        def _release(ref):
+            # Evicting disconnects clients, which is not done from within
+            # garbage collection - keys are unpinned on next use of pool.
+            self._released_pins.append(self._output_pins.pop(ref))
+        self._unpin_released()
+        self.session_pool.pin(host_key)
+        self._output_pins[weakref.ref(cmd, _release)] = host_key
+
+    def _unpin_released(self):
+        while self._released_pins:
+            self.session_pool.unpin(self._released_pins.pop())
+
     def get_output(self, cmd, output, timeout=None):
         """Get output from command.
 
@@ -268,7 +857,7 @@ class BaseParallelSSHClient(object):
                                   client, exception=exception)
 
     def join(self, output, consume_output=False, timeout=None,
-             encoding='utf-8'):
+             encoding='utf-8', deadline=None):
         """Wait until all remote commands in output have finished.
         Does *not* block other commands from running in parallel.
 
@@ -292,11 +881,23 @@ class BaseParallelSSHClient(object):
         :param encoding: Encoding to use for output. Must be valid
           `Python codec <https://docs.python.org/library/codecs.html>`_
         :type encoding: str
+        :param deadline: (Optional) Seconds from now after which hosts whose
+          commands have not finished are no longer waited on. Their channels
+          are closed and their host output's ``exception`` set to
+          :py:class:`pssh.exceptions.DeadlineTimeout` rather than ``join``
+          raising.
+        :type deadline: float
 
         :raises: :py:class:`pssh.exceptions.Timeout` on timeout requested and
           reached with commands still running.
 
         :rtype: ``None``"""
+        if deadline is not None:
+            host_outs = output if isinstance(output, list) \
+                else list(output.values())
+            return self._join_deadline(
+                host_outs, deadline, consume_output=consume_output,
+                encoding=encoding)
         cmds = []
         if isinstance(output, list):
             for host_i, host_out in enumerate(output):
@@ -321,6 +922,27 @@ class BaseParallelSSHClient(object):
                 "Timeout of %s sec(s) reached with commands "
                 "still running")
 
+    def _join_deadline(self, host_outs, deadline, consume_output=False,
+                       encoding='utf-8'):
+        host_outs = [host_out for host_out in host_outs
+                     if host_out is not None]
+        cmds = self._spawn_with_deadline(
+            deadline, self._join,
+            ((host_out.host, (host_out,)) for host_out in host_outs),
+            consume_output=consume_output, encoding=encoding)
+        joinall(cmds, raise_error=False)
+        for host_out, cmd in zip(host_outs, cmds):
+            if cmd.exception is None:
+                continue
+            if not isinstance(cmd.exception, Timeout):
+                raise cmd.exception
+            host_out.exception = cmd.exception
+            try:
+                host_out.client.close_channel(host_out.channel)
+            except Exception as ex:
+                logger.debug("Error closing channel of host %s - %s",
+                             host_out.host, ex)
+
     def _join(self, host_out, consume_output=False, timeout=None,
               encoding="utf-8"):
         if host_out is None:
@@ -371,7 +993,8 @@ class BaseParallelSSHClient(object):
         """
         warn("get_exit_code is deprecated and will be removed in 2.0.0")
 
-    def copy_file(self, local_file, remote_file, recurse=False, copy_args=None):
+    def copy_file(self, local_file, remote_file, recurse=False, copy_args=None,
+                  deadline=None):
         """Copy local file to remote file in parallel
 
         This function returns a list of greenlets which can be
@@ -399,6 +1022,11 @@ class BaseParallelSSHClient(object):
           equal length of host list -
           :py:class:`pssh.exceptions.HostArgumentException` is raised otherwise
         :type copy_args: tuple or list
+        :param deadline: (Optional) Seconds from now after which copies not
+          yet started are not started and copies in progress are killed.
+          Greenlets of such hosts raise
+          :py:class:`pssh.exceptions.DeadlineTimeout`.
+        :type deadline: float
 
         :rtype: List(:py:class:`gevent.Greenlet`) of greenlets for remote copy
           commands
@@ -416,6 +1044,22 @@ class BaseParallelSSHClient(object):
           created as long as permissions allow.
 
         """
+        self._start_run()
+        if deadline is not None:
+            hosts = list(self.hosts)
+            try:
+                files = [(local_file % copy_args[host_i],
+                          remote_file % copy_args[host_i]) if copy_args
+                         else (local_file, remote_file)
+                         for host_i in range(len(hosts))]
+            except IndexError:
+                raise HostArgumentException(
+                    "Number of per-host copy arguments provided does not match "
+                    "number of hosts")
+            return self._spawn_with_deadline(
+                deadline, self._copy_file,
+                ((host, (host_i, host) + files[host_i] + ({'recurse': recurse},))
+                 for host_i, host in enumerate(hosts)))
         if copy_args:
             try:
                 return [self.pool.spawn(self._copy_file, host_i, host,
@@ -434,6 +1078,7 @@ class BaseParallelSSHClient(object):
 
     def _copy_file(self, host_i, host, local_file, remote_file, recurse=False):
         """Make sftp client, copy file"""
+        self.session_pool.pin((host_i, host))
         try:
             self._make_ssh_client(host_i, host)
             return self._host_clients[(host_i, host)].copy_file(
@@ -441,6 +1086,8 @@ class BaseParallelSSHClient(object):
         except Exception as ex:
             ex.host = host
             raise ex
+        finally:
+            self.session_pool.unpin((host_i, host))
 
     def copy_remote_file(self, remote_file, local_file, recurse=False,
                          suffix_separator='_', copy_args=None, **kwargs):
@@ -501,6 +1148,7 @@ class BaseParallelSSHClient(object):
           filepath separated by ``suffix_separator``.
 
         """
+        self._start_run()
         if copy_args:
             try:
                 return [self.pool.spawn(
@@ -521,6 +1169,7 @@ class BaseParallelSSHClient(object):
     def _copy_remote_file(self, host_i, host, remote_file, local_file, recurse,
                           **kwargs):
         """Make sftp client, copy file to local"""
+        self.session_pool.pin((host_i, host))
         try:
             self._make_ssh_client(host_i, host)
             return self._host_clients[(host_i, host)].copy_remote_file(
@@ -528,6 +1177,8 @@ class BaseParallelSSHClient(object):
         except Exception as ex:
             ex.host = host
             raise ex
+        finally:
+            self.session_pool.unpin((host_i, host))
 
     def _handle_greenlet_exc(self, func, host, *args, **kwargs):
         try:
@@ -538,3 +1189,121 @@ class BaseParallelSSHClient(object):
 
     def _make_ssh_client(self, host_i, host):
         raise NotImplementedError
+
+    def _pool_slot(self):
+        """Pool and pool greenlet holding pool slot for current greenlet, for
+        giving up while waiting to retry, or ``None`` if not running in
+        pool."""
+        current = getcurrent()
+        greenlet = self._slot_greenlets.get(current, current)
+        if greenlet in self.pool:
+            return self.pool, greenlet
+
+    def _circuit_guard(self, host):
+        """Context manager for creating client of host through circuit
+        breaker, if one is used."""
+        if self.circuit_breaker is None:
+            return _no_guard()
+        return self.circuit_breaker.guard(host)
+
+    def _get_live_client(self, host_i, host):
+        """Get client of host if one is connected and its session is still
+        alive. Clients with sessions no longer alive are disconnected so
+        that a new client is made."""
+        host_key = (host_i, host)
+        client = self._host_clients.get(host_key)
+        if client is None or client.is_alive():
+            return client
+        logger.info("Session of host %s is no longer alive - reconnecting",
+                    host)
+        self._discard_dead_client(host_key, client)
+
+    def _discard_dead_client(self, host_key, client):
+        """Remove and disconnect client whose session is no longer alive."""
+        self._host_clients.pop(host_key)
+        if self.host_clients.get(host_key[1]) is client:
+            del self.host_clients[host_key[1]]
+        if self.session_registry is not None:
+            self.session_registry.discard(client)
+        client.disconnect()
+
+    def _shared_client(self, host, user, port, pkey, make_client):
+        """Get client of host from session registry, if one is used, or make
+        new client."""
+        if self.session_registry is None:
+            return make_client()
+        return self.session_registry.acquire(
+            (host, port, user, pkey), make_client)
+
+    def _disconnect_client(self, client):
+        """Release client to session registry if it is from one, otherwise
+        disconnect it."""
+        if self.session_registry is not None and \
+                client in self.session_registry:
+            self.session_registry.release(client)
+            return
+        client.disconnect()
+
+    def __del__(self):
+        if not hasattr(self, '_host_clients'):
+            return
+        logger.debug("Disconnecting clients")
+        for s_client in self._host_clients.values():
+            try:
+                self._disconnect_client(s_client)
+            except Exception as ex:
+                logger.debug("Client disconnect failed with %s", ex)
+                pass
+            del s_client
+        if getattr(self, 'auth_executor', None) is not None:
+            self.auth_executor.close()
+
+    def _start_run(self, resolve_hosts=True):
+        """Reset retry budget, unpin clients of released output and resolve
+        hosts before running on them."""
+        self._end_run()
+        self.retry_policy.reset()
+        self._unpin_released()
+        if resolve_hosts:
+            self._resolve_hosts()
+
+    def _end_run(self):
+        """Save authentication methods remembered during run, if saving to
+        file."""
+        if self.auth_cache is not None:
+            self.auth_cache.save()
+
+    def _resolve_hosts(self):
+        """Resolve hosts not yet connected to concurrently so that clients
+        connect with addresses from DNS cache."""
+        if self.dns_cache is None:
+            return
+        hosts = [host for host_i, host in enumerate(self.hosts)
+                 if (host_i, host) not in self._host_clients]
+        unresolved = self.dns_cache.prefetch(hosts, concurrency=self.pool_size)
+        if unresolved:
+            logger.error("Could not resolve hosts %s", unresolved)
+
+    def _drop_client(self, host_key):
+        """Remove client from clients kept by parallel client without
+        disconnecting it, leaving it to be disconnected once host output
+        using it is no longer referenced."""
+        client = self._host_clients.pop(host_key, None)
+        if client is None:
+            return
+        if self.host_clients.get(host_key[1]) is client:
+            del self.host_clients[host_key[1]]
+        if self.session_registry is not None:
+            self.session_registry.drop(client)
+
+    def _evict_client(self, host_key, client):
+        """Disconnect client evicted from session pool"""
+        host_i, host = host_key
+        if self.host_clients.get(host) is client:
+            del self.host_clients[host]
+        self._disconnect_client(client)
+
+    def _host_lock(self, host_i, host):
+        """Lock for creating client of host so that clients for different
+        hosts can be created concurrently."""
+        return _HostLock(self._host_locks, (host_i, host))
@@ -0,0 +1,123 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Reference counted registry of connected clients shared between parallel
+clients"""
+
+import logging
+
+from gevent.lock import RLock
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRegistry(object):
+    """Connected host clients shared by any number of parallel clients.
+
+    Clients are registered by key - host, port, user and private key - and
+    handed out to every parallel client asking for the same key, with
+    commands from all of them running over channels of the one session.
+    Clients are disconnected once released by all parallel clients using
+    them.
+
+    Use :py:data:`SESSION_REGISTRY` to share clients between all parallel
+    clients in a process that use it, or separate registries for separate
+    groups of parallel clients. Parallel clients sharing a registry must run
+    in the same thread.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._refs = {}
+        self._keys = {}
+        self._locks = {}
+
+    def stats(self):
+        """Number of registered clients and references to them.
+
+        :rtype: dict
+        """
+        return {'size': len(self._clients),
+                'references': sum(self._refs.values())}
+
+    def acquire(self, key, make_client):
+        """Get client for key, calling ``make_client`` to make one if none is
+        registered, and add a reference to it.
+
+        :param key: Host, port, user and private key of client.
+        :type key: tuple
+        :param make_client: Function returning new connected client.
+        :type make_client: function
+        """
+        with self._locks.setdefault(key, RLock()):
+            client = self._clients.get(key)
+            if client is None:
+                client = make_client()
+                self._clients[key] = client
+                self._keys[id(client)] = key
+                self._refs[key] = 0
+            else:
+                logger.debug("Sharing registered client for %s", key)
+            self._refs[key] += 1
+            return client
+
+    def release(self, client):
+        """Remove a reference to client, disconnecting it if no references
+        remain."""
+        key = self._keys.get(id(client))
+        if key is None:
+            return
+        self._refs[key] -= 1
+        if self._refs[key] > 0:
+            return
+        self._remove(key)
+        client.disconnect()
+
+    def drop(self, client):
+        """Remove a reference to client without disconnecting it. Client is
+        removed from registry once no references remain, leaving it to be
+        disconnected by its last user."""
+        key = self._keys.get(id(client))
+        if key is None:
+            return
+        self._refs[key] -= 1
+        if self._refs[key] <= 0:
+            self._remove(key)
+
+    def discard(self, client):
+        """Remove client from registry regardless of references to it, so
+        that a new client is made on next ``acquire``. For clients whose
+        session is no longer alive."""
+        key = self._keys.get(id(client))
+        if key is not None:
+            self._remove(key)
+
+    def __contains__(self, client):
+        return id(client) in self._keys
+
+    def __len__(self):
+        return len(self._clients)
+
+    def _remove(self, key):
+        client = self._clients.pop(key)
+        del self._keys[id(client)]
+        del self._refs[key]
+
+
+SESSION_REGISTRY = SessionRegistry()
+"""Process wide registry of clients"""
@@ -0,0 +1,145 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Host name resolution with time to live cache"""
+
+import logging
+from collections import OrderedDict
+from socket import gaierror as sock_gaierror
+from time import time
+
+from gevent import socket
+from gevent.pool import Pool
+
+
+logger = logging.getLogger(__name__)
+
+
+class DNSCache(object):
+    """Cache of resolved host addresses.
+
+    Host names are resolved with gevent's resolver and resulting addresses
+    cached for ``ttl`` seconds. Resolution errors are cached as well, for
+    ``negative_ttl`` seconds, so that connecting to a host that does not
+    resolve fails straight away rather than resolving again.
+
+    ``prefetch`` resolves many hosts concurrently ahead of connecting to them.
+
+    The same cache can be used by any number of clients, including clients
+    running in other threads.
+    """
+
+    def __init__(self, ttl=300, negative_ttl=30):
+        """
+        :param ttl: Seconds to cache resolved addresses for.
+        :type ttl: float
+        :param negative_ttl: Seconds to cache resolution errors for.
+          Capped at ``ttl``.
+        :type negative_ttl: float
+        """
+        self.ttl = ttl
+        self.negative_ttl = min(negative_ttl, ttl)
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def stats(self):
+        """Current size and counters.
+
+        :rtype: dict
+        """
+        return {'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses}
+
+    def resolve(self, host, port):
+        """Get addresses of host, resolving it if not cached.
+
+        :param host: Host name or address to resolve.
+        :type host: str
+        :param port: Port to include in addresses.
+        :type port: int
+
+        :rtype: list(tuple(family, sockaddr)) with ``family`` being the
+          address family to create a socket with and ``sockaddr`` the
+          address to connect it to.
+
+        :raises: :py:class:`socket.gaierror` on host not resolving, including
+          when a resolution error is cached.
+        """
+        addresses = self._get(host)
+        return [(family, (sockaddr[0], port) + tuple(sockaddr[2:]))
+                for family, sockaddr in addresses]
+
+    def prefetch(self, hosts, concurrency=100):
+        """Resolve hosts concurrently and cache the results. Hosts already
+        cached, including hosts cached as not resolving, are not resolved
+        again.
+
+        :param hosts: Host names to resolve.
+        :type hosts: list(str)
+        :param concurrency: Maximum number of concurrent resolutions.
+        :type concurrency: int
+
+        :rtype: list(str) of hosts that could not be resolved
+        """
+        pool = Pool(size=concurrency)
+        hosts = list(OrderedDict.fromkeys(hosts))
+        results = pool.map(self._prefetch_host, hosts)
+        return [host for host, resolved in zip(hosts, results)
+                if not resolved]
+
+    def invalidate(self, host=None):
+        """Remove host, or all hosts if no host given, from cache."""
+        if host is None:
+            self._entries.clear()
+            return
+        self._entries.pop(host, None)
+
+    def _prefetch_host(self, host):
+        try:
+            self._get(host)
+        except sock_gaierror:
+            return False
+        return True
+
+    def _get(self, host):
+        entry = self._entries.get(host)
+        if entry is not None and entry[0] > time():
+            self.hits += 1
+            addresses = entry[1]
+        else:
+            self.misses += 1
+            addresses = self._lookup(host)
+        if isinstance(addresses, sock_gaierror):
+            raise addresses
+        return addresses
+
+    def _lookup(self, host):
+        logger.debug("Resolving host %s", host)
+        try:
+            addrinfo = socket.getaddrinfo(host, None, 0, socket.SOCK_STREAM)
+        except sock_gaierror as ex:
+            logger.debug("Could not resolve host %s - %s", host, ex)
+            self._entries[host] = (time() + self.negative_ttl, ex)
+            return ex
+        addresses = []
+        for family, _, _, _, sockaddr in addrinfo:
+            if (family, sockaddr) not in addresses:
+                addresses.append((family, sockaddr))
+        self._entries[host] = (time() + self.ttl, addresses)
+        return addresses
@@ -0,0 +1,158 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Retry policies for connection and authentication errors"""
+
+import logging
+import random
+from threading import Lock
+from time import time
+
+from gevent import sleep
+
+from ...constants import RETRY_DELAY
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy(object):
+    """Fixed delay between retries, with optional retry budget.
+
+    Clients ask the policy whether a retry is allowed via ``allow`` and then
+    ``wait`` for the delay from ``delay`` before retrying. The number of
+    retries per host is limited by the client's ``num_retries`` - the policy's
+    ``budget`` additionally limits retries across all hosts, so that a
+    network wide failure does not cause every host to retry.
+
+    When waiting with a pool slot, the greenlet holding the slot gives it up
+    while waiting so that other hosts can use it, and waits for a free slot
+    again before retrying. Parallel clients pass the slot of the pool
+    greenlet a host is being connected from, so that one policy can be shared
+    between clients.
+
+    Retries and time spent waiting per host since last ``reset`` are available
+    from ``stats``. Parallel clients reset their policy on every run.
+
+    Subclasses can override ``delay`` to implement other backoff strategies.
+    """
+
+    def __init__(self, retry_delay=RETRY_DELAY, budget=None):
+        """
+        :param retry_delay: Seconds to wait before each retry.
+        :type retry_delay: float
+        :param budget: (Optional) Maximum number of retries across all hosts
+          until next ``reset``. Defaults to no limit.
+        :type budget: int
+        """
+        self.retry_delay = retry_delay
+        self.budget = budget
+        self.retries = 0
+        self._host_stats = {}
+        # Clients may be created in native threads
+        self._lock = Lock()
+
+    def reset(self):
+        """Reset retry budget and per host statistics."""
+        with self._lock:
+            self.retries = 0
+            self._host_stats = {}
+
+    def stats(self):
+        """Retries and seconds spent waiting to retry per host.
+
+        :rtype: dict of host to dict of ``retries`` and ``wait_time``
+        """
+        with self._lock:
+            return dict((host, dict(host_stats))
+                        for host, host_stats in self._host_stats.items())
+
+    def delay(self, retries):
+        """Seconds to wait before retrying after ``retries`` number of failed
+        attempts.
+
+        :rtype: float
+        """
+        return self.retry_delay
+
+    def allow(self, host):
+        """Check retry budget and count a retry for host if allowed.
+
+        :rtype: bool
+        """
+        with self._lock:
+            if self.budget is not None and self.retries >= self.budget:
+                logger.error("Retry budget of %s exhausted - not retrying %s",
+                             self.budget, host)
+                return False
+            self.retries += 1
+            self._get_host_stats(host)['retries'] += 1
+        return True
+
+    def wait(self, host, retries, pool_slot=None):
+        """Wait before retrying after ``retries`` number of failed attempts,
+        giving up pool slot, if any, while waiting.
+
+        :param pool_slot: (Optional) ``(pool, greenlet)`` of pool greenlet
+          holding a slot of pool for host.
+        :type pool_slot: tuple(:py:class:`gevent.pool.Pool`,
+          :py:class:`gevent.Greenlet`)
+        """
+        delay = self.delay(retries)
+        pool, greenlet = pool_slot if pool_slot is not None else (None, None)
+        release = pool is not None and greenlet in pool
+        start = time()
+        if release:
+            pool.discard(greenlet)
+        try:
+            sleep(delay)
+            if release:
+                pool.add(greenlet)
+        finally:
+            wait_time = time() - start
+            with self._lock:
+                self._get_host_stats(host)['wait_time'] += wait_time
+
+    def _get_host_stats(self, host):
+        return self._host_stats.setdefault(
+            host, {'retries': 0, 'wait_time': 0})
+
+
+class ExponentialBackoff(RetryPolicy):
+    """Exponential backoff with full jitter.
+
+    Delay before each retry is a random number of seconds between zero and
+    ``base_delay * 2 ** (retries - 1)``, capped at ``max_delay``. Randomising
+    the whole delay spreads out retries of hosts that failed at the same time.
+    """
+
+    def __init__(self, base_delay=1, max_delay=60, budget=None):
+        """
+        :param base_delay: Maximum delay before first retry.
+        :type base_delay: float
+        :param max_delay: Maximum delay before any retry.
+        :type max_delay: float
+        :param budget: (Optional) Maximum number of retries across all hosts
+          until next ``reset``. Defaults to no limit.
+        :type budget: int
+        """
+        RetryPolicy.__init__(self, retry_delay=base_delay, budget=budget)
+        self.max_delay = max_delay
+
+    def delay(self, retries):
+        return random.uniform(
+            0, min(self.max_delay, self.retry_delay * 2 ** (retries - 1)))
@@ -0,0 +1,199 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Bounded pool of connected host clients"""
+
+import logging
+from collections import OrderedDict
+from time import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionPool(object):
+    """Mapping of host keys to connected clients with least recently used
+    and idle time eviction.
+
+    Clients are evicted when more than ``max_size`` clients are in the pool,
+    least recently used first, and when not used for more than
+    ``idle_timeout`` seconds. Evicted clients are passed to ``on_evict``,
+    which is expected to disconnect them.
+
+    Keys in use can be pinned with ``pin`` so that their clients are not
+    evicted until ``unpin`` is called as many times, after which their idle
+    time starts. The pool may grow over ``max_size`` while all of its clients
+    are pinned.
+
+    Hit, miss and eviction counters are available as attributes and via
+    ``stats``.
+    """
+
+    def __init__(self, max_size=None, idle_timeout=None, on_evict=None):
+        """
+        :param max_size: (Optional) Maximum number of clients in pool.
+          Defaults to no limit.
+        :type max_size: int
+        :param idle_timeout: (Optional) Seconds after last use after which
+          clients are evicted. Defaults to no idle eviction.
+        :type idle_timeout: float
+        :param on_evict: (Optional) Function to call with ``(key, client)``
+          for each evicted client.
+        :type on_evict: function
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clients = OrderedDict()
+        self._last_used = {}
+        self._pinned = {}
+
+    def stats(self):
+        """Current size and counters.
+
+        :rtype: dict
+        """
+        return {'size': len(self._clients),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
+
+    def get(self, key, default=None):
+        """Get client for key, counting a hit or miss and marking client as
+        most recently used."""
+        self._expire()
+        client = self._clients.get(key)
+        if client is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(key)
+        return client
+
+    def __getitem__(self, key):
+        client = self._clients[key]
+        self._touch(key)
+        return client
+
+    def __setitem__(self, key, client):
+        self._clients[key] = client
+        self._touch(key)
+        self._shrink()
+
+    def pin(self, key):
+        """Mark key as in use so that its client, current or added later, is
+        not evicted until unpinned."""
+        self._pinned[key] = self._pinned.get(key, 0) + 1
+
+    def unpin(self, key):
+        """Remove one pin from key, making its client evictable and starting
+        its idle time once no pins remain."""
+        self._pinned[key] -= 1
+        if self._pinned[key] > 0:
+            return
+        del self._pinned[key]
+        if key in self._clients:
+            self._touch(key)
+        self._shrink()
+
+    def __delitem__(self, key):
+        del self._clients[key]
+        del self._last_used[key]
+
+    def __contains__(self, key):
+        self._expire()
+        return key in self._clients
+
+    def __len__(self):
+        return len(self._clients)
+
+    def __iter__(self):
+        return iter(list(self._clients))
+
+    def keys(self):
+        return list(self._clients.keys())
+
+    def values(self):
+        return list(self._clients.values())
+
+    def items(self):
+        return list(self._clients.items())
+
+    def rekey(self, keys):
+        """Change keys of clients, keeping their order and last use time.
+
+        :param keys: Mapping of current keys to new keys. Clients of keys not
+          in mapping keep their key. New keys must not be in use by other
+          clients.
+        :type keys: dict
+        """
+        clients = OrderedDict()
+        last_used = {}
+        for key, client in self._clients.items():
+            new_key = keys.get(key, key)
+            clients[new_key] = client
+            last_used[new_key] = self._last_used[key]
+        self._clients = clients
+        self._last_used = last_used
+        self._pinned = dict((keys.get(key, key), pins)
+                            for key, pins in self._pinned.items())
+
+    def pop(self, key, *default):
+        client = self._clients.pop(key, *default)
+        self._last_used.pop(key, None)
+        return client
+
+    def _touch(self, key):
+        self._last_used[key] = time()
+        self._clients[key] = self._clients.pop(key)
+
+    def _oldest_unpinned(self):
+        for key in self._clients:
+            if key not in self._pinned:
+                return key
+
+    def _expire(self):
+        if self.idle_timeout is None:
+            return
+        oldest = time() - self.idle_timeout
+        while True:
+            key = self._oldest_unpinned()
+            if key is None or self._last_used[key] > oldest:
+                return
+            self._evict(key)
+
+    def _shrink(self):
+        self._expire()
+        while self.max_size is not None and \
+                len(self._clients) > self.max_size:
+            key = self._oldest_unpinned()
+            if key is None:
+                return
+            self._evict(key)
+
+    def _evict(self, key):
+        client = self.pop(key)
+        self.evictions += 1
+        logger.debug("Evicting client for %s", key)
+        if self.on_evict is not None:
+            try:
+                self.on_evict(key, client)
+            except Exception as ex:
+                logger.error("Error evicting client for %s - %s", key, ex)
@@ -23,13 +23,24 @@ except ImportError:
     WIN_PLATFORM = True
 else:
     WIN_PLATFORM = False
-from socket import gaierror as sock_gaierror, error as sock_error
+from select import select
+try:
+    from select import poll, POLLIN
+except ImportError:
+    # Windows - select has no limit on socket numbers
+    poll = None
+from socket import gaierror as sock_gaierror, error as sock_error, MSG_PEEK
+from time import time
 
-from gevent import sleep, socket, get_hub
+from gevent import socket, get_hub, spawn, killall
 from gevent.hub import Hub
+from gevent.queue import Queue, Empty as QueueEmpty
 
+from .concurrency import _NO_STAGE_LIMITS
+from .retry import RetryPolicy
 from ..common import _validate_pkey_path
-from ...constants import DEFAULT_RETRIES, RETRY_DELAY
+from ...constants import DEFAULT_RETRIES, RETRY_DELAY, \
+    CONNECT_ATTEMPT_DELAY
 from ...exceptions import UnknownHostException, AuthenticationException, \
     ConnectionErrorException
 
@@ -40,6 +51,50 @@ logger = logging.getLogger(__name__)
 THREAD_POOL = get_hub().threadpool
 
 
+def _sock_readable(sock):
+    """Check socket is readable, or closed or in error, without blocking.
+
+    Uses ``poll`` where available as ``select`` cannot be used with file
+    descriptors of ``FD_SETSIZE``, normally 1024, or above."""
+    if poll is None:
+        readable, _, _ = select([sock], [], [], 0)
+        return bool(readable)
+    poller = poll()
+    poller.register(sock, POLLIN)
+    return bool(poller.poll(0))
+
+
+def _sock_alive(sock):
+    """Check socket has not been closed or reset by the remote end, without
+    blocking or sending anything."""
+    try:
+        if not _sock_readable(sock):
+            return True
+        # Readable with no data to read means remote end closed connection
+        return sock.recv(1, MSG_PEEK) != b''
+    except (sock_error, ValueError):
+        return False
+
+
+def _interleave_families(addresses):
+    """Order ``(family, address)`` list to alternate between address
+    families, keeping order within each family and starting with the family
+    of the first address."""
+    families = []
+    by_family = {}
+    for family, address in addresses:
+        if family not in by_family:
+            families.append(family)
+            by_family[family] = []
+        by_family[family].append((family, address))
+    ordered = []
+    while len(ordered) < len(addresses):
+        for family in families:
+            if by_family[family]:
+                ordered.append(by_family[family].pop(0))
+    return ordered
+
+
 class BaseSSHClient(object):
 
     IDENTITIES = (
@@ -58,7 +113,18 @@ class BaseSSHClient(object):
                  allow_agent=True, timeout=None,
                  proxy_host=None,
                  _auth_thread_pool=True,
-                 identity_auth=True):
+                 identity_auth=True,
+                 _connect_limiter=None,
+                 _stage_limits=None,
+                 _dns_cache=None,
+                 _retry_policy=None,
+                 _auth_executor=None,
+                 _auth_cache=None,
+                 _pkey_cache=None,
+                 _connect_rate_limiter=None,
+                 _socket_options=None,
+                 _source_addresses=None,
+                 _pool_slot=None):
         self.host = host
         self.user = user if user else None
         if self.user is None and not WIN_PLATFORM:
@@ -76,15 +142,146 @@ class BaseSSHClient(object):
         self._host = proxy_host if proxy_host else host
         self.pkey = _validate_pkey_path(pkey, self.host)
         self.identity_auth = identity_auth
-        self._connect(self._host, self.port)
-        if _auth_thread_pool:
-            THREAD_POOL.apply(self._init)
-        else:
-            self._init()
+        self._stage_limits = _stage_limits if _stage_limits is not None \
+            else _NO_STAGE_LIMITS
+        self._dns_cache = _dns_cache
+        self._retry_policy = _retry_policy if _retry_policy is not None \
+            else RetryPolicy(retry_delay=retry_delay)
+        self._auth_executor = _auth_executor if _auth_executor is not None \
+            else THREAD_POOL
+        self._auth_cache = _auth_cache
+        self._pkey_cache = _pkey_cache
+        self._connect_rate_limiter = _connect_rate_limiter
+        self._socket_options = _socket_options
+        self._source_addresses = _source_addresses
+        self.last_activity = None
+        self._keepalive_error = None
+        try:
+            self._connect_init_retries(_connect_limiter, _auth_thread_pool,
+                                       _pool_slot)
+        except BaseException:
+            # Free socket right away rather than on garbage collection, also
+            # when connecting greenlet is killed. Sockets still used by auth
+            # thread are closed by _init_thread once it is done with them.
+            if self.sock is not None and not self.sock.closed:
+                self.sock.close()
+            raise
+
+    def _connect_init_retries(self, _connect_limiter, _auth_thread_pool,
+                              _pool_slot=None):
+        """Connect and initialise session, retrying failed attempts.
+
+        Each attempt acquires connection limiter and stage limits on its own
+        and releases them, as well as pool slot ``_pool_slot`` if given,
+        before waiting to retry, so that hosts waiting to retry do not hold
+        up other hosts. Connection rate limit is waited on
+        once per attempt, before acquiring either."""
+        retries = 1
+        while True:
+            try:
+                addresses = self._wait_connect_rate()
+                if _connect_limiter is not None:
+                    return _connect_limiter.run(
+                        self._connect_init, _auth_thread_pool, retries,
+                        addresses)
+                return self._connect_init(_auth_thread_pool, retries,
+                                          addresses)
+            except Exception as ex:
+                if not getattr(ex, '_retry', False) or \
+                   not self._retry_policy.allow(self.host):
+                    raise
+            self.session = None
+            if self.sock is not None and not self.sock.closed:
+                try:
+                    self.sock.close()
+                except Exception:
+                    pass
+            self._retry_policy.wait(self.host, retries, pool_slot=_pool_slot)
+            retries += 1
+
+    def _wait_connect_rate(self):
+        """Wait until connection rate limiter, if any, allows an attempt to
+        host's first address.
+
+        :rtype: list of ``(family, address)`` of host, or ``None`` if not
+          resolved, in which case resolution is attempted again by
+          ``_connect`` to raise its error.
+        """
+        if self._connect_rate_limiter is None:
+            return
+        try:
+            addresses = self._resolve(self._host, self.port)
+        except (sock_gaierror, UnknownHostException):
+            return
+        self._connect_rate_limiter.acquire(addresses[0][1][0])
+        return addresses
+
+    def _connect_init(self, _auth_thread_pool, retries=1, addresses=None):
+        with self._stage_limits.connect:
+            self._connect(self._host, self.port, retries=retries,
+                          addresses=addresses)
+        with self._stage_limits.auth:
+            if _auth_thread_pool:
+                self._init_thread(retries)
+            else:
+                self._init(retries=retries)
+
+    def _init_thread(self, retries):
+        """Initialise session in auth thread pool.
+
+        If connecting greenlet is killed meanwhile, by any exception
+        including deadline timeouts, socket is shut down to abort
+        initialisation and only closed once the thread no longer uses it, so
+        that its file descriptor is not reused while in use."""
+        result = self._auth_executor.spawn(self._init, retries=retries)
+        try:
+            return result.get()
+        except BaseException:
+            if result.ready():
+                raise
+            sock, self.sock = self.sock, None
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except Exception:
+                    pass
+                spawn(self._close_sock_after, sock, result)
+            raise
+
+    def _close_sock_after(self, sock, result):
+        result.wait()
+        sock.close()
+
+    def _retryable(self, ex, retries):
+        """Mark exception of failed connection or session initialisation
+        attempt to be retried if attempts remain."""
+        ex._retry = retries < self.num_retries
+        return ex
 
     def disconnect(self):
         raise NotImplementedError
 
+    def is_alive(self):
+        """Check whether client's session can still be used, without a round
+        trip to the server.
+
+        Session is not alive when client has been disconnected, its socket
+        has been closed or reset by the remote end or sending keep alive
+        messages has failed.
+
+        Time of last command started on client is available as
+        ``last_activity``.
+
+        :rtype: bool
+        """
+        if self.session is None or self.sock is None or self.sock.closed:
+            return False
+        if self._keepalive_error is not None:
+            logger.debug("Keep alive for host %s failed - %s",
+                         self.host, self._keepalive_error)
+            return False
+        return _sock_alive(self.sock)
+
     def __del__(self):
         try:
             self.disconnect()
@@ -97,46 +294,48 @@ class BaseSSHClient(object):
     def __exit__(self, *args):
         self.disconnect()
 
-    def _connect_init_retry(self, retries):
-        retries += 1
-        self.session = None
-        if not self.sock.closed:
-            try:
-                self.sock.close()
-            except Exception:
-                pass
-        sleep(self.retry_delay)
-        self._connect(self._host, self.port, retries=retries)
-        return self._init(retries=retries)
-
     def _init(self, retries=1):
         raise NotImplementedError
 
-    def _connect(self, host, port, retries=1):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        if self.timeout:
-            self.sock.settimeout(self.timeout)
+    def _resolve(self, host, port):
+        """Resolve host to list of ``(family, address)`` to connect to, from
+        DNS cache if one is used. Resolution errors from cache are not
+        retried as they are cached."""
+        if self._dns_cache is None:
+            addresses = []
+            for family, _, _, _, address in socket.getaddrinfo(
+                    host, port, 0, socket.SOCK_STREAM):
+                if (family, address) not in addresses:
+                    addresses.append((family, address))
+            return addresses
+        try:
+            return self._dns_cache.resolve(host, port)
+        except sock_gaierror as ex:
+            logger.error("Could not resolve host '%s'", host)
+            ex = UnknownHostException("Unknown host %s - %s", host,
+                                      str(ex.args[-1]))
+            ex.host = host
+            ex.port = port
+            raise ex
+
+    def _connect(self, host, port, retries=1, addresses=None):
         logger.debug("Connecting to %s:%s", host, port)
         try:
-            self.sock.connect((host, port))
+            if addresses is None:
+                addresses = self._resolve(host, port)
+            self.sock = self._connect_addresses(addresses)
         except sock_gaierror as ex:
             logger.error("Could not resolve host '%s' - retry %s/%s",
                          host, retries, self.num_retries)
-            while retries < self.num_retries:
-                sleep(self.retry_delay)
-                return self._connect(host, port, retries=retries+1)
             ex = UnknownHostException("Unknown host %s - %s - retry %s/%s",
                                       host, str(ex.args[1]), retries,
                                       self.num_retries)
             ex.host = host
             ex.port = port
-            raise ex
+            raise self._retryable(ex, retries)
         except sock_error as ex:
             logger.error("Error connecting to host '%s:%s' - retry %s/%s",
                          host, port, retries, self.num_retries)
-            while retries < self.num_retries:
-                sleep(self.retry_delay)
-                return self._connect(host, port, retries=retries+1)
             error_type = ex.args[1] if len(ex.args) > 1 else ex.args[0]
             ex = ConnectionErrorException(
                 "Error connecting to host '%s:%s' - %s - retry %s/%s",
@@ -144,7 +343,84 @@ class BaseSSHClient(object):
                 self.num_retries,)
             ex.host = host
             ex.port = port
-            raise ex
+            raise self._retryable(ex, retries)
+
+    def _connect_addresses(self, addresses):
+        """Connect to first address that accepts a connection.
+
+        Connection attempts are raced, starting with the first address and
+        alternating between address families. Each attempt is given
+        :py:data:`pssh.constants.CONNECT_ATTEMPT_DELAY` seconds before the
+        next address is also tried, or less if it fails. The first connected
+        socket is returned and all other attempts are stopped.
+
+        :raises: :py:class:`socket.error` from last failed attempt if all
+          attempts fail, or if there are no addresses. Other exceptions from
+          last failed attempt, for example on invalid socket options.
+        """
+        addresses = iter(_interleave_families(addresses))
+        results = Queue()
+        attempts = []
+        pending = 0
+        error = sock_error("No addresses to connect to")
+        sock = None
+        try:
+            while True:
+                address = next(addresses, None)
+                if address is not None:
+                    attempts.append(spawn(
+                        self._connect_attempt, address[0], address[1],
+                        results))
+                    pending += 1
+                elif pending == 0:
+                    raise error
+                try:
+                    sock, ex = results.get(
+                        timeout=CONNECT_ATTEMPT_DELAY
+                        if address is not None else None)
+                except QueueEmpty:
+                    continue
+                pending -= 1
+                if sock is not None:
+                    return sock
+                error = ex
+        finally:
+            killall(attempts)
+            # Close sockets of attempts that connected after first one
+            while not results.empty():
+                _sock, _ = results.get()
+                if _sock is not None and _sock is not sock:
+                    _sock.close()
+
+    def _connect_attempt(self, family, address, results):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        if self.timeout:
+            sock.settimeout(self.timeout)
+        try:
+            self._configure_socket(sock, family)
+            sock.connect(address)
+        except Exception as ex:
+            # Every failed attempt puts a result so that no attempt is
+            # waited on forever
+            logger.debug("Error connecting to %s - %s", address, ex)
+            sock.close()
+            results.put((None, ex))
+            return
+        except BaseException:
+            sock.close()
+            raise
+        results.put((sock, None))
+
+    def _configure_socket(self, sock, family):
+        """Set socket options and bind to next source address, if any, before
+        connecting."""
+        if self._socket_options:
+            for level, option, value in self._socket_options:
+                sock.setsockopt(level, option, value)
+        if self._source_addresses is not None:
+            source = self._source_addresses.get(family)
+            if source is not None:
+                sock.bind((source, 0))
 
     def _identity_auth(self):
         for identity_file in self.IDENTITIES:
@@ -163,12 +439,58 @@ class BaseSSHClient(object):
             else:
                 logger.debug("Authentication succeeded with identity file %s",
                              identity_file)
-                return
+                return identity_file
         raise AuthenticationException("No authentication methods succeeded")
 
+    def _cached_auth(self):
+        """Try authentication method that last succeeded for host, if any.
+
+        :rtype: bool - whether authentication succeeded."""
+        if self._auth_cache is None:
+            return False
+        cached = self._auth_cache.get(self.user, self.host)
+        if cached is None:
+            return False
+        method, identity = cached
+        if not self._auth_method_allowed(method):
+            logger.debug("Cached authentication method %s for host %s is not "
+                         "allowed by client settings - trying all methods",
+                         method, self.host)
+            return False
+        logger.debug("Trying cached authentication method %s for host %s",
+                     method, self.host)
+        try:
+            if method == 'agent':
+                self._agent_auth()
+            elif method == 'identity':
+                self._pkey_auth(identity, password=self.password)
+            else:
+                self._password_auth()
+        except Exception as ex:
+            logger.debug("Cached authentication method %s failed for host %s "
+                         "- %s, trying all methods", method, self.host, ex)
+            self._auth_cache.remove(self.user, self.host)
+            return False
+        return True
+
+    def _auth_method_allowed(self, method):
+        if method == 'agent':
+            return self.allow_agent
+        if method == 'identity':
+            return self.identity_auth
+        return self.password is not None
+
+    def _cache_auth(self, method, identity=None):
+        if self._auth_cache is not None:
+            self._auth_cache.set(self.user, self.host, method,
+                                 identity=identity)
+
     def auth(self):
         raise NotImplementedError
 
+    def _agent_auth(self):
+        raise NotImplementedError
+
     def _password_auth(self):
         raise NotImplementedError
 
@@ -258,6 +580,7 @@ class BaseSSHClient(object):
                 _command = 'sudo -u %s -S ' % (user,)
             _shell = shell if shell else '$SHELL -c'
             _command += "%s '%s'" % (_shell, command,)
+        self.last_activity = time()
         channel = self.execute(_command, use_pty=use_pty)
         return channel, self.host, \
             self.read_output_buffer(
@@ -16,6 +16,9 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 
 import os
+import socket
+from itertools import cycle
+from threading import Lock
 
 from ..exceptions import PKeyFileError
 
@@ -32,3 +35,92 @@ def _validate_pkey_path(pkey, host=None):
         ex.host = host
         raise ex
     return pkey
+
+
+def _read_pkey_file(pkey, passphrase=None):
+    with open(pkey, 'rb') as fh:
+        return fh.read()
+
+
+class PKeyCache(object):
+    """Cache of private keys loaded from files.
+
+    Each key file is loaded once, with ``loader``, and the loaded key shared
+    by all clients authenticating with that file. By default key files are
+    read into memory for authentication with in-memory key data - clients
+    using libraries that parse keys into key objects use a loader returning
+    those instead.
+    """
+
+    def __init__(self, loader=_read_pkey_file):
+        """
+        :param loader: Function to load key with, called with
+          ``(path, passphrase)``.
+        :type loader: function
+        """
+        self.loader = loader
+        self._keys = {}
+        # Keys are loaded from authentication threads
+        self._lock = Lock()
+
+    def get(self, pkey, passphrase=None):
+        """Get key loaded from file ``pkey``, loading it if not already
+        loaded.
+
+        :param pkey: Private key file path.
+        :type pkey: str
+        :param passphrase: (Optional) Passphrase key file is encrypted with.
+        :type passphrase: str
+        """
+        key = (pkey, passphrase)
+        with self._lock:
+            loaded = self._keys.get(key)
+            if loaded is None:
+                loaded = self.loader(pkey, passphrase)
+                self._keys[key] = loaded
+        return loaded
+
+    def clear(self):
+        """Remove all loaded keys from cache."""
+        with self._lock:
+            self._keys.clear()
+
+
+class SourceAddressPool(object):
+    """Local addresses to bind new connections to, in turn.
+
+    Each local address has its own range of ephemeral ports per destination,
+    so spreading connections across several local addresses allows more
+    concurrent connections to a single destination, like a proxy host, than
+    one address does.
+
+    Addresses are handed out round robin per address family, so that
+    connections to IPv4 hosts are bound to IPv4 addresses and IPv6 to IPv6.
+    Safe to use from multiple threads.
+    """
+
+    def __init__(self, addresses):
+        """
+        :param addresses: Local IP addresses to bind to.
+        :type addresses: list(str)
+        """
+        self.addresses = list(addresses)
+        by_family = {}
+        for address in self.addresses:
+            family = socket.AF_INET6 if ':' in address else socket.AF_INET
+            by_family.setdefault(family, []).append(address)
+        self._cycles = dict((family, cycle(family_addresses))
+                            for family, family_addresses in by_family.items())
+        self._lock = Lock()
+
+    def get(self, family):
+        """Next address of family, or ``None`` if there are no addresses of
+        that family.
+
+        :rtype: str
+        """
+        addresses = self._cycles.get(family)
+        if addresses is None:
+            return
+        with self._lock:
+            return next(addresses)
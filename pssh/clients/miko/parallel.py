@@ -78,9 +78,10 @@ class ParallelSSHClient(BaseParallelSSHClient):
         :param timeout: (Optional) Number of seconds to wait before connection
           and authentication attempt times out. Note that total time before
           timeout will be
-          ``timeout`` * ``num_retries`` + (5 * (``num_retries``-1)) number of
-          seconds, where (5 * (``num_retries``-1)) refers to a five (5) second
-          delay between retries.
+          ``timeout`` * ``num_retries`` + (``retry_delay`` *
+          (``num_retries``-1)) number of seconds, where
+          (``retry_delay`` * (``num_retries``-1)) refers to the delay between
+          retries.
         :type timeout: int
         :param forward_ssh_agent: (Optional) Turn on/off SSH agent forwarding -
           equivalent to `ssh -A` from the `ssh` command line utility.
@@ -338,6 +339,8 @@ class ParallelSSHClient(BaseParallelSSHClient):
                 proxy_user=self.proxy_user, proxy_password=self.proxy_password,
                 proxy_pkey=self.proxy_pkey, allow_agent=self.allow_agent,
                 agent=self.agent, channel_timeout=self.channel_timeout,
+                _retry_policy=self.retry_policy,
+                _pool_slot=self._pool_slot(),
                 **paramiko_kwargs)
             self.host_clients[host] = _client
             self._host_clients[(host_i, host)] = _client
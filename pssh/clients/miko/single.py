@@ -32,6 +32,7 @@ from ...exceptions import UnknownHostException, AuthenticationException, \
     ConnectionErrorException, SSHException  # noqa: E402
 from ...constants import DEFAULT_RETRIES  # noqa: E402
 from ...utils import read_openssh_config  # noqa: E402
+from ..base.retry import RetryPolicy  # noqa: E402
 
 host_logger = logging.getLogger('pssh.host_logger')
 logger = logging.getLogger(__name__)
@@ -52,6 +53,8 @@ class SSHClient(object):
                  proxy_port=22, proxy_user=None, proxy_password=None,
                  proxy_pkey=None, channel_timeout=None,
                  _openssh_config_file=None,
+                 _retry_policy=None,
+                 _pool_slot=None,
                  **paramiko_kwargs):
         """
         :param host: Hostname to connect to
@@ -123,6 +126,8 @@ class SSHClient(object):
         if agent:
             self.client._agent = agent
         self.num_retries = num_retries
+        self._retry_policy = _retry_policy if _retry_policy is not None \
+            else RetryPolicy()
         self.timeout = timeout
         self.channel_timeout = channel_timeout
         self.proxy_host, self.proxy_port, self.proxy_user, \
@@ -130,13 +135,21 @@ class SSHClient(object):
             proxy_user, proxy_password, proxy_pkey
         self.proxy_client = None
         real_host = _host if _host is not None else host
-        if self.proxy_host and self.proxy_port:
-            logger.debug(
-                "Proxy configured for destination host %s - Proxy host: %s:%s",
-                real_host, self.proxy_host, self.proxy_port,)
-            self._connect_tunnel(real_host, **paramiko_kwargs)
-        else:
-            self._connect(self.client, real_host, self.port, **paramiko_kwargs)
+        # Pool slot given up while waiting to retry, only used while
+        # connecting
+        self._pool_slot = _pool_slot
+        try:
+            if self.proxy_host and self.proxy_port:
+                logger.debug(
+                    "Proxy configured for destination host %s - "
+                    "Proxy host: %s:%s",
+                    real_host, self.proxy_host, self.proxy_port,)
+                self._connect_tunnel(real_host, **paramiko_kwargs)
+            else:
+                self._connect(self.client, real_host, self.port,
+                              **paramiko_kwargs)
+        finally:
+            self._pool_slot = None
 
     def __del__(self):
         try:
@@ -200,8 +213,10 @@ class SSHClient(object):
         except sock_gaierror as ex:
             logger.error("Could not resolve host '%s' - retry %s/%s",
                          host, retries, self.num_retries)
-            while retries < self.num_retries:
-                sleep(5)
+            if retries < self.num_retries and \
+               self._retry_policy.allow(host):
+                self._retry_policy.wait(host, retries,
+                                        pool_slot=self._pool_slot)
                 return self._connect(client, host, port,
                                      sock=sock,
                                      retries=retries+1,
@@ -212,8 +227,10 @@ class SSHClient(object):
         except sock_error as ex:
             logger.error("Error connecting to host '%s:%s' - retry %s/%s",
                          host, self.port, retries, self.num_retries)
-            while retries < self.num_retries:
-                sleep(5)
+            if retries < self.num_retries and \
+               self._retry_policy.allow(host):
+                self._retry_policy.wait(host, retries,
+                                        pool_slot=self._pool_slot)
                 return self._connect(client, host, port,
                                      sock=sock,
                                      retries=retries+1,
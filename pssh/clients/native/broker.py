@@ -0,0 +1,391 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Local session broker keeping authenticated sessions open for use by
+other processes over a Unix socket."""
+
+import argparse
+import errno
+import json
+import logging
+import os
+import socket as _socket
+import stat
+
+from gevent import joinall, socket, spawn
+from gevent.lock import RLock, Semaphore
+from gevent.pool import Pool
+from gevent.server import StreamServer
+
+from .single import SSHClient
+from ..base.sessions import SessionPool
+from ... import exceptions
+from ...exceptions import HostArgumentException
+from ...output import HostOutput
+
+
+logger = logging.getLogger(__name__)
+
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+class SessionBroker(object):
+    """Broker process keeping native clients connected and authenticated to
+    hosts and running commands on them on behalf of
+    :py:class:`BrokerClient` connections on a Unix socket.
+
+    Clients are kept per host, port and user and reused by all requests for
+    them, so that processes using the broker do not pay for TCP connection,
+    SSH handshake and authentication on each run. Clients not running any
+    requests are evicted and disconnected as per ``max_sessions`` and
+    ``session_idle_timeout``.
+
+    All authentication configuration stays in the broker process. The socket
+    is only accessible by the user running the broker.
+
+    The protocol is newline delimited JSON. Each request is an object with
+    ``host``, ``command`` and optional ``port``, ``user``, ``sudo``,
+    ``sudo_user``, ``use_pty``, ``shell``, ``encoding`` and ``timeout`` keys.
+    Replies are ``{"stdout": line}`` and ``{"stderr": line}`` objects as
+    output is read, followed by either ``{"exit_code": code}`` or
+    ``{"exception": name, "args": args}``. Any number of requests may be
+    sent over a connection, one at a time.
+    """
+
+    def __init__(self, socket_path, max_sessions=None,
+                 session_idle_timeout=300, **client_kwargs):
+        """
+        :param socket_path: Path of Unix socket to listen on.
+        :type socket_path: str
+        :param max_sessions: (Optional) Maximum number of connected clients
+          to keep. Defaults to no limit.
+        :type max_sessions: int
+        :param session_idle_timeout: (Optional) Seconds after last use after
+          which clients are disconnected. Set to ``None`` to keep clients
+          connected until evicted by ``max_sessions``.
+        :type session_idle_timeout: float
+        :param client_kwargs: Keyword arguments to pass on to each
+          :py:class:`SSHClient <pssh.clients.native.single.SSHClient>`, like
+          ``pkey``, ``password``, ``num_retries`` and ``timeout``.
+        """
+        self.socket_path = os.path.expanduser(socket_path)
+        self.client_kwargs = client_kwargs
+        self.session_pool = SessionPool(
+            max_size=max_sessions, idle_timeout=session_idle_timeout,
+            on_evict=self._evict_client)
+        self.server = None
+        self._client_locks = {}
+
+    def start(self):
+        """Start listening on socket without blocking."""
+        self.server = StreamServer(self._listen(), self._handle)
+        self.server.start()
+        logger.info("Session broker listening on %s", self.socket_path)
+
+    def serve_forever(self):
+        """Start listening on socket and serve requests until stopped."""
+        if self.server is None:
+            self.start()
+        self.server.serve_forever()
+
+    def stop(self):
+        """Stop listening, disconnect all clients and remove socket."""
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
+        for key in self.session_pool:
+            self._evict_client(key, self.session_pool.pop(key))
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    def _listen(self):
+        self._remove_stale_socket()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only user running the broker may connect
+        umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+        sock.listen(128)
+        return sock
+
+    def _remove_stale_socket(self):
+        """Remove socket left behind by a broker that is no longer running.
+
+        :raises: :py:class:`ValueError` on socket path existing and not being
+          a socket."""
+        try:
+            mode = os.stat(self.socket_path).st_mode
+        except OSError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise ValueError("Socket path %s exists and is not a socket" % (
+                self.socket_path,))
+        sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except _socket.error as ex:
+            if ex.errno == errno.ECONNREFUSED:
+                logger.debug("Removing stale socket %s", self.socket_path)
+                os.unlink(self.socket_path)
+        finally:
+            sock.close()
+
+    def _handle(self, sock, address):
+        reader = sock.makefile('rb')
+        try:
+            for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line.decode('utf-8'))
+                    self._run_request(sock, request)
+                except Exception as ex:
+                    logger.error("Failed to run request - %s", ex)
+                    _send(sock, {'exception': ex.__class__.__name__,
+                                 'args': [str(arg) for arg in ex.args]})
+        except _socket.error as ex:
+            logger.debug("Broker connection closed - %s", ex)
+        finally:
+            reader.close()
+            sock.close()
+
+    def _get_client(self, key):
+        host, port, user = key
+        with self._client_locks.setdefault(key, Semaphore()):
+            client = self.session_pool.get(key)
+            if client is not None and client.is_alive():
+                return client, True
+            if client is not None:
+                logger.debug("Session of %s is no longer alive - "
+                             "reconnecting", key)
+                self.session_pool.pop(key).disconnect()
+            client = SSHClient(host, user=user, port=port,
+                               **self.client_kwargs)
+            self.session_pool[key] = client
+        return client, False
+
+    def _evict_client(self, key, client):
+        """Disconnect client evicted from session pool"""
+        self._client_locks.pop(key, None)
+        client.disconnect()
+
+    def _run_request(self, sock, request):
+        key = (request['host'], request.get('port'), request.get('user'))
+        # Keep client from being evicted while request is running
+        self.session_pool.pin(key)
+        try:
+            self._run_client_request(sock, key, request)
+        finally:
+            self.session_pool.unpin(key)
+
+    def _run_client_request(self, sock, key, request):
+        client, reused = self._get_client(key)
+        run_kwargs = dict(
+            sudo=request.get('sudo', False), user=request.get('sudo_user'),
+            use_pty=request.get('use_pty', False),
+            shell=request.get('shell'),
+            encoding=request.get('encoding', 'utf-8'),
+            timeout=request.get('timeout'))
+        try:
+            channel, _, stdout, stderr, _ = client.run_command(
+                request['command'], **run_kwargs)
+        except Exception as ex:
+            if not reused:
+                raise
+            # Session may have been closed by server since last use
+            logger.debug("Reconnecting to %s after error on kept session - "
+                         "%s", key[0], ex)
+            if self.session_pool.get(key) is client:
+                self.session_pool.pop(key).disconnect()
+            client, _ = self._get_client(key)
+            channel, _, stdout, stderr, _ = client.run_command(
+                request['command'], **run_kwargs)
+        send_lock = RLock()
+        readers = [spawn(self._send_output, sock, send_lock, name, output)
+                   for name, output in (('stdout', stdout),
+                                        ('stderr', stderr))]
+        try:
+            joinall(readers, raise_error=True)
+        finally:
+            for reader in readers:
+                reader.kill()
+        client.wait_finished(channel)
+        _send(sock, {'exit_code': client.get_exit_status(channel)})
+
+    def _send_output(self, sock, send_lock, name, output):
+        for line in output:
+            with send_lock:
+                _send(sock, {name: line})
+
+
+class BrokerClient(object):
+    """Client running commands on hosts via a :py:class:`SessionBroker`
+    process, reusing sessions the broker keeps open.
+
+    Host output returned by this client contains already finished commands.
+    ``stdout`` and ``stderr`` are lists of lines and ``exit_code`` is
+    available immediately.
+    """
+
+    def __init__(self, socket_path, hosts, user=None, port=None,
+                 pool_size=100):
+        """
+        :param socket_path: Path of broker's Unix socket.
+        :type socket_path: str
+        :param hosts: Hosts to run commands on.
+        :type hosts: list(str)
+        :param user: (Optional) User to login as. Defaults to user running
+          the broker.
+        :type user: str
+        :param port: (Optional) Port to connect to. Defaults to SSH default.
+        :type port: int
+        :param pool_size: (Optional) Number of hosts to run commands on
+          concurrently, each over its own broker connection.
+        :type pool_size: int
+        """
+        if isinstance(hosts, str) or isinstance(hosts, bytes):
+            raise TypeError(
+                "Hosts must be list or other iterable, not string. "
+                "For example: ['localhost'] not 'localhost'.")
+        self.socket_path = os.path.expanduser(socket_path)
+        self.hosts = hosts
+        self.user = user
+        self.port = port
+        self.pool_size = pool_size
+
+    def run_command(self, command, sudo=False, user=None,
+                    stop_on_errors=True, use_pty=False, host_args=None,
+                    shell=None, encoding='utf-8', timeout=None):
+        """Run command on all hosts via broker and return list of host
+        output once all hosts have finished.
+
+        Parameters are as per :py:func:`ParallelSSHClient.run_command
+        <pssh.clients.native.parallel.ParallelSSHClient.run_command>`.
+
+        :rtype: list(:py:class:`pssh.output.HostOutput`) in the same order as
+          ``self.hosts``.
+
+        :raises: Exceptions from hosts when ``stop_on_errors`` is ``True``,
+          including :py:class:`socket.error` on broker not running.
+        """
+        hosts = list(self.hosts)
+        if host_args:
+            try:
+                commands = [command % host_args[host_i]
+                            for host_i in range(len(hosts))]
+            except IndexError:
+                raise HostArgumentException(
+                    "Number of host arguments provided does not match "
+                    "number of hosts ")
+        else:
+            commands = [command for _ in hosts]
+        request = {'port': self.port, 'user': self.user, 'sudo': sudo,
+                   'sudo_user': user, 'use_pty': use_pty, 'shell': shell,
+                   'encoding': encoding, 'timeout': timeout}
+        pool = Pool(size=self.pool_size)
+        output = pool.map(
+            lambda host_cmd: self._run_host(host_cmd[0], host_cmd[1], request),
+            zip(hosts, commands))
+        if stop_on_errors:
+            for host_out in output:
+                if host_out.exception is not None:
+                    raise host_out.exception
+        return output
+
+    def _run_host(self, host, command, request):
+        request = dict(request, host=host, command=command)
+        stdout = []
+        stderr = []
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+            _send(sock, request)
+            reader = sock.makefile('rb')
+            try:
+                for line in reader:
+                    reply = json.loads(line.decode('utf-8'))
+                    if 'stdout' in reply:
+                        stdout.append(reply['stdout'])
+                    elif 'stderr' in reply:
+                        stderr.append(reply['stderr'])
+                    elif 'exit_code' in reply:
+                        return HostOutput(
+                            host, None, None, stdout, stderr, None, None,
+                            exit_code=reply['exit_code'])
+                    elif 'exception' in reply:
+                        raise self._make_exception(reply)
+            finally:
+                reader.close()
+            raise EOFError("Broker closed connection before command finished")
+        except Exception as ex:
+            ex.host = host
+            logger.error("Failed to run on host %s - %s", host, ex)
+            return HostOutput(host, None, None, None, None, None, None,
+                              exception=ex)
+        finally:
+            sock.close()
+
+    @staticmethod
+    def _make_exception(reply):
+        """Exception from broker reply. Exceptions not from
+        :py:mod:`pssh.exceptions` are raised as :py:class:`Exception`."""
+        ex_cls = getattr(exceptions, reply['exception'], None)
+        if not isinstance(ex_cls, type) or not issubclass(ex_cls, Exception):
+            return Exception("%s: %s" % (
+                reply['exception'], ', '.join(reply['args'])))
+        return ex_cls(*reply['args'])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description="Keep SSH sessions open for processes using "
+        "pssh.clients.native.broker.BrokerClient.")
+    parser.add_argument('socket_path', help="Unix socket to listen on")
+    parser.add_argument('--pkey', help="Private key file to authenticate with")
+    parser.add_argument('--num-retries', type=int, default=1,
+                        help="Connection and authentication attempts per "
+                        "host")
+    parser.add_argument('--timeout', type=float,
+                        help="SSH session timeout in seconds")
+    parser.add_argument('--max-sessions', type=int,
+                        help="Maximum number of sessions to keep open")
+    parser.add_argument('--idle-timeout', type=float, default=300,
+                        help="Seconds after last use to close sessions after")
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(args)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO)
+    broker = SessionBroker(
+        args.socket_path, max_sessions=args.max_sessions,
+        session_idle_timeout=args.idle_timeout, pkey=args.pkey,
+        num_retries=args.num_retries, timeout=args.timeout)
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.stop()
+
+
+if __name__ == '__main__':
+    main()
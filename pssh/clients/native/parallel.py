@@ -17,15 +17,18 @@
 
 import logging
 from collections import deque
+from functools import partial
+
 from gevent import sleep
-from gevent.lock import RLock
+from gevent.lock import RLock, BoundedSemaphore
 
 from .single import SSHClient
 from .tunnel import Tunnel
-from ..common import _validate_pkey_path
+from ..common import _validate_pkey_path, PKeyCache
 from ..base.parallel import BaseParallelSSHClient
 from ...constants import DEFAULT_RETRIES, RETRY_DELAY
 from ...exceptions import ProxyError, Timeout, HostArgumentException
+from ...output import HostOutput
 
 
 logger = logging.getLogger(__name__)
@@ -40,7 +43,15 @@ class ParallelSSHClient(BaseParallelSSHClient):
                  proxy_host=None, proxy_port=22,
                  proxy_user=None, proxy_password=None, proxy_pkey=None,
                  forward_ssh_agent=False, tunnel_timeout=None,
-                 keepalive_seconds=60, identity_auth=True):
+                 keepalive_seconds=60, identity_auth=True,
+                 adaptive_concurrency=False, connect_concurrency=None,
+                 auth_concurrency=None, exec_concurrency=None,
+                 max_sessions=None, session_idle_timeout=None,
+                 dns_cache_ttl=None, retry_policy=None, auth_threads=None,
+                 remember_auth=False, auth_cache_file=None,
+                 circuit_breaker=None, session_registry=None,
+                 connect_rate_limiter=None, socket_options=None,
+                 source_addresses=None):
         """
         :param hosts: Hosts to connect to
         :type hosts: list(str)
@@ -117,6 +128,97 @@ class ParallelSSHClient(BaseParallelSSHClient):
         :param tunnel_timeout: (Optional) Timeout setting for proxy tunnel
           connections.
         :type tunnel_timeout: float
+        :param adaptive_concurrency: (Optional) Set to ``True`` to adapt
+          number of concurrent connection attempts to how well remote hosts
+          are keeping up, starting low and backing off on connection errors
+          and timeouts. ``pool_size`` is then the maximum concurrency. See
+          :py:class:`pssh.clients.base.concurrency.AdaptiveLimiter`. Current
+          limit is available as ``self.connect_limiter.limit``.
+        :type adaptive_concurrency: bool
+        :param connect_concurrency: (Optional) Maximum number of concurrent
+          TCP connection attempts. Defaults to no limit other than
+          ``pool_size``.
+        :type connect_concurrency: int
+        :param auth_concurrency: (Optional) Maximum number of concurrent SSH
+          handshakes and authentications. These are CPU bound - setting this
+          to a small multiple of CPU cores allows ``pool_size`` to be set high
+          so that connecting and executing on other hosts continues while
+          handshakes are queued.
+        :type auth_concurrency: int
+        :param exec_concurrency: (Optional) Maximum number of concurrent
+          channel open and command execution requests.
+        :type exec_concurrency: int
+        :param max_sessions: (Optional) Maximum number of connected clients to
+          keep. Least recently used clients are disconnected once there are
+          more, and reconnected on next use. Must not be lower than
+          ``pool_size``. Clients running commands or copying files, or with
+          command output still referenced, are not disconnected, in which
+          case more clients are kept - when running on more hosts than this,
+          read and release output as it is returned by ``imap_run_command``.
+          Defaults to no limit.
+        :type max_sessions: int
+        :param session_idle_timeout: (Optional) Seconds after last use after
+          which clients are disconnected. Defaults to no idle timeout.
+        :type session_idle_timeout: float
+        :param dns_cache_ttl: (Optional) Resolve all hosts concurrently ahead
+          of connecting and cache their addresses for this many seconds. Hosts
+          that do not resolve fail without retries. Cache is available as
+          ``self.dns_cache`` - see
+          :py:class:`pssh.clients.base.resolver.DNSCache`. Defaults to
+          resolving each host when connecting to it.
+        :type dns_cache_ttl: float
+        :param retry_policy: (Optional) Policy for waiting between and
+          limiting retries of connection and authentication errors, for
+          example :py:class:`pssh.clients.base.retry.ExponentialBackoff`.
+          Hosts give up their pool slot while waiting to retry. Retries and
+          time spent waiting per host are available from
+          ``self.retry_policy.stats()``. Defaults to waiting ``retry_delay``
+          seconds between retries.
+        :type retry_policy: :py:class:`pssh.clients.base.retry.RetryPolicy`
+        :param auth_threads: (Optional) Number of threads of a thread pool
+          dedicated to SSH handshakes and authentication. Queue depth and
+          time spent waiting for a thread are available from
+          ``self.auth_executor.stats()`` - see
+          :py:class:`pssh.clients.base.concurrency.AuthExecutor`. Threads are
+          stopped when the parallel client is deleted. Defaults to sharing
+          gevent's hub thread pool.
+        :type auth_threads: int
+        :param remember_auth: (Optional) Remember which authentication method
+          and identity file succeeded for each host and try it first on
+          subsequent connections, falling back to all methods if it fails.
+          See :py:class:`pssh.clients.base.auth.AuthCache`.
+        :type remember_auth: bool
+        :param auth_cache_file: (Optional) File to load and save remembered
+          authentication methods from and to. Enables ``remember_auth``.
+        :type auth_cache_file: str
+        :param circuit_breaker: (Optional) Circuit breaker for failing hosts
+          that have repeatedly failed to connect straight away with
+          :py:class:`pssh.exceptions.CircuitOpenError` for a cool down period,
+          without connection attempts or retries.
+        :type circuit_breaker:
+          :py:class:`pssh.clients.base.circuit.CircuitBreaker`
+        :param session_registry: (Optional) Registry of connected clients to
+          share with other parallel clients using the same registry. Clients
+          for the same host, port, user and private key are shared and
+          disconnected once no parallel client uses them. Use
+          :py:data:`pssh.clients.base.registry.SESSION_REGISTRY` to share
+          clients process wide. Not used for hosts connected via proxy host.
+        :type session_registry:
+          :py:class:`pssh.clients.base.registry.SessionRegistry`
+        :param connect_rate_limiter: (Optional) Rate limit of new connection
+          attempts, overall and per subnet. Applies to connections via proxy
+          host as well.
+        :type connect_rate_limiter:
+          :py:class:`pssh.clients.base.concurrency.ConnectRateLimiter`
+        :param socket_options: (Optional) Socket options to set on every
+          connection's socket, as list of ``(level, option, value)`` tuples
+          like ``[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]``.
+        :type socket_options: list(tuple)
+        :param source_addresses: (Optional) Local IP addresses to bind
+          connections to, in turn, for more concurrent connections to the
+          same destination than the ephemeral ports of one address allow.
+          See :py:class:`pssh.clients.common.SourceAddressPool`.
+        :type source_addresses: list(str)
 
         :raises: :py:class:`pssh.exceptions.PKeyFileError` on errors finding
           provided private key.
@@ -126,8 +228,21 @@ class ParallelSSHClient(BaseParallelSSHClient):
             allow_agent=allow_agent, num_retries=num_retries,
             timeout=timeout, pool_size=pool_size,
             host_config=host_config, retry_delay=retry_delay,
-            identity_auth=identity_auth)
+            identity_auth=identity_auth,
+            adaptive_concurrency=adaptive_concurrency,
+            connect_concurrency=connect_concurrency,
+            auth_concurrency=auth_concurrency,
+            exec_concurrency=exec_concurrency,
+            max_sessions=max_sessions,
+            session_idle_timeout=session_idle_timeout,
+            dns_cache_ttl=dns_cache_ttl, retry_policy=retry_policy,
+            auth_threads=auth_threads, remember_auth=remember_auth,
+            auth_cache_file=auth_cache_file, circuit_breaker=circuit_breaker,
+            session_registry=session_registry,
+            connect_rate_limiter=connect_rate_limiter,
+            socket_options=socket_options, source_addresses=source_addresses)
         self.pkey = _validate_pkey_path(pkey)
+        self._pkey_cache = PKeyCache()
         self.proxy_host = proxy_host
         self.proxy_port = proxy_port
         self.proxy_pkey = _validate_pkey_path(proxy_pkey)
@@ -141,11 +256,12 @@ class ParallelSSHClient(BaseParallelSSHClient):
         self._tunnel_timeout = tunnel_timeout
         self._clients_lock = RLock()
         self.keepalive_seconds = keepalive_seconds
+        self._shells = {}
 
     def run_command(self, command, sudo=False, user=None, stop_on_errors=True,
                     use_pty=False, host_args=None, shell=None,
                     encoding='utf-8', timeout=None, greenlet_timeout=None,
-                    return_list=False):
+                    return_list=False, deadline=None):
         """Run command on all hosts in parallel, honoring self.pool_size,
         and return output.
 
@@ -211,6 +327,12 @@ class ParallelSSHClient(BaseParallelSSHClient):
           from 2.0.0 - enable this flag to avoid client code breaking on
           upgrading to 2.0.0.
         :type return_list: bool
+        :param deadline: (Optional) Seconds from now by which all hosts must
+          have connected and started executing. Hosts not started by then
+          are not started and hosts still connecting or executing are
+          stopped, with their host output's ``exception`` set to
+          :py:class:`pssh.exceptions.DeadlineTimeout`.
+        :type deadline: float
         :rtype: Dictionary with host as key and
           :py:class:`pssh.output.HostOutput` as value
           *or* list(:py:class:`pssh.output.HostOutput`) when
@@ -239,19 +361,166 @@ class ParallelSSHClient(BaseParallelSSHClient):
             self, command, stop_on_errors=stop_on_errors, host_args=host_args,
             user=user, shell=shell, sudo=sudo,
             encoding=encoding, use_pty=use_pty, timeout=timeout,
-            greenlet_timeout=greenlet_timeout, return_list=return_list)
+            greenlet_timeout=greenlet_timeout, return_list=return_list,
+            deadline=deadline)
+
+    def run_commands(self, commands, max_channels=10, sudo=False, user=None,
+                     stop_on_errors=True, use_pty=False, shell=None,
+                     encoding='utf-8', timeout=None):
+        """Run each of ``commands`` on all hosts, with commands on a host
+        running concurrently over separate channels of a single SSH session
+        to that host.
+
+        At most ``max_channels`` channels are open on each host at any time.
+        Output of each command is read to completion and its channel closed
+        before the next command waiting for a channel on that host is
+        started. This function therefor blocks until all commands have
+        finished.
+
+        Other parameters are as per ``run_command``.
+
+        :param commands: Commands to run on each host.
+        :type commands: list(str)
+        :param max_channels: Maximum number of channels open concurrently on
+          each host. Should not be higher than the server's ``MaxSessions``
+          setting - defaults to ``10``, the OpenSSH default.
+        :type max_channels: int
+
+        :rtype: list(:py:class:`pssh.output.HostOutput`) of each command's
+          output, ordered by host as in ``self.hosts`` and then by command.
+          Output of command ``cmd_i`` on host ``host_i`` is at index
+          ``host_i * len(commands) + cmd_i``. ``stdout`` and ``stderr`` are
+          lists of lines and ``exit_code`` is already available.
+
+        :raises: Exception from first output, in output order, with an
+          exception when ``stop_on_errors`` is ``True``, once all commands
+          have been attempted.
+        """
+        self._start_run()
+        hosts = list(self.hosts)
+        channel_limits = {}
+        run_cmd = partial(
+            self._run_channel_command, channel_limits=channel_limits,
+            max_channels=max_channels, sudo=sudo, user=user, shell=shell,
+            use_pty=use_pty, encoding=encoding, timeout=timeout)
+        # Commands are dispatched in command order across all hosts so that
+        # pool slots are not taken by commands waiting on channels of the
+        # same host.
+        host_cmds = ((host_i * len(commands) + cmd_i, host_i, host, command)
+                     for cmd_i, command in enumerate(commands)
+                     for host_i, host in enumerate(hosts))
+        output = [None for _ in range(len(hosts) * len(commands))]
+        for out_i, host_out in self.pool.imap_unordered(run_cmd, host_cmds):
+            output[out_i] = host_out
+        self._end_run()
+        if stop_on_errors:
+            for host_out in output:
+                if host_out.exception is not None:
+                    raise host_out.exception
+        return output
+
+    def run_shell_command(self, command, stop_on_errors=True, host_args=None,
+                          encoding='utf-8', timeout=None):
+        """Run command on all hosts in parallel over persistent shells, one
+        per host, that are kept open between calls.
+
+        Shells are opened on first use and reused by subsequent calls,
+        avoiding the cost of opening a channel and executing per command.
+        Shell state like current directory and environment variables persists
+        between commands. See :py:class:`PersistentShell
+        <pssh.clients.native.shell.PersistentShell>`.
+
+        Shells are closed along with their host's client when it is
+        disconnected by the session pool, as per ``max_sessions`` and
+        ``session_idle_timeout``. A new shell is then opened on next call,
+        without state from the previous one - current directory, environment
+        variables and other shell state are silently reset.
+
+        This function blocks until the command has finished on all hosts.
+
+        :param command: Command to run. Must be a complete shell command.
+        :type command: str
+        :param stop_on_errors: (Optional) Raise exception from first host, in
+          host order, with an error once all hosts have finished.
+        :type stop_on_errors: bool
+        :param host_args: (Optional) Format command string with per-host
+          arguments as per ``run_command``.
+        :type host_args: tuple or list
+        :param encoding: Encoding to use for command and output.
+        :type encoding: str
+        :param timeout: (Optional) Seconds to wait for command to finish on
+          each host. Shells timing out are closed and reopened on next call.
+        :type timeout: float
 
-    def __del__(self):
-        if not hasattr(self, '_host_clients'):
-            return
-        logger.debug("Disconnecting clients")
-        for s_client in self._host_clients.values():
+        :rtype: list(:py:class:`pssh.output.HostOutput`) in the same order as
+          ``self.hosts``, with ``stdout`` and ``stderr`` as lists of lines and
+          ``exit_code`` already available.
+        """
+        self._start_run()
+        hosts = list(self.hosts)
+        run_cmd = partial(
+            self._run_shell_command, encoding=encoding, timeout=timeout)
+        output = [None for _ in hosts]
+        for host_i, host_out in self.pool.imap_unordered(
+                run_cmd, self._host_commands(hosts, command, host_args)):
+            output[host_i] = host_out
+        self._end_run()
+        if stop_on_errors:
+            for host_out in output:
+                if host_out.exception is not None:
+                    raise host_out.exception
+        return output
+
+    def _run_shell_command(self, host_cmd, encoding='utf-8', timeout=None):
+        host_i, host, command = host_cmd
+        # Client and its shell are not evicted while shell is in use
+        self.session_pool.pin((host_i, host))
+        try:
+            shell = self._shells.get((host_i, host))
+            if shell is not None and not shell.closed and \
+               not shell.client.is_alive():
+                # Client is reconnected by _make_ssh_client
+                self._close_shell((host_i, host))
+                shell = None
+            if shell is None or shell.closed:
+                _client = self._make_ssh_client(host_i, host)
+                shell = _client.open_shell(encoding=encoding)
+                self._shells[(host_i, host)] = shell
+            stdout, stderr, exit_code = shell.run(command, timeout=timeout)
+        except Exception as ex:
+            ex.host = host
+            logger.error("Failed to run on host %s - %s", host, ex)
+            return host_i, HostOutput(host, None, None, None, None, None,
+                                      None, exception=ex)
+        finally:
+            self.session_pool.unpin((host_i, host))
+        return host_i, HostOutput(host, None, None, stdout, stderr, None,
+                                  None, exit_code=exit_code)
+
+    def _run_channel_command(self, out_host_cmd, channel_limits=None,
+                             max_channels=None, **kwargs):
+        """Run command on host within host's channel limit, read its output
+        to completion and close channel"""
+        out_i, host_i, host, command = out_host_cmd
+        channel_limit = channel_limits.setdefault(
+            host_i, BoundedSemaphore(max_channels))
+        with channel_limit:
+            host_out = self._run_command_output(
+                (host_i, host, command), **kwargs)
+            if host_out.exception is not None:
+                return out_i, host_out
             try:
-                s_client.disconnect()
+                stdout = list(host_out.stdout)
+                stderr = list(host_out.stderr)
+                host_out.client.wait_finished(host_out.channel)
+                exit_code = host_out.exit_code
             except Exception as ex:
-                logger.debug("Client disconnect failed with %s", ex)
-                pass
-            del s_client
+                ex.host = host
+                logger.error("Failed to run on host %s - %s", host, ex)
+                return out_i, HostOutput(host, host_out.cmd, None, None, None,
+                                         None, None, exception=ex)
+        return out_i, HostOutput(host, host_out.cmd, None, stdout, stderr,
+                                 None, None, exit_code=exit_code)
 
     def _start_tunnel_thread(self):
         self._tunnel_lock = RLock()
@@ -263,7 +532,10 @@ class ParallelSSHClient(BaseParallelSSHClient):
             password=self.proxy_password, port=self.proxy_port,
             pkey=self.proxy_pkey, num_retries=self.num_retries,
             timeout=self._tunnel_timeout, retry_delay=self.retry_delay,
-            allow_agent=self.allow_agent)
+            allow_agent=self.allow_agent, _dns_cache=self.dns_cache,
+            _connect_rate_limiter=self.connect_rate_limiter,
+            _socket_options=self.socket_options,
+            _source_addresses=self.source_addresses)
         self._tunnel.daemon = True
         self._tunnel.start()
         while not self._tunnel.tunnel_open.is_set():
@@ -275,18 +547,54 @@ class ParallelSSHClient(BaseParallelSSHClient):
                 logger.error(msg, self._tunnel.exception)
                 raise ProxyError(msg, self._tunnel.exception)
 
+    def _can_probe(self):
+        return self.proxy_host is None
+
+    def _resolve_hosts(self):
+        if self.proxy_host is not None:
+            # Hosts are resolved by proxy host
+            return
+        BaseParallelSSHClient._resolve_hosts(self)
+
+    def _evict_client(self, host_key, client):
+        self._close_shell(host_key)
+        BaseParallelSSHClient._evict_client(self, host_key, client)
+
+    def _discard_dead_client(self, host_key, client):
+        self._close_shell(host_key)
+        BaseParallelSSHClient._discard_dead_client(self, host_key, client)
+
+    def _close_shell(self, host_key):
+        shell = self._shells.pop(host_key, None)
+        if shell is not None:
+            shell.close()
+
+    def _rekey_clients(self, host_keys):
+        self._shells = dict((host_keys.get(host_key, host_key), shell)
+                            for host_key, shell in self._shells.items())
+        BaseParallelSSHClient._rekey_clients(self, host_keys)
+
     def _make_ssh_client(self, host_i, host):
         auth_thread_pool = True
         if self.proxy_host is not None and self._tunnel is None:
             self._start_tunnel_thread()
         logger.debug("Make client request for host %s, host in clients: %s",
                      host, host in self.host_clients)
-        with self._clients_lock:
-            if (host_i, host) not in self._host_clients \
-               or self._host_clients[(host_i, host)] is None:
+        # Tunnel listening ports are handed out in order of requests
+        clients_lock = self._clients_lock if self.proxy_host is not None \
+            else self._host_lock(host_i, host)
+        with clients_lock:
+            _client = self._get_live_client(host_i, host)
+            if _client is None:
                 _user, _port, _password, _pkey = self._get_host_config_values(
                     host)
                 proxy_host = None if self.proxy_host is None else '127.0.0.1'
+                # Connections via proxy are rate limited and bound to source
+                # addresses by tunnel
+                rate_limiter = self.connect_rate_limiter \
+                    if proxy_host is None else None
+                source_addresses = self.source_addresses \
+                    if proxy_host is None else None
                 if proxy_host is not None:
                     auth_thread_pool = False
                     _wait = 0.0
@@ -306,22 +614,46 @@ class ParallelSSHClient(BaseParallelSSHClient):
                             _wait += .5
                         else:
                             break
-                _client = SSHClient(
-                    host, user=_user, password=_password, port=_port,
-                    pkey=_pkey, num_retries=self.num_retries,
-                    timeout=self.timeout,
-                    allow_agent=self.allow_agent, retry_delay=self.retry_delay,
-                    proxy_host=proxy_host, _auth_thread_pool=auth_thread_pool,
-                    forward_ssh_agent=self.forward_ssh_agent,
-                    keepalive_seconds=self.keepalive_seconds,
-                    identity_auth=self.identity_auth,
-                )
+
+                pool_slot = self._pool_slot()
+
+                def _make_client():
+                    with self._circuit_guard(host):
+                        return SSHClient(
+                            host, user=_user, password=_password, port=_port,
+                            pkey=_pkey, num_retries=self.num_retries,
+                            timeout=self.timeout,
+                            allow_agent=self.allow_agent,
+                            retry_delay=self.retry_delay,
+                            proxy_host=proxy_host,
+                            _auth_thread_pool=auth_thread_pool,
+                            forward_ssh_agent=self.forward_ssh_agent,
+                            keepalive_seconds=self.keepalive_seconds,
+                            identity_auth=self.identity_auth,
+                            _connect_limiter=self.connect_limiter,
+                            _stage_limits=self.stage_limits,
+                            _dns_cache=self.dns_cache,
+                            _retry_policy=self.retry_policy,
+                            _auth_executor=self.auth_executor,
+                            _auth_cache=self.auth_cache,
+                            _pkey_cache=self._pkey_cache,
+                            _connect_rate_limiter=rate_limiter,
+                            _socket_options=self.socket_options,
+                            _source_addresses=source_addresses,
+                            _pool_slot=pool_slot,
+                        )
+                if proxy_host is None:
+                    _client = self._shared_client(
+                        host, _user, _port, _pkey, _make_client)
+                else:
+                    _client = _make_client()
                 self.host_clients[host] = _client
                 self._host_clients[(host_i, host)] = _client
                 return _client
-        return self._host_clients[(host_i, host)]
+        return _client
 
-    def copy_file(self, local_file, remote_file, recurse=False, copy_args=None):
+    def copy_file(self, local_file, remote_file, recurse=False, copy_args=None,
+                  deadline=None):
         """Copy local file to remote file in parallel via SFTP.
 
         This function returns a list of greenlets which can be
@@ -349,6 +681,11 @@ class ParallelSSHClient(BaseParallelSSHClient):
           equal length of host list -
           :py:class:`pssh.exceptions.HostArgumentException` is raised otherwise
         :type copy_args: tuple or list
+        :param deadline: (Optional) Seconds from now after which copies not
+          yet started are not started and copies in progress are killed.
+          Greenlets of such hosts raise
+          :py:class:`pssh.exceptions.DeadlineTimeout`.
+        :type deadline: float
 
         :rtype: list(:py:class:`gevent.Greenlet`) of greenlets for remote copy
           commands
@@ -370,7 +707,8 @@ class ParallelSSHClient(BaseParallelSSHClient):
 
         """
         return BaseParallelSSHClient.copy_file(
-            self, local_file, remote_file, recurse=recurse, copy_args=copy_args)
+            self, local_file, remote_file, recurse=recurse, copy_args=copy_args,
+            deadline=deadline)
 
     def copy_remote_file(self, remote_file, local_file, recurse=False,
                          suffix_separator='_', copy_args=None,
@@ -445,16 +783,24 @@ class ParallelSSHClient(BaseParallelSSHClient):
             encoding=encoding)
 
     def _scp_send(self, host_i, host, local_file, remote_file, recurse=False):
-        self._make_ssh_client(host_i, host)
-        return self._handle_greenlet_exc(
-            self._host_clients[(host_i, host)].scp_send, host,
-            local_file, remote_file, recurse=recurse)
+        self.session_pool.pin((host_i, host))
+        try:
+            self._make_ssh_client(host_i, host)
+            return self._handle_greenlet_exc(
+                self._host_clients[(host_i, host)].scp_send, host,
+                local_file, remote_file, recurse=recurse)
+        finally:
+            self.session_pool.unpin((host_i, host))
 
     def _scp_recv(self, host_i, host, remote_file, local_file, recurse=False):
-        self._make_ssh_client(host_i, host)
-        return self._handle_greenlet_exc(
-            self._host_clients[(host_i, host)].scp_recv, host,
-            remote_file, local_file, recurse=recurse)
+        self.session_pool.pin((host_i, host))
+        try:
+            self._make_ssh_client(host_i, host)
+            return self._handle_greenlet_exc(
+                self._host_clients[(host_i, host)].scp_recv, host,
+                remote_file, local_file, recurse=recurse)
+        finally:
+            self.session_pool.unpin((host_i, host))
 
     def scp_send(self, local_file, remote_file, recurse=False):
         """Copy local file to remote file in parallel via SCP.
@@ -0,0 +1,258 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Multi-process parallel client running one native parallel client per
+process."""
+
+import logging
+import multiprocessing
+import pickle
+
+import gevent
+from gevent import spawn
+from gevent.queue import Queue
+from gevent.socket import wait_read
+
+from .parallel import ParallelSSHClient
+from ...exceptions import HostArgumentException
+from ...output import HostOutput
+
+
+logger = logging.getLogger(__name__)
+try:
+    # Forked workers would inherit and run the parent's greenlets - use
+    # fresh interpreters where available.
+    _mp = multiprocessing.get_context('spawn')
+except AttributeError:
+    _mp = multiprocessing
+
+
+def _picklable_exception(ex, host):
+    try:
+        pickle.dumps(ex)
+    except Exception:
+        ex = Exception(repr(ex))
+    ex.host = host
+    return ex
+
+
+def _run_shard(conn, hosts, commands, client_kwargs, run_kwargs):
+    """Worker process target. Runs commands on shard's hosts with a native
+    parallel client and sends per host results back over ``conn`` as
+    ``(host_i, host, exit_code, stdout, stderr, exception)`` tuples as each
+    host finishes, followed by ``None``."""
+    gevent.reinit()
+
+    def _run_host(host_cmd):
+        shard_i, host, command = host_cmd
+        host_out = client._run_command_output(
+            (shard_i, host, command), **run_kwargs)
+        if host_out.exception is not None:
+            return shard_i, host, None, None, None, _picklable_exception(
+                host_out.exception, host)
+        try:
+            stdout = list(host_out.stdout)
+            stderr = list(host_out.stderr)
+            host_out.client.wait_finished(host_out.channel)
+        except Exception as ex:
+            return shard_i, host, None, None, None, _picklable_exception(
+                ex, host)
+        return shard_i, host, host_out.exit_code, stdout, stderr, None
+
+    try:
+        client = ParallelSSHClient(hosts, **client_kwargs)
+        host_cmds = ((shard_i, host, commands[shard_i])
+                     for shard_i, host in enumerate(hosts))
+        for result in client.pool.imap_unordered(_run_host, host_cmds):
+            conn.send(result)
+        conn.send(None)
+    except Exception as ex:
+        logger.error("Shard worker failed - %s", ex)
+        conn.send(_picklable_exception(ex, None))
+    finally:
+        conn.close()
+
+
+class ShardedParallelSSHClient(object):
+    """Parallel client that splits hosts across a number of worker processes,
+    each running its own native :py:class:`ParallelSSHClient
+    <pssh.clients.native.parallel.ParallelSSHClient>`.
+
+    All session processing - key exchange, encryption and output parsing -
+    happens in worker processes, allowing all CPU cores to be used for very
+    large numbers of hosts. Results are sent back to the parent process
+    per host as each host's command completes.
+
+    Worker processes are started as new interpreters where supported, meaning
+    scripts using this client must guard their entry point with
+    ``if __name__ == '__main__':``.
+
+    As output is read to completion in worker processes, host output returned
+    by this client contains already finished commands. ``stdout`` and
+    ``stderr`` are lists of lines and ``exit_code`` is available immediately.
+    There are no client or channel objects in the parent process, making
+    functions like ``join`` unnecessary.
+    """
+
+    def __init__(self, hosts, processes=None, host_config=None,
+                 **client_kwargs):
+        """
+        :param hosts: Hosts to connect to
+        :type hosts: list(str)
+        :param processes: (Optional) Number of worker processes to split hosts
+          across. Defaults to number of CPU cores.
+        :type processes: int
+        :param host_config: (Optional) Per-host configuration as per
+          :py:class:`ParallelSSHClient
+          <pssh.clients.native.parallel.ParallelSSHClient>`. Only configuration
+          of hosts in a shard is sent to each worker.
+        :type host_config: dict
+        :param client_kwargs: Keyword arguments to pass on to each worker's
+          :py:class:`ParallelSSHClient
+          <pssh.clients.native.parallel.ParallelSSHClient>`. Must be
+          picklable.
+        """
+        if isinstance(hosts, str) or isinstance(hosts, bytes):
+            raise TypeError(
+                "Hosts must be list or other iterable, not string. "
+                "For example: ['localhost'] not 'localhost'.")
+        self.hosts = hosts
+        self.processes = processes if processes \
+            else multiprocessing.cpu_count()
+        self.host_config = host_config if host_config else {}
+        self.client_kwargs = client_kwargs
+
+    def _shards(self, command, host_args=None):
+        hosts = list(self.hosts)
+        if host_args:
+            try:
+                commands = [command % host_args[host_i]
+                            for host_i in range(len(hosts))]
+            except IndexError:
+                raise HostArgumentException(
+                    "Number of host arguments provided does not match "
+                    "number of hosts ")
+        else:
+            commands = [command for _ in hosts]
+        num_shards = min(self.processes, len(hosts))
+        for shard in range(num_shards):
+            host_idxs = list(range(shard, len(hosts), num_shards))
+            yield host_idxs, [hosts[i] for i in host_idxs], \
+                [commands[i] for i in host_idxs]
+
+    def _start_worker(self, shard_hosts, commands, run_kwargs):
+        client_kwargs = dict(self.client_kwargs)
+        client_kwargs['host_config'] = dict(
+            (host, self.host_config[host]) for host in shard_hosts
+            if host in self.host_config)
+        reader, writer = _mp.Pipe(duplex=False)
+        proc = _mp.Process(
+            target=_run_shard,
+            args=(writer, shard_hosts, commands, client_kwargs, run_kwargs))
+        proc.daemon = True
+        proc.start()
+        writer.close()
+        return proc, reader
+
+    def _read_shard(self, reader, host_idxs, results):
+        try:
+            while True:
+                wait_read(reader.fileno())
+                result = reader.recv()
+                if result is None:
+                    return
+                if isinstance(result, Exception):
+                    results.put(result)
+                    return
+                shard_i, host, exit_code, stdout, stderr, exception = result
+                results.put((host_idxs[shard_i], HostOutput(
+                    host, None, None, stdout, stderr, None, None,
+                    exception=exception, exit_code=exit_code)))
+        except EOFError:
+            results.put(EOFError("Shard worker exited without sending "
+                                 "results for all hosts"))
+        finally:
+            reader.close()
+            results.put(StopIteration)
+
+    def imap_run_command(self, command, sudo=False, user=None,
+                         stop_on_errors=True, use_pty=False, host_args=None,
+                         shell=None, encoding='utf-8', timeout=None):
+        """Run command on all hosts across worker processes and yield
+        ``(host_i, host_output)`` tuples as each host finishes, where
+        ``host_i`` is the index of the host in ``self.hosts``.
+
+        Parameters are as per :py:func:`ParallelSSHClient.run_command
+        <pssh.clients.native.parallel.ParallelSSHClient.run_command>`.
+
+        :rtype: generator of ``(int, HostOutput)`` tuples
+
+        :raises: Exceptions from hosts when ``stop_on_errors`` is ``True``.
+        :raises: :py:class:`EOFError` if a worker process exits unexpectedly.
+        """
+        run_kwargs = dict(sudo=sudo, user=user, use_pty=use_pty, shell=shell,
+                          encoding=encoding, timeout=timeout)
+        results = Queue()
+        workers = []
+        readers = []
+        try:
+            for host_idxs, shard_hosts, commands in self._shards(
+                    command, host_args=host_args):
+                proc, reader = self._start_worker(
+                    shard_hosts, commands, run_kwargs)
+                workers.append(proc)
+                readers.append((reader, host_idxs))
+            for reader, host_idxs in readers:
+                spawn(self._read_shard, reader, host_idxs, results)
+            running = len(workers)
+            while running:
+                result = results.get()
+                if result is StopIteration:
+                    running -= 1
+                    continue
+                if isinstance(result, Exception):
+                    raise result
+                host_i, host_out = result
+                if stop_on_errors and host_out.exception is not None:
+                    raise host_out.exception
+                yield host_i, host_out
+        finally:
+            for proc in workers:
+                if proc.is_alive():
+                    proc.terminate()
+                proc.join()
+
+    def run_command(self, command, sudo=False, user=None,
+                    stop_on_errors=True, use_pty=False, host_args=None,
+                    shell=None, encoding='utf-8', timeout=None):
+        """Run command on all hosts across worker processes and return list of
+        host output once all hosts have finished.
+
+        Parameters are as per :py:func:`ParallelSSHClient.run_command
+        <pssh.clients.native.parallel.ParallelSSHClient.run_command>`.
+
+        :rtype: list(:py:class:`pssh.output.HostOutput`) in the same order as
+          ``self.hosts``.
+        """
+        output = [None for _ in self.hosts]
+        for host_i, host_out in self.imap_run_command(
+                command, sudo=sudo, user=user,
+                stop_on_errors=stop_on_errors, use_pty=use_pty,
+                host_args=host_args, shell=shell, encoding=encoding,
+                timeout=timeout):
+            output[host_i] = host_out
+        return output
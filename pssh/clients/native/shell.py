@@ -0,0 +1,134 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Persistent shell for running commands over one long lived channel."""
+
+import logging
+from uuid import uuid4
+
+from gevent import spawn, Timeout as GTimeout
+from gevent.lock import RLock
+
+from ...exceptions import SessionError, Timeout
+from ...native._ssh2 import eagain_write
+
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentShell(object):
+    """Shell running on a channel that is kept open for running commands.
+
+    Commands are written to the shell's standard input followed by commands
+    printing a unique marker, with the exit code of the command, on standard
+    output and standard error. Output of each command is read up to its
+    markers, meaning no channel needs to be opened per command.
+
+    As commands run in the same shell, shell state like current directory and
+    environment variables persists between commands. Commands have their
+    standard input redirected from ``/dev/null`` so they do not consume
+    subsequent commands.
+
+    One command runs at a time - concurrent calls to ``run`` wait for
+    previous commands to finish.
+    """
+
+    def __init__(self, client, channel, encoding='utf-8'):
+        """
+        :param client: Client shell channel is open on.
+        :type client: :py:class:`pssh.clients.native.single.SSHClient`
+        :param channel: Channel with shell started on it.
+        :type channel: :py:class:`ssh2.channel.Channel`
+        :param encoding: Encoding to use for commands and output.
+        :type encoding: str
+        """
+        self.client = client
+        self.channel = channel
+        self.encoding = encoding
+        self._stdout = client.read_output(channel)
+        self._stderr = client.read_stderr(channel)
+        self._lock = RLock()
+        self.closed = False
+
+    def run(self, command, timeout=None):
+        """Run command in shell and wait for it to finish.
+
+        :param command: Command to run. Must be a complete shell command.
+        :type command: str
+        :param timeout: (Optional) Seconds to wait for command to finish.
+          The shell is closed on timeout, as it may still be running the
+          command.
+        :type timeout: float
+
+        :rtype: tuple(stdout, stderr, exit_code) with stdout and stderr being
+          lists of lines.
+
+        :raises: :py:class:`pssh.exceptions.Timeout` on timeout reached.
+        :raises: :py:class:`pssh.exceptions.SessionError` if shell has been
+          closed or exits.
+        """
+        with self._lock:
+            if self.closed:
+                raise SessionError("Shell is closed")
+            marker = uuid4().hex
+            script = "{ %s\n} </dev/null\nprintf '%s %%s\\n' \"$?\"\n" \
+                "printf '%s\\n' >&2\n" % (command, marker, marker)
+            try:
+                with GTimeout(timeout):
+                    eagain_write(self.channel.write,
+                                 script.encode(self.encoding),
+                                 self.client.session)
+                    stderr_reader = spawn(
+                        self._read_until_marker, self._stderr, marker)
+                    try:
+                        stdout, exit_code = self._read_until_marker(
+                            self._stdout, marker)
+                        stderr, _ = stderr_reader.get()
+                    finally:
+                        stderr_reader.kill()
+            except GTimeout:
+                self.close()
+                raise Timeout("Timed out running command on shell after "
+                              "%s seconds" % (timeout,))
+            except Exception:
+                self.close()
+                raise
+        return stdout, stderr, int(exit_code)
+
+    def _read_until_marker(self, output, marker):
+        marker = marker.encode(self.encoding)
+        lines = []
+        for line in output:
+            pos = line.find(marker)
+            if pos < 0:
+                lines.append(line.decode(self.encoding))
+                continue
+            # Command output not ending in a new line is followed by marker
+            if pos > 0:
+                lines.append(line[:pos].decode(self.encoding))
+            return lines, line[pos + len(marker):].strip()
+        raise SessionError("Shell exited while running command")
+
+    def close(self):
+        """Close shell channel."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.client.close_channel(self.channel)
+        except Exception as ex:
+            logger.debug("Error closing shell channel - %s", ex)
@@ -31,6 +31,7 @@ from ssh2.sftp import LIBSSH2_FXF_READ, LIBSSH2_FXF_CREAT, LIBSSH2_FXF_WRITE, \
     LIBSSH2_SFTP_S_IWUSR, LIBSSH2_SFTP_S_IXUSR, LIBSSH2_SFTP_S_IROTH, \
     LIBSSH2_SFTP_S_IXGRP, LIBSSH2_SFTP_S_IXOTH
 
+from .shell import PersistentShell
 from ..base.single import BaseSSHClient
 from ...exceptions import AuthenticationException, SessionError, SFTPError, \
     SFTPIOError, Timeout, SCPError
@@ -53,7 +54,18 @@ class SSHClient(BaseSSHClient):
                  forward_ssh_agent=False,
                  proxy_host=None,
                  _auth_thread_pool=True, keepalive_seconds=60,
-                 identity_auth=True,):
+                 identity_auth=True,
+                 _connect_limiter=None,
+                 _stage_limits=None,
+                 _dns_cache=None,
+                 _retry_policy=None,
+                 _auth_executor=None,
+                 _auth_cache=None,
+                 _pkey_cache=None,
+                 _connect_rate_limiter=None,
+                 _socket_options=None,
+                 _source_addresses=None,
+                 _pool_slot=None):
         """:param host: Host name or IP to connect to.
         :type host: str
         :param user: User to connect as. Defaults to logged in user.
@@ -104,11 +116,24 @@ class SSHClient(BaseSSHClient):
             num_retries=num_retries, retry_delay=retry_delay,
             allow_agent=allow_agent, _auth_thread_pool=_auth_thread_pool,
             timeout=timeout,
-            proxy_host=proxy_host, identity_auth=identity_auth)
+            proxy_host=proxy_host, identity_auth=identity_auth,
+            _connect_limiter=_connect_limiter,
+            _stage_limits=_stage_limits,
+            _dns_cache=_dns_cache,
+            _retry_policy=_retry_policy,
+            _auth_executor=_auth_executor,
+            _auth_cache=_auth_cache,
+            _pkey_cache=_pkey_cache,
+            _connect_rate_limiter=_connect_rate_limiter,
+            _socket_options=_socket_options,
+            _source_addresses=_source_addresses,
+            _pool_slot=_pool_slot)
 
     def disconnect(self):
         """Disconnect session, close socket if needed."""
         logger.debug("Disconnecting client for host %s", self.host)
+        if self._keepalive_greenlet is not None:
+            self._keepalive_greenlet.kill(block=False)
         self._keepalive_greenlet = None
         if self.session is not None:
             try:
@@ -116,6 +141,8 @@ class SSHClient(BaseSSHClient):
             except Exception:
                 pass
             self.session = None
+        if self.sock is not None and not self.sock.closed:
+            self.sock.close()
         self.sock = None
 
     def spawn_send_keepalive(self):
@@ -124,8 +151,13 @@ class SSHClient(BaseSSHClient):
         return spawn(self._send_keepalive)
 
     def _send_keepalive(self):
-        while True:
-            sleep(self._eagain(self.session.keepalive_send))
+        try:
+            while True:
+                sleep(self._eagain(self.session.keepalive_send))
+        except Exception as ex:
+            logger.error("Sending keep alive to host %s failed - %s",
+                         self.host, ex)
+            self._keepalive_error = ex
 
     def configure_keepalive(self):
         self.session.keepalive_config(False, self.keepalive_seconds)
@@ -138,22 +170,19 @@ class SSHClient(BaseSSHClient):
         try:
             self.session.handshake(self.sock)
         except Exception as ex:
-            while retries < self.num_retries:
-                return self._connect_init_retry(retries)
             msg = "Error connecting to host %s:%s - %s"
             logger.error(msg, self.host, self.port, ex)
             if isinstance(ex, SSH2Timeout):
-                raise Timeout(msg, self.host, self.port, ex)
+                ex = Timeout(msg, self.host, self.port, ex)
             ex.host = self.host
             ex.port = self.port
-            raise
+            raise self._retryable(ex, retries)
         try:
             self.auth()
         except Exception as ex:
-            while retries < self.num_retries:
-                return self._connect_init_retry(retries)
             msg = "Authentication error while connecting to %s:%s - %s"
-            raise AuthenticationException(msg, self.host, self.port, ex)
+            raise self._retryable(AuthenticationException(
+                msg, self.host, self.port, ex), retries)
         self.session.set_blocking(0)
         if self.keepalive_seconds:
             self.configure_keepalive()
@@ -163,10 +192,12 @@ class SSHClient(BaseSSHClient):
         if self.pkey is not None:
             logger.debug(
                 "Proceeding with private key file authentication")
-            return self._pkey_auth(password=self.password)
+            return self._pkey_auth(self.pkey, password=self.password)
+        if self._cached_auth():
+            return
         if self.allow_agent:
             try:
-                self.session.agent_auth(self.user)
+                self._agent_auth()
             except (AgentAuthenticationError, AgentConnectionError, AgentGetIdentityError,
                     AgentListIdentitiesError) as ex:
                 logger.debug("Agent auth failed with %s"
@@ -175,20 +206,34 @@ class SSHClient(BaseSSHClient):
                 logger.error("Unknown error during agent authentication - %s", ex)
             else:
                 logger.debug("Authentication with SSH Agent succeeded")
+                self._cache_auth('agent')
                 return
         try:
-            self._identity_auth()
+            identity_file = self._identity_auth()
         except AuthenticationException:
             if self.password is None:
                 raise
             logger.debug("Private key auth failed, trying password")
             self._password_auth()
-
-    def _pkey_auth(self, password=None):
+            self._cache_auth('password')
+        else:
+            self._cache_auth('identity', identity=identity_file)
+
+    def _agent_auth(self):
+        self.session.agent_auth(self.user)
+
+    def _pkey_auth(self, pkey, password=None):
+        passphrase = password if password is not None else ''
+        if self._pkey_cache is not None:
+            self.session.userauth_publickey_frommemory(
+                self.user,
+                self._pkey_cache.get(pkey),
+                passphrase=passphrase)
+            return
         self.session.userauth_publickey_fromfile(
             self.user,
-            self.pkey,
-            passphrase=password if password is not None else '')
+            pkey,
+            passphrase=passphrase)
 
     def _password_auth(self):
         try:
@@ -237,6 +282,23 @@ class SSHClient(BaseSSHClient):
         self._eagain(channel.execute, cmd)
         return channel
 
+    def open_shell(self, encoding='utf-8'):
+        """Open a persistent shell for running commands over a single
+        channel.
+
+        Any output from shell start up, like login messages, is discarded.
+
+        :param encoding: Encoding to use for commands and output.
+        :type encoding: str
+
+        :rtype: :py:class:`pssh.clients.native.shell.PersistentShell`
+        """
+        channel = self.open_session()
+        self._eagain(channel.shell)
+        shell = PersistentShell(self, channel, encoding=encoding)
+        shell.run(':')
+        return shell
+
     def read_stderr(self, channel, timeout=None):
         """Read standard error buffer from channel.
         Returns a generator of line by line output.
@@ -48,7 +48,9 @@ class Tunnel(Thread):
                  num_retries=DEFAULT_RETRIES,
                  retry_delay=RETRY_DELAY,
                  allow_agent=True, timeout=None,
-                 channel_retries=5):
+                 channel_retries=5, _dns_cache=None,
+                 _connect_rate_limiter=None, _socket_options=None,
+                 _source_addresses=None):
         """
         :param host: Remote SSH host to open tunnels with.
         :type host: str
@@ -99,6 +101,10 @@ class Tunnel(Thread):
         self.tunnel_open = Event()
         self._tunnels = []
         self.channel_retries = channel_retries
+        self._dns_cache = _dns_cache
+        self._connect_rate_limiter = _connect_rate_limiter
+        self._socket_options = _socket_options
+        self._source_addresses = _source_addresses
 
     def __del__(self):
         self.cleanup()
@@ -179,7 +185,12 @@ class Tunnel(Thread):
                                 retry_delay=self.retry_delay,
                                 allow_agent=self.allow_agent,
                                 timeout=self.timeout,
-                                _auth_thread_pool=False)
+                                _auth_thread_pool=False,
+                                _dns_cache=self._dns_cache,
+                                _connect_rate_limiter=(
+                                    self._connect_rate_limiter),
+                                _socket_options=self._socket_options,
+                                _source_addresses=self._source_addresses)
         self.session = self.client.session
         self.tunnel_open.set()
 
@@ -256,6 +267,8 @@ class Tunnel(Thread):
                      fw_host, fw_port, forward_addr)
         local_port = forward_addr[1]
         try:
+            if self._connect_rate_limiter is not None:
+                self._connect_rate_limiter.acquire(fw_host)
             channel = self._open_channel_retries(fw_host, fw_port, local_port)
         except Exception as ex:
             logger.exception("Could not establish channel to %s:%s:",
@@ -18,8 +18,8 @@
 import logging
 from gevent.lock import RLock
 
-from .single import SSHClient
-from ..common import _validate_pkey_path
+from .single import SSHClient, _import_pkey
+from ..common import _validate_pkey_path, PKeyCache
 from ..base.parallel import BaseParallelSSHClient
 from ...constants import DEFAULT_RETRIES, RETRY_DELAY
 
@@ -38,7 +38,15 @@ class ParallelSSHClient(BaseParallelSSHClient):
                  gssapi_server_identity=None,
                  gssapi_client_identity=None,
                  gssapi_delegate_credentials=False,
-                 identity_auth=True):
+                 identity_auth=True,
+                 adaptive_concurrency=False, connect_concurrency=None,
+                 auth_concurrency=None, exec_concurrency=None,
+                 max_sessions=None, session_idle_timeout=None,
+                 dns_cache_ttl=None, retry_policy=None, auth_threads=None,
+                 remember_auth=False, auth_cache_file=None,
+                 circuit_breaker=None, session_registry=None,
+                 connect_rate_limiter=None, socket_options=None,
+                 source_addresses=None):
         """
         :param hosts: Hosts to connect to
         :type hosts: list(str)
@@ -116,6 +124,97 @@ class ParallelSSHClient(BaseParallelSSHClient):
         :param gssapi_delegate_credentials: Enable/disable server credentials
           delegation.
         :type gssapi_delegate_credentials: bool
+        :param adaptive_concurrency: (Optional) Set to ``True`` to adapt
+          number of concurrent connection attempts to how well remote hosts
+          are keeping up, starting low and backing off on connection errors
+          and timeouts. ``pool_size`` is then the maximum concurrency. See
+          :py:class:`pssh.clients.base.concurrency.AdaptiveLimiter`. Current
+          limit is available as ``self.connect_limiter.limit``.
+        :type adaptive_concurrency: bool
+        :param connect_concurrency: (Optional) Maximum number of concurrent
+          TCP connection attempts. Defaults to no limit other than
+          ``pool_size``.
+        :type connect_concurrency: int
+        :param auth_concurrency: (Optional) Maximum number of concurrent SSH
+          handshakes and authentications. These are CPU bound - setting this
+          to a small multiple of CPU cores allows ``pool_size`` to be set high
+          so that connecting and executing on other hosts continues while
+          handshakes are queued.
+        :type auth_concurrency: int
+        :param exec_concurrency: (Optional) Maximum number of concurrent
+          channel open and command execution requests.
+        :type exec_concurrency: int
+        :param max_sessions: (Optional) Maximum number of connected clients to
+          keep. Least recently used clients are disconnected once there are
+          more, and reconnected on next use. Must not be lower than
+          ``pool_size``. Clients running commands or copying files, or with
+          command output still referenced, are not disconnected, in which
+          case more clients are kept - when running on more hosts than this,
+          read and release output as it is returned by ``imap_run_command``.
+          Defaults to no limit.
+        :type max_sessions: int
+        :param session_idle_timeout: (Optional) Seconds after last use after
+          which clients are disconnected. Defaults to no idle timeout.
+        :type session_idle_timeout: float
+        :param dns_cache_ttl: (Optional) Resolve all hosts concurrently ahead
+          of connecting and cache their addresses for this many seconds. Hosts
+          that do not resolve fail without retries. Cache is available as
+          ``self.dns_cache`` - see
+          :py:class:`pssh.clients.base.resolver.DNSCache`. Defaults to
+          resolving each host when connecting to it.
+        :type dns_cache_ttl: float
+        :param retry_policy: (Optional) Policy for waiting between and
+          limiting retries of connection and authentication errors, for
+          example :py:class:`pssh.clients.base.retry.ExponentialBackoff`.
+          Hosts give up their pool slot while waiting to retry. Retries and
+          time spent waiting per host are available from
+          ``self.retry_policy.stats()``. Defaults to waiting ``retry_delay``
+          seconds between retries.
+        :type retry_policy: :py:class:`pssh.clients.base.retry.RetryPolicy`
+        :param auth_threads: (Optional) Number of threads of a thread pool
+          dedicated to SSH handshakes and authentication. Queue depth and
+          time spent waiting for a thread are available from
+          ``self.auth_executor.stats()`` - see
+          :py:class:`pssh.clients.base.concurrency.AuthExecutor`. Threads are
+          stopped when the parallel client is deleted. Defaults to sharing
+          gevent's hub thread pool.
+        :type auth_threads: int
+        :param remember_auth: (Optional) Remember which authentication method
+          and identity file succeeded for each host and try it first on
+          subsequent connections, falling back to all methods if it fails.
+          See :py:class:`pssh.clients.base.auth.AuthCache`.
+        :type remember_auth: bool
+        :param auth_cache_file: (Optional) File to load and save remembered
+          authentication methods from and to. Enables ``remember_auth``.
+        :type auth_cache_file: str
+        :param circuit_breaker: (Optional) Circuit breaker for failing hosts
+          that have repeatedly failed to connect straight away with
+          :py:class:`pssh.exceptions.CircuitOpenError` for a cool down period,
+          without connection attempts or retries.
+        :type circuit_breaker:
+          :py:class:`pssh.clients.base.circuit.CircuitBreaker`
+        :param session_registry: (Optional) Registry of connected clients to
+          share with other parallel clients using the same registry. Clients
+          for the same host, port, user and private key are shared and
+          disconnected once no parallel client uses them. Use
+          :py:data:`pssh.clients.base.registry.SESSION_REGISTRY` to share
+          clients process wide. Not used for hosts connected via proxy host.
+        :type session_registry:
+          :py:class:`pssh.clients.base.registry.SessionRegistry`
+        :param connect_rate_limiter: (Optional) Rate limit of new connection
+          attempts, overall and per subnet. Applies to connections via proxy
+          host as well.
+        :type connect_rate_limiter:
+          :py:class:`pssh.clients.base.concurrency.ConnectRateLimiter`
+        :param socket_options: (Optional) Socket options to set on every
+          connection's socket, as list of ``(level, option, value)`` tuples
+          like ``[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]``.
+        :type socket_options: list(tuple)
+        :param source_addresses: (Optional) Local IP addresses to bind
+          connections to, in turn, for more concurrent connections to the
+          same destination than the ephemeral ports of one address allow.
+          See :py:class:`pssh.clients.common.SourceAddressPool`.
+        :type source_addresses: list(str)
 
         :raises: :py:class:`pssh.exceptions.PKeyFileError` on errors finding
           provided private key.
@@ -125,8 +224,21 @@ class ParallelSSHClient(BaseParallelSSHClient):
             allow_agent=allow_agent, num_retries=num_retries,
             timeout=timeout, pool_size=pool_size,
             host_config=host_config, retry_delay=retry_delay,
-            identity_auth=identity_auth)
+            identity_auth=identity_auth,
+            adaptive_concurrency=adaptive_concurrency,
+            connect_concurrency=connect_concurrency,
+            auth_concurrency=auth_concurrency,
+            exec_concurrency=exec_concurrency,
+            max_sessions=max_sessions,
+            session_idle_timeout=session_idle_timeout,
+            dns_cache_ttl=dns_cache_ttl, retry_policy=retry_policy,
+            auth_threads=auth_threads, remember_auth=remember_auth,
+            auth_cache_file=auth_cache_file, circuit_breaker=circuit_breaker,
+            session_registry=session_registry,
+            connect_rate_limiter=connect_rate_limiter,
+            socket_options=socket_options, source_addresses=source_addresses)
         self.pkey = _validate_pkey_path(pkey)
+        self._pkey_cache = PKeyCache(loader=_import_pkey)
         self.forward_ssh_agent = forward_ssh_agent
         self._clients_lock = RLock()
         self.gssapi_auth = gssapi_auth
@@ -137,7 +249,7 @@ class ParallelSSHClient(BaseParallelSSHClient):
     def run_command(self, command, sudo=False, user=None, stop_on_errors=True,
                     use_pty=False, host_args=None, shell=None,
                     encoding='utf-8', timeout=None, greenlet_timeout=None,
-                    return_list=False):
+                    return_list=False, deadline=None):
         """Run command on all hosts in parallel, honoring self.pool_size,
         and return output.
 
@@ -201,6 +313,12 @@ class ParallelSSHClient(BaseParallelSSHClient):
           ``BaseException`` and thus **can not be caught** by
           ``stop_on_errors=False``.
         :type greenlet_timeout: float
+        :param deadline: (Optional) Seconds from now by which all hosts must
+          have connected and started executing. Hosts not started by then
+          are not started and hosts still connecting or executing are
+          stopped, with their host output's ``exception`` set to
+          :py:class:`pssh.exceptions.DeadlineTimeout`.
+        :type deadline: float
         :rtype: Dictionary with host as key and
           :py:class:`pssh.output.HostOutput` as value as per
           :py:func:`pssh.pssh_client.ParallelSSHClient.get_output`
@@ -229,34 +347,55 @@ class ParallelSSHClient(BaseParallelSSHClient):
             self, command, stop_on_errors=stop_on_errors, host_args=host_args,
             user=user, shell=shell, sudo=sudo,
             encoding=encoding, use_pty=use_pty, timeout=timeout,
-            greenlet_timeout=greenlet_timeout, return_list=return_list)
+            greenlet_timeout=greenlet_timeout, return_list=return_list,
+            deadline=deadline)
 
     def _make_ssh_client(self, host_i, host):
         logger.debug(
             "Make client request for host %s, (host_i, host) in clients: %s",
             host, (host_i, host) in self._host_clients)
-        with self._clients_lock:
-            if (host_i, host) not in self._host_clients \
-               or self._host_clients[(host_i, host)] is None:
+        with self._host_lock(host_i, host):
+            _client = self._get_live_client(host_i, host)
+            if _client is None:
                 _user, _port, _password, _pkey = self._get_host_config_values(
                     host)
-                _client = SSHClient(
-                    host, user=_user, password=_password, port=_port,
-                    pkey=_pkey, num_retries=self.num_retries,
-                    timeout=self.timeout,
-                    allow_agent=self.allow_agent, retry_delay=self.retry_delay,
-                    gssapi_auth=self.gssapi_auth,
-                    gssapi_server_identity=self.gssapi_server_identity,
-                    gssapi_client_identity=self.gssapi_client_identity,
-                    gssapi_delegate_credentials=self.gssapi_delegate_credentials,
-                    identity_auth=self.identity_auth,
-                )
+
+                pool_slot = self._pool_slot()
+
+                def _make_client():
+                    with self._circuit_guard(host):
+                        return SSHClient(
+                            host, user=_user, password=_password, port=_port,
+                            pkey=_pkey, num_retries=self.num_retries,
+                            timeout=self.timeout,
+                            allow_agent=self.allow_agent,
+                            retry_delay=self.retry_delay,
+                            gssapi_auth=self.gssapi_auth,
+                            gssapi_server_identity=self.gssapi_server_identity,
+                            gssapi_client_identity=self.gssapi_client_identity,
+                            gssapi_delegate_credentials=(
+                                self.gssapi_delegate_credentials),
+                            identity_auth=self.identity_auth,
+                            _connect_limiter=self.connect_limiter,
+                            _stage_limits=self.stage_limits,
+                            _dns_cache=self.dns_cache,
+                            _retry_policy=self.retry_policy,
+                            _auth_executor=self.auth_executor,
+                            _auth_cache=self.auth_cache,
+                            _pkey_cache=self._pkey_cache,
+                            _connect_rate_limiter=self.connect_rate_limiter,
+                            _socket_options=self.socket_options,
+                            _source_addresses=self.source_addresses,
+                            _pool_slot=pool_slot,
+                        )
+                _client = self._shared_client(
+                    host, _user, _port, _pkey, _make_client)
                 self.host_clients[host] = _client
                 self._host_clients[(host_i, host)] = _client
                 # TODO - Add forward agent functionality
                 # forward_ssh_agent=self.forward_ssh_agent)
                 return _client
-        return self._host_clients[(host_i, host)]
+        return _client
 
     def finished(self, output):
         """Check if commands have finished without blocking
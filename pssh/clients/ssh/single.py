@@ -37,6 +37,11 @@ from ...native._ssh2 import wait_select_ssh as wait_select, eagain_ssh as eagain
 logger = logging.getLogger(__name__)
 
 
+def _import_pkey(pkey, passphrase=None):
+    passphrase = b'' if not passphrase else passphrase
+    return import_privkey_file(pkey, passphrase=passphrase)
+
+
 class SSHClient(BaseSSHClient):
     """ssh-python based non-blocking client."""
 
@@ -51,7 +56,18 @@ class SSHClient(BaseSSHClient):
                  gssapi_server_identity=None,
                  gssapi_client_identity=None,
                  gssapi_delegate_credentials=False,
-                 _auth_thread_pool=True):
+                 _auth_thread_pool=True,
+                 _connect_limiter=None,
+                 _stage_limits=None,
+                 _dns_cache=None,
+                 _retry_policy=None,
+                 _auth_executor=None,
+                 _auth_cache=None,
+                 _pkey_cache=None,
+                 _connect_rate_limiter=None,
+                 _socket_options=None,
+                 _source_addresses=None,
+                 _pool_slot=None):
         """:param host: Host name or IP to connect to.
         :type host: str
         :param user: User to connect as. Defaults to logged in user.
@@ -106,7 +122,18 @@ class SSHClient(BaseSSHClient):
             allow_agent=allow_agent,
             _auth_thread_pool=_auth_thread_pool,
             timeout=timeout,
-            identity_auth=identity_auth)
+            identity_auth=identity_auth,
+            _connect_limiter=_connect_limiter,
+            _stage_limits=_stage_limits,
+            _dns_cache=_dns_cache,
+            _retry_policy=_retry_policy,
+            _auth_executor=_auth_executor,
+            _auth_cache=_auth_cache,
+            _pkey_cache=_pkey_cache,
+            _connect_rate_limiter=_connect_rate_limiter,
+            _socket_options=_socket_options,
+            _source_addresses=_source_addresses,
+            _pool_slot=_pool_slot)
         self._stdout_buffer = BytesIO()
         self._stderr_buffer = BytesIO()
         self._stdout_reader = None
@@ -141,23 +168,19 @@ class SSHClient(BaseSSHClient):
         try:
             self.session.connect()
         except Exception as ex:
-            while retries < self.num_retries:
-                return self._connect_init_retry(retries)
             msg = "Error connecting to host %s:%s - %s"
             logger.error(msg, self.host, self.port, ex)
             ex.host = self.host
             ex.port = self.port
-            raise ex
+            raise self._retryable(ex, retries)
         try:
             self.auth()
         except Exception as ex:
-            while retries < self.num_retries:
-                return self._connect_init_retry(retries)
             msg = "Authentication error while connecting to %s:%s - %s"
             ex = AuthenticationException(msg, self.host, self.port, ex)
             ex.host = self.host
             ex.port = self.port
-            raise ex
+            raise self._retryable(ex, retries)
         logger.debug("Authentication completed successfully - "
                      "setting session to non-blocking mode")
         self.session.set_blocking(0)
@@ -167,9 +190,11 @@ class SSHClient(BaseSSHClient):
             logger.debug(
                 "Proceeding with private key file authentication")
             return self._pkey_auth(self.pkey, self.password)
+        if self._cached_auth():
+            return
         if self.allow_agent:
             try:
-                self.session.userauth_agent(self.user)
+                self._agent_auth()
             except Exception as ex:
                 logger.debug(
                     "Agent auth failed with %s, "
@@ -178,6 +203,7 @@ class SSHClient(BaseSSHClient):
             else:
                 logger.debug(
                     "Authentication with SSH Agent succeeded.")
+                self._cache_auth('agent')
                 return
         if self.gssapi_auth or (self.gssapi_server_identity or self.gssapi_client_identity):
             try:
@@ -189,12 +215,19 @@ class SSHClient(BaseSSHClient):
                     ex)
         if self.identity_auth:
             try:
-                self._identity_auth()
+                identity_file = self._identity_auth()
             except AuthenticationException:
                 if self.password is None:
                     raise
+            else:
+                self._cache_auth('identity', identity=identity_file)
+                return
         logger.debug("Private key auth failed, trying password")
         self._password_auth()
+        self._cache_auth('password')
+
+    def _agent_auth(self):
+        self.session.userauth_agent(self.user)
 
     def _password_auth(self):
         if not self.password:
@@ -205,8 +238,10 @@ class SSHClient(BaseSSHClient):
             raise AuthenticationException("Password authentication failed - %s", ex)
 
     def _pkey_auth(self, pkey, password=None):
-        password = b'' if not password else password
-        pkey = import_privkey_file(pkey, passphrase=password)
+        if self._pkey_cache is not None:
+            pkey = self._pkey_cache.get(pkey, passphrase=password)
+        else:
+            pkey = _import_pkey(pkey, password)
         self.session.userauth_publickey(pkey)
 
     def open_session(self):
@@ -20,3 +20,5 @@
 
 DEFAULT_RETRIES = 3
 RETRY_DELAY = 5
+# Seconds to wait for a connection attempt before also trying next address
+CONNECT_ATTEMPT_DELAY = 0.25
@@ -67,9 +67,24 @@ class Timeout(Exception):
     """Raised on timeout requested and reached"""
 
 
+class DeadlineTimeout(Timeout):
+    """Raised on deadline of parallel client function reached before host
+    finished"""
+
+
 class SCPError(Exception):
     """Raised on errors copying file via SCP"""
 
 
 class PKeyFileError(Exception):
     """Raised on errors finding private key file"""
+
+
+class RollingAbortError(Exception):
+    """Raised for hosts not run on by a rolling run that was stopped due to
+    its failure rate threshold being crossed"""
+
+
+class CircuitOpenError(Exception):
+    """Raised for hosts not connected to because of repeated recent
+    connection failures, until their circuit breaker cool down has passed"""
@@ -1,14 +1,16 @@
-/* Generated by Cython 0.29.21 */
+/* Generated by Cython 0.29.37 */
 
+#ifndef PY_SSIZE_T_CLEAN
 #define PY_SSIZE_T_CLEAN
+#endif /* PY_SSIZE_T_CLEAN */
 #include "Python.h"
 #ifndef Py_PYTHON_H
     #error Python headers needed to compile C extensions, please install development version of Python.
 #elif PY_VERSION_HEX < 0x02060000 || (0x03000000 <= PY_VERSION_HEX && PY_VERSION_HEX < 0x03030000)
     #error Cython requires Python 2.6+ or Python 3.3+.
 #else
-#define CYTHON_ABI "0_29_21"
-#define CYTHON_HEX_VERSION 0x001D15F0
+#define CYTHON_ABI "0_29_37"
+#define CYTHON_HEX_VERSION 0x001D25F0
 #define CYTHON_FUTURE_DIVISION 1
 #include <stddef.h>
 #ifndef offsetof
@@ -47,6 +49,7 @@
   #define CYTHON_COMPILING_IN_PYPY 1
   #define CYTHON_COMPILING_IN_PYSTON 0
   #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 0
   #undef CYTHON_USE_TYPE_SLOTS
   #define CYTHON_USE_TYPE_SLOTS 0
   #undef CYTHON_USE_PYTYPE_LOOKUP
@@ -75,18 +78,26 @@
   #define CYTHON_FAST_THREAD_STATE 0
   #undef CYTHON_FAST_PYCALL
   #define CYTHON_FAST_PYCALL 0
-  #undef CYTHON_PEP489_MULTI_PHASE_INIT
-  #define CYTHON_PEP489_MULTI_PHASE_INIT 0
+  #if PY_VERSION_HEX < 0x03090000
+    #undef CYTHON_PEP489_MULTI_PHASE_INIT
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 0
+  #elif !defined(CYTHON_PEP489_MULTI_PHASE_INIT)
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 1
+  #endif
   #undef CYTHON_USE_TP_FINALIZE
-  #define CYTHON_USE_TP_FINALIZE 0
+  #define CYTHON_USE_TP_FINALIZE (PY_VERSION_HEX >= 0x030400a1 && PYPY_VERSION_NUM >= 0x07030C00)
   #undef CYTHON_USE_DICT_VERSIONS
   #define CYTHON_USE_DICT_VERSIONS 0
   #undef CYTHON_USE_EXC_INFO_STACK
   #define CYTHON_USE_EXC_INFO_STACK 0
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 0
+  #endif
 #elif defined(PYSTON_VERSION)
   #define CYTHON_COMPILING_IN_PYPY 0
   #define CYTHON_COMPILING_IN_PYSTON 1
   #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 0
   #ifndef CYTHON_USE_TYPE_SLOTS
     #define CYTHON_USE_TYPE_SLOTS 1
   #endif
@@ -124,10 +135,59 @@
   #define CYTHON_USE_DICT_VERSIONS 0
   #undef CYTHON_USE_EXC_INFO_STACK
   #define CYTHON_USE_EXC_INFO_STACK 0
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 0
+  #endif
+#elif defined(PY_NOGIL)
+  #define CYTHON_COMPILING_IN_PYPY 0
+  #define CYTHON_COMPILING_IN_PYSTON 0
+  #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 1
+  #ifndef CYTHON_USE_TYPE_SLOTS
+    #define CYTHON_USE_TYPE_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYTYPE_LOOKUP
+  #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #ifndef CYTHON_USE_ASYNC_SLOTS
+    #define CYTHON_USE_ASYNC_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYLIST_INTERNALS
+  #define CYTHON_USE_PYLIST_INTERNALS 0
+  #ifndef CYTHON_USE_UNICODE_INTERNALS
+    #define CYTHON_USE_UNICODE_INTERNALS 1
+  #endif
+  #undef CYTHON_USE_UNICODE_WRITER
+  #define CYTHON_USE_UNICODE_WRITER 0
+  #undef CYTHON_USE_PYLONG_INTERNALS
+  #define CYTHON_USE_PYLONG_INTERNALS 0
+  #ifndef CYTHON_AVOID_BORROWED_REFS
+    #define CYTHON_AVOID_BORROWED_REFS 0
+  #endif
+  #ifndef CYTHON_ASSUME_SAFE_MACROS
+    #define CYTHON_ASSUME_SAFE_MACROS 1
+  #endif
+  #ifndef CYTHON_UNPACK_METHODS
+    #define CYTHON_UNPACK_METHODS 1
+  #endif
+  #undef CYTHON_FAST_THREAD_STATE
+  #define CYTHON_FAST_THREAD_STATE 0
+  #undef CYTHON_FAST_PYCALL
+  #define CYTHON_FAST_PYCALL 0
+  #ifndef CYTHON_PEP489_MULTI_PHASE_INIT
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 1
+  #endif
+  #ifndef CYTHON_USE_TP_FINALIZE
+    #define CYTHON_USE_TP_FINALIZE 1
+  #endif
+  #undef CYTHON_USE_DICT_VERSIONS
+  #define CYTHON_USE_DICT_VERSIONS 0
+  #undef CYTHON_USE_EXC_INFO_STACK
+  #define CYTHON_USE_EXC_INFO_STACK 0
 #else
   #define CYTHON_COMPILING_IN_PYPY 0
   #define CYTHON_COMPILING_IN_PYSTON 0
   #define CYTHON_COMPILING_IN_CPYTHON 1
+  #define CYTHON_COMPILING_IN_NOGIL 0
   #ifndef CYTHON_USE_TYPE_SLOTS
     #define CYTHON_USE_TYPE_SLOTS 1
   #endif
@@ -147,7 +207,7 @@
     #undef CYTHON_USE_PYLONG_INTERNALS
     #define CYTHON_USE_PYLONG_INTERNALS 0
   #elif !defined(CYTHON_USE_PYLONG_INTERNALS)
-    #define CYTHON_USE_PYLONG_INTERNALS 1
+    #define CYTHON_USE_PYLONG_INTERNALS (PY_VERSION_HEX < 0x030C00A5)
   #endif
   #ifndef CYTHON_USE_PYLIST_INTERNALS
     #define CYTHON_USE_PYLIST_INTERNALS 1
@@ -155,7 +215,7 @@
   #ifndef CYTHON_USE_UNICODE_INTERNALS
     #define CYTHON_USE_UNICODE_INTERNALS 1
   #endif
-  #if PY_VERSION_HEX < 0x030300F0
+  #if PY_VERSION_HEX < 0x030300F0 || PY_VERSION_HEX >= 0x030B00A2
     #undef CYTHON_USE_UNICODE_WRITER
     #define CYTHON_USE_UNICODE_WRITER 0
   #elif !defined(CYTHON_USE_UNICODE_WRITER)
@@ -170,11 +230,14 @@
   #ifndef CYTHON_UNPACK_METHODS
     #define CYTHON_UNPACK_METHODS 1
   #endif
-  #ifndef CYTHON_FAST_THREAD_STATE
+  #if PY_VERSION_HEX >= 0x030B00A4
+    #undef CYTHON_FAST_THREAD_STATE
+    #define CYTHON_FAST_THREAD_STATE 0
+  #elif !defined(CYTHON_FAST_THREAD_STATE)
     #define CYTHON_FAST_THREAD_STATE 1
   #endif
   #ifndef CYTHON_FAST_PYCALL
-    #define CYTHON_FAST_PYCALL 1
+    #define CYTHON_FAST_PYCALL (PY_VERSION_HEX < 0x030A0000)
   #endif
   #ifndef CYTHON_PEP489_MULTI_PHASE_INIT
     #define CYTHON_PEP489_MULTI_PHASE_INIT (PY_VERSION_HEX >= 0x03050000)
@@ -183,17 +246,25 @@
     #define CYTHON_USE_TP_FINALIZE (PY_VERSION_HEX >= 0x030400a1)
   #endif
   #ifndef CYTHON_USE_DICT_VERSIONS
-    #define CYTHON_USE_DICT_VERSIONS (PY_VERSION_HEX >= 0x030600B1)
+    #define CYTHON_USE_DICT_VERSIONS ((PY_VERSION_HEX >= 0x030600B1) && (PY_VERSION_HEX < 0x030C00A5))
   #endif
-  #ifndef CYTHON_USE_EXC_INFO_STACK
+  #if PY_VERSION_HEX >= 0x030B00A4
+    #undef CYTHON_USE_EXC_INFO_STACK
+    #define CYTHON_USE_EXC_INFO_STACK 0
+  #elif !defined(CYTHON_USE_EXC_INFO_STACK)
     #define CYTHON_USE_EXC_INFO_STACK (PY_VERSION_HEX >= 0x030700A3)
   #endif
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 1
+  #endif
 #endif
 #if !defined(CYTHON_FAST_PYCCALL)
 #define CYTHON_FAST_PYCCALL  (CYTHON_FAST_PYCALL && PY_VERSION_HEX >= 0x030600B1)
 #endif
 #if CYTHON_USE_PYLONG_INTERNALS
-  #include "longintrepr.h"
+  #if PY_MAJOR_VERSION < 3
+    #include "longintrepr.h"
+  #endif
   #undef SHIFT
   #undef BASE
   #undef MASK
@@ -298,9 +369,6 @@
   #endif
 #endif
 
-#if CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX < 0x02070600 && !defined(Py_OptimizeFlag)
-  #define Py_OptimizeFlag 0
-#endif
 #define __PYX_BUILD_PY_SSIZE_T "n"
 #define CYTHON_FORMAT_SSIZE_T "z"
 #if PY_MAJOR_VERSION < 3
@@ -310,15 +378,79 @@
   #define __Pyx_DefaultClassType PyClass_Type
 #else
   #define __Pyx_BUILTIN_MODULE_NAME "builtins"
-#if PY_VERSION_HEX >= 0x030800A4 && PY_VERSION_HEX < 0x030800B2
-  #define __Pyx_PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)\
-          PyCode_New(a, 0, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)
+  #define __Pyx_DefaultClassType PyType_Type
+#if PY_VERSION_HEX >= 0x030B00A1
+    static CYTHON_INLINE PyCodeObject* __Pyx_PyCode_New(int a, int k, int l, int s, int f,
+                                                    PyObject *code, PyObject *c, PyObject* n, PyObject *v,
+                                                    PyObject *fv, PyObject *cell, PyObject* fn,
+                                                    PyObject *name, int fline, PyObject *lnos) {
+        PyObject *kwds=NULL, *argcount=NULL, *posonlyargcount=NULL, *kwonlyargcount=NULL;
+        PyObject *nlocals=NULL, *stacksize=NULL, *flags=NULL, *replace=NULL, *call_result=NULL, *empty=NULL;
+        const char *fn_cstr=NULL;
+        const char *name_cstr=NULL;
+        PyCodeObject* co=NULL;
+        PyObject *type, *value, *traceback;
+        PyErr_Fetch(&type, &value, &traceback);
+        if (!(kwds=PyDict_New())) goto end;
+        if (!(argcount=PyLong_FromLong(a))) goto end;
+        if (PyDict_SetItemString(kwds, "co_argcount", argcount) != 0) goto end;
+        if (!(posonlyargcount=PyLong_FromLong(0))) goto end;
+        if (PyDict_SetItemString(kwds, "co_posonlyargcount", posonlyargcount) != 0) goto end;
+        if (!(kwonlyargcount=PyLong_FromLong(k))) goto end;
+        if (PyDict_SetItemString(kwds, "co_kwonlyargcount", kwonlyargcount) != 0) goto end;
+        if (!(nlocals=PyLong_FromLong(l))) goto end;
+        if (PyDict_SetItemString(kwds, "co_nlocals", nlocals) != 0) goto end;
+        if (!(stacksize=PyLong_FromLong(s))) goto end;
+        if (PyDict_SetItemString(kwds, "co_stacksize", stacksize) != 0) goto end;
+        if (!(flags=PyLong_FromLong(f))) goto end;
+        if (PyDict_SetItemString(kwds, "co_flags", flags) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_code", code) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_consts", c) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_names", n) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_varnames", v) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_freevars", fv) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_cellvars", cell) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_linetable", lnos) != 0) goto end;
+        if (!(fn_cstr=PyUnicode_AsUTF8AndSize(fn, NULL))) goto end;
+        if (!(name_cstr=PyUnicode_AsUTF8AndSize(name, NULL))) goto end;
+        if (!(co = PyCode_NewEmpty(fn_cstr, name_cstr, fline))) goto end;
+        if (!(replace = PyObject_GetAttrString((PyObject*)co, "replace"))) goto cleanup_code_too;
+        if (!(empty = PyTuple_New(0))) goto cleanup_code_too; // unfortunately __pyx_empty_tuple isn't available here
+        if (!(call_result = PyObject_Call(replace, empty, kwds))) goto cleanup_code_too;
+        Py_XDECREF((PyObject*)co);
+        co = (PyCodeObject*)call_result;
+        call_result = NULL;
+        if (0) {
+            cleanup_code_too:
+            Py_XDECREF((PyObject*)co);
+            co = NULL;
+        }
+        end:
+        Py_XDECREF(kwds);
+        Py_XDECREF(argcount);
+        Py_XDECREF(posonlyargcount);
+        Py_XDECREF(kwonlyargcount);
+        Py_XDECREF(nlocals);
+        Py_XDECREF(stacksize);
+        Py_XDECREF(replace);
+        Py_XDECREF(call_result);
+        Py_XDECREF(empty);
+        if (type) {
+            PyErr_Restore(type, value, traceback);
+        }
+        return co;
+    }
 #else
   #define __Pyx_PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)\
           PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)
 #endif
   #define __Pyx_DefaultClassType PyType_Type
 #endif
+#if PY_VERSION_HEX >= 0x030900F0 && !CYTHON_COMPILING_IN_PYPY
+  #define __Pyx_PyObject_GC_IsFinalized(o) PyObject_GC_IsFinalized(o)
+#else
+  #define __Pyx_PyObject_GC_IsFinalized(o) _PyGC_FINALIZED(o)
+#endif
 #ifndef Py_TPFLAGS_CHECKTYPES
   #define Py_TPFLAGS_CHECKTYPES 0
 #endif
@@ -426,8 +558,12 @@ static CYTHON_INLINE void * PyThread_tss_get(Py_tss_t *key) {
 #endif
 #if PY_VERSION_HEX > 0x03030000 && defined(PyUnicode_KIND)
   #define CYTHON_PEP393_ENABLED 1
-  #define __Pyx_PyUnicode_READY(op)       (likely(PyUnicode_IS_READY(op)) ?\
-                                              0 : _PyUnicode_Ready((PyObject *)(op)))
+  #if PY_VERSION_HEX >= 0x030C0000
+    #define __Pyx_PyUnicode_READY(op)       (0)
+  #else
+    #define __Pyx_PyUnicode_READY(op)       (likely(PyUnicode_IS_READY(op)) ?\
+                                                0 : _PyUnicode_Ready((PyObject *)(op)))
+  #endif
   #define __Pyx_PyUnicode_GET_LENGTH(u)   PyUnicode_GET_LENGTH(u)
   #define __Pyx_PyUnicode_READ_CHAR(u, i) PyUnicode_READ_CHAR(u, i)
   #define __Pyx_PyUnicode_MAX_CHAR_VALUE(u)   PyUnicode_MAX_CHAR_VALUE(u)
@@ -435,10 +571,14 @@ static CYTHON_INLINE void * PyThread_tss_get(Py_tss_t *key) {
   #define __Pyx_PyUnicode_DATA(u)         PyUnicode_DATA(u)
   #define __Pyx_PyUnicode_READ(k, d, i)   PyUnicode_READ(k, d, i)
   #define __Pyx_PyUnicode_WRITE(k, d, i, ch)  PyUnicode_WRITE(k, d, i, ch)
-  #if defined(PyUnicode_IS_READY) && defined(PyUnicode_GET_SIZE)
-  #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != (likely(PyUnicode_IS_READY(u)) ? PyUnicode_GET_LENGTH(u) : PyUnicode_GET_SIZE(u)))
+  #if PY_VERSION_HEX >= 0x030C0000
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != PyUnicode_GET_LENGTH(u))
   #else
-  #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != PyUnicode_GET_LENGTH(u))
+    #if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x03090000
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != (likely(PyUnicode_IS_READY(u)) ? PyUnicode_GET_LENGTH(u) : ((PyCompactUnicodeObject *)(u))->wstr_length))
+    #else
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != (likely(PyUnicode_IS_READY(u)) ? PyUnicode_GET_LENGTH(u) : PyUnicode_GET_SIZE(u)))
+    #endif
   #endif
 #else
   #define CYTHON_PEP393_ENABLED 0
@@ -542,10 +682,10 @@ static CYTHON_INLINE void * PyThread_tss_get(Py_tss_t *key) {
 #if PY_VERSION_HEX < 0x030200A4
   typedef long Py_hash_t;
   #define __Pyx_PyInt_FromHash_t PyInt_FromLong
-  #define __Pyx_PyInt_AsHash_t   PyInt_AsLong
+  #define __Pyx_PyInt_AsHash_t   __Pyx_PyIndex_AsHash_t
 #else
   #define __Pyx_PyInt_FromHash_t PyInt_FromSsize_t
-  #define __Pyx_PyInt_AsHash_t   PyInt_AsSsize_t
+  #define __Pyx_PyInt_AsHash_t   __Pyx_PyIndex_AsSsize_t
 #endif
 #if PY_MAJOR_VERSION >= 3
   #define __Pyx_PyMethod_New(func, self, klass) ((self) ? ((void)(klass), PyMethod_New(func, self)) : __Pyx_NewRef(func))
@@ -570,8 +710,10 @@ static CYTHON_INLINE void * PyThread_tss_get(Py_tss_t *key) {
     } __Pyx_PyAsyncMethodsStruct;
 #endif
 
-#if defined(WIN32) || defined(MS_WINDOWS)
-  #define _USE_MATH_DEFINES
+#if defined(_WIN32) || defined(WIN32) || defined(MS_WINDOWS)
+  #if !defined(_USE_MATH_DEFINES)
+    #define _USE_MATH_DEFINES
+  #endif
 #endif
 #include <math.h>
 #ifdef NAN
@@ -605,6 +747,7 @@ static CYTHON_INLINE float __PYX_NAN() {
 #define __PYX_HAVE__pssh__native___ssh2
 #define __PYX_HAVE_API__pssh__native___ssh2
 /* Early includes */
+#include <string.h>
 #ifdef _OPENMP
 #include <omp.h>
 #endif /* _OPENMP */
@@ -701,6 +844,7 @@ static CYTHON_INLINE PyObject* __Pyx_PyNumber_IntOrLong(PyObject* x);
     (likely(PyTuple_CheckExact(obj)) ? __Pyx_NewRef(obj) : PySequence_Tuple(obj))
 static CYTHON_INLINE Py_ssize_t __Pyx_PyIndex_AsSsize_t(PyObject*);
 static CYTHON_INLINE PyObject * __Pyx_PyInt_FromSize_t(size_t);
+static CYTHON_INLINE Py_hash_t __Pyx_PyIndex_AsHash_t(PyObject*);
 #if CYTHON_ASSUME_SAFE_MACROS
 #define __pyx_PyFloat_AsDouble(x) (PyFloat_CheckExact(x) ? PyFloat_AS_DOUBLE(x) : PyFloat_AsDouble(x))
 #else
@@ -819,22 +963,24 @@ static const char *__pyx_f[] = {
 /*--- Type declarations ---*/
 struct __pyx_obj_4pssh_6native_5_ssh2___pyx_scope_struct___read_output;
 
-/* "pssh/native/_ssh2.pyx":41
+/* "pssh/native/_ssh2.pyx":52
  * 
  * 
  * def _read_output(session, read_func, timeout=None):             # <<<<<<<<<<<<<<
- *     cdef Py_ssize_t _size
- *     cdef bytes _data
+ *     """Read from ``read_func`` and yield output line by line, without line
+ *     separator and trailing whitespace.
  */
 struct __pyx_obj_4pssh_6native_5_ssh2___pyx_scope_struct___read_output {
   PyObject_HEAD
   PyObject *__pyx_v__data;
-  size_t __pyx_v__pos;
+  Py_ssize_t __pyx_v__pos;
   Py_ssize_t __pyx_v__size;
-  Py_ssize_t __pyx_v_linesep;
+  char const *__pyx_v_c_data;
+  char const *__pyx_v_c_remainder;
+  Py_ssize_t __pyx_v_line_end;
+  char const *__pyx_v_linesep;
   PyObject *__pyx_v_read_func;
   PyObject *__pyx_v_remainder;
-  Py_ssize_t __pyx_v_remainder_len;
   PyObject *__pyx_v_session;
   PyObject *__pyx_v_t;
   PyObject *__pyx_v_timeout;
@@ -934,13 +1080,21 @@ static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args,
 #ifndef Py_MEMBER_SIZE
 #define Py_MEMBER_SIZE(type, member) sizeof(((type *)0)->member)
 #endif
+#if CYTHON_FAST_PYCALL
   static size_t __pyx_pyframe_localsplus_offset = 0;
   #include "frameobject.h"
+#if PY_VERSION_HEX >= 0x030b00a6
+  #ifndef Py_BUILD_CORE
+    #define Py_BUILD_CORE 1
+  #endif
+  #include "internal/pycore_frame.h"
+#endif
   #define __Pxy_PyFrame_Initialize_Offsets()\
     ((void)__Pyx_BUILD_ASSERT_EXPR(sizeof(PyFrameObject) == offsetof(PyFrameObject, f_localsplus) + Py_MEMBER_SIZE(PyFrameObject, f_localsplus)),\
      (void)(__pyx_pyframe_localsplus_offset = ((size_t)PyFrame_Type.tp_basicsize) - Py_MEMBER_SIZE(PyFrameObject, f_localsplus)))
   #define __Pyx_PyFrame_GetLocalsplus(frame)\
     (assert(__pyx_pyframe_localsplus_offset), (PyObject **)(((char *)(frame)) + __pyx_pyframe_localsplus_offset))
+#endif // CYTHON_FAST_PYCALL
 #endif
 
 /* PyObjectCall.proto */
@@ -1022,18 +1176,18 @@ static CYTHON_INLINE int __Pyx_object_dict_version_matches(PyObject* obj, PY_UIN
 
 /* GetModuleGlobalName.proto */
 #if CYTHON_USE_DICT_VERSIONS
-#define __Pyx_GetModuleGlobalName(var, name)  {\
+#define __Pyx_GetModuleGlobalName(var, name)  do {\
     static PY_UINT64_T __pyx_dict_version = 0;\
     static PyObject *__pyx_dict_cached_value = NULL;\
     (var) = (likely(__pyx_dict_version == __PYX_GET_DICT_VERSION(__pyx_d))) ?\
         (likely(__pyx_dict_cached_value) ? __Pyx_NewRef(__pyx_dict_cached_value) : __Pyx_GetBuiltinName(name)) :\
         __Pyx__GetModuleGlobalName(name, &__pyx_dict_version, &__pyx_dict_cached_value);\
-}
-#define __Pyx_GetModuleGlobalNameUncached(var, name)  {\
+} while(0)
+#define __Pyx_GetModuleGlobalNameUncached(var, name)  do {\
     PY_UINT64_T __pyx_dict_version;\
     PyObject *__pyx_dict_cached_value;\
     (var) = __Pyx__GetModuleGlobalName(name, &__pyx_dict_version, &__pyx_dict_cached_value);\
-}
+} while(0)
 static PyObject *__Pyx__GetModuleGlobalName(PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value);
 #else
 #define __Pyx_GetModuleGlobalName(var, name)  (var) = __Pyx__GetModuleGlobalName(name)
@@ -1044,6 +1198,14 @@ static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name);
 /* PyObjectCall2Args.proto */
 static CYTHON_UNUSED PyObject* __Pyx_PyObject_Call2Args(PyObject* function, PyObject* arg1, PyObject* arg2);
 
+/* SliceObject.proto */
+#define __Pyx_PyObject_DelSlice(obj, cstart, cstop, py_start, py_stop, py_slice, has_cstart, has_cstop, wraparound)\
+    __Pyx_PyObject_SetSlice(obj, (PyObject*)NULL, cstart, cstop, py_start, py_stop, py_slice, has_cstart, has_cstop, wraparound)
+static CYTHON_INLINE int __Pyx_PyObject_SetSlice(
+        PyObject* obj, PyObject* value, Py_ssize_t cstart, Py_ssize_t cstop,
+        PyObject** py_start, PyObject** py_stop, PyObject** py_slice,
+        int has_cstart, int has_cstop, int wraparound);
+
 /* GetTopmostException.proto */
 #if CYTHON_USE_EXC_INFO_STACK
 static _PyErr_StackItem * __Pyx_PyErr_GetTopmostException(PyThreadState *tstate);
@@ -1204,12 +1366,17 @@ static void __pyx_insert_code_object(int code_line, PyCodeObject* code_object);
 static void __Pyx_AddTraceback(const char *funcname, int c_line,
                                int py_line, const char *filename);
 
-/* CIntToPy.proto */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value);
+/* GCCDiagnostics.proto */
+#if defined(__GNUC__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 6))
+#define __Pyx_HAS_GCC_DIAGNOSTIC
+#endif
 
 /* CIntFromPy.proto */
 static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
 
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value);
+
 /* CIntFromPy.proto */
 static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *);
 
@@ -1251,6 +1418,7 @@ typedef struct {
     PyObject *gi_qualname;
     PyObject *gi_modulename;
     PyObject *gi_code;
+    PyObject *gi_frame;
     int resume_label;
     char is_running;
 } __pyx_CoroutineObject;
@@ -1310,9 +1478,11 @@ static int __Pyx_check_binary_version(void);
 static int __Pyx_InitStrings(__Pyx_StringTabEntry *t);
 
 
+/* Module declarations from 'libc.string' */
+
 /* Module declarations from 'pssh.native._ssh2' */
 static PyTypeObject *__pyx_ptype_4pssh_6native_5_ssh2___pyx_scope_struct___read_output = 0;
-static PyObject *__pyx_v_4pssh_6native_5_ssh2_LINESEP = 0;
+static char __pyx_v_4pssh_6native_5_ssh2_LINESEP;
 static int __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_ERROR_EAGAIN;
 static int __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_SESSION_BLOCK_INBOUND;
 static int __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_SESSION_BLOCK_OUTBOUND;
@@ -1321,21 +1491,19 @@ static int __pyx_v_4pssh_6native_5_ssh2__SSH_WRITE_PENDING;
 static int __pyx_v_4pssh_6native_5_ssh2__SSH_AGAIN;
 static int __pyx_v_4pssh_6native_5_ssh2__POLLIN;
 static int __pyx_v_4pssh_6native_5_ssh2__POLLOUT;
+static CYTHON_INLINE Py_ssize_t __pyx_f_4pssh_6native_5_ssh2__rstrip_end(char const *, Py_ssize_t, Py_ssize_t); /*proto*/
 #define __Pyx_MODULE_NAME "pssh.native._ssh2"
 extern int __pyx_module_is_main_pssh__native___ssh2;
 int __pyx_module_is_main_pssh__native___ssh2 = 0;
 
 /* Implementation of 'pssh.native._ssh2' */
 static const char __pyx_k_t[] = "t";
-static const char __pyx_k__2[] = "";
-static const char __pyx_k__3[] = "\n";
 static const char __pyx_k_rc[] = "rc";
 static const char __pyx_k_pop[] = "pop";
 static const char __pyx_k_pos[] = "_pos";
 static const char __pyx_k_ret[] = "ret";
 static const char __pyx_k_args[] = "args";
 static const char __pyx_k_data[] = "data";
-static const char __pyx_k_find[] = "find";
 static const char __pyx_k_func[] = "func";
 static const char __pyx_k_main[] = "__main__";
 static const char __pyx_k_name[] = "__name__";
@@ -1348,13 +1516,13 @@ static const char __pyx_k_close[] = "close";
 static const char __pyx_k_start[] = "start";
 static const char __pyx_k_throw[] = "throw";
 static const char __pyx_k_POLLIN[] = "POLLIN";
+static const char __pyx_k_c_data[] = "c_data";
 static const char __pyx_k_data_2[] = "_data";
 static const char __pyx_k_events[] = "events";
 static const char __pyx_k_gevent[] = "gevent";
 static const char __pyx_k_import[] = "__import__";
 static const char __pyx_k_kwargs[] = "kwargs";
 static const char __pyx_k_poller[] = "poller";
-static const char __pyx_k_rstrip[] = "rstrip";
 static const char __pyx_k_socket[] = "_socket";
 static const char __pyx_k_POLLOUT[] = "POLLOUT";
 static const char __pyx_k_Timeout[] = "Timeout";
@@ -1363,6 +1531,7 @@ static const char __pyx_k_session[] = "session";
 static const char __pyx_k_timeout[] = "timeout";
 static const char __pyx_k_GTimeout[] = "GTimeout";
 static const char __pyx_k_data_len[] = "data_len";
+static const char __pyx_k_line_end[] = "line_end";
 static const char __pyx_k_register[] = "register";
 static const char __pyx_k_SSH_AGAIN[] = "SSH_AGAIN";
 static const char __pyx_k_eventmask[] = "eventmask";
@@ -1372,6 +1541,7 @@ static const char __pyx_k_directions[] = "directions";
 static const char __pyx_k_eagain_ssh[] = "eagain_ssh";
 static const char __pyx_k_exceptions[] = "exceptions";
 static const char __pyx_k_write_func[] = "write_func";
+static const char __pyx_k_c_remainder[] = "c_remainder";
 static const char __pyx_k_read_output[] = "_read_output";
 static const char __pyx_k_ssh_session[] = "ssh.session";
 static const char __pyx_k_wait_select[] = "wait_select";
@@ -1379,7 +1549,6 @@ static const char __pyx_k_eagain_write[] = "eagain_write";
 static const char __pyx_k_ssh2_session[] = "ssh2.session";
 static const char __pyx_k_bytes_written[] = "bytes_written";
 static const char __pyx_k_gevent_select[] = "gevent.select";
-static const char __pyx_k_remainder_len[] = "remainder_len";
 static const char __pyx_k_total_written[] = "total_written";
 static const char __pyx_k_get_poll_flags[] = "get_poll_flags";
 static const char __pyx_k_ssh_error_codes[] = "ssh.error_codes";
@@ -1405,11 +1574,11 @@ static PyObject *__pyx_n_s_SSH_AGAIN;
 static PyObject *__pyx_n_s_SSH_READ_PENDING;
 static PyObject *__pyx_n_s_SSH_WRITE_PENDING;
 static PyObject *__pyx_n_s_Timeout;
-static PyObject *__pyx_kp_b__2;
-static PyObject *__pyx_kp_b__3;
 static PyObject *__pyx_n_s_args;
 static PyObject *__pyx_n_s_block_directions;
 static PyObject *__pyx_n_s_bytes_written;
+static PyObject *__pyx_n_s_c_data;
+static PyObject *__pyx_n_s_c_remainder;
 static PyObject *__pyx_n_s_cline_in_traceback;
 static PyObject *__pyx_n_s_close;
 static PyObject *__pyx_n_s_data;
@@ -1421,13 +1590,13 @@ static PyObject *__pyx_n_s_eagain_write;
 static PyObject *__pyx_n_s_eventmask;
 static PyObject *__pyx_n_s_events;
 static PyObject *__pyx_n_s_exceptions;
-static PyObject *__pyx_n_s_find;
 static PyObject *__pyx_n_s_func;
 static PyObject *__pyx_n_s_get_poll_flags;
 static PyObject *__pyx_n_s_gevent;
 static PyObject *__pyx_n_s_gevent_select;
 static PyObject *__pyx_n_s_import;
 static PyObject *__pyx_n_s_kwargs;
+static PyObject *__pyx_n_s_line_end;
 static PyObject *__pyx_n_s_linesep;
 static PyObject *__pyx_n_s_main;
 static PyObject *__pyx_n_s_name;
@@ -1442,9 +1611,7 @@ static PyObject *__pyx_n_s_read_func;
 static PyObject *__pyx_n_s_read_output;
 static PyObject *__pyx_n_s_register;
 static PyObject *__pyx_n_s_remainder;
-static PyObject *__pyx_n_s_remainder_len;
 static PyObject *__pyx_n_s_ret;
-static PyObject *__pyx_n_s_rstrip;
 static PyObject *__pyx_n_s_send;
 static PyObject *__pyx_n_s_session;
 static PyObject *__pyx_n_s_size;
@@ -1474,29 +1641,107 @@ static __Pyx_CachedCFunction __pyx_umethod_PyDict_Type_pop = {0, &__pyx_n_s_pop,
 static PyObject *__pyx_int_0;
 static PyObject *__pyx_int_1000;
 static PyObject *__pyx_codeobj_;
-static PyObject *__pyx_tuple__4;
+static PyObject *__pyx_tuple__2;
+static PyObject *__pyx_tuple__3;
 static PyObject *__pyx_tuple__5;
 static PyObject *__pyx_tuple__7;
 static PyObject *__pyx_tuple__9;
-static PyObject *__pyx_tuple__11;
+static PyObject *__pyx_codeobj__4;
 static PyObject *__pyx_codeobj__6;
 static PyObject *__pyx_codeobj__8;
 static PyObject *__pyx_codeobj__10;
-static PyObject *__pyx_codeobj__12;
 /* Late includes */
+
+/* "pssh/native/_ssh2.pyx":43
+ * 
+ * 
+ * cdef inline Py_ssize_t _rstrip_end(const char *data, Py_ssize_t start,             # <<<<<<<<<<<<<<
+ *                                    Py_ssize_t end) nogil:
+ *     """End of data between start and end without trailing whitespace, as
+ */
+
+static CYTHON_INLINE Py_ssize_t __pyx_f_4pssh_6native_5_ssh2__rstrip_end(char const *__pyx_v_data, Py_ssize_t __pyx_v_start, Py_ssize_t __pyx_v_end) {
+  Py_ssize_t __pyx_r;
+  int __pyx_t_1;
+  int __pyx_t_2;
+  char __pyx_t_3;
+  int __pyx_t_4;
+
+  /* "pssh/native/_ssh2.pyx":47
+ *     """End of data between start and end without trailing whitespace, as
+ *     per ``bytes.rstrip``"""
+ *     while end > start and (data[end - 1] == 32 or 9 <= data[end - 1] <= 13):             # <<<<<<<<<<<<<<
+ *         end -= 1
+ *     return end
+ */
+  while (1) {
+    __pyx_t_2 = ((__pyx_v_end > __pyx_v_start) != 0);
+    if (__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L5_bool_binop_done;
+    }
+    __pyx_t_2 = (((__pyx_v_data[(__pyx_v_end - 1)]) == 32) != 0);
+    if (!__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L5_bool_binop_done;
+    }
+    __pyx_t_3 = (__pyx_v_data[(__pyx_v_end - 1)]);
+    __pyx_t_2 = (9 <= __pyx_t_3);
+    if (__pyx_t_2) {
+      __pyx_t_2 = (__pyx_t_3 <= 13);
+    }
+    __pyx_t_4 = (__pyx_t_2 != 0);
+    __pyx_t_1 = __pyx_t_4;
+    __pyx_L5_bool_binop_done:;
+    if (!__pyx_t_1) break;
+
+    /* "pssh/native/_ssh2.pyx":48
+ *     per ``bytes.rstrip``"""
+ *     while end > start and (data[end - 1] == 32 or 9 <= data[end - 1] <= 13):
+ *         end -= 1             # <<<<<<<<<<<<<<
+ *     return end
+ * 
+ */
+    __pyx_v_end = (__pyx_v_end - 1);
+  }
+
+  /* "pssh/native/_ssh2.pyx":49
+ *     while end > start and (data[end - 1] == 32 or 9 <= data[end - 1] <= 13):
+ *         end -= 1
+ *     return end             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_r = __pyx_v_end;
+  goto __pyx_L0;
+
+  /* "pssh/native/_ssh2.pyx":43
+ * 
+ * 
+ * cdef inline Py_ssize_t _rstrip_end(const char *data, Py_ssize_t start,             # <<<<<<<<<<<<<<
+ *                                    Py_ssize_t end) nogil:
+ *     """End of data between start and end without trailing whitespace, as
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  return __pyx_r;
+}
 static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject *__pyx_generator, CYTHON_UNUSED PyThreadState *__pyx_tstate, PyObject *__pyx_sent_value); /* proto */
 
-/* "pssh/native/_ssh2.pyx":41
+/* "pssh/native/_ssh2.pyx":52
  * 
  * 
  * def _read_output(session, read_func, timeout=None):             # <<<<<<<<<<<<<<
- *     cdef Py_ssize_t _size
- *     cdef bytes _data
+ *     """Read from ``read_func`` and yield output line by line, without line
+ *     separator and trailing whitespace.
  */
 
 /* Python wrapper */
 static PyObject *__pyx_pw_4pssh_6native_5_ssh2_1_read_output(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
-static char __pyx_doc_4pssh_6native_5_ssh2__read_output[] = "_read_output(session, read_func, timeout=None)";
+static char __pyx_doc_4pssh_6native_5_ssh2__read_output[] = "_read_output(session, read_func, timeout=None)\nRead from ``read_func`` and yield output line by line, without line\n    separator and trailing whitespace.\n\n    Line separators are found with ``memchr`` directly on data read and each\n    line is copied once, into the bytes object yielded. Lines spanning reads\n    are collected in a buffer that is reused for the whole output.\n    ";
 static PyMethodDef __pyx_mdef_4pssh_6native_5_ssh2_1_read_output = {"_read_output", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_4pssh_6native_5_ssh2_1_read_output, METH_VARARGS|METH_KEYWORDS, __pyx_doc_4pssh_6native_5_ssh2__read_output};
 static PyObject *__pyx_pw_4pssh_6native_5_ssh2_1_read_output(PyObject *__pyx_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
   PyObject *__pyx_v_session = 0;
@@ -1534,7 +1779,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_1_read_output(PyObject *__pyx_sel
         case  1:
         if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_read_func)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("_read_output", 0, 2, 3, 1); __PYX_ERR(0, 41, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("_read_output", 0, 2, 3, 1); __PYX_ERR(0, 52, __pyx_L3_error)
         }
         CYTHON_FALLTHROUGH;
         case  2:
@@ -1544,7 +1789,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_1_read_output(PyObject *__pyx_sel
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_read_output") < 0)) __PYX_ERR(0, 41, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "_read_output") < 0)) __PYX_ERR(0, 52, __pyx_L3_error)
       }
     } else {
       switch (PyTuple_GET_SIZE(__pyx_args)) {
@@ -1562,7 +1807,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_1_read_output(PyObject *__pyx_sel
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("_read_output", 0, 2, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 41, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("_read_output", 0, 2, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 52, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("pssh.native._ssh2._read_output", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
@@ -1587,7 +1832,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2__read_output(CYTHON_UNUSED PyObje
   if (unlikely(!__pyx_cur_scope)) {
     __pyx_cur_scope = ((struct __pyx_obj_4pssh_6native_5_ssh2___pyx_scope_struct___read_output *)Py_None);
     __Pyx_INCREF(Py_None);
-    __PYX_ERR(0, 41, __pyx_L1_error)
+    __PYX_ERR(0, 52, __pyx_L1_error)
   } else {
     __Pyx_GOTREF(__pyx_cur_scope);
   }
@@ -1601,7 +1846,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2__read_output(CYTHON_UNUSED PyObje
   __Pyx_INCREF(__pyx_cur_scope->__pyx_v_timeout);
   __Pyx_GIVEREF(__pyx_cur_scope->__pyx_v_timeout);
   {
-    __pyx_CoroutineObject *gen = __Pyx_Generator_New((__pyx_coroutine_body_t) __pyx_gb_4pssh_6native_5_ssh2_2generator, __pyx_codeobj_, (PyObject *) __pyx_cur_scope, __pyx_n_s_read_output, __pyx_n_s_read_output, __pyx_n_s_pssh_native__ssh2); if (unlikely(!gen)) __PYX_ERR(0, 41, __pyx_L1_error)
+    __pyx_CoroutineObject *gen = __Pyx_Generator_New((__pyx_coroutine_body_t) __pyx_gb_4pssh_6native_5_ssh2_2generator, __pyx_codeobj_, (PyObject *) __pyx_cur_scope, __pyx_n_s_read_output, __pyx_n_s_read_output, __pyx_n_s_pssh_native__ssh2); if (unlikely(!gen)) __PYX_ERR(0, 52, __pyx_L1_error)
     __Pyx_DECREF(__pyx_cur_scope);
     __Pyx_RefNannyFinishContext();
     return (PyObject *) gen;
@@ -1633,12 +1878,13 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
   int __pyx_t_10;
   int __pyx_t_11;
   int __pyx_t_12;
-  PyObject *__pyx_t_13 = NULL;
-  int __pyx_t_14;
-  char const *__pyx_t_15;
-  PyObject *__pyx_t_16 = NULL;
+  char const *__pyx_t_13;
+  char const *__pyx_t_14;
+  int __pyx_t_15;
+  char const *__pyx_t_16;
   PyObject *__pyx_t_17 = NULL;
   PyObject *__pyx_t_18 = NULL;
+  PyObject *__pyx_t_19 = NULL;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
@@ -1654,40 +1900,24 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
     return NULL;
   }
   __pyx_L3_first_run:;
-  if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 41, __pyx_L1_error)
-
-  /* "pssh/native/_ssh2.pyx":44
- *     cdef Py_ssize_t _size
- *     cdef bytes _data
- *     cdef bytes remainder = b""             # <<<<<<<<<<<<<<
- *     cdef Py_ssize_t remainder_len = 0
- *     cdef size_t _pos = 0
- */
-  __Pyx_INCREF(__pyx_kp_b__2);
-  __Pyx_GIVEREF(__pyx_kp_b__2);
-  __pyx_cur_scope->__pyx_v_remainder = __pyx_kp_b__2;
-
-  /* "pssh/native/_ssh2.pyx":45
- *     cdef bytes _data
- *     cdef bytes remainder = b""
- *     cdef Py_ssize_t remainder_len = 0             # <<<<<<<<<<<<<<
- *     cdef size_t _pos = 0
- *     cdef Py_ssize_t linesep
- */
-  __pyx_cur_scope->__pyx_v_remainder_len = 0;
-
-  /* "pssh/native/_ssh2.pyx":46
- *     cdef bytes remainder = b""
- *     cdef Py_ssize_t remainder_len = 0
- *     cdef size_t _pos = 0             # <<<<<<<<<<<<<<
- *     cdef Py_ssize_t linesep
- *     _size, _data = read_func()
+  if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 52, __pyx_L1_error)
+
+  /* "pssh/native/_ssh2.pyx":65
+ *     cdef const char *linesep
+ *     cdef const char *c_remainder
+ *     cdef bytearray remainder = bytearray()             # <<<<<<<<<<<<<<
+ *     cdef Py_ssize_t _pos
+ *     cdef Py_ssize_t line_end
  */
-  __pyx_cur_scope->__pyx_v__pos = 0;
+  __pyx_t_1 = __Pyx_PyObject_CallNoArg(((PyObject *)(&PyByteArray_Type))); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 65, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_GIVEREF(__pyx_t_1);
+  __pyx_cur_scope->__pyx_v_remainder = ((PyObject*)__pyx_t_1);
+  __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":48
- *     cdef size_t _pos = 0
- *     cdef Py_ssize_t linesep
+  /* "pssh/native/_ssh2.pyx":68
+ *     cdef Py_ssize_t _pos
+ *     cdef Py_ssize_t line_end
  *     _size, _data = read_func()             # <<<<<<<<<<<<<<
  *     t = GTimeout(timeout)
  *     t.start()
@@ -1705,7 +1935,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
   }
   __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_2);
   __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 48, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 68, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   if ((likely(PyTuple_CheckExact(__pyx_t_1))) || (PyList_CheckExact(__pyx_t_1))) {
@@ -1714,7 +1944,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
     if (unlikely(size != 2)) {
       if (size > 2) __Pyx_RaiseTooManyValuesError(2);
       else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
-      __PYX_ERR(0, 48, __pyx_L1_error)
+      __PYX_ERR(0, 68, __pyx_L1_error)
     }
     #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
     if (likely(PyTuple_CheckExact(sequence))) {
@@ -1727,15 +1957,15 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
     __Pyx_INCREF(__pyx_t_2);
     __Pyx_INCREF(__pyx_t_3);
     #else
-    __pyx_t_2 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 48, __pyx_L1_error)
+    __pyx_t_2 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 68, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_2);
-    __pyx_t_3 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 48, __pyx_L1_error)
+    __pyx_t_3 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 68, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_3);
     #endif
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   } else {
     Py_ssize_t index = -1;
-    __pyx_t_4 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 48, __pyx_L1_error)
+    __pyx_t_4 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 68, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_4);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     __pyx_t_5 = Py_TYPE(__pyx_t_4)->tp_iternext;
@@ -1743,7 +1973,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
     __Pyx_GOTREF(__pyx_t_2);
     index = 1; __pyx_t_3 = __pyx_t_5(__pyx_t_4); if (unlikely(!__pyx_t_3)) goto __pyx_L4_unpacking_failed;
     __Pyx_GOTREF(__pyx_t_3);
-    if (__Pyx_IternextUnpackEndCheck(__pyx_t_5(__pyx_t_4), 2) < 0) __PYX_ERR(0, 48, __pyx_L1_error)
+    if (__Pyx_IternextUnpackEndCheck(__pyx_t_5(__pyx_t_4), 2) < 0) __PYX_ERR(0, 68, __pyx_L1_error)
     __pyx_t_5 = NULL;
     __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
     goto __pyx_L5_unpacking_done;
@@ -1751,25 +1981,25 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
     __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
     __pyx_t_5 = NULL;
     if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
-    __PYX_ERR(0, 48, __pyx_L1_error)
+    __PYX_ERR(0, 68, __pyx_L1_error)
     __pyx_L5_unpacking_done:;
   }
-  __pyx_t_6 = __Pyx_PyIndex_AsSsize_t(__pyx_t_2); if (unlikely((__pyx_t_6 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 48, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyIndex_AsSsize_t(__pyx_t_2); if (unlikely((__pyx_t_6 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 68, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  if (!(likely(PyBytes_CheckExact(__pyx_t_3))||((__pyx_t_3) == Py_None)||(PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "bytes", Py_TYPE(__pyx_t_3)->tp_name), 0))) __PYX_ERR(0, 48, __pyx_L1_error)
+  if (!(likely(PyBytes_CheckExact(__pyx_t_3))||((__pyx_t_3) == Py_None)||((void)PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "bytes", Py_TYPE(__pyx_t_3)->tp_name), 0))) __PYX_ERR(0, 68, __pyx_L1_error)
   __pyx_cur_scope->__pyx_v__size = __pyx_t_6;
   __Pyx_GIVEREF(__pyx_t_3);
   __pyx_cur_scope->__pyx_v__data = ((PyObject*)__pyx_t_3);
   __pyx_t_3 = 0;
 
-  /* "pssh/native/_ssh2.pyx":49
- *     cdef Py_ssize_t linesep
+  /* "pssh/native/_ssh2.pyx":69
+ *     cdef Py_ssize_t line_end
  *     _size, _data = read_func()
  *     t = GTimeout(timeout)             # <<<<<<<<<<<<<<
  *     t.start()
  *     try:
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_GTimeout); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 49, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_GTimeout); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 69, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
   __pyx_t_2 = NULL;
   if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_3))) {
@@ -1783,21 +2013,21 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
   }
   __pyx_t_1 = (__pyx_t_2) ? __Pyx_PyObject_Call2Args(__pyx_t_3, __pyx_t_2, __pyx_cur_scope->__pyx_v_timeout) : __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_cur_scope->__pyx_v_timeout);
   __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 49, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 69, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_GIVEREF(__pyx_t_1);
   __pyx_cur_scope->__pyx_v_t = __pyx_t_1;
   __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":50
+  /* "pssh/native/_ssh2.pyx":70
  *     _size, _data = read_func()
  *     t = GTimeout(timeout)
  *     t.start()             # <<<<<<<<<<<<<<
  *     try:
  *         while _size == _LIBSSH2_ERROR_EAGAIN or _size > 0:
  */
-  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_cur_scope->__pyx_v_t, __pyx_n_s_start); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 50, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_cur_scope->__pyx_v_t, __pyx_n_s_start); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 70, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
   __pyx_t_2 = NULL;
   if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_3))) {
@@ -1811,12 +2041,12 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
   }
   __pyx_t_1 = (__pyx_t_2) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_2) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
   __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 50, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 70, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":51
+  /* "pssh/native/_ssh2.pyx":71
  *     t = GTimeout(timeout)
  *     t.start()
  *     try:             # <<<<<<<<<<<<<<
@@ -1831,7 +2061,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
       __Pyx_XGOTREF(__pyx_t_9);
       /*try:*/ {
 
-        /* "pssh/native/_ssh2.pyx":52
+        /* "pssh/native/_ssh2.pyx":72
  *     t.start()
  *     try:
  *         while _size == _LIBSSH2_ERROR_EAGAIN or _size > 0:             # <<<<<<<<<<<<<<
@@ -1850,7 +2080,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
           __pyx_L17_bool_binop_done:;
           if (!__pyx_t_10) break;
 
-          /* "pssh/native/_ssh2.pyx":53
+          /* "pssh/native/_ssh2.pyx":73
  *     try:
  *         while _size == _LIBSSH2_ERROR_EAGAIN or _size > 0:
  *             if _size == _LIBSSH2_ERROR_EAGAIN:             # <<<<<<<<<<<<<<
@@ -1860,14 +2090,14 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
           __pyx_t_10 = ((__pyx_cur_scope->__pyx_v__size == __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_ERROR_EAGAIN) != 0);
           if (__pyx_t_10) {
 
-            /* "pssh/native/_ssh2.pyx":54
+            /* "pssh/native/_ssh2.pyx":74
  *         while _size == _LIBSSH2_ERROR_EAGAIN or _size > 0:
  *             if _size == _LIBSSH2_ERROR_EAGAIN:
  *                 wait_select(session, timeout)             # <<<<<<<<<<<<<<
  *                 _size, _data = read_func()
  *             while _size > 0:
  */
-            __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_wait_select); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 54, __pyx_L9_error)
+            __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_wait_select); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 74, __pyx_L9_error)
             __Pyx_GOTREF(__pyx_t_3);
             __pyx_t_2 = NULL;
             __pyx_t_12 = 0;
@@ -1884,7 +2114,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
             #if CYTHON_FAST_PYCALL
             if (PyFunction_Check(__pyx_t_3)) {
               PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_cur_scope->__pyx_v_session, __pyx_cur_scope->__pyx_v_timeout};
-              __pyx_t_1 = __Pyx_PyFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 54, __pyx_L9_error)
+              __pyx_t_1 = __Pyx_PyFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 74, __pyx_L9_error)
               __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
               __Pyx_GOTREF(__pyx_t_1);
             } else
@@ -1892,13 +2122,13 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
             #if CYTHON_FAST_PYCCALL
             if (__Pyx_PyFastCFunction_Check(__pyx_t_3)) {
               PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_cur_scope->__pyx_v_session, __pyx_cur_scope->__pyx_v_timeout};
-              __pyx_t_1 = __Pyx_PyCFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 54, __pyx_L9_error)
+              __pyx_t_1 = __Pyx_PyCFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 74, __pyx_L9_error)
               __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
               __Pyx_GOTREF(__pyx_t_1);
             } else
             #endif
             {
-              __pyx_t_4 = PyTuple_New(2+__pyx_t_12); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 54, __pyx_L9_error)
+              __pyx_t_4 = PyTuple_New(2+__pyx_t_12); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 74, __pyx_L9_error)
               __Pyx_GOTREF(__pyx_t_4);
               if (__pyx_t_2) {
                 __Pyx_GIVEREF(__pyx_t_2); PyTuple_SET_ITEM(__pyx_t_4, 0, __pyx_t_2); __pyx_t_2 = NULL;
@@ -1909,19 +2139,19 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
               __Pyx_INCREF(__pyx_cur_scope->__pyx_v_timeout);
               __Pyx_GIVEREF(__pyx_cur_scope->__pyx_v_timeout);
               PyTuple_SET_ITEM(__pyx_t_4, 1+__pyx_t_12, __pyx_cur_scope->__pyx_v_timeout);
-              __pyx_t_1 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_4, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 54, __pyx_L9_error)
+              __pyx_t_1 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_4, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 74, __pyx_L9_error)
               __Pyx_GOTREF(__pyx_t_1);
               __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
             }
             __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
             __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-            /* "pssh/native/_ssh2.pyx":55
+            /* "pssh/native/_ssh2.pyx":75
  *             if _size == _LIBSSH2_ERROR_EAGAIN:
  *                 wait_select(session, timeout)
  *                 _size, _data = read_func()             # <<<<<<<<<<<<<<
  *             while _size > 0:
- *                 while _pos < _size:
+ *                 c_data = _data
  */
             __Pyx_INCREF(__pyx_cur_scope->__pyx_v_read_func);
             __pyx_t_3 = __pyx_cur_scope->__pyx_v_read_func; __pyx_t_4 = NULL;
@@ -1936,7 +2166,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
             }
             __pyx_t_1 = (__pyx_t_4) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_4) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
             __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
-            if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 55, __pyx_L9_error)
+            if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 75, __pyx_L9_error)
             __Pyx_GOTREF(__pyx_t_1);
             __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
             if ((likely(PyTuple_CheckExact(__pyx_t_1))) || (PyList_CheckExact(__pyx_t_1))) {
@@ -1945,7 +2175,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
               if (unlikely(size != 2)) {
                 if (size > 2) __Pyx_RaiseTooManyValuesError(2);
                 else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
-                __PYX_ERR(0, 55, __pyx_L9_error)
+                __PYX_ERR(0, 75, __pyx_L9_error)
               }
               #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
               if (likely(PyTuple_CheckExact(sequence))) {
@@ -1958,15 +2188,15 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
               __Pyx_INCREF(__pyx_t_3);
               __Pyx_INCREF(__pyx_t_4);
               #else
-              __pyx_t_3 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 55, __pyx_L9_error)
+              __pyx_t_3 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 75, __pyx_L9_error)
               __Pyx_GOTREF(__pyx_t_3);
-              __pyx_t_4 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 55, __pyx_L9_error)
+              __pyx_t_4 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 75, __pyx_L9_error)
               __Pyx_GOTREF(__pyx_t_4);
               #endif
               __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
             } else {
               Py_ssize_t index = -1;
-              __pyx_t_2 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 55, __pyx_L9_error)
+              __pyx_t_2 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 75, __pyx_L9_error)
               __Pyx_GOTREF(__pyx_t_2);
               __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
               __pyx_t_5 = Py_TYPE(__pyx_t_2)->tp_iternext;
@@ -1974,7 +2204,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
               __Pyx_GOTREF(__pyx_t_3);
               index = 1; __pyx_t_4 = __pyx_t_5(__pyx_t_2); if (unlikely(!__pyx_t_4)) goto __pyx_L20_unpacking_failed;
               __Pyx_GOTREF(__pyx_t_4);
-              if (__Pyx_IternextUnpackEndCheck(__pyx_t_5(__pyx_t_2), 2) < 0) __PYX_ERR(0, 55, __pyx_L9_error)
+              if (__Pyx_IternextUnpackEndCheck(__pyx_t_5(__pyx_t_2), 2) < 0) __PYX_ERR(0, 75, __pyx_L9_error)
               __pyx_t_5 = NULL;
               __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
               goto __pyx_L21_unpacking_done;
@@ -1982,19 +2212,19 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
               __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
               __pyx_t_5 = NULL;
               if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
-              __PYX_ERR(0, 55, __pyx_L9_error)
+              __PYX_ERR(0, 75, __pyx_L9_error)
               __pyx_L21_unpacking_done:;
             }
-            __pyx_t_6 = __Pyx_PyIndex_AsSsize_t(__pyx_t_3); if (unlikely((__pyx_t_6 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 55, __pyx_L9_error)
+            __pyx_t_6 = __Pyx_PyIndex_AsSsize_t(__pyx_t_3); if (unlikely((__pyx_t_6 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 75, __pyx_L9_error)
             __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-            if (!(likely(PyBytes_CheckExact(__pyx_t_4))||((__pyx_t_4) == Py_None)||(PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "bytes", Py_TYPE(__pyx_t_4)->tp_name), 0))) __PYX_ERR(0, 55, __pyx_L9_error)
+            if (!(likely(PyBytes_CheckExact(__pyx_t_4))||((__pyx_t_4) == Py_None)||((void)PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "bytes", Py_TYPE(__pyx_t_4)->tp_name), 0))) __PYX_ERR(0, 75, __pyx_L9_error)
             __pyx_cur_scope->__pyx_v__size = __pyx_t_6;
             __Pyx_GOTREF(__pyx_cur_scope->__pyx_v__data);
             __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v__data, ((PyObject*)__pyx_t_4));
             __Pyx_GIVEREF(__pyx_t_4);
             __pyx_t_4 = 0;
 
-            /* "pssh/native/_ssh2.pyx":53
+            /* "pssh/native/_ssh2.pyx":73
  *     try:
  *         while _size == _LIBSSH2_ERROR_EAGAIN or _size > 0:
  *             if _size == _LIBSSH2_ERROR_EAGAIN:             # <<<<<<<<<<<<<<
@@ -2003,440 +2233,366 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
  */
           }
 
-          /* "pssh/native/_ssh2.pyx":56
+          /* "pssh/native/_ssh2.pyx":76
  *                 wait_select(session, timeout)
  *                 _size, _data = read_func()
  *             while _size > 0:             # <<<<<<<<<<<<<<
- *                 while _pos < _size:
- *                     linesep = _data[:_size].find(LINESEP, _pos)
+ *                 c_data = _data
+ *                 _pos = 0
  */
           while (1) {
             __pyx_t_10 = ((__pyx_cur_scope->__pyx_v__size > 0) != 0);
             if (!__pyx_t_10) break;
 
-            /* "pssh/native/_ssh2.pyx":57
+            /* "pssh/native/_ssh2.pyx":77
  *                 _size, _data = read_func()
  *             while _size > 0:
+ *                 c_data = _data             # <<<<<<<<<<<<<<
+ *                 _pos = 0
+ *                 while _pos < _size:
+ */
+            if (unlikely(__pyx_cur_scope->__pyx_v__data == Py_None)) {
+              PyErr_SetString(PyExc_TypeError, "expected bytes, NoneType found");
+              __PYX_ERR(0, 77, __pyx_L9_error)
+            }
+            __pyx_t_13 = __Pyx_PyBytes_AsString(__pyx_cur_scope->__pyx_v__data); if (unlikely((!__pyx_t_13) && PyErr_Occurred())) __PYX_ERR(0, 77, __pyx_L9_error)
+            __pyx_cur_scope->__pyx_v_c_data = __pyx_t_13;
+
+            /* "pssh/native/_ssh2.pyx":78
+ *             while _size > 0:
+ *                 c_data = _data
+ *                 _pos = 0             # <<<<<<<<<<<<<<
+ *                 while _pos < _size:
+ *                     linesep = <const char *>memchr(
+ */
+            __pyx_cur_scope->__pyx_v__pos = 0;
+
+            /* "pssh/native/_ssh2.pyx":79
+ *                 c_data = _data
+ *                 _pos = 0
  *                 while _pos < _size:             # <<<<<<<<<<<<<<
- *                     linesep = _data[:_size].find(LINESEP, _pos)
- *                     if linesep >= 0:
+ *                     linesep = <const char *>memchr(
+ *                         c_data + _pos, LINESEP, _size - _pos)
  */
             while (1) {
               __pyx_t_10 = ((__pyx_cur_scope->__pyx_v__pos < __pyx_cur_scope->__pyx_v__size) != 0);
               if (!__pyx_t_10) break;
 
-              /* "pssh/native/_ssh2.pyx":58
- *             while _size > 0:
+              /* "pssh/native/_ssh2.pyx":80
+ *                 _pos = 0
  *                 while _pos < _size:
- *                     linesep = _data[:_size].find(LINESEP, _pos)             # <<<<<<<<<<<<<<
- *                     if linesep >= 0:
- *                         if remainder_len > 0:
+ *                     linesep = <const char *>memchr(             # <<<<<<<<<<<<<<
+ *                         c_data + _pos, LINESEP, _size - _pos)
+ *                     if linesep is NULL:
  */
-              if (unlikely(__pyx_cur_scope->__pyx_v__data == Py_None)) {
-                PyErr_SetString(PyExc_TypeError, "'NoneType' object is not subscriptable");
-                __PYX_ERR(0, 58, __pyx_L9_error)
-              }
-              __pyx_t_4 = PySequence_GetSlice(__pyx_cur_scope->__pyx_v__data, 0, __pyx_cur_scope->__pyx_v__size); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 58, __pyx_L9_error)
-              __Pyx_GOTREF(__pyx_t_4);
-              __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_4, __pyx_n_s_find); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 58, __pyx_L9_error)
-              __Pyx_GOTREF(__pyx_t_3);
-              __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-              __pyx_t_4 = __Pyx_PyInt_FromSize_t(__pyx_cur_scope->__pyx_v__pos); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 58, __pyx_L9_error)
-              __Pyx_GOTREF(__pyx_t_4);
-              __pyx_t_2 = NULL;
-              __pyx_t_12 = 0;
-              if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_3))) {
-                __pyx_t_2 = PyMethod_GET_SELF(__pyx_t_3);
-                if (likely(__pyx_t_2)) {
-                  PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
-                  __Pyx_INCREF(__pyx_t_2);
-                  __Pyx_INCREF(function);
-                  __Pyx_DECREF_SET(__pyx_t_3, function);
-                  __pyx_t_12 = 1;
-                }
-              }
-              #if CYTHON_FAST_PYCALL
-              if (PyFunction_Check(__pyx_t_3)) {
-                PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_v_4pssh_6native_5_ssh2_LINESEP, __pyx_t_4};
-                __pyx_t_1 = __Pyx_PyFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 58, __pyx_L9_error)
-                __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
-                __Pyx_GOTREF(__pyx_t_1);
-                __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-              } else
-              #endif
-              #if CYTHON_FAST_PYCCALL
-              if (__Pyx_PyFastCFunction_Check(__pyx_t_3)) {
-                PyObject *__pyx_temp[3] = {__pyx_t_2, __pyx_v_4pssh_6native_5_ssh2_LINESEP, __pyx_t_4};
-                __pyx_t_1 = __Pyx_PyCFunction_FastCall(__pyx_t_3, __pyx_temp+1-__pyx_t_12, 2+__pyx_t_12); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 58, __pyx_L9_error)
-                __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
+              __pyx_cur_scope->__pyx_v_linesep = ((char const *)memchr((__pyx_cur_scope->__pyx_v_c_data + __pyx_cur_scope->__pyx_v__pos), __pyx_v_4pssh_6native_5_ssh2_LINESEP, (__pyx_cur_scope->__pyx_v__size - __pyx_cur_scope->__pyx_v__pos)));
+
+              /* "pssh/native/_ssh2.pyx":82
+ *                     linesep = <const char *>memchr(
+ *                         c_data + _pos, LINESEP, _size - _pos)
+ *                     if linesep is NULL:             # <<<<<<<<<<<<<<
+ *                         remainder += c_data[_pos:_size]
+ *                         break
+ */
+              __pyx_t_10 = ((__pyx_cur_scope->__pyx_v_linesep == NULL) != 0);
+              if (__pyx_t_10) {
+
+                /* "pssh/native/_ssh2.pyx":83
+ *                         c_data + _pos, LINESEP, _size - _pos)
+ *                     if linesep is NULL:
+ *                         remainder += c_data[_pos:_size]             # <<<<<<<<<<<<<<
+ *                         break
+ *                     line_end = linesep - c_data
+ */
+                __pyx_t_1 = __Pyx_PyBytes_FromStringAndSize(__pyx_cur_scope->__pyx_v_c_data + __pyx_cur_scope->__pyx_v__pos, __pyx_cur_scope->__pyx_v__size - __pyx_cur_scope->__pyx_v__pos); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 83, __pyx_L9_error)
                 __Pyx_GOTREF(__pyx_t_1);
-                __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-              } else
-              #endif
-              {
-                __pyx_t_13 = PyTuple_New(2+__pyx_t_12); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 58, __pyx_L9_error)
-                __Pyx_GOTREF(__pyx_t_13);
-                if (__pyx_t_2) {
-                  __Pyx_GIVEREF(__pyx_t_2); PyTuple_SET_ITEM(__pyx_t_13, 0, __pyx_t_2); __pyx_t_2 = NULL;
-                }
-                __Pyx_INCREF(__pyx_v_4pssh_6native_5_ssh2_LINESEP);
-                __Pyx_GIVEREF(__pyx_v_4pssh_6native_5_ssh2_LINESEP);
-                PyTuple_SET_ITEM(__pyx_t_13, 0+__pyx_t_12, __pyx_v_4pssh_6native_5_ssh2_LINESEP);
+                __pyx_t_4 = PyNumber_InPlaceAdd(__pyx_cur_scope->__pyx_v_remainder, __pyx_t_1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 83, __pyx_L9_error)
+                __Pyx_GOTREF(__pyx_t_4);
+                __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+                __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_remainder);
+                __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_remainder, ((PyObject*)__pyx_t_4));
                 __Pyx_GIVEREF(__pyx_t_4);
-                PyTuple_SET_ITEM(__pyx_t_13, 1+__pyx_t_12, __pyx_t_4);
                 __pyx_t_4 = 0;
-                __pyx_t_1 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_13, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 58, __pyx_L9_error)
-                __Pyx_GOTREF(__pyx_t_1);
-                __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
+
+                /* "pssh/native/_ssh2.pyx":84
+ *                     if linesep is NULL:
+ *                         remainder += c_data[_pos:_size]
+ *                         break             # <<<<<<<<<<<<<<
+ *                     line_end = linesep - c_data
+ *                     if len(remainder) > 0:
+ */
+                goto __pyx_L25_break;
+
+                /* "pssh/native/_ssh2.pyx":82
+ *                     linesep = <const char *>memchr(
+ *                         c_data + _pos, LINESEP, _size - _pos)
+ *                     if linesep is NULL:             # <<<<<<<<<<<<<<
+ *                         remainder += c_data[_pos:_size]
+ *                         break
+ */
               }
-              __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-              __pyx_t_6 = __Pyx_PyIndex_AsSsize_t(__pyx_t_1); if (unlikely((__pyx_t_6 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 58, __pyx_L9_error)
-              __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-              __pyx_cur_scope->__pyx_v_linesep = __pyx_t_6;
 
-              /* "pssh/native/_ssh2.pyx":59
- *                 while _pos < _size:
- *                     linesep = _data[:_size].find(LINESEP, _pos)
- *                     if linesep >= 0:             # <<<<<<<<<<<<<<
- *                         if remainder_len > 0:
- *                             yield remainder + _data[_pos:linesep].rstrip()
+              /* "pssh/native/_ssh2.pyx":85
+ *                         remainder += c_data[_pos:_size]
+ *                         break
+ *                     line_end = linesep - c_data             # <<<<<<<<<<<<<<
+ *                     if len(remainder) > 0:
+ *                         remainder += c_data[_pos:line_end]
  */
-              __pyx_t_10 = ((__pyx_cur_scope->__pyx_v_linesep >= 0) != 0);
-              if (__pyx_t_10) {
+              __pyx_cur_scope->__pyx_v_line_end = (__pyx_cur_scope->__pyx_v_linesep - __pyx_cur_scope->__pyx_v_c_data);
 
-                /* "pssh/native/_ssh2.pyx":60
- *                     linesep = _data[:_size].find(LINESEP, _pos)
- *                     if linesep >= 0:
- *                         if remainder_len > 0:             # <<<<<<<<<<<<<<
- *                             yield remainder + _data[_pos:linesep].rstrip()
- *                             remainder = b""
- */
-                __pyx_t_10 = ((__pyx_cur_scope->__pyx_v_remainder_len > 0) != 0);
-                if (__pyx_t_10) {
-
-                  /* "pssh/native/_ssh2.pyx":61
- *                     if linesep >= 0:
- *                         if remainder_len > 0:
- *                             yield remainder + _data[_pos:linesep].rstrip()             # <<<<<<<<<<<<<<
- *                             remainder = b""
- *                             remainder_len = 0
- */
-                  if (unlikely(__pyx_cur_scope->__pyx_v__data == Py_None)) {
-                    PyErr_SetString(PyExc_TypeError, "'NoneType' object is not subscriptable");
-                    __PYX_ERR(0, 61, __pyx_L9_error)
-                  }
-                  __pyx_t_3 = PySequence_GetSlice(__pyx_cur_scope->__pyx_v__data, __pyx_cur_scope->__pyx_v__pos, __pyx_cur_scope->__pyx_v_linesep); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 61, __pyx_L9_error)
-                  __Pyx_GOTREF(__pyx_t_3);
-                  __pyx_t_13 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_rstrip); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 61, __pyx_L9_error)
-                  __Pyx_GOTREF(__pyx_t_13);
-                  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-                  __pyx_t_3 = NULL;
-                  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_13))) {
-                    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_13);
-                    if (likely(__pyx_t_3)) {
-                      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_13);
-                      __Pyx_INCREF(__pyx_t_3);
-                      __Pyx_INCREF(function);
-                      __Pyx_DECREF_SET(__pyx_t_13, function);
-                    }
-                  }
-                  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_13, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_13);
-                  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-                  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 61, __pyx_L9_error)
-                  __Pyx_GOTREF(__pyx_t_1);
-                  __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-                  __pyx_t_13 = PyNumber_Add(__pyx_cur_scope->__pyx_v_remainder, __pyx_t_1); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 61, __pyx_L9_error)
-                  __Pyx_GOTREF(__pyx_t_13);
-                  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-                  __pyx_r = __pyx_t_13;
-                  __pyx_t_13 = 0;
-                  __Pyx_XGIVEREF(__pyx_t_7);
-                  __pyx_cur_scope->__pyx_t_0 = __pyx_t_7;
-                  __Pyx_XGIVEREF(__pyx_t_8);
-                  __pyx_cur_scope->__pyx_t_1 = __pyx_t_8;
-                  __Pyx_XGIVEREF(__pyx_t_9);
-                  __pyx_cur_scope->__pyx_t_2 = __pyx_t_9;
-                  __Pyx_XGIVEREF(__pyx_r);
-                  __Pyx_RefNannyFinishContext();
-                  __Pyx_Coroutine_ResetAndClearException(__pyx_generator);
-                  /* return from generator, yielding value */
-                  __pyx_generator->resume_label = 1;
-                  return __pyx_r;
-                  __pyx_L28_resume_from_yield:;
-                  __pyx_t_7 = __pyx_cur_scope->__pyx_t_0;
-                  __pyx_cur_scope->__pyx_t_0 = 0;
-                  __Pyx_XGOTREF(__pyx_t_7);
-                  __pyx_t_8 = __pyx_cur_scope->__pyx_t_1;
-                  __pyx_cur_scope->__pyx_t_1 = 0;
-                  __Pyx_XGOTREF(__pyx_t_8);
-                  __pyx_t_9 = __pyx_cur_scope->__pyx_t_2;
-                  __pyx_cur_scope->__pyx_t_2 = 0;
-                  __Pyx_XGOTREF(__pyx_t_9);
-                  if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 61, __pyx_L9_error)
-
-                  /* "pssh/native/_ssh2.pyx":62
- *                         if remainder_len > 0:
- *                             yield remainder + _data[_pos:linesep].rstrip()
- *                             remainder = b""             # <<<<<<<<<<<<<<
- *                             remainder_len = 0
- *                         else:
- */
-                  __Pyx_INCREF(__pyx_kp_b__2);
-                  __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_remainder);
-                  __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_remainder, __pyx_kp_b__2);
-                  __Pyx_GIVEREF(__pyx_kp_b__2);
-
-                  /* "pssh/native/_ssh2.pyx":63
- *                             yield remainder + _data[_pos:linesep].rstrip()
- *                             remainder = b""
- *                             remainder_len = 0             # <<<<<<<<<<<<<<
- *                         else:
- *                             yield _data[_pos:linesep].rstrip()
- */
-                  __pyx_cur_scope->__pyx_v_remainder_len = 0;
-
-                  /* "pssh/native/_ssh2.pyx":60
- *                     linesep = _data[:_size].find(LINESEP, _pos)
- *                     if linesep >= 0:
- *                         if remainder_len > 0:             # <<<<<<<<<<<<<<
- *                             yield remainder + _data[_pos:linesep].rstrip()
- *                             remainder = b""
- */
-                  goto __pyx_L27;
-                }
+              /* "pssh/native/_ssh2.pyx":86
+ *                         break
+ *                     line_end = linesep - c_data
+ *                     if len(remainder) > 0:             # <<<<<<<<<<<<<<
+ *                         remainder += c_data[_pos:line_end]
+ *                         c_remainder = remainder
+ */
+              __pyx_t_6 = PyByteArray_GET_SIZE(__pyx_cur_scope->__pyx_v_remainder); if (unlikely(__pyx_t_6 == ((Py_ssize_t)-1))) __PYX_ERR(0, 86, __pyx_L9_error)
+              __pyx_t_10 = ((__pyx_t_6 > 0) != 0);
+              if (__pyx_t_10) {
 
-                /* "pssh/native/_ssh2.pyx":65
- *                             remainder_len = 0
- *                         else:
- *                             yield _data[_pos:linesep].rstrip()             # <<<<<<<<<<<<<<
- *                         _pos = linesep + 1
+                /* "pssh/native/_ssh2.pyx":87
+ *                     line_end = linesep - c_data
+ *                     if len(remainder) > 0:
+ *                         remainder += c_data[_pos:line_end]             # <<<<<<<<<<<<<<
+ *                         c_remainder = remainder
+ *                         yield c_remainder[:_rstrip_end(
+ */
+                __pyx_t_4 = __Pyx_PyBytes_FromStringAndSize(__pyx_cur_scope->__pyx_v_c_data + __pyx_cur_scope->__pyx_v__pos, __pyx_cur_scope->__pyx_v_line_end - __pyx_cur_scope->__pyx_v__pos); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 87, __pyx_L9_error)
+                __Pyx_GOTREF(__pyx_t_4);
+                __pyx_t_1 = PyNumber_InPlaceAdd(__pyx_cur_scope->__pyx_v_remainder, __pyx_t_4); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 87, __pyx_L9_error)
+                __Pyx_GOTREF(__pyx_t_1);
+                __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+                __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_remainder);
+                __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_remainder, ((PyObject*)__pyx_t_1));
+                __Pyx_GIVEREF(__pyx_t_1);
+                __pyx_t_1 = 0;
+
+                /* "pssh/native/_ssh2.pyx":88
+ *                     if len(remainder) > 0:
+ *                         remainder += c_data[_pos:line_end]
+ *                         c_remainder = remainder             # <<<<<<<<<<<<<<
+ *                         yield c_remainder[:_rstrip_end(
+ *                             c_remainder, 0, len(remainder))]
+ */
+                __pyx_t_14 = __Pyx_PyObject_AsString(__pyx_cur_scope->__pyx_v_remainder); if (unlikely((!__pyx_t_14) && PyErr_Occurred())) __PYX_ERR(0, 88, __pyx_L9_error)
+                __pyx_cur_scope->__pyx_v_c_remainder = __pyx_t_14;
+
+                /* "pssh/native/_ssh2.pyx":90
+ *                         c_remainder = remainder
+ *                         yield c_remainder[:_rstrip_end(
+ *                             c_remainder, 0, len(remainder))]             # <<<<<<<<<<<<<<
+ *                         del remainder[:]
  *                     else:
  */
-                /*else*/ {
-                  if (unlikely(__pyx_cur_scope->__pyx_v__data == Py_None)) {
-                    PyErr_SetString(PyExc_TypeError, "'NoneType' object is not subscriptable");
-                    __PYX_ERR(0, 65, __pyx_L9_error)
-                  }
-                  __pyx_t_1 = PySequence_GetSlice(__pyx_cur_scope->__pyx_v__data, __pyx_cur_scope->__pyx_v__pos, __pyx_cur_scope->__pyx_v_linesep); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 65, __pyx_L9_error)
-                  __Pyx_GOTREF(__pyx_t_1);
-                  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_rstrip); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 65, __pyx_L9_error)
-                  __Pyx_GOTREF(__pyx_t_3);
-                  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-                  __pyx_t_1 = NULL;
-                  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_3))) {
-                    __pyx_t_1 = PyMethod_GET_SELF(__pyx_t_3);
-                    if (likely(__pyx_t_1)) {
-                      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
-                      __Pyx_INCREF(__pyx_t_1);
-                      __Pyx_INCREF(function);
-                      __Pyx_DECREF_SET(__pyx_t_3, function);
-                    }
-                  }
-                  __pyx_t_13 = (__pyx_t_1) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_1) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
-                  __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
-                  if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 65, __pyx_L9_error)
-                  __Pyx_GOTREF(__pyx_t_13);
-                  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-                  __pyx_r = __pyx_t_13;
-                  __pyx_t_13 = 0;
-                  __Pyx_XGIVEREF(__pyx_t_7);
-                  __pyx_cur_scope->__pyx_t_0 = __pyx_t_7;
-                  __Pyx_XGIVEREF(__pyx_t_8);
-                  __pyx_cur_scope->__pyx_t_1 = __pyx_t_8;
-                  __Pyx_XGIVEREF(__pyx_t_9);
-                  __pyx_cur_scope->__pyx_t_2 = __pyx_t_9;
-                  __Pyx_XGIVEREF(__pyx_r);
-                  __Pyx_RefNannyFinishContext();
-                  __Pyx_Coroutine_ResetAndClearException(__pyx_generator);
-                  /* return from generator, yielding value */
-                  __pyx_generator->resume_label = 2;
-                  return __pyx_r;
-                  __pyx_L29_resume_from_yield:;
-                  __pyx_t_7 = __pyx_cur_scope->__pyx_t_0;
-                  __pyx_cur_scope->__pyx_t_0 = 0;
-                  __Pyx_XGOTREF(__pyx_t_7);
-                  __pyx_t_8 = __pyx_cur_scope->__pyx_t_1;
-                  __pyx_cur_scope->__pyx_t_1 = 0;
-                  __Pyx_XGOTREF(__pyx_t_8);
-                  __pyx_t_9 = __pyx_cur_scope->__pyx_t_2;
-                  __pyx_cur_scope->__pyx_t_2 = 0;
-                  __Pyx_XGOTREF(__pyx_t_9);
-                  if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 65, __pyx_L9_error)
-                }
-                __pyx_L27:;
-
-                /* "pssh/native/_ssh2.pyx":66
- *                         else:
- *                             yield _data[_pos:linesep].rstrip()
- *                         _pos = linesep + 1             # <<<<<<<<<<<<<<
+                __pyx_t_6 = PyByteArray_GET_SIZE(__pyx_cur_scope->__pyx_v_remainder); if (unlikely(__pyx_t_6 == ((Py_ssize_t)-1))) __PYX_ERR(0, 90, __pyx_L9_error)
+
+                /* "pssh/native/_ssh2.pyx":89
+ *                         remainder += c_data[_pos:line_end]
+ *                         c_remainder = remainder
+ *                         yield c_remainder[:_rstrip_end(             # <<<<<<<<<<<<<<
+ *                             c_remainder, 0, len(remainder))]
+ *                         del remainder[:]
+ */
+                __pyx_t_1 = __Pyx_PyBytes_FromStringAndSize(__pyx_cur_scope->__pyx_v_c_remainder + 0, __pyx_f_4pssh_6native_5_ssh2__rstrip_end(__pyx_cur_scope->__pyx_v_c_remainder, 0, __pyx_t_6) - 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 89, __pyx_L9_error)
+                __Pyx_GOTREF(__pyx_t_1);
+                __pyx_r = __pyx_t_1;
+                __pyx_t_1 = 0;
+                __Pyx_XGIVEREF(__pyx_t_7);
+                __pyx_cur_scope->__pyx_t_0 = __pyx_t_7;
+                __Pyx_XGIVEREF(__pyx_t_8);
+                __pyx_cur_scope->__pyx_t_1 = __pyx_t_8;
+                __Pyx_XGIVEREF(__pyx_t_9);
+                __pyx_cur_scope->__pyx_t_2 = __pyx_t_9;
+                __Pyx_XGIVEREF(__pyx_r);
+                __Pyx_RefNannyFinishContext();
+                __Pyx_Coroutine_ResetAndClearException(__pyx_generator);
+                /* return from generator, yielding value */
+                __pyx_generator->resume_label = 1;
+                return __pyx_r;
+                __pyx_L28_resume_from_yield:;
+                __pyx_t_7 = __pyx_cur_scope->__pyx_t_0;
+                __pyx_cur_scope->__pyx_t_0 = 0;
+                __Pyx_XGOTREF(__pyx_t_7);
+                __pyx_t_8 = __pyx_cur_scope->__pyx_t_1;
+                __pyx_cur_scope->__pyx_t_1 = 0;
+                __Pyx_XGOTREF(__pyx_t_8);
+                __pyx_t_9 = __pyx_cur_scope->__pyx_t_2;
+                __pyx_cur_scope->__pyx_t_2 = 0;
+                __Pyx_XGOTREF(__pyx_t_9);
+                if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 89, __pyx_L9_error)
+
+                /* "pssh/native/_ssh2.pyx":91
+ *                         yield c_remainder[:_rstrip_end(
+ *                             c_remainder, 0, len(remainder))]
+ *                         del remainder[:]             # <<<<<<<<<<<<<<
  *                     else:
- *                         remainder += _data[_pos:]
+ *                         yield c_data[_pos:_rstrip_end(c_data, _pos, line_end)]
  */
-                __pyx_cur_scope->__pyx_v__pos = (__pyx_cur_scope->__pyx_v_linesep + 1);
+                if (__Pyx_PyObject_DelSlice(__pyx_cur_scope->__pyx_v_remainder, 0, 0, NULL, NULL, NULL, 0, 0, 0) < 0) __PYX_ERR(0, 91, __pyx_L9_error)
 
-                /* "pssh/native/_ssh2.pyx":59
- *                 while _pos < _size:
- *                     linesep = _data[:_size].find(LINESEP, _pos)
- *                     if linesep >= 0:             # <<<<<<<<<<<<<<
- *                         if remainder_len > 0:
- *                             yield remainder + _data[_pos:linesep].rstrip()
+                /* "pssh/native/_ssh2.pyx":86
+ *                         break
+ *                     line_end = linesep - c_data
+ *                     if len(remainder) > 0:             # <<<<<<<<<<<<<<
+ *                         remainder += c_data[_pos:line_end]
+ *                         c_remainder = remainder
  */
-                goto __pyx_L26;
+                goto __pyx_L27;
               }
 
-              /* "pssh/native/_ssh2.pyx":68
- *                         _pos = linesep + 1
+              /* "pssh/native/_ssh2.pyx":93
+ *                         del remainder[:]
  *                     else:
- *                         remainder += _data[_pos:]             # <<<<<<<<<<<<<<
- *                         remainder_len = len(remainder)
- *                         break
+ *                         yield c_data[_pos:_rstrip_end(c_data, _pos, line_end)]             # <<<<<<<<<<<<<<
+ *                     _pos = line_end + 1
+ *                 _size, _data = read_func()
  */
               /*else*/ {
-                if (unlikely(__pyx_cur_scope->__pyx_v__data == Py_None)) {
-                  PyErr_SetString(PyExc_TypeError, "'NoneType' object is not subscriptable");
-                  __PYX_ERR(0, 68, __pyx_L9_error)
-                }
-                __pyx_t_13 = PySequence_GetSlice(__pyx_cur_scope->__pyx_v__data, __pyx_cur_scope->__pyx_v__pos, PY_SSIZE_T_MAX); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 68, __pyx_L9_error)
-                __Pyx_GOTREF(__pyx_t_13);
-                __pyx_t_3 = PyNumber_InPlaceAdd(__pyx_cur_scope->__pyx_v_remainder, __pyx_t_13); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 68, __pyx_L9_error)
-                __Pyx_GOTREF(__pyx_t_3);
-                __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-                __Pyx_GOTREF(__pyx_cur_scope->__pyx_v_remainder);
-                __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v_remainder, ((PyObject*)__pyx_t_3));
-                __Pyx_GIVEREF(__pyx_t_3);
-                __pyx_t_3 = 0;
+                __pyx_t_1 = __Pyx_PyBytes_FromStringAndSize(__pyx_cur_scope->__pyx_v_c_data + __pyx_cur_scope->__pyx_v__pos, __pyx_f_4pssh_6native_5_ssh2__rstrip_end(__pyx_cur_scope->__pyx_v_c_data, __pyx_cur_scope->__pyx_v__pos, __pyx_cur_scope->__pyx_v_line_end) - __pyx_cur_scope->__pyx_v__pos); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 93, __pyx_L9_error)
+                __Pyx_GOTREF(__pyx_t_1);
+                __pyx_r = __pyx_t_1;
+                __pyx_t_1 = 0;
+                __Pyx_XGIVEREF(__pyx_t_7);
+                __pyx_cur_scope->__pyx_t_0 = __pyx_t_7;
+                __Pyx_XGIVEREF(__pyx_t_8);
+                __pyx_cur_scope->__pyx_t_1 = __pyx_t_8;
+                __Pyx_XGIVEREF(__pyx_t_9);
+                __pyx_cur_scope->__pyx_t_2 = __pyx_t_9;
+                __Pyx_XGIVEREF(__pyx_r);
+                __Pyx_RefNannyFinishContext();
+                __Pyx_Coroutine_ResetAndClearException(__pyx_generator);
+                /* return from generator, yielding value */
+                __pyx_generator->resume_label = 2;
+                return __pyx_r;
+                __pyx_L29_resume_from_yield:;
+                __pyx_t_7 = __pyx_cur_scope->__pyx_t_0;
+                __pyx_cur_scope->__pyx_t_0 = 0;
+                __Pyx_XGOTREF(__pyx_t_7);
+                __pyx_t_8 = __pyx_cur_scope->__pyx_t_1;
+                __pyx_cur_scope->__pyx_t_1 = 0;
+                __Pyx_XGOTREF(__pyx_t_8);
+                __pyx_t_9 = __pyx_cur_scope->__pyx_t_2;
+                __pyx_cur_scope->__pyx_t_2 = 0;
+                __Pyx_XGOTREF(__pyx_t_9);
+                if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 93, __pyx_L9_error)
+              }
+              __pyx_L27:;
 
-                /* "pssh/native/_ssh2.pyx":69
+              /* "pssh/native/_ssh2.pyx":94
  *                     else:
- *                         remainder += _data[_pos:]
- *                         remainder_len = len(remainder)             # <<<<<<<<<<<<<<
- *                         break
- *                 _size, _data = read_func()
- */
-                __pyx_t_6 = PyBytes_GET_SIZE(__pyx_cur_scope->__pyx_v_remainder); if (unlikely(__pyx_t_6 == ((Py_ssize_t)-1))) __PYX_ERR(0, 69, __pyx_L9_error)
-                __pyx_cur_scope->__pyx_v_remainder_len = __pyx_t_6;
-
-                /* "pssh/native/_ssh2.pyx":70
- *                         remainder += _data[_pos:]
- *                         remainder_len = len(remainder)
- *                         break             # <<<<<<<<<<<<<<
+ *                         yield c_data[_pos:_rstrip_end(c_data, _pos, line_end)]
+ *                     _pos = line_end + 1             # <<<<<<<<<<<<<<
  *                 _size, _data = read_func()
- *                 _pos = 0
+ *         if len(remainder) > 0:
  */
-                goto __pyx_L25_break;
-              }
-              __pyx_L26:;
+              __pyx_cur_scope->__pyx_v__pos = (__pyx_cur_scope->__pyx_v_line_end + 1);
             }
             __pyx_L25_break:;
 
-            /* "pssh/native/_ssh2.pyx":71
- *                         remainder_len = len(remainder)
- *                         break
+            /* "pssh/native/_ssh2.pyx":95
+ *                         yield c_data[_pos:_rstrip_end(c_data, _pos, line_end)]
+ *                     _pos = line_end + 1
  *                 _size, _data = read_func()             # <<<<<<<<<<<<<<
- *                 _pos = 0
- *         if remainder_len > 0:
+ *         if len(remainder) > 0:
+ *             # Finished reading without finding ending linesep
  */
             __Pyx_INCREF(__pyx_cur_scope->__pyx_v_read_func);
-            __pyx_t_13 = __pyx_cur_scope->__pyx_v_read_func; __pyx_t_1 = NULL;
-            if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_13))) {
-              __pyx_t_1 = PyMethod_GET_SELF(__pyx_t_13);
-              if (likely(__pyx_t_1)) {
-                PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_13);
-                __Pyx_INCREF(__pyx_t_1);
+            __pyx_t_4 = __pyx_cur_scope->__pyx_v_read_func; __pyx_t_3 = NULL;
+            if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_4))) {
+              __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_4);
+              if (likely(__pyx_t_3)) {
+                PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+                __Pyx_INCREF(__pyx_t_3);
                 __Pyx_INCREF(function);
-                __Pyx_DECREF_SET(__pyx_t_13, function);
+                __Pyx_DECREF_SET(__pyx_t_4, function);
               }
             }
-            __pyx_t_3 = (__pyx_t_1) ? __Pyx_PyObject_CallOneArg(__pyx_t_13, __pyx_t_1) : __Pyx_PyObject_CallNoArg(__pyx_t_13);
-            __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
-            if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 71, __pyx_L9_error)
-            __Pyx_GOTREF(__pyx_t_3);
-            __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-            if ((likely(PyTuple_CheckExact(__pyx_t_3))) || (PyList_CheckExact(__pyx_t_3))) {
-              PyObject* sequence = __pyx_t_3;
+            __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_4);
+            __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+            if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 95, __pyx_L9_error)
+            __Pyx_GOTREF(__pyx_t_1);
+            __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+            if ((likely(PyTuple_CheckExact(__pyx_t_1))) || (PyList_CheckExact(__pyx_t_1))) {
+              PyObject* sequence = __pyx_t_1;
               Py_ssize_t size = __Pyx_PySequence_SIZE(sequence);
               if (unlikely(size != 2)) {
                 if (size > 2) __Pyx_RaiseTooManyValuesError(2);
                 else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
-                __PYX_ERR(0, 71, __pyx_L9_error)
+                __PYX_ERR(0, 95, __pyx_L9_error)
               }
               #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
               if (likely(PyTuple_CheckExact(sequence))) {
-                __pyx_t_13 = PyTuple_GET_ITEM(sequence, 0); 
-                __pyx_t_1 = PyTuple_GET_ITEM(sequence, 1); 
+                __pyx_t_4 = PyTuple_GET_ITEM(sequence, 0); 
+                __pyx_t_3 = PyTuple_GET_ITEM(sequence, 1); 
               } else {
-                __pyx_t_13 = PyList_GET_ITEM(sequence, 0); 
-                __pyx_t_1 = PyList_GET_ITEM(sequence, 1); 
+                __pyx_t_4 = PyList_GET_ITEM(sequence, 0); 
+                __pyx_t_3 = PyList_GET_ITEM(sequence, 1); 
               }
-              __Pyx_INCREF(__pyx_t_13);
-              __Pyx_INCREF(__pyx_t_1);
+              __Pyx_INCREF(__pyx_t_4);
+              __Pyx_INCREF(__pyx_t_3);
               #else
-              __pyx_t_13 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 71, __pyx_L9_error)
-              __Pyx_GOTREF(__pyx_t_13);
-              __pyx_t_1 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 71, __pyx_L9_error)
-              __Pyx_GOTREF(__pyx_t_1);
+              __pyx_t_4 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 95, __pyx_L9_error)
+              __Pyx_GOTREF(__pyx_t_4);
+              __pyx_t_3 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 95, __pyx_L9_error)
+              __Pyx_GOTREF(__pyx_t_3);
               #endif
-              __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+              __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
             } else {
               Py_ssize_t index = -1;
-              __pyx_t_4 = PyObject_GetIter(__pyx_t_3); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 71, __pyx_L9_error)
+              __pyx_t_2 = PyObject_GetIter(__pyx_t_1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 95, __pyx_L9_error)
+              __Pyx_GOTREF(__pyx_t_2);
+              __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+              __pyx_t_5 = Py_TYPE(__pyx_t_2)->tp_iternext;
+              index = 0; __pyx_t_4 = __pyx_t_5(__pyx_t_2); if (unlikely(!__pyx_t_4)) goto __pyx_L30_unpacking_failed;
               __Pyx_GOTREF(__pyx_t_4);
-              __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-              __pyx_t_5 = Py_TYPE(__pyx_t_4)->tp_iternext;
-              index = 0; __pyx_t_13 = __pyx_t_5(__pyx_t_4); if (unlikely(!__pyx_t_13)) goto __pyx_L30_unpacking_failed;
-              __Pyx_GOTREF(__pyx_t_13);
-              index = 1; __pyx_t_1 = __pyx_t_5(__pyx_t_4); if (unlikely(!__pyx_t_1)) goto __pyx_L30_unpacking_failed;
-              __Pyx_GOTREF(__pyx_t_1);
-              if (__Pyx_IternextUnpackEndCheck(__pyx_t_5(__pyx_t_4), 2) < 0) __PYX_ERR(0, 71, __pyx_L9_error)
+              index = 1; __pyx_t_3 = __pyx_t_5(__pyx_t_2); if (unlikely(!__pyx_t_3)) goto __pyx_L30_unpacking_failed;
+              __Pyx_GOTREF(__pyx_t_3);
+              if (__Pyx_IternextUnpackEndCheck(__pyx_t_5(__pyx_t_2), 2) < 0) __PYX_ERR(0, 95, __pyx_L9_error)
               __pyx_t_5 = NULL;
-              __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+              __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
               goto __pyx_L31_unpacking_done;
               __pyx_L30_unpacking_failed:;
-              __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+              __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
               __pyx_t_5 = NULL;
               if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
-              __PYX_ERR(0, 71, __pyx_L9_error)
+              __PYX_ERR(0, 95, __pyx_L9_error)
               __pyx_L31_unpacking_done:;
             }
-            __pyx_t_6 = __Pyx_PyIndex_AsSsize_t(__pyx_t_13); if (unlikely((__pyx_t_6 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 71, __pyx_L9_error)
-            __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
-            if (!(likely(PyBytes_CheckExact(__pyx_t_1))||((__pyx_t_1) == Py_None)||(PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "bytes", Py_TYPE(__pyx_t_1)->tp_name), 0))) __PYX_ERR(0, 71, __pyx_L9_error)
+            __pyx_t_6 = __Pyx_PyIndex_AsSsize_t(__pyx_t_4); if (unlikely((__pyx_t_6 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 95, __pyx_L9_error)
+            __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+            if (!(likely(PyBytes_CheckExact(__pyx_t_3))||((__pyx_t_3) == Py_None)||((void)PyErr_Format(PyExc_TypeError, "Expected %.16s, got %.200s", "bytes", Py_TYPE(__pyx_t_3)->tp_name), 0))) __PYX_ERR(0, 95, __pyx_L9_error)
             __pyx_cur_scope->__pyx_v__size = __pyx_t_6;
             __Pyx_GOTREF(__pyx_cur_scope->__pyx_v__data);
-            __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v__data, ((PyObject*)__pyx_t_1));
-            __Pyx_GIVEREF(__pyx_t_1);
-            __pyx_t_1 = 0;
-
-            /* "pssh/native/_ssh2.pyx":72
- *                         break
- *                 _size, _data = read_func()
- *                 _pos = 0             # <<<<<<<<<<<<<<
- *         if remainder_len > 0:
- *             # Finished reading without finding ending linesep
- */
-            __pyx_cur_scope->__pyx_v__pos = 0;
+            __Pyx_DECREF_SET(__pyx_cur_scope->__pyx_v__data, ((PyObject*)__pyx_t_3));
+            __Pyx_GIVEREF(__pyx_t_3);
+            __pyx_t_3 = 0;
           }
         }
 
-        /* "pssh/native/_ssh2.pyx":73
+        /* "pssh/native/_ssh2.pyx":96
+ *                     _pos = line_end + 1
  *                 _size, _data = read_func()
- *                 _pos = 0
- *         if remainder_len > 0:             # <<<<<<<<<<<<<<
+ *         if len(remainder) > 0:             # <<<<<<<<<<<<<<
  *             # Finished reading without finding ending linesep
- *             yield remainder
+ *             yield bytes(remainder)
  */
-        __pyx_t_10 = ((__pyx_cur_scope->__pyx_v_remainder_len > 0) != 0);
+        __pyx_t_6 = PyByteArray_GET_SIZE(__pyx_cur_scope->__pyx_v_remainder); if (unlikely(__pyx_t_6 == ((Py_ssize_t)-1))) __PYX_ERR(0, 96, __pyx_L9_error)
+        __pyx_t_10 = ((__pyx_t_6 > 0) != 0);
         if (__pyx_t_10) {
 
-          /* "pssh/native/_ssh2.pyx":75
- *         if remainder_len > 0:
+          /* "pssh/native/_ssh2.pyx":98
+ *         if len(remainder) > 0:
  *             # Finished reading without finding ending linesep
- *             yield remainder             # <<<<<<<<<<<<<<
+ *             yield bytes(remainder)             # <<<<<<<<<<<<<<
  *     except GTimeout:
  *         raise Timeout
  */
-          __Pyx_INCREF(__pyx_cur_scope->__pyx_v_remainder);
-          __pyx_r = __pyx_cur_scope->__pyx_v_remainder;
+          __pyx_t_1 = __Pyx_PyObject_CallOneArg(((PyObject *)(&PyBytes_Type)), __pyx_cur_scope->__pyx_v_remainder); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 98, __pyx_L9_error)
+          __Pyx_GOTREF(__pyx_t_1);
+          __pyx_r = __pyx_t_1;
+          __pyx_t_1 = 0;
           __Pyx_XGIVEREF(__pyx_t_7);
           __pyx_cur_scope->__pyx_t_0 = __pyx_t_7;
           __Pyx_XGIVEREF(__pyx_t_8);
@@ -2459,18 +2615,18 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
           __pyx_t_9 = __pyx_cur_scope->__pyx_t_2;
           __pyx_cur_scope->__pyx_t_2 = 0;
           __Pyx_XGOTREF(__pyx_t_9);
-          if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 75, __pyx_L9_error)
+          if (unlikely(!__pyx_sent_value)) __PYX_ERR(0, 98, __pyx_L9_error)
 
-          /* "pssh/native/_ssh2.pyx":73
+          /* "pssh/native/_ssh2.pyx":96
+ *                     _pos = line_end + 1
  *                 _size, _data = read_func()
- *                 _pos = 0
- *         if remainder_len > 0:             # <<<<<<<<<<<<<<
+ *         if len(remainder) > 0:             # <<<<<<<<<<<<<<
  *             # Finished reading without finding ending linesep
- *             yield remainder
+ *             yield bytes(remainder)
  */
         }
 
-        /* "pssh/native/_ssh2.pyx":51
+        /* "pssh/native/_ssh2.pyx":71
  *     t = GTimeout(timeout)
  *     t.start()
  *     try:             # <<<<<<<<<<<<<<
@@ -2484,49 +2640,48 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
       goto __pyx_L14_try_end;
       __pyx_L9_error:;
       __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
-      __Pyx_XDECREF(__pyx_t_13); __pyx_t_13 = 0;
       __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
       __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
       __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
 
-      /* "pssh/native/_ssh2.pyx":76
+      /* "pssh/native/_ssh2.pyx":99
  *             # Finished reading without finding ending linesep
- *             yield remainder
+ *             yield bytes(remainder)
  *     except GTimeout:             # <<<<<<<<<<<<<<
  *         raise Timeout
  *     finally:
  */
-      __Pyx_ErrFetch(&__pyx_t_3, &__pyx_t_1, &__pyx_t_13);
-      __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_GTimeout); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 76, __pyx_L11_except_error)
-      __Pyx_GOTREF(__pyx_t_4);
-      __pyx_t_12 = __Pyx_PyErr_GivenExceptionMatches(__pyx_t_3, __pyx_t_4);
-      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-      __Pyx_ErrRestore(__pyx_t_3, __pyx_t_1, __pyx_t_13);
-      __pyx_t_3 = 0; __pyx_t_1 = 0; __pyx_t_13 = 0;
+      __Pyx_ErrFetch(&__pyx_t_1, &__pyx_t_3, &__pyx_t_4);
+      __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_GTimeout); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 99, __pyx_L11_except_error)
+      __Pyx_GOTREF(__pyx_t_2);
+      __pyx_t_12 = __Pyx_PyErr_GivenExceptionMatches(__pyx_t_1, __pyx_t_2);
+      __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+      __Pyx_ErrRestore(__pyx_t_1, __pyx_t_3, __pyx_t_4);
+      __pyx_t_1 = 0; __pyx_t_3 = 0; __pyx_t_4 = 0;
       if (__pyx_t_12) {
         __Pyx_AddTraceback("pssh.native._ssh2._read_output", __pyx_clineno, __pyx_lineno, __pyx_filename);
-        if (__Pyx_GetException(&__pyx_t_13, &__pyx_t_1, &__pyx_t_3) < 0) __PYX_ERR(0, 76, __pyx_L11_except_error)
-        __Pyx_GOTREF(__pyx_t_13);
-        __Pyx_GOTREF(__pyx_t_1);
+        if (__Pyx_GetException(&__pyx_t_4, &__pyx_t_3, &__pyx_t_1) < 0) __PYX_ERR(0, 99, __pyx_L11_except_error)
+        __Pyx_GOTREF(__pyx_t_4);
         __Pyx_GOTREF(__pyx_t_3);
+        __Pyx_GOTREF(__pyx_t_1);
 
-        /* "pssh/native/_ssh2.pyx":77
- *             yield remainder
+        /* "pssh/native/_ssh2.pyx":100
+ *             yield bytes(remainder)
  *     except GTimeout:
  *         raise Timeout             # <<<<<<<<<<<<<<
  *     finally:
  *         t.close()
  */
-        __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_Timeout); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 77, __pyx_L11_except_error)
-        __Pyx_GOTREF(__pyx_t_4);
-        __Pyx_Raise(__pyx_t_4, 0, 0, 0);
-        __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-        __PYX_ERR(0, 77, __pyx_L11_except_error)
+        __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_Timeout); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 100, __pyx_L11_except_error)
+        __Pyx_GOTREF(__pyx_t_2);
+        __Pyx_Raise(__pyx_t_2, 0, 0, 0);
+        __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+        __PYX_ERR(0, 100, __pyx_L11_except_error)
       }
       goto __pyx_L11_except_error;
       __pyx_L11_except_error:;
 
-      /* "pssh/native/_ssh2.pyx":51
+      /* "pssh/native/_ssh2.pyx":71
  *     t = GTimeout(timeout)
  *     t.start()
  *     try:             # <<<<<<<<<<<<<<
@@ -2542,7 +2697,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
     }
   }
 
-  /* "pssh/native/_ssh2.pyx":79
+  /* "pssh/native/_ssh2.pyx":102
  *         raise Timeout
  *     finally:
  *         t.close()             # <<<<<<<<<<<<<<
@@ -2551,100 +2706,99 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
  */
   /*finally:*/ {
     /*normal exit:*/{
-      __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_cur_scope->__pyx_v_t, __pyx_n_s_close); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 79, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_1);
-      __pyx_t_13 = NULL;
-      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_1))) {
-        __pyx_t_13 = PyMethod_GET_SELF(__pyx_t_1);
-        if (likely(__pyx_t_13)) {
-          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_1);
-          __Pyx_INCREF(__pyx_t_13);
+      __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_cur_scope->__pyx_v_t, __pyx_n_s_close); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 102, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_3);
+      __pyx_t_4 = NULL;
+      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_3))) {
+        __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_3);
+        if (likely(__pyx_t_4)) {
+          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
+          __Pyx_INCREF(__pyx_t_4);
           __Pyx_INCREF(function);
-          __Pyx_DECREF_SET(__pyx_t_1, function);
+          __Pyx_DECREF_SET(__pyx_t_3, function);
         }
       }
-      __pyx_t_3 = (__pyx_t_13) ? __Pyx_PyObject_CallOneArg(__pyx_t_1, __pyx_t_13) : __Pyx_PyObject_CallNoArg(__pyx_t_1);
-      __Pyx_XDECREF(__pyx_t_13); __pyx_t_13 = 0;
-      if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 79, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_3);
-      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+      __pyx_t_1 = (__pyx_t_4) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_4) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
+      __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+      if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 102, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_1);
       __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
       goto __pyx_L8;
     }
     __pyx_L7_error:;
     /*exception exit:*/{
       __Pyx_PyThreadState_assign
-      __pyx_t_9 = 0; __pyx_t_8 = 0; __pyx_t_7 = 0; __pyx_t_16 = 0; __pyx_t_17 = 0; __pyx_t_18 = 0;
+      __pyx_t_9 = 0; __pyx_t_8 = 0; __pyx_t_7 = 0; __pyx_t_17 = 0; __pyx_t_18 = 0; __pyx_t_19 = 0;
       __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
-      __Pyx_XDECREF(__pyx_t_13); __pyx_t_13 = 0;
       __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
       __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
       __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
-      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_16, &__pyx_t_17, &__pyx_t_18);
+      if (PY_MAJOR_VERSION >= 3) __Pyx_ExceptionSwap(&__pyx_t_17, &__pyx_t_18, &__pyx_t_19);
       if ((PY_MAJOR_VERSION < 3) || unlikely(__Pyx_GetException(&__pyx_t_9, &__pyx_t_8, &__pyx_t_7) < 0)) __Pyx_ErrFetch(&__pyx_t_9, &__pyx_t_8, &__pyx_t_7);
       __Pyx_XGOTREF(__pyx_t_9);
       __Pyx_XGOTREF(__pyx_t_8);
       __Pyx_XGOTREF(__pyx_t_7);
-      __Pyx_XGOTREF(__pyx_t_16);
       __Pyx_XGOTREF(__pyx_t_17);
       __Pyx_XGOTREF(__pyx_t_18);
-      __pyx_t_12 = __pyx_lineno; __pyx_t_14 = __pyx_clineno; __pyx_t_15 = __pyx_filename;
+      __Pyx_XGOTREF(__pyx_t_19);
+      __pyx_t_12 = __pyx_lineno; __pyx_t_15 = __pyx_clineno; __pyx_t_16 = __pyx_filename;
       {
-        __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_cur_scope->__pyx_v_t, __pyx_n_s_close); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 79, __pyx_L37_error)
-        __Pyx_GOTREF(__pyx_t_1);
-        __pyx_t_13 = NULL;
-        if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_1))) {
-          __pyx_t_13 = PyMethod_GET_SELF(__pyx_t_1);
-          if (likely(__pyx_t_13)) {
-            PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_1);
-            __Pyx_INCREF(__pyx_t_13);
+        __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_cur_scope->__pyx_v_t, __pyx_n_s_close); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 102, __pyx_L37_error)
+        __Pyx_GOTREF(__pyx_t_3);
+        __pyx_t_4 = NULL;
+        if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_3))) {
+          __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_3);
+          if (likely(__pyx_t_4)) {
+            PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
+            __Pyx_INCREF(__pyx_t_4);
             __Pyx_INCREF(function);
-            __Pyx_DECREF_SET(__pyx_t_1, function);
+            __Pyx_DECREF_SET(__pyx_t_3, function);
           }
         }
-        __pyx_t_3 = (__pyx_t_13) ? __Pyx_PyObject_CallOneArg(__pyx_t_1, __pyx_t_13) : __Pyx_PyObject_CallNoArg(__pyx_t_1);
-        __Pyx_XDECREF(__pyx_t_13); __pyx_t_13 = 0;
-        if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 79, __pyx_L37_error)
-        __Pyx_GOTREF(__pyx_t_3);
-        __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+        __pyx_t_1 = (__pyx_t_4) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_4) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
+        __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+        if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 102, __pyx_L37_error)
+        __Pyx_GOTREF(__pyx_t_1);
         __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+        __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
       }
       if (PY_MAJOR_VERSION >= 3) {
-        __Pyx_XGIVEREF(__pyx_t_16);
         __Pyx_XGIVEREF(__pyx_t_17);
         __Pyx_XGIVEREF(__pyx_t_18);
-        __Pyx_ExceptionReset(__pyx_t_16, __pyx_t_17, __pyx_t_18);
+        __Pyx_XGIVEREF(__pyx_t_19);
+        __Pyx_ExceptionReset(__pyx_t_17, __pyx_t_18, __pyx_t_19);
       }
       __Pyx_XGIVEREF(__pyx_t_9);
       __Pyx_XGIVEREF(__pyx_t_8);
       __Pyx_XGIVEREF(__pyx_t_7);
       __Pyx_ErrRestore(__pyx_t_9, __pyx_t_8, __pyx_t_7);
-      __pyx_t_9 = 0; __pyx_t_8 = 0; __pyx_t_7 = 0; __pyx_t_16 = 0; __pyx_t_17 = 0; __pyx_t_18 = 0;
-      __pyx_lineno = __pyx_t_12; __pyx_clineno = __pyx_t_14; __pyx_filename = __pyx_t_15;
+      __pyx_t_9 = 0; __pyx_t_8 = 0; __pyx_t_7 = 0; __pyx_t_17 = 0; __pyx_t_18 = 0; __pyx_t_19 = 0;
+      __pyx_lineno = __pyx_t_12; __pyx_clineno = __pyx_t_15; __pyx_filename = __pyx_t_16;
       goto __pyx_L1_error;
       __pyx_L37_error:;
       if (PY_MAJOR_VERSION >= 3) {
-        __Pyx_XGIVEREF(__pyx_t_16);
         __Pyx_XGIVEREF(__pyx_t_17);
         __Pyx_XGIVEREF(__pyx_t_18);
-        __Pyx_ExceptionReset(__pyx_t_16, __pyx_t_17, __pyx_t_18);
+        __Pyx_XGIVEREF(__pyx_t_19);
+        __Pyx_ExceptionReset(__pyx_t_17, __pyx_t_18, __pyx_t_19);
       }
       __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
       __Pyx_XDECREF(__pyx_t_8); __pyx_t_8 = 0;
       __Pyx_XDECREF(__pyx_t_7); __pyx_t_7 = 0;
-      __pyx_t_16 = 0; __pyx_t_17 = 0; __pyx_t_18 = 0;
+      __pyx_t_17 = 0; __pyx_t_18 = 0; __pyx_t_19 = 0;
       goto __pyx_L1_error;
     }
     __pyx_L8:;
   }
   CYTHON_MAYBE_UNUSED_VAR(__pyx_cur_scope);
 
-  /* "pssh/native/_ssh2.pyx":41
+  /* "pssh/native/_ssh2.pyx":52
  * 
  * 
  * def _read_output(session, read_func, timeout=None):             # <<<<<<<<<<<<<<
- *     cdef Py_ssize_t _size
- *     cdef bytes _data
+ *     """Read from ``read_func`` and yield output line by line, without line
+ *     separator and trailing whitespace.
  */
 
   /* function exit code */
@@ -2655,7 +2809,6 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
   __Pyx_XDECREF(__pyx_t_2);
   __Pyx_XDECREF(__pyx_t_3);
   __Pyx_XDECREF(__pyx_t_4);
-  __Pyx_XDECREF(__pyx_t_13);
   __Pyx_AddTraceback("_read_output", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __pyx_L0:;
   __Pyx_XDECREF(__pyx_r); __pyx_r = 0;
@@ -2668,7 +2821,7 @@ static PyObject *__pyx_gb_4pssh_6native_5_ssh2_2generator(__pyx_CoroutineObject
   return __pyx_r;
 }
 
-/* "pssh/native/_ssh2.pyx":82
+/* "pssh/native/_ssh2.pyx":105
  * 
  * 
  * def wait_select(session, timeout=None):             # <<<<<<<<<<<<<<
@@ -2717,7 +2870,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_4wait_select(PyObject *__pyx_self
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "wait_select") < 0)) __PYX_ERR(0, 82, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "wait_select") < 0)) __PYX_ERR(0, 105, __pyx_L3_error)
       }
     } else {
       switch (PyTuple_GET_SIZE(__pyx_args)) {
@@ -2733,7 +2886,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_4wait_select(PyObject *__pyx_self
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("wait_select", 0, 1, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 82, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("wait_select", 0, 1, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 105, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("pssh.native._ssh2.wait_select", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
@@ -2765,7 +2918,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
   __Pyx_RefNannySetupContext("wait_select", 0);
   __Pyx_INCREF(__pyx_v_timeout);
 
-  /* "pssh/native/_ssh2.pyx":88
+  /* "pssh/native/_ssh2.pyx":111
  *     in the appropriate direction.
  *     """
  *     cdef int events = 0             # <<<<<<<<<<<<<<
@@ -2774,14 +2927,14 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
  */
   __pyx_v_events = 0;
 
-  /* "pssh/native/_ssh2.pyx":89
+  /* "pssh/native/_ssh2.pyx":112
  *     """
  *     cdef int events = 0
  *     cdef int directions = session.block_directions()             # <<<<<<<<<<<<<<
  *     if directions == 0:
  *         return 0
  */
-  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_v_session, __pyx_n_s_block_directions); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 89, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_v_session, __pyx_n_s_block_directions); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 112, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __pyx_t_3 = NULL;
   if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
@@ -2795,14 +2948,14 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
   }
   __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_2);
   __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 89, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 112, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __pyx_t_4 = __Pyx_PyInt_As_int(__pyx_t_1); if (unlikely((__pyx_t_4 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 89, __pyx_L1_error)
+  __pyx_t_4 = __Pyx_PyInt_As_int(__pyx_t_1); if (unlikely((__pyx_t_4 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 112, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __pyx_v_directions = __pyx_t_4;
 
-  /* "pssh/native/_ssh2.pyx":90
+  /* "pssh/native/_ssh2.pyx":113
  *     cdef int events = 0
  *     cdef int directions = session.block_directions()
  *     if directions == 0:             # <<<<<<<<<<<<<<
@@ -2812,7 +2965,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
   __pyx_t_5 = ((__pyx_v_directions == 0) != 0);
   if (__pyx_t_5) {
 
-    /* "pssh/native/_ssh2.pyx":91
+    /* "pssh/native/_ssh2.pyx":114
  *     cdef int directions = session.block_directions()
  *     if directions == 0:
  *         return 0             # <<<<<<<<<<<<<<
@@ -2824,7 +2977,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
     __pyx_r = __pyx_int_0;
     goto __pyx_L0;
 
-    /* "pssh/native/_ssh2.pyx":90
+    /* "pssh/native/_ssh2.pyx":113
  *     cdef int events = 0
  *     cdef int directions = session.block_directions()
  *     if directions == 0:             # <<<<<<<<<<<<<<
@@ -2833,19 +2986,19 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
  */
   }
 
-  /* "pssh/native/_ssh2.pyx":92
+  /* "pssh/native/_ssh2.pyx":115
  *     if directions == 0:
  *         return 0
  *     _socket = session.sock             # <<<<<<<<<<<<<<
  *     # gevent.select.poll converts seconds to miliseconds to match python socket
  *     # implementation
  */
-  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_session, __pyx_n_s_sock); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 92, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_session, __pyx_n_s_sock); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 115, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_v__socket = __pyx_t_1;
   __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":95
+  /* "pssh/native/_ssh2.pyx":118
  *     # gevent.select.poll converts seconds to miliseconds to match python socket
  *     # implementation
  *     timeout = timeout * 1000 if timeout is not None else None             # <<<<<<<<<<<<<<
@@ -2854,7 +3007,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
  */
   __pyx_t_5 = (__pyx_v_timeout != Py_None);
   if ((__pyx_t_5 != 0)) {
-    __pyx_t_2 = PyNumber_Multiply(__pyx_v_timeout, __pyx_int_1000); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 95, __pyx_L1_error)
+    __pyx_t_2 = PyNumber_Multiply(__pyx_v_timeout, __pyx_int_1000); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 118, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_2);
     __pyx_t_1 = __pyx_t_2;
     __pyx_t_2 = 0;
@@ -2865,7 +3018,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
   __Pyx_DECREF_SET(__pyx_v_timeout, __pyx_t_1);
   __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":96
+  /* "pssh/native/_ssh2.pyx":119
  *     # implementation
  *     timeout = timeout * 1000 if timeout is not None else None
  *     if directions & _LIBSSH2_SESSION_BLOCK_INBOUND:             # <<<<<<<<<<<<<<
@@ -2875,7 +3028,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
   __pyx_t_5 = ((__pyx_v_directions & __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_SESSION_BLOCK_INBOUND) != 0);
   if (__pyx_t_5) {
 
-    /* "pssh/native/_ssh2.pyx":97
+    /* "pssh/native/_ssh2.pyx":120
  *     timeout = timeout * 1000 if timeout is not None else None
  *     if directions & _LIBSSH2_SESSION_BLOCK_INBOUND:
  *         events = _POLLIN             # <<<<<<<<<<<<<<
@@ -2884,7 +3037,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
  */
     __pyx_v_events = __pyx_v_4pssh_6native_5_ssh2__POLLIN;
 
-    /* "pssh/native/_ssh2.pyx":96
+    /* "pssh/native/_ssh2.pyx":119
  *     # implementation
  *     timeout = timeout * 1000 if timeout is not None else None
  *     if directions & _LIBSSH2_SESSION_BLOCK_INBOUND:             # <<<<<<<<<<<<<<
@@ -2893,7 +3046,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
  */
   }
 
-  /* "pssh/native/_ssh2.pyx":98
+  /* "pssh/native/_ssh2.pyx":121
  *     if directions & _LIBSSH2_SESSION_BLOCK_INBOUND:
  *         events = _POLLIN
  *     if directions & _LIBSSH2_SESSION_BLOCK_OUTBOUND:             # <<<<<<<<<<<<<<
@@ -2903,7 +3056,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
   __pyx_t_5 = ((__pyx_v_directions & __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_SESSION_BLOCK_OUTBOUND) != 0);
   if (__pyx_t_5) {
 
-    /* "pssh/native/_ssh2.pyx":99
+    /* "pssh/native/_ssh2.pyx":122
  *         events = _POLLIN
  *     if directions & _LIBSSH2_SESSION_BLOCK_OUTBOUND:
  *         events |= _POLLOUT             # <<<<<<<<<<<<<<
@@ -2912,7 +3065,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
  */
     __pyx_v_events = (__pyx_v_events | __pyx_v_4pssh_6native_5_ssh2__POLLOUT);
 
-    /* "pssh/native/_ssh2.pyx":98
+    /* "pssh/native/_ssh2.pyx":121
  *     if directions & _LIBSSH2_SESSION_BLOCK_INBOUND:
  *         events = _POLLIN
  *     if directions & _LIBSSH2_SESSION_BLOCK_OUTBOUND:             # <<<<<<<<<<<<<<
@@ -2921,14 +3074,14 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
  */
   }
 
-  /* "pssh/native/_ssh2.pyx":100
+  /* "pssh/native/_ssh2.pyx":123
  *     if directions & _LIBSSH2_SESSION_BLOCK_OUTBOUND:
  *         events |= _POLLOUT
  *     poller = poll()             # <<<<<<<<<<<<<<
  *     poller.register(_socket, eventmask=events)
  *     poller.poll(timeout=timeout)
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_poll); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 100, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_poll); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 123, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __pyx_t_3 = NULL;
   if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_2))) {
@@ -2942,58 +3095,58 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
   }
   __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_2);
   __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 100, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 123, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_poller = __pyx_t_1;
   __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":101
+  /* "pssh/native/_ssh2.pyx":124
  *         events |= _POLLOUT
  *     poller = poll()
  *     poller.register(_socket, eventmask=events)             # <<<<<<<<<<<<<<
  *     poller.poll(timeout=timeout)
  * 
  */
-  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_poller, __pyx_n_s_register); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 101, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_poller, __pyx_n_s_register); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 124, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = PyTuple_New(1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 101, __pyx_L1_error)
+  __pyx_t_2 = PyTuple_New(1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 124, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_INCREF(__pyx_v__socket);
   __Pyx_GIVEREF(__pyx_v__socket);
   PyTuple_SET_ITEM(__pyx_t_2, 0, __pyx_v__socket);
-  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 101, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 124, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
-  __pyx_t_6 = __Pyx_PyInt_From_int(__pyx_v_events); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 101, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyInt_From_int(__pyx_v_events); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 124, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
-  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_eventmask, __pyx_t_6) < 0) __PYX_ERR(0, 101, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_eventmask, __pyx_t_6) < 0) __PYX_ERR(0, 124, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_1, __pyx_t_2, __pyx_t_3); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 101, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_1, __pyx_t_2, __pyx_t_3); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 124, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
 
-  /* "pssh/native/_ssh2.pyx":102
+  /* "pssh/native/_ssh2.pyx":125
  *     poller = poll()
  *     poller.register(_socket, eventmask=events)
  *     poller.poll(timeout=timeout)             # <<<<<<<<<<<<<<
  * 
  * 
  */
-  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_poller, __pyx_n_s_poll); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 102, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_poller, __pyx_n_s_poll); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 125, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
-  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 102, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 125, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
-  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_timeout, __pyx_v_timeout) < 0) __PYX_ERR(0, 102, __pyx_L1_error)
-  __pyx_t_2 = __Pyx_PyObject_Call(__pyx_t_6, __pyx_empty_tuple, __pyx_t_3); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 102, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_timeout, __pyx_v_timeout) < 0) __PYX_ERR(0, 125, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_Call(__pyx_t_6, __pyx_empty_tuple, __pyx_t_3); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 125, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":82
+  /* "pssh/native/_ssh2.pyx":105
  * 
  * 
  * def wait_select(session, timeout=None):             # <<<<<<<<<<<<<<
@@ -3020,7 +3173,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_3wait_select(CYTHON_UNUSED PyObje
   return __pyx_r;
 }
 
-/* "pssh/native/_ssh2.pyx":105
+/* "pssh/native/_ssh2.pyx":128
  * 
  * 
  * def wait_select_ssh(session, timeout=None):             # <<<<<<<<<<<<<<
@@ -3069,7 +3222,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_6wait_select_ssh(PyObject *__pyx_
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "wait_select_ssh") < 0)) __PYX_ERR(0, 105, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "wait_select_ssh") < 0)) __PYX_ERR(0, 128, __pyx_L3_error)
       }
     } else {
       switch (PyTuple_GET_SIZE(__pyx_args)) {
@@ -3085,7 +3238,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_6wait_select_ssh(PyObject *__pyx_
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("wait_select_ssh", 0, 1, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 105, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("wait_select_ssh", 0, 1, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 128, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("pssh.native._ssh2.wait_select_ssh", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
@@ -3117,7 +3270,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
   __Pyx_RefNannySetupContext("wait_select_ssh", 0);
   __Pyx_INCREF(__pyx_v_timeout);
 
-  /* "pssh/native/_ssh2.pyx":107
+  /* "pssh/native/_ssh2.pyx":130
  * def wait_select_ssh(session, timeout=None):
  *     """ssh-python based co-operative gevent select on session socket."""
  *     cdef int events = 0             # <<<<<<<<<<<<<<
@@ -3126,14 +3279,14 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
  */
   __pyx_v_events = 0;
 
-  /* "pssh/native/_ssh2.pyx":108
+  /* "pssh/native/_ssh2.pyx":131
  *     """ssh-python based co-operative gevent select on session socket."""
  *     cdef int events = 0
  *     cdef int directions = session.get_poll_flags()             # <<<<<<<<<<<<<<
  *     if directions == 0:
  *         return 0
  */
-  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_v_session, __pyx_n_s_get_poll_flags); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 108, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_v_session, __pyx_n_s_get_poll_flags); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 131, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __pyx_t_3 = NULL;
   if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
@@ -3147,14 +3300,14 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
   }
   __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_2);
   __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 108, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 131, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __pyx_t_4 = __Pyx_PyInt_As_int(__pyx_t_1); if (unlikely((__pyx_t_4 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 108, __pyx_L1_error)
+  __pyx_t_4 = __Pyx_PyInt_As_int(__pyx_t_1); if (unlikely((__pyx_t_4 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 131, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __pyx_v_directions = __pyx_t_4;
 
-  /* "pssh/native/_ssh2.pyx":109
+  /* "pssh/native/_ssh2.pyx":132
  *     cdef int events = 0
  *     cdef int directions = session.get_poll_flags()
  *     if directions == 0:             # <<<<<<<<<<<<<<
@@ -3164,7 +3317,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
   __pyx_t_5 = ((__pyx_v_directions == 0) != 0);
   if (__pyx_t_5) {
 
-    /* "pssh/native/_ssh2.pyx":110
+    /* "pssh/native/_ssh2.pyx":133
  *     cdef int directions = session.get_poll_flags()
  *     if directions == 0:
  *         return 0             # <<<<<<<<<<<<<<
@@ -3176,7 +3329,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
     __pyx_r = __pyx_int_0;
     goto __pyx_L0;
 
-    /* "pssh/native/_ssh2.pyx":109
+    /* "pssh/native/_ssh2.pyx":132
  *     cdef int events = 0
  *     cdef int directions = session.get_poll_flags()
  *     if directions == 0:             # <<<<<<<<<<<<<<
@@ -3185,19 +3338,19 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
  */
   }
 
-  /* "pssh/native/_ssh2.pyx":111
+  /* "pssh/native/_ssh2.pyx":134
  *     if directions == 0:
  *         return 0
  *     _socket = session.sock             # <<<<<<<<<<<<<<
  *     timeout = timeout * 1000 if timeout is not None else None
  *     if directions & _SSH_READ_PENDING:
  */
-  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_session, __pyx_n_s_sock); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 111, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_session, __pyx_n_s_sock); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 134, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_v__socket = __pyx_t_1;
   __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":112
+  /* "pssh/native/_ssh2.pyx":135
  *         return 0
  *     _socket = session.sock
  *     timeout = timeout * 1000 if timeout is not None else None             # <<<<<<<<<<<<<<
@@ -3206,7 +3359,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
  */
   __pyx_t_5 = (__pyx_v_timeout != Py_None);
   if ((__pyx_t_5 != 0)) {
-    __pyx_t_2 = PyNumber_Multiply(__pyx_v_timeout, __pyx_int_1000); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 112, __pyx_L1_error)
+    __pyx_t_2 = PyNumber_Multiply(__pyx_v_timeout, __pyx_int_1000); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 135, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_2);
     __pyx_t_1 = __pyx_t_2;
     __pyx_t_2 = 0;
@@ -3217,7 +3370,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
   __Pyx_DECREF_SET(__pyx_v_timeout, __pyx_t_1);
   __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":113
+  /* "pssh/native/_ssh2.pyx":136
  *     _socket = session.sock
  *     timeout = timeout * 1000 if timeout is not None else None
  *     if directions & _SSH_READ_PENDING:             # <<<<<<<<<<<<<<
@@ -3227,7 +3380,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
   __pyx_t_5 = ((__pyx_v_directions & __pyx_v_4pssh_6native_5_ssh2__SSH_READ_PENDING) != 0);
   if (__pyx_t_5) {
 
-    /* "pssh/native/_ssh2.pyx":114
+    /* "pssh/native/_ssh2.pyx":137
  *     timeout = timeout * 1000 if timeout is not None else None
  *     if directions & _SSH_READ_PENDING:
  *         events = _POLLIN             # <<<<<<<<<<<<<<
@@ -3236,7 +3389,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
  */
     __pyx_v_events = __pyx_v_4pssh_6native_5_ssh2__POLLIN;
 
-    /* "pssh/native/_ssh2.pyx":113
+    /* "pssh/native/_ssh2.pyx":136
  *     _socket = session.sock
  *     timeout = timeout * 1000 if timeout is not None else None
  *     if directions & _SSH_READ_PENDING:             # <<<<<<<<<<<<<<
@@ -3245,7 +3398,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
  */
   }
 
-  /* "pssh/native/_ssh2.pyx":115
+  /* "pssh/native/_ssh2.pyx":138
  *     if directions & _SSH_READ_PENDING:
  *         events = _POLLIN
  *     if directions & _SSH_WRITE_PENDING:             # <<<<<<<<<<<<<<
@@ -3255,7 +3408,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
   __pyx_t_5 = ((__pyx_v_directions & __pyx_v_4pssh_6native_5_ssh2__SSH_WRITE_PENDING) != 0);
   if (__pyx_t_5) {
 
-    /* "pssh/native/_ssh2.pyx":116
+    /* "pssh/native/_ssh2.pyx":139
  *         events = _POLLIN
  *     if directions & _SSH_WRITE_PENDING:
  *         events |= _POLLOUT             # <<<<<<<<<<<<<<
@@ -3264,7 +3417,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
  */
     __pyx_v_events = (__pyx_v_events | __pyx_v_4pssh_6native_5_ssh2__POLLOUT);
 
-    /* "pssh/native/_ssh2.pyx":115
+    /* "pssh/native/_ssh2.pyx":138
  *     if directions & _SSH_READ_PENDING:
  *         events = _POLLIN
  *     if directions & _SSH_WRITE_PENDING:             # <<<<<<<<<<<<<<
@@ -3273,14 +3426,14 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
  */
   }
 
-  /* "pssh/native/_ssh2.pyx":117
+  /* "pssh/native/_ssh2.pyx":140
  *     if directions & _SSH_WRITE_PENDING:
  *         events |= _POLLOUT
  *     poller = poll()             # <<<<<<<<<<<<<<
  *     poller.register(_socket, eventmask=events)
  *     poller.poll(timeout=timeout)
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_poll); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 117, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_poll); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 140, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __pyx_t_3 = NULL;
   if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_2))) {
@@ -3294,58 +3447,58 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
   }
   __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_t_3) : __Pyx_PyObject_CallNoArg(__pyx_t_2);
   __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
-  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 117, __pyx_L1_error)
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 140, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_poller = __pyx_t_1;
   __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":118
+  /* "pssh/native/_ssh2.pyx":141
  *         events |= _POLLOUT
  *     poller = poll()
  *     poller.register(_socket, eventmask=events)             # <<<<<<<<<<<<<<
  *     poller.poll(timeout=timeout)
  * 
  */
-  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_poller, __pyx_n_s_register); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 118, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_poller, __pyx_n_s_register); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 141, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = PyTuple_New(1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 118, __pyx_L1_error)
+  __pyx_t_2 = PyTuple_New(1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 141, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_INCREF(__pyx_v__socket);
   __Pyx_GIVEREF(__pyx_v__socket);
   PyTuple_SET_ITEM(__pyx_t_2, 0, __pyx_v__socket);
-  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 118, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 141, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
-  __pyx_t_6 = __Pyx_PyInt_From_int(__pyx_v_events); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 118, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyInt_From_int(__pyx_v_events); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 141, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
-  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_eventmask, __pyx_t_6) < 0) __PYX_ERR(0, 118, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_eventmask, __pyx_t_6) < 0) __PYX_ERR(0, 141, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_1, __pyx_t_2, __pyx_t_3); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 118, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_1, __pyx_t_2, __pyx_t_3); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 141, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
 
-  /* "pssh/native/_ssh2.pyx":119
+  /* "pssh/native/_ssh2.pyx":142
  *     poller = poll()
  *     poller.register(_socket, eventmask=events)
  *     poller.poll(timeout=timeout)             # <<<<<<<<<<<<<<
  * 
  * 
  */
-  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_poller, __pyx_n_s_poll); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 119, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_v_poller, __pyx_n_s_poll); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 142, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
-  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 119, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 142, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
-  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_timeout, __pyx_v_timeout) < 0) __PYX_ERR(0, 119, __pyx_L1_error)
-  __pyx_t_2 = __Pyx_PyObject_Call(__pyx_t_6, __pyx_empty_tuple, __pyx_t_3); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 119, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_t_3, __pyx_n_s_timeout, __pyx_v_timeout) < 0) __PYX_ERR(0, 142, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_Call(__pyx_t_6, __pyx_empty_tuple, __pyx_t_3); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 142, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
   __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":105
+  /* "pssh/native/_ssh2.pyx":128
  * 
  * 
  * def wait_select_ssh(session, timeout=None):             # <<<<<<<<<<<<<<
@@ -3372,7 +3525,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_5wait_select_ssh(CYTHON_UNUSED Py
   return __pyx_r;
 }
 
-/* "pssh/native/_ssh2.pyx":122
+/* "pssh/native/_ssh2.pyx":145
  * 
  * 
  * def eagain_write(write_func, data, session, timeout=None):             # <<<<<<<<<<<<<<
@@ -3423,13 +3576,13 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_8eagain_write(PyObject *__pyx_sel
         case  1:
         if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_data)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("eagain_write", 0, 3, 4, 1); __PYX_ERR(0, 122, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("eagain_write", 0, 3, 4, 1); __PYX_ERR(0, 145, __pyx_L3_error)
         }
         CYTHON_FALLTHROUGH;
         case  2:
         if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_session)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("eagain_write", 0, 3, 4, 2); __PYX_ERR(0, 122, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("eagain_write", 0, 3, 4, 2); __PYX_ERR(0, 145, __pyx_L3_error)
         }
         CYTHON_FALLTHROUGH;
         case  3:
@@ -3439,7 +3592,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_8eagain_write(PyObject *__pyx_sel
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "eagain_write") < 0)) __PYX_ERR(0, 122, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "eagain_write") < 0)) __PYX_ERR(0, 145, __pyx_L3_error)
       }
     } else {
       switch (PyTuple_GET_SIZE(__pyx_args)) {
@@ -3459,7 +3612,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_8eagain_write(PyObject *__pyx_sel
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("eagain_write", 0, 3, 4, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 122, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("eagain_write", 0, 3, 4, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 145, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("pssh.native._ssh2.eagain_write", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
@@ -3493,17 +3646,17 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("eagain_write", 0);
 
-  /* "pssh/native/_ssh2.pyx":127
+  /* "pssh/native/_ssh2.pyx":150
  *     write_func.
  *     """
  *     cdef Py_ssize_t data_len = len(data)             # <<<<<<<<<<<<<<
  *     cdef size_t total_written = 0
  *     cdef int rc
  */
-  __pyx_t_1 = PyObject_Length(__pyx_v_data); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 127, __pyx_L1_error)
+  __pyx_t_1 = PyObject_Length(__pyx_v_data); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 150, __pyx_L1_error)
   __pyx_v_data_len = __pyx_t_1;
 
-  /* "pssh/native/_ssh2.pyx":128
+  /* "pssh/native/_ssh2.pyx":151
  *     """
  *     cdef Py_ssize_t data_len = len(data)
  *     cdef size_t total_written = 0             # <<<<<<<<<<<<<<
@@ -3512,7 +3665,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
  */
   __pyx_v_total_written = 0;
 
-  /* "pssh/native/_ssh2.pyx":131
+  /* "pssh/native/_ssh2.pyx":154
  *     cdef int rc
  *     cdef size_t bytes_written
  *     while total_written < data_len:             # <<<<<<<<<<<<<<
@@ -3523,14 +3676,14 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
     __pyx_t_2 = ((__pyx_v_total_written < __pyx_v_data_len) != 0);
     if (!__pyx_t_2) break;
 
-    /* "pssh/native/_ssh2.pyx":132
+    /* "pssh/native/_ssh2.pyx":155
  *     cdef size_t bytes_written
  *     while total_written < data_len:
  *         rc, bytes_written = write_func(data[total_written:])             # <<<<<<<<<<<<<<
  *         total_written += bytes_written
  *         if rc == _LIBSSH2_ERROR_EAGAIN:
  */
-    __pyx_t_4 = __Pyx_PyObject_GetSlice(__pyx_v_data, __pyx_v_total_written, 0, NULL, NULL, NULL, 1, 0, 0); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 132, __pyx_L1_error)
+    __pyx_t_4 = __Pyx_PyObject_GetSlice(__pyx_v_data, __pyx_v_total_written, 0, NULL, NULL, NULL, 1, 0, 0); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 155, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_4);
     __Pyx_INCREF(__pyx_v_write_func);
     __pyx_t_5 = __pyx_v_write_func; __pyx_t_6 = NULL;
@@ -3546,7 +3699,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
     __pyx_t_3 = (__pyx_t_6) ? __Pyx_PyObject_Call2Args(__pyx_t_5, __pyx_t_6, __pyx_t_4) : __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_t_4);
     __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
     __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-    if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 132, __pyx_L1_error)
+    if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 155, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_3);
     __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
     if ((likely(PyTuple_CheckExact(__pyx_t_3))) || (PyList_CheckExact(__pyx_t_3))) {
@@ -3555,7 +3708,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
       if (unlikely(size != 2)) {
         if (size > 2) __Pyx_RaiseTooManyValuesError(2);
         else if (size >= 0) __Pyx_RaiseNeedMoreValuesError(size);
-        __PYX_ERR(0, 132, __pyx_L1_error)
+        __PYX_ERR(0, 155, __pyx_L1_error)
       }
       #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
       if (likely(PyTuple_CheckExact(sequence))) {
@@ -3568,15 +3721,15 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
       __Pyx_INCREF(__pyx_t_5);
       __Pyx_INCREF(__pyx_t_4);
       #else
-      __pyx_t_5 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 132, __pyx_L1_error)
+      __pyx_t_5 = PySequence_ITEM(sequence, 0); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 155, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_5);
-      __pyx_t_4 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 132, __pyx_L1_error)
+      __pyx_t_4 = PySequence_ITEM(sequence, 1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 155, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_4);
       #endif
       __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
     } else {
       Py_ssize_t index = -1;
-      __pyx_t_6 = PyObject_GetIter(__pyx_t_3); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 132, __pyx_L1_error)
+      __pyx_t_6 = PyObject_GetIter(__pyx_t_3); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 155, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
       __pyx_t_7 = Py_TYPE(__pyx_t_6)->tp_iternext;
@@ -3584,7 +3737,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
       __Pyx_GOTREF(__pyx_t_5);
       index = 1; __pyx_t_4 = __pyx_t_7(__pyx_t_6); if (unlikely(!__pyx_t_4)) goto __pyx_L5_unpacking_failed;
       __Pyx_GOTREF(__pyx_t_4);
-      if (__Pyx_IternextUnpackEndCheck(__pyx_t_7(__pyx_t_6), 2) < 0) __PYX_ERR(0, 132, __pyx_L1_error)
+      if (__Pyx_IternextUnpackEndCheck(__pyx_t_7(__pyx_t_6), 2) < 0) __PYX_ERR(0, 155, __pyx_L1_error)
       __pyx_t_7 = NULL;
       __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
       goto __pyx_L6_unpacking_done;
@@ -3592,17 +3745,17 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
       __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
       __pyx_t_7 = NULL;
       if (__Pyx_IterFinish() == 0) __Pyx_RaiseNeedMoreValuesError(index);
-      __PYX_ERR(0, 132, __pyx_L1_error)
+      __PYX_ERR(0, 155, __pyx_L1_error)
       __pyx_L6_unpacking_done:;
     }
-    __pyx_t_8 = __Pyx_PyInt_As_int(__pyx_t_5); if (unlikely((__pyx_t_8 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 132, __pyx_L1_error)
+    __pyx_t_8 = __Pyx_PyInt_As_int(__pyx_t_5); if (unlikely((__pyx_t_8 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 155, __pyx_L1_error)
     __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-    __pyx_t_9 = __Pyx_PyInt_As_size_t(__pyx_t_4); if (unlikely((__pyx_t_9 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 132, __pyx_L1_error)
+    __pyx_t_9 = __Pyx_PyInt_As_size_t(__pyx_t_4); if (unlikely((__pyx_t_9 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 155, __pyx_L1_error)
     __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
     __pyx_v_rc = __pyx_t_8;
     __pyx_v_bytes_written = __pyx_t_9;
 
-    /* "pssh/native/_ssh2.pyx":133
+    /* "pssh/native/_ssh2.pyx":156
  *     while total_written < data_len:
  *         rc, bytes_written = write_func(data[total_written:])
  *         total_written += bytes_written             # <<<<<<<<<<<<<<
@@ -3611,7 +3764,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
  */
     __pyx_v_total_written = (__pyx_v_total_written + __pyx_v_bytes_written);
 
-    /* "pssh/native/_ssh2.pyx":134
+    /* "pssh/native/_ssh2.pyx":157
  *         rc, bytes_written = write_func(data[total_written:])
  *         total_written += bytes_written
  *         if rc == _LIBSSH2_ERROR_EAGAIN:             # <<<<<<<<<<<<<<
@@ -3621,31 +3774,31 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
     __pyx_t_2 = ((__pyx_v_rc == __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_ERROR_EAGAIN) != 0);
     if (__pyx_t_2) {
 
-      /* "pssh/native/_ssh2.pyx":135
+      /* "pssh/native/_ssh2.pyx":158
  *         total_written += bytes_written
  *         if rc == _LIBSSH2_ERROR_EAGAIN:
  *             wait_select(session, timeout=timeout)             # <<<<<<<<<<<<<<
  * 
  * 
  */
-      __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_wait_select); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 135, __pyx_L1_error)
+      __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_wait_select); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 158, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_3);
-      __pyx_t_4 = PyTuple_New(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 135, __pyx_L1_error)
+      __pyx_t_4 = PyTuple_New(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 158, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_4);
       __Pyx_INCREF(__pyx_v_session);
       __Pyx_GIVEREF(__pyx_v_session);
       PyTuple_SET_ITEM(__pyx_t_4, 0, __pyx_v_session);
-      __pyx_t_5 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 135, __pyx_L1_error)
+      __pyx_t_5 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 158, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_5);
-      if (PyDict_SetItem(__pyx_t_5, __pyx_n_s_timeout, __pyx_v_timeout) < 0) __PYX_ERR(0, 135, __pyx_L1_error)
-      __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_4, __pyx_t_5); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 135, __pyx_L1_error)
+      if (PyDict_SetItem(__pyx_t_5, __pyx_n_s_timeout, __pyx_v_timeout) < 0) __PYX_ERR(0, 158, __pyx_L1_error)
+      __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_4, __pyx_t_5); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 158, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
       __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
       __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
       __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
 
-      /* "pssh/native/_ssh2.pyx":134
+      /* "pssh/native/_ssh2.pyx":157
  *         rc, bytes_written = write_func(data[total_written:])
  *         total_written += bytes_written
  *         if rc == _LIBSSH2_ERROR_EAGAIN:             # <<<<<<<<<<<<<<
@@ -3655,7 +3808,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
     }
   }
 
-  /* "pssh/native/_ssh2.pyx":122
+  /* "pssh/native/_ssh2.pyx":145
  * 
  * 
  * def eagain_write(write_func, data, session, timeout=None):             # <<<<<<<<<<<<<<
@@ -3679,7 +3832,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_7eagain_write(CYTHON_UNUSED PyObj
   return __pyx_r;
 }
 
-/* "pssh/native/_ssh2.pyx":138
+/* "pssh/native/_ssh2.pyx":161
  * 
  * 
  * def eagain_ssh(session, func, *args, **kwargs):             # <<<<<<<<<<<<<<
@@ -3738,12 +3891,12 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_10eagain_ssh(PyObject *__pyx_self
         case  1:
         if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_func)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("eagain_ssh", 0, 2, 2, 1); __PYX_ERR(0, 138, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("eagain_ssh", 0, 2, 2, 1); __PYX_ERR(0, 161, __pyx_L3_error)
         }
       }
       if (unlikely(kw_args > 0)) {
         const Py_ssize_t used_pos_args = (pos_args < 2) ? pos_args : 2;
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, __pyx_v_kwargs, values, used_pos_args, "eagain_ssh") < 0)) __PYX_ERR(0, 138, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, __pyx_v_kwargs, values, used_pos_args, "eagain_ssh") < 0)) __PYX_ERR(0, 161, __pyx_L3_error)
       }
     } else if (PyTuple_GET_SIZE(__pyx_args) < 2) {
       goto __pyx_L5_argtuple_error;
@@ -3756,7 +3909,7 @@ static PyObject *__pyx_pw_4pssh_6native_5_ssh2_10eagain_ssh(PyObject *__pyx_self
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("eagain_ssh", 0, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 138, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("eagain_ssh", 0, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 161, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_DECREF(__pyx_v_args); __pyx_v_args = 0;
   __Pyx_DECREF(__pyx_v_kwargs); __pyx_v_kwargs = 0;
@@ -3779,9 +3932,9 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_9eagain_ssh(CYTHON_UNUSED PyObjec
   PyObject *__pyx_r = NULL;
   __Pyx_RefNannyDeclarations
   PyObject *__pyx_t_1 = NULL;
-  int __pyx_t_2;
+  PyObject *__pyx_t_2 = NULL;
   int __pyx_t_3;
-  PyObject *__pyx_t_4 = NULL;
+  int __pyx_t_4;
   PyObject *__pyx_t_5 = NULL;
   PyObject *__pyx_t_6 = NULL;
   int __pyx_t_7;
@@ -3791,32 +3944,35 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_9eagain_ssh(CYTHON_UNUSED PyObjec
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("eagain_ssh", 0);
 
-  /* "pssh/native/_ssh2.pyx":140
+  /* "pssh/native/_ssh2.pyx":163
  * def eagain_ssh(session, func, *args, **kwargs):
  *     """Run function given and handle EAGAIN for an ssh-python session"""
  *     timeout = kwargs.pop('timeout', None)             # <<<<<<<<<<<<<<
  *     cdef int ret = func(*args, **kwargs)
  *     while ret == _SSH_AGAIN:
  */
-  __pyx_t_1 = __Pyx_PyDict_Pop(__pyx_v_kwargs, __pyx_n_u_timeout, Py_None); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 140, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyDict_Pop(__pyx_v_kwargs, __pyx_n_u_timeout, Py_None); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 163, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_v_timeout = __pyx_t_1;
   __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":141
+  /* "pssh/native/_ssh2.pyx":164
  *     """Run function given and handle EAGAIN for an ssh-python session"""
  *     timeout = kwargs.pop('timeout', None)
  *     cdef int ret = func(*args, **kwargs)             # <<<<<<<<<<<<<<
  *     while ret == _SSH_AGAIN:
  *         wait_select_ssh(session, timeout=timeout)
  */
-  __pyx_t_1 = __Pyx_PyObject_Call(__pyx_v_func, __pyx_v_args, __pyx_v_kwargs); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 141, __pyx_L1_error)
+  __pyx_t_1 = PyDict_Copy(__pyx_v_kwargs); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 164, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = __Pyx_PyInt_As_int(__pyx_t_1); if (unlikely((__pyx_t_2 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 141, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_Call(__pyx_v_func, __pyx_v_args, __pyx_t_1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 164, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_v_ret = __pyx_t_2;
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 164, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_v_ret = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":142
+  /* "pssh/native/_ssh2.pyx":165
  *     timeout = kwargs.pop('timeout', None)
  *     cdef int ret = func(*args, **kwargs)
  *     while ret == _SSH_AGAIN:             # <<<<<<<<<<<<<<
@@ -3824,47 +3980,50 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_9eagain_ssh(CYTHON_UNUSED PyObjec
  *         ret = func(*args, **kwargs)
  */
   while (1) {
-    __pyx_t_3 = ((__pyx_v_ret == __pyx_v_4pssh_6native_5_ssh2__SSH_AGAIN) != 0);
-    if (!__pyx_t_3) break;
+    __pyx_t_4 = ((__pyx_v_ret == __pyx_v_4pssh_6native_5_ssh2__SSH_AGAIN) != 0);
+    if (!__pyx_t_4) break;
 
-    /* "pssh/native/_ssh2.pyx":143
+    /* "pssh/native/_ssh2.pyx":166
  *     cdef int ret = func(*args, **kwargs)
  *     while ret == _SSH_AGAIN:
  *         wait_select_ssh(session, timeout=timeout)             # <<<<<<<<<<<<<<
  *         ret = func(*args, **kwargs)
  *         if ret == _SSH_AGAIN and timeout is not None:
  */
-    __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_wait_select_ssh); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 143, __pyx_L1_error)
+    __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_wait_select_ssh); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 166, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __pyx_t_1 = PyTuple_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 166, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_1);
-    __pyx_t_4 = PyTuple_New(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 143, __pyx_L1_error)
-    __Pyx_GOTREF(__pyx_t_4);
     __Pyx_INCREF(__pyx_v_session);
     __Pyx_GIVEREF(__pyx_v_session);
-    PyTuple_SET_ITEM(__pyx_t_4, 0, __pyx_v_session);
-    __pyx_t_5 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 143, __pyx_L1_error)
+    PyTuple_SET_ITEM(__pyx_t_1, 0, __pyx_v_session);
+    __pyx_t_5 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 166, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_5);
-    if (PyDict_SetItem(__pyx_t_5, __pyx_n_s_timeout, __pyx_v_timeout) < 0) __PYX_ERR(0, 143, __pyx_L1_error)
-    __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_1, __pyx_t_4, __pyx_t_5); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 143, __pyx_L1_error)
+    if (PyDict_SetItem(__pyx_t_5, __pyx_n_s_timeout, __pyx_v_timeout) < 0) __PYX_ERR(0, 166, __pyx_L1_error)
+    __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_2, __pyx_t_1, __pyx_t_5); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 166, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_6);
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
     __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
     __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
 
-    /* "pssh/native/_ssh2.pyx":144
+    /* "pssh/native/_ssh2.pyx":167
  *     while ret == _SSH_AGAIN:
  *         wait_select_ssh(session, timeout=timeout)
  *         ret = func(*args, **kwargs)             # <<<<<<<<<<<<<<
  *         if ret == _SSH_AGAIN and timeout is not None:
  *             raise Timeout
  */
-    __pyx_t_6 = __Pyx_PyObject_Call(__pyx_v_func, __pyx_v_args, __pyx_v_kwargs); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 144, __pyx_L1_error)
+    __pyx_t_6 = PyDict_Copy(__pyx_v_kwargs); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 167, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_6);
-    __pyx_t_2 = __Pyx_PyInt_As_int(__pyx_t_6); if (unlikely((__pyx_t_2 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 144, __pyx_L1_error)
+    __pyx_t_5 = __Pyx_PyObject_Call(__pyx_v_func, __pyx_v_args, __pyx_t_6); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 167, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
     __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-    __pyx_v_ret = __pyx_t_2;
+    __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_5); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 167, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+    __pyx_v_ret = __pyx_t_3;
 
-    /* "pssh/native/_ssh2.pyx":145
+    /* "pssh/native/_ssh2.pyx":168
  *         wait_select_ssh(session, timeout=timeout)
  *         ret = func(*args, **kwargs)
  *         if ret == _SSH_AGAIN and timeout is not None:             # <<<<<<<<<<<<<<
@@ -3874,28 +4033,28 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_9eagain_ssh(CYTHON_UNUSED PyObjec
     __pyx_t_7 = ((__pyx_v_ret == __pyx_v_4pssh_6native_5_ssh2__SSH_AGAIN) != 0);
     if (__pyx_t_7) {
     } else {
-      __pyx_t_3 = __pyx_t_7;
+      __pyx_t_4 = __pyx_t_7;
       goto __pyx_L6_bool_binop_done;
     }
     __pyx_t_7 = (__pyx_v_timeout != Py_None);
     __pyx_t_8 = (__pyx_t_7 != 0);
-    __pyx_t_3 = __pyx_t_8;
+    __pyx_t_4 = __pyx_t_8;
     __pyx_L6_bool_binop_done:;
-    if (unlikely(__pyx_t_3)) {
+    if (unlikely(__pyx_t_4)) {
 
-      /* "pssh/native/_ssh2.pyx":146
+      /* "pssh/native/_ssh2.pyx":169
  *         ret = func(*args, **kwargs)
  *         if ret == _SSH_AGAIN and timeout is not None:
  *             raise Timeout             # <<<<<<<<<<<<<<
  *     return ret
  */
-      __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_Timeout); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 146, __pyx_L1_error)
-      __Pyx_GOTREF(__pyx_t_6);
-      __Pyx_Raise(__pyx_t_6, 0, 0, 0);
-      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-      __PYX_ERR(0, 146, __pyx_L1_error)
+      __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_Timeout); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 169, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_5);
+      __Pyx_Raise(__pyx_t_5, 0, 0, 0);
+      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+      __PYX_ERR(0, 169, __pyx_L1_error)
 
-      /* "pssh/native/_ssh2.pyx":145
+      /* "pssh/native/_ssh2.pyx":168
  *         wait_select_ssh(session, timeout=timeout)
  *         ret = func(*args, **kwargs)
  *         if ret == _SSH_AGAIN and timeout is not None:             # <<<<<<<<<<<<<<
@@ -3905,19 +4064,19 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_9eagain_ssh(CYTHON_UNUSED PyObjec
     }
   }
 
-  /* "pssh/native/_ssh2.pyx":147
+  /* "pssh/native/_ssh2.pyx":170
  *         if ret == _SSH_AGAIN and timeout is not None:
  *             raise Timeout
  *     return ret             # <<<<<<<<<<<<<<
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_6 = __Pyx_PyInt_From_int(__pyx_v_ret); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 147, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_6);
-  __pyx_r = __pyx_t_6;
-  __pyx_t_6 = 0;
+  __pyx_t_5 = __Pyx_PyInt_From_int(__pyx_v_ret); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 170, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_r = __pyx_t_5;
+  __pyx_t_5 = 0;
   goto __pyx_L0;
 
-  /* "pssh/native/_ssh2.pyx":138
+  /* "pssh/native/_ssh2.pyx":161
  * 
  * 
  * def eagain_ssh(session, func, *args, **kwargs):             # <<<<<<<<<<<<<<
@@ -3928,7 +4087,7 @@ static PyObject *__pyx_pf_4pssh_6native_5_ssh2_9eagain_ssh(CYTHON_UNUSED PyObjec
   /* function exit code */
   __pyx_L1_error:;
   __Pyx_XDECREF(__pyx_t_1);
-  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_2);
   __Pyx_XDECREF(__pyx_t_5);
   __Pyx_XDECREF(__pyx_t_6);
   __Pyx_AddTraceback("pssh.native._ssh2.eagain_ssh", __pyx_clineno, __pyx_lineno, __pyx_filename);
@@ -4064,12 +4223,15 @@ static PyTypeObject __pyx_type_4pssh_6native_5_ssh2___pyx_scope_struct___read_ou
   #if PY_VERSION_HEX >= 0x030400a1
   0, /*tp_finalize*/
   #endif
-  #if PY_VERSION_HEX >= 0x030800b1
+  #if PY_VERSION_HEX >= 0x030800b1 && (!CYTHON_COMPILING_IN_PYPY || PYPY_VERSION_NUM >= 0x07030800)
   0, /*tp_vectorcall*/
   #endif
   #if PY_VERSION_HEX >= 0x030800b4 && PY_VERSION_HEX < 0x03090000
   0, /*tp_print*/
   #endif
+  #if CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX >= 0x03090000 && PY_VERSION_HEX < 0x030a0000
+  0, /*tp_pypy_flags*/
+  #endif
 };
 
 static PyMethodDef __pyx_methods[] = {
@@ -4128,11 +4290,11 @@ static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_SSH_READ_PENDING, __pyx_k_SSH_READ_PENDING, sizeof(__pyx_k_SSH_READ_PENDING), 0, 0, 1, 1},
   {&__pyx_n_s_SSH_WRITE_PENDING, __pyx_k_SSH_WRITE_PENDING, sizeof(__pyx_k_SSH_WRITE_PENDING), 0, 0, 1, 1},
   {&__pyx_n_s_Timeout, __pyx_k_Timeout, sizeof(__pyx_k_Timeout), 0, 0, 1, 1},
-  {&__pyx_kp_b__2, __pyx_k__2, sizeof(__pyx_k__2), 0, 0, 0, 0},
-  {&__pyx_kp_b__3, __pyx_k__3, sizeof(__pyx_k__3), 0, 0, 0, 0},
   {&__pyx_n_s_args, __pyx_k_args, sizeof(__pyx_k_args), 0, 0, 1, 1},
   {&__pyx_n_s_block_directions, __pyx_k_block_directions, sizeof(__pyx_k_block_directions), 0, 0, 1, 1},
   {&__pyx_n_s_bytes_written, __pyx_k_bytes_written, sizeof(__pyx_k_bytes_written), 0, 0, 1, 1},
+  {&__pyx_n_s_c_data, __pyx_k_c_data, sizeof(__pyx_k_c_data), 0, 0, 1, 1},
+  {&__pyx_n_s_c_remainder, __pyx_k_c_remainder, sizeof(__pyx_k_c_remainder), 0, 0, 1, 1},
   {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
   {&__pyx_n_s_close, __pyx_k_close, sizeof(__pyx_k_close), 0, 0, 1, 1},
   {&__pyx_n_s_data, __pyx_k_data, sizeof(__pyx_k_data), 0, 0, 1, 1},
@@ -4144,13 +4306,13 @@ static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_eventmask, __pyx_k_eventmask, sizeof(__pyx_k_eventmask), 0, 0, 1, 1},
   {&__pyx_n_s_events, __pyx_k_events, sizeof(__pyx_k_events), 0, 0, 1, 1},
   {&__pyx_n_s_exceptions, __pyx_k_exceptions, sizeof(__pyx_k_exceptions), 0, 0, 1, 1},
-  {&__pyx_n_s_find, __pyx_k_find, sizeof(__pyx_k_find), 0, 0, 1, 1},
   {&__pyx_n_s_func, __pyx_k_func, sizeof(__pyx_k_func), 0, 0, 1, 1},
   {&__pyx_n_s_get_poll_flags, __pyx_k_get_poll_flags, sizeof(__pyx_k_get_poll_flags), 0, 0, 1, 1},
   {&__pyx_n_s_gevent, __pyx_k_gevent, sizeof(__pyx_k_gevent), 0, 0, 1, 1},
   {&__pyx_n_s_gevent_select, __pyx_k_gevent_select, sizeof(__pyx_k_gevent_select), 0, 0, 1, 1},
   {&__pyx_n_s_import, __pyx_k_import, sizeof(__pyx_k_import), 0, 0, 1, 1},
   {&__pyx_n_s_kwargs, __pyx_k_kwargs, sizeof(__pyx_k_kwargs), 0, 0, 1, 1},
+  {&__pyx_n_s_line_end, __pyx_k_line_end, sizeof(__pyx_k_line_end), 0, 0, 1, 1},
   {&__pyx_n_s_linesep, __pyx_k_linesep, sizeof(__pyx_k_linesep), 0, 0, 1, 1},
   {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
   {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
@@ -4165,9 +4327,7 @@ static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_read_output, __pyx_k_read_output, sizeof(__pyx_k_read_output), 0, 0, 1, 1},
   {&__pyx_n_s_register, __pyx_k_register, sizeof(__pyx_k_register), 0, 0, 1, 1},
   {&__pyx_n_s_remainder, __pyx_k_remainder, sizeof(__pyx_k_remainder), 0, 0, 1, 1},
-  {&__pyx_n_s_remainder_len, __pyx_k_remainder_len, sizeof(__pyx_k_remainder_len), 0, 0, 1, 1},
   {&__pyx_n_s_ret, __pyx_k_ret, sizeof(__pyx_k_ret), 0, 0, 1, 1},
-  {&__pyx_n_s_rstrip, __pyx_k_rstrip, sizeof(__pyx_k_rstrip), 0, 0, 1, 1},
   {&__pyx_n_s_send, __pyx_k_send, sizeof(__pyx_k_send), 0, 0, 1, 1},
   {&__pyx_n_s_session, __pyx_k_session, sizeof(__pyx_k_session), 0, 0, 1, 1},
   {&__pyx_n_s_size, __pyx_k_size, sizeof(__pyx_k_size), 0, 0, 1, 1},
@@ -4197,65 +4357,65 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
 
-  /* "pssh/native/_ssh2.pyx":41
+  /* "pssh/native/_ssh2.pyx":52
  * 
  * 
  * def _read_output(session, read_func, timeout=None):             # <<<<<<<<<<<<<<
- *     cdef Py_ssize_t _size
- *     cdef bytes _data
+ *     """Read from ``read_func`` and yield output line by line, without line
+ *     separator and trailing whitespace.
  */
-  __pyx_tuple__4 = PyTuple_Pack(10, __pyx_n_s_session, __pyx_n_s_read_func, __pyx_n_s_timeout, __pyx_n_s_size, __pyx_n_s_data_2, __pyx_n_s_remainder, __pyx_n_s_remainder_len, __pyx_n_s_pos, __pyx_n_s_linesep, __pyx_n_s_t); if (unlikely(!__pyx_tuple__4)) __PYX_ERR(0, 41, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__4);
-  __Pyx_GIVEREF(__pyx_tuple__4);
-  __pyx_codeobj_ = (PyObject*)__Pyx_PyCode_New(3, 0, 10, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__4, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_read_output, 41, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj_)) __PYX_ERR(0, 41, __pyx_L1_error)
+  __pyx_tuple__2 = PyTuple_Pack(12, __pyx_n_s_session, __pyx_n_s_read_func, __pyx_n_s_timeout, __pyx_n_s_size, __pyx_n_s_data_2, __pyx_n_s_c_data, __pyx_n_s_linesep, __pyx_n_s_c_remainder, __pyx_n_s_remainder, __pyx_n_s_pos, __pyx_n_s_line_end, __pyx_n_s_t); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__2);
+  __Pyx_GIVEREF(__pyx_tuple__2);
+  __pyx_codeobj_ = (PyObject*)__Pyx_PyCode_New(3, 0, 12, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__2, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_read_output, 52, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj_)) __PYX_ERR(0, 52, __pyx_L1_error)
 
-  /* "pssh/native/_ssh2.pyx":82
+  /* "pssh/native/_ssh2.pyx":105
  * 
  * 
  * def wait_select(session, timeout=None):             # <<<<<<<<<<<<<<
  *     """Perform co-operative gevent select on ssh2 session socket.
  * 
  */
-  __pyx_tuple__5 = PyTuple_Pack(6, __pyx_n_s_session, __pyx_n_s_timeout, __pyx_n_s_events, __pyx_n_s_directions, __pyx_n_s_socket, __pyx_n_s_poller); if (unlikely(!__pyx_tuple__5)) __PYX_ERR(0, 82, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__5);
-  __Pyx_GIVEREF(__pyx_tuple__5);
-  __pyx_codeobj__6 = (PyObject*)__Pyx_PyCode_New(2, 0, 6, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__5, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_wait_select, 82, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__6)) __PYX_ERR(0, 82, __pyx_L1_error)
+  __pyx_tuple__3 = PyTuple_Pack(6, __pyx_n_s_session, __pyx_n_s_timeout, __pyx_n_s_events, __pyx_n_s_directions, __pyx_n_s_socket, __pyx_n_s_poller); if (unlikely(!__pyx_tuple__3)) __PYX_ERR(0, 105, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__3);
+  __Pyx_GIVEREF(__pyx_tuple__3);
+  __pyx_codeobj__4 = (PyObject*)__Pyx_PyCode_New(2, 0, 6, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__3, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_wait_select, 105, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__4)) __PYX_ERR(0, 105, __pyx_L1_error)
 
-  /* "pssh/native/_ssh2.pyx":105
+  /* "pssh/native/_ssh2.pyx":128
  * 
  * 
  * def wait_select_ssh(session, timeout=None):             # <<<<<<<<<<<<<<
  *     """ssh-python based co-operative gevent select on session socket."""
  *     cdef int events = 0
  */
-  __pyx_tuple__7 = PyTuple_Pack(6, __pyx_n_s_session, __pyx_n_s_timeout, __pyx_n_s_events, __pyx_n_s_directions, __pyx_n_s_socket, __pyx_n_s_poller); if (unlikely(!__pyx_tuple__7)) __PYX_ERR(0, 105, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__7);
-  __Pyx_GIVEREF(__pyx_tuple__7);
-  __pyx_codeobj__8 = (PyObject*)__Pyx_PyCode_New(2, 0, 6, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__7, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_wait_select_ssh, 105, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__8)) __PYX_ERR(0, 105, __pyx_L1_error)
+  __pyx_tuple__5 = PyTuple_Pack(6, __pyx_n_s_session, __pyx_n_s_timeout, __pyx_n_s_events, __pyx_n_s_directions, __pyx_n_s_socket, __pyx_n_s_poller); if (unlikely(!__pyx_tuple__5)) __PYX_ERR(0, 128, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__5);
+  __Pyx_GIVEREF(__pyx_tuple__5);
+  __pyx_codeobj__6 = (PyObject*)__Pyx_PyCode_New(2, 0, 6, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__5, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_wait_select_ssh, 128, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__6)) __PYX_ERR(0, 128, __pyx_L1_error)
 
-  /* "pssh/native/_ssh2.pyx":122
+  /* "pssh/native/_ssh2.pyx":145
  * 
  * 
  * def eagain_write(write_func, data, session, timeout=None):             # <<<<<<<<<<<<<<
  *     """Write data with given write_func for an ssh2-python session while
  *     handling EAGAIN and resuming writes from last written byte on each call to
  */
-  __pyx_tuple__9 = PyTuple_Pack(8, __pyx_n_s_write_func, __pyx_n_s_data, __pyx_n_s_session, __pyx_n_s_timeout, __pyx_n_s_data_len, __pyx_n_s_total_written, __pyx_n_s_rc, __pyx_n_s_bytes_written); if (unlikely(!__pyx_tuple__9)) __PYX_ERR(0, 122, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__9);
-  __Pyx_GIVEREF(__pyx_tuple__9);
-  __pyx_codeobj__10 = (PyObject*)__Pyx_PyCode_New(4, 0, 8, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__9, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_eagain_write, 122, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__10)) __PYX_ERR(0, 122, __pyx_L1_error)
+  __pyx_tuple__7 = PyTuple_Pack(8, __pyx_n_s_write_func, __pyx_n_s_data, __pyx_n_s_session, __pyx_n_s_timeout, __pyx_n_s_data_len, __pyx_n_s_total_written, __pyx_n_s_rc, __pyx_n_s_bytes_written); if (unlikely(!__pyx_tuple__7)) __PYX_ERR(0, 145, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__7);
+  __Pyx_GIVEREF(__pyx_tuple__7);
+  __pyx_codeobj__8 = (PyObject*)__Pyx_PyCode_New(4, 0, 8, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__7, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_eagain_write, 145, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__8)) __PYX_ERR(0, 145, __pyx_L1_error)
 
-  /* "pssh/native/_ssh2.pyx":138
+  /* "pssh/native/_ssh2.pyx":161
  * 
  * 
  * def eagain_ssh(session, func, *args, **kwargs):             # <<<<<<<<<<<<<<
  *     """Run function given and handle EAGAIN for an ssh-python session"""
  *     timeout = kwargs.pop('timeout', None)
  */
-  __pyx_tuple__11 = PyTuple_Pack(6, __pyx_n_s_session, __pyx_n_s_func, __pyx_n_s_args, __pyx_n_s_kwargs, __pyx_n_s_timeout, __pyx_n_s_ret); if (unlikely(!__pyx_tuple__11)) __PYX_ERR(0, 138, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__11);
-  __Pyx_GIVEREF(__pyx_tuple__11);
-  __pyx_codeobj__12 = (PyObject*)__Pyx_PyCode_New(2, 0, 6, 0, CO_OPTIMIZED|CO_NEWLOCALS|CO_VARARGS|CO_VARKEYWORDS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__11, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_eagain_ssh, 138, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__12)) __PYX_ERR(0, 138, __pyx_L1_error)
+  __pyx_tuple__9 = PyTuple_Pack(6, __pyx_n_s_session, __pyx_n_s_func, __pyx_n_s_args, __pyx_n_s_kwargs, __pyx_n_s_timeout, __pyx_n_s_ret); if (unlikely(!__pyx_tuple__9)) __PYX_ERR(0, 161, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__9);
+  __Pyx_GIVEREF(__pyx_tuple__9);
+  __pyx_codeobj__10 = (PyObject*)__Pyx_PyCode_New(2, 0, 6, 0, CO_OPTIMIZED|CO_NEWLOCALS|CO_VARARGS|CO_VARKEYWORDS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__9, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_pssh_native__ssh2_pyx, __pyx_n_s_eagain_ssh, 161, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__10)) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_RefNannyFinishContext();
   return 0;
   __pyx_L1_error:;
@@ -4265,7 +4425,7 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
 
 static CYTHON_SMALL_CODE int __Pyx_InitGlobals(void) {
   __pyx_umethod_PyDict_Type_pop.type = (PyObject*)&PyDict_Type;
-  if (__Pyx_InitStrings(__pyx_string_tab) < 0) __PYX_ERR(0, 1, __pyx_L1_error);
+  if (__Pyx_InitStrings(__pyx_string_tab) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   __pyx_int_0 = PyInt_FromLong(0); if (unlikely(!__pyx_int_0)) __PYX_ERR(0, 1, __pyx_L1_error)
   __pyx_int_1000 = PyInt_FromLong(1000); if (unlikely(!__pyx_int_1000)) __PYX_ERR(0, 1, __pyx_L1_error)
   return 0;
@@ -4285,7 +4445,6 @@ static int __Pyx_modinit_global_init_code(void) {
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("__Pyx_modinit_global_init_code", 0);
   /*--- Global init code ---*/
-  __pyx_v_4pssh_6native_5_ssh2_LINESEP = ((PyObject*)Py_None); Py_INCREF(Py_None);
   __Pyx_RefNannyFinishContext();
   return 0;
 }
@@ -4313,7 +4472,7 @@ static int __Pyx_modinit_type_init_code(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("__Pyx_modinit_type_init_code", 0);
   /*--- Type init code ---*/
-  if (PyType_Ready(&__pyx_type_4pssh_6native_5_ssh2___pyx_scope_struct___read_output) < 0) __PYX_ERR(0, 41, __pyx_L1_error)
+  if (PyType_Ready(&__pyx_type_4pssh_6native_5_ssh2___pyx_scope_struct___read_output) < 0) __PYX_ERR(0, 52, __pyx_L1_error)
   #if PY_VERSION_HEX < 0x030800B1
   __pyx_type_4pssh_6native_5_ssh2___pyx_scope_struct___read_output.tp_print = 0;
   #endif
@@ -4499,11 +4658,9 @@ if (!__Pyx_RefNanny) {
   #endif
   /*--- Library function declarations ---*/
   /*--- Threads initialization code ---*/
-  #if defined(__PYX_FORCE_INIT_THREADS) && __PYX_FORCE_INIT_THREADS
-  #ifdef WITH_THREAD /* Python build with threading support? */
+  #if defined(WITH_THREAD) && PY_VERSION_HEX < 0x030700F0 && defined(__PYX_FORCE_INIT_THREADS) && __PYX_FORCE_INIT_THREADS
   PyEval_InitThreads();
   #endif
-  #endif
   /*--- Module creation code ---*/
   #if CYTHON_PEP489_MULTI_PHASE_INIT
   __pyx_m = __pyx_pyinit_module;
@@ -4522,7 +4679,7 @@ if (!__Pyx_RefNanny) {
   Py_INCREF(__pyx_b);
   __pyx_cython_runtime = PyImport_AddModule((char *) "cython_runtime"); if (unlikely(!__pyx_cython_runtime)) __PYX_ERR(0, 1, __pyx_L1_error)
   Py_INCREF(__pyx_cython_runtime);
-  if (PyObject_SetAttrString(__pyx_m, "__builtins__", __pyx_b) < 0) __PYX_ERR(0, 1, __pyx_L1_error);
+  if (PyObject_SetAttrString(__pyx_m, "__builtins__", __pyx_b) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   /*--- Initialize various global constants etc. ---*/
   if (__Pyx_InitGlobals() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   #if PY_MAJOR_VERSION < 3 && (__PYX_DEFAULT_STRING_ENCODING_IS_ASCII || __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT)
@@ -4556,14 +4713,14 @@ if (!__Pyx_RefNanny) {
   if (__Pyx_patch_abc() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   #endif
 
-  /* "pssh/native/_ssh2.pyx":20
- * """Cython functions for interfacing with ssh2-python and ssh-python"""
+  /* "pssh/native/_ssh2.pyx":22
+ * from libc.string cimport memchr
  * 
  * from gevent.select import poll, POLLIN, POLLOUT             # <<<<<<<<<<<<<<
  * from ssh2.session import LIBSSH2_SESSION_BLOCK_INBOUND, LIBSSH2_SESSION_BLOCK_OUTBOUND
  * from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
  */
-  __pyx_t_1 = PyList_New(3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 20, __pyx_L1_error)
+  __pyx_t_1 = PyList_New(3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_INCREF(__pyx_n_s_poll);
   __Pyx_GIVEREF(__pyx_n_s_poll);
@@ -4574,31 +4731,31 @@ if (!__Pyx_RefNanny) {
   __Pyx_INCREF(__pyx_n_s_POLLOUT);
   __Pyx_GIVEREF(__pyx_n_s_POLLOUT);
   PyList_SET_ITEM(__pyx_t_1, 2, __pyx_n_s_POLLOUT);
-  __pyx_t_2 = __Pyx_Import(__pyx_n_s_gevent_select, __pyx_t_1, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 20, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_Import(__pyx_n_s_gevent_select, __pyx_t_1, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 22, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_poll); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 20, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_poll); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_poll, __pyx_t_1) < 0) __PYX_ERR(0, 20, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_poll, __pyx_t_1) < 0) __PYX_ERR(0, 22, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_POLLIN); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 20, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_POLLIN); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_POLLIN, __pyx_t_1) < 0) __PYX_ERR(0, 20, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_POLLIN, __pyx_t_1) < 0) __PYX_ERR(0, 22, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_POLLOUT); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 20, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_POLLOUT); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_POLLOUT, __pyx_t_1) < 0) __PYX_ERR(0, 20, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_POLLOUT, __pyx_t_1) < 0) __PYX_ERR(0, 22, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":21
+  /* "pssh/native/_ssh2.pyx":23
  * 
  * from gevent.select import poll, POLLIN, POLLOUT
  * from ssh2.session import LIBSSH2_SESSION_BLOCK_INBOUND, LIBSSH2_SESSION_BLOCK_OUTBOUND             # <<<<<<<<<<<<<<
  * from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
  * from ssh.session import SSH_READ_PENDING, SSH_WRITE_PENDING
  */
-  __pyx_t_2 = PyList_New(2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 21, __pyx_L1_error)
+  __pyx_t_2 = PyList_New(2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 23, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_INCREF(__pyx_n_s_LIBSSH2_SESSION_BLOCK_INBOUND);
   __Pyx_GIVEREF(__pyx_n_s_LIBSSH2_SESSION_BLOCK_INBOUND);
@@ -4606,48 +4763,48 @@ if (!__Pyx_RefNanny) {
   __Pyx_INCREF(__pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND);
   __Pyx_GIVEREF(__pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND);
   PyList_SET_ITEM(__pyx_t_2, 1, __pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND);
-  __pyx_t_1 = __Pyx_Import(__pyx_n_s_ssh2_session, __pyx_t_2, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 21, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_ssh2_session, __pyx_t_2, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 23, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_LIBSSH2_SESSION_BLOCK_INBOUND); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 21, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_LIBSSH2_SESSION_BLOCK_INBOUND); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 23, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_LIBSSH2_SESSION_BLOCK_INBOUND, __pyx_t_2) < 0) __PYX_ERR(0, 21, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_LIBSSH2_SESSION_BLOCK_INBOUND, __pyx_t_2) < 0) __PYX_ERR(0, 23, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 21, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 23, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND, __pyx_t_2) < 0) __PYX_ERR(0, 21, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND, __pyx_t_2) < 0) __PYX_ERR(0, 23, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":22
+  /* "pssh/native/_ssh2.pyx":24
  * from gevent.select import poll, POLLIN, POLLOUT
  * from ssh2.session import LIBSSH2_SESSION_BLOCK_INBOUND, LIBSSH2_SESSION_BLOCK_OUTBOUND
  * from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN             # <<<<<<<<<<<<<<
  * from ssh.session import SSH_READ_PENDING, SSH_WRITE_PENDING
  * from ssh.error_codes import SSH_AGAIN
  */
-  __pyx_t_1 = PyList_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_1 = PyList_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_INCREF(__pyx_n_s_LIBSSH2_ERROR_EAGAIN);
   __Pyx_GIVEREF(__pyx_n_s_LIBSSH2_ERROR_EAGAIN);
   PyList_SET_ITEM(__pyx_t_1, 0, __pyx_n_s_LIBSSH2_ERROR_EAGAIN);
-  __pyx_t_2 = __Pyx_Import(__pyx_n_s_ssh2_error_codes, __pyx_t_1, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_Import(__pyx_n_s_ssh2_error_codes, __pyx_t_1, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_LIBSSH2_ERROR_EAGAIN); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_LIBSSH2_ERROR_EAGAIN); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_LIBSSH2_ERROR_EAGAIN, __pyx_t_1) < 0) __PYX_ERR(0, 22, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_LIBSSH2_ERROR_EAGAIN, __pyx_t_1) < 0) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":23
+  /* "pssh/native/_ssh2.pyx":25
  * from ssh2.session import LIBSSH2_SESSION_BLOCK_INBOUND, LIBSSH2_SESSION_BLOCK_OUTBOUND
  * from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
  * from ssh.session import SSH_READ_PENDING, SSH_WRITE_PENDING             # <<<<<<<<<<<<<<
  * from ssh.error_codes import SSH_AGAIN
  * 
  */
-  __pyx_t_2 = PyList_New(2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 23, __pyx_L1_error)
+  __pyx_t_2 = PyList_New(2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 25, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_INCREF(__pyx_n_s_SSH_READ_PENDING);
   __Pyx_GIVEREF(__pyx_n_s_SSH_READ_PENDING);
@@ -4655,256 +4812,253 @@ if (!__Pyx_RefNanny) {
   __Pyx_INCREF(__pyx_n_s_SSH_WRITE_PENDING);
   __Pyx_GIVEREF(__pyx_n_s_SSH_WRITE_PENDING);
   PyList_SET_ITEM(__pyx_t_2, 1, __pyx_n_s_SSH_WRITE_PENDING);
-  __pyx_t_1 = __Pyx_Import(__pyx_n_s_ssh_session, __pyx_t_2, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 23, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_ssh_session, __pyx_t_2, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 25, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_SSH_READ_PENDING); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 23, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_SSH_READ_PENDING); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 25, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_SSH_READ_PENDING, __pyx_t_2) < 0) __PYX_ERR(0, 23, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_SSH_READ_PENDING, __pyx_t_2) < 0) __PYX_ERR(0, 25, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_SSH_WRITE_PENDING); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 23, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_SSH_WRITE_PENDING); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 25, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_SSH_WRITE_PENDING, __pyx_t_2) < 0) __PYX_ERR(0, 23, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_SSH_WRITE_PENDING, __pyx_t_2) < 0) __PYX_ERR(0, 25, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":24
+  /* "pssh/native/_ssh2.pyx":26
  * from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
  * from ssh.session import SSH_READ_PENDING, SSH_WRITE_PENDING
  * from ssh.error_codes import SSH_AGAIN             # <<<<<<<<<<<<<<
  * 
  * from ..exceptions import Timeout
  */
-  __pyx_t_1 = PyList_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 24, __pyx_L1_error)
+  __pyx_t_1 = PyList_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 26, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_INCREF(__pyx_n_s_SSH_AGAIN);
   __Pyx_GIVEREF(__pyx_n_s_SSH_AGAIN);
   PyList_SET_ITEM(__pyx_t_1, 0, __pyx_n_s_SSH_AGAIN);
-  __pyx_t_2 = __Pyx_Import(__pyx_n_s_ssh_error_codes, __pyx_t_1, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 24, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_Import(__pyx_n_s_ssh_error_codes, __pyx_t_1, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 26, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_SSH_AGAIN); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 24, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_SSH_AGAIN); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 26, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_SSH_AGAIN, __pyx_t_1) < 0) __PYX_ERR(0, 24, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_SSH_AGAIN, __pyx_t_1) < 0) __PYX_ERR(0, 26, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":26
+  /* "pssh/native/_ssh2.pyx":28
  * from ssh.error_codes import SSH_AGAIN
  * 
  * from ..exceptions import Timeout             # <<<<<<<<<<<<<<
  * from gevent import Timeout as GTimeout
  * 
  */
-  __pyx_t_2 = PyList_New(1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 26, __pyx_L1_error)
+  __pyx_t_2 = PyList_New(1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 28, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_INCREF(__pyx_n_s_Timeout);
   __Pyx_GIVEREF(__pyx_n_s_Timeout);
   PyList_SET_ITEM(__pyx_t_2, 0, __pyx_n_s_Timeout);
-  __pyx_t_1 = __Pyx_Import(__pyx_n_s_exceptions, __pyx_t_2, 2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 26, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_exceptions, __pyx_t_2, 2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 28, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_Timeout); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 26, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_ImportFrom(__pyx_t_1, __pyx_n_s_Timeout); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 28, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_Timeout, __pyx_t_2) < 0) __PYX_ERR(0, 26, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_Timeout, __pyx_t_2) < 0) __PYX_ERR(0, 28, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "pssh/native/_ssh2.pyx":27
+  /* "pssh/native/_ssh2.pyx":29
  * 
  * from ..exceptions import Timeout
  * from gevent import Timeout as GTimeout             # <<<<<<<<<<<<<<
  * 
  * 
  */
-  __pyx_t_1 = PyList_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 27, __pyx_L1_error)
+  __pyx_t_1 = PyList_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 29, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_INCREF(__pyx_n_s_Timeout);
   __Pyx_GIVEREF(__pyx_n_s_Timeout);
   PyList_SET_ITEM(__pyx_t_1, 0, __pyx_n_s_Timeout);
-  __pyx_t_2 = __Pyx_Import(__pyx_n_s_gevent, __pyx_t_1, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 27, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_Import(__pyx_n_s_gevent, __pyx_t_1, 0); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 29, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_Timeout); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 27, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_ImportFrom(__pyx_t_2, __pyx_n_s_Timeout); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 29, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_GTimeout, __pyx_t_1) < 0) __PYX_ERR(0, 27, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_GTimeout, __pyx_t_1) < 0) __PYX_ERR(0, 29, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":30
+  /* "pssh/native/_ssh2.pyx":32
  * 
  * 
- * cdef bytes LINESEP = b'\n'             # <<<<<<<<<<<<<<
+ * cdef char LINESEP = b'\n'             # <<<<<<<<<<<<<<
  * cdef int _LIBSSH2_ERROR_EAGAIN = LIBSSH2_ERROR_EAGAIN
  * cdef int _LIBSSH2_SESSION_BLOCK_INBOUND = LIBSSH2_SESSION_BLOCK_INBOUND
  */
-  __Pyx_INCREF(__pyx_kp_b__3);
-  __Pyx_XGOTREF(__pyx_v_4pssh_6native_5_ssh2_LINESEP);
-  __Pyx_DECREF_SET(__pyx_v_4pssh_6native_5_ssh2_LINESEP, __pyx_kp_b__3);
-  __Pyx_GIVEREF(__pyx_kp_b__3);
+  __pyx_v_4pssh_6native_5_ssh2_LINESEP = '\n';
 
-  /* "pssh/native/_ssh2.pyx":31
+  /* "pssh/native/_ssh2.pyx":33
  * 
- * cdef bytes LINESEP = b'\n'
+ * cdef char LINESEP = b'\n'
  * cdef int _LIBSSH2_ERROR_EAGAIN = LIBSSH2_ERROR_EAGAIN             # <<<<<<<<<<<<<<
  * cdef int _LIBSSH2_SESSION_BLOCK_INBOUND = LIBSSH2_SESSION_BLOCK_INBOUND
  * cdef int _LIBSSH2_SESSION_BLOCK_OUTBOUND = LIBSSH2_SESSION_BLOCK_OUTBOUND
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_LIBSSH2_ERROR_EAGAIN); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 31, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_LIBSSH2_ERROR_EAGAIN); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 33, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 31, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 33, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_ERROR_EAGAIN = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":32
- * cdef bytes LINESEP = b'\n'
+  /* "pssh/native/_ssh2.pyx":34
+ * cdef char LINESEP = b'\n'
  * cdef int _LIBSSH2_ERROR_EAGAIN = LIBSSH2_ERROR_EAGAIN
  * cdef int _LIBSSH2_SESSION_BLOCK_INBOUND = LIBSSH2_SESSION_BLOCK_INBOUND             # <<<<<<<<<<<<<<
  * cdef int _LIBSSH2_SESSION_BLOCK_OUTBOUND = LIBSSH2_SESSION_BLOCK_OUTBOUND
  * cdef int _SSH_READ_PENDING = SSH_READ_PENDING
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_LIBSSH2_SESSION_BLOCK_INBOUND); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 32, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_LIBSSH2_SESSION_BLOCK_INBOUND); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 34, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 32, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 34, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_SESSION_BLOCK_INBOUND = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":33
+  /* "pssh/native/_ssh2.pyx":35
  * cdef int _LIBSSH2_ERROR_EAGAIN = LIBSSH2_ERROR_EAGAIN
  * cdef int _LIBSSH2_SESSION_BLOCK_INBOUND = LIBSSH2_SESSION_BLOCK_INBOUND
  * cdef int _LIBSSH2_SESSION_BLOCK_OUTBOUND = LIBSSH2_SESSION_BLOCK_OUTBOUND             # <<<<<<<<<<<<<<
  * cdef int _SSH_READ_PENDING = SSH_READ_PENDING
  * cdef int _SSH_WRITE_PENDING = SSH_WRITE_PENDING
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 33, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_LIBSSH2_SESSION_BLOCK_OUTBOUND); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 35, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 33, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 35, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_4pssh_6native_5_ssh2__LIBSSH2_SESSION_BLOCK_OUTBOUND = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":34
+  /* "pssh/native/_ssh2.pyx":36
  * cdef int _LIBSSH2_SESSION_BLOCK_INBOUND = LIBSSH2_SESSION_BLOCK_INBOUND
  * cdef int _LIBSSH2_SESSION_BLOCK_OUTBOUND = LIBSSH2_SESSION_BLOCK_OUTBOUND
  * cdef int _SSH_READ_PENDING = SSH_READ_PENDING             # <<<<<<<<<<<<<<
  * cdef int _SSH_WRITE_PENDING = SSH_WRITE_PENDING
  * cdef int _SSH_AGAIN = SSH_AGAIN
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_SSH_READ_PENDING); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 34, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_SSH_READ_PENDING); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 36, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 34, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 36, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_4pssh_6native_5_ssh2__SSH_READ_PENDING = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":35
+  /* "pssh/native/_ssh2.pyx":37
  * cdef int _LIBSSH2_SESSION_BLOCK_OUTBOUND = LIBSSH2_SESSION_BLOCK_OUTBOUND
  * cdef int _SSH_READ_PENDING = SSH_READ_PENDING
  * cdef int _SSH_WRITE_PENDING = SSH_WRITE_PENDING             # <<<<<<<<<<<<<<
  * cdef int _SSH_AGAIN = SSH_AGAIN
  * cdef int _POLLIN = POLLIN
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_SSH_WRITE_PENDING); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 35, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_SSH_WRITE_PENDING); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 37, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 35, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 37, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_4pssh_6native_5_ssh2__SSH_WRITE_PENDING = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":36
+  /* "pssh/native/_ssh2.pyx":38
  * cdef int _SSH_READ_PENDING = SSH_READ_PENDING
  * cdef int _SSH_WRITE_PENDING = SSH_WRITE_PENDING
  * cdef int _SSH_AGAIN = SSH_AGAIN             # <<<<<<<<<<<<<<
  * cdef int _POLLIN = POLLIN
  * cdef int _POLLOUT = POLLOUT
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_SSH_AGAIN); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 36, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_SSH_AGAIN); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 38, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 36, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 38, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_4pssh_6native_5_ssh2__SSH_AGAIN = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":37
+  /* "pssh/native/_ssh2.pyx":39
  * cdef int _SSH_WRITE_PENDING = SSH_WRITE_PENDING
  * cdef int _SSH_AGAIN = SSH_AGAIN
  * cdef int _POLLIN = POLLIN             # <<<<<<<<<<<<<<
  * cdef int _POLLOUT = POLLOUT
  * 
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_POLLIN); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 37, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_POLLIN); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 39, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 37, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 39, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_4pssh_6native_5_ssh2__POLLIN = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":38
+  /* "pssh/native/_ssh2.pyx":40
  * cdef int _SSH_AGAIN = SSH_AGAIN
  * cdef int _POLLIN = POLLIN
  * cdef int _POLLOUT = POLLOUT             # <<<<<<<<<<<<<<
  * 
  * 
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_POLLOUT); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 38, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_2, __pyx_n_s_POLLOUT); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 40, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 38, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_As_int(__pyx_t_2); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 40, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __pyx_v_4pssh_6native_5_ssh2__POLLOUT = __pyx_t_3;
 
-  /* "pssh/native/_ssh2.pyx":41
+  /* "pssh/native/_ssh2.pyx":52
  * 
  * 
  * def _read_output(session, read_func, timeout=None):             # <<<<<<<<<<<<<<
- *     cdef Py_ssize_t _size
- *     cdef bytes _data
+ *     """Read from ``read_func`` and yield output line by line, without line
+ *     separator and trailing whitespace.
  */
-  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_1_read_output, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 41, __pyx_L1_error)
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_1_read_output, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 52, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_read_output, __pyx_t_2) < 0) __PYX_ERR(0, 41, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_read_output, __pyx_t_2) < 0) __PYX_ERR(0, 52, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":82
+  /* "pssh/native/_ssh2.pyx":105
  * 
  * 
  * def wait_select(session, timeout=None):             # <<<<<<<<<<<<<<
  *     """Perform co-operative gevent select on ssh2 session socket.
  * 
  */
-  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_4wait_select, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 82, __pyx_L1_error)
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_4wait_select, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 105, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_wait_select, __pyx_t_2) < 0) __PYX_ERR(0, 82, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_wait_select, __pyx_t_2) < 0) __PYX_ERR(0, 105, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":105
+  /* "pssh/native/_ssh2.pyx":128
  * 
  * 
  * def wait_select_ssh(session, timeout=None):             # <<<<<<<<<<<<<<
  *     """ssh-python based co-operative gevent select on session socket."""
  *     cdef int events = 0
  */
-  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_6wait_select_ssh, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 105, __pyx_L1_error)
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_6wait_select_ssh, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 128, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_wait_select_ssh, __pyx_t_2) < 0) __PYX_ERR(0, 105, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_wait_select_ssh, __pyx_t_2) < 0) __PYX_ERR(0, 128, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":122
+  /* "pssh/native/_ssh2.pyx":145
  * 
  * 
  * def eagain_write(write_func, data, session, timeout=None):             # <<<<<<<<<<<<<<
  *     """Write data with given write_func for an ssh2-python session while
  *     handling EAGAIN and resuming writes from last written byte on each call to
  */
-  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_8eagain_write, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 122, __pyx_L1_error)
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_8eagain_write, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 145, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_eagain_write, __pyx_t_2) < 0) __PYX_ERR(0, 122, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_eagain_write, __pyx_t_2) < 0) __PYX_ERR(0, 145, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
-  /* "pssh/native/_ssh2.pyx":138
+  /* "pssh/native/_ssh2.pyx":161
  * 
  * 
  * def eagain_ssh(session, func, *args, **kwargs):             # <<<<<<<<<<<<<<
  *     """Run function given and handle EAGAIN for an ssh-python session"""
  *     timeout = kwargs.pop('timeout', None)
  */
-  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_10eagain_ssh, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 138, __pyx_L1_error)
+  __pyx_t_2 = PyCFunction_NewEx(&__pyx_mdef_4pssh_6native_5_ssh2_10eagain_ssh, NULL, __pyx_n_s_pssh_native__ssh2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
-  if (PyDict_SetItem(__pyx_d, __pyx_n_s_eagain_ssh, __pyx_t_2) < 0) __PYX_ERR(0, 138, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_eagain_ssh, __pyx_t_2) < 0) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
 
   /* "pssh/native/_ssh2.pyx":1
@@ -5225,7 +5379,7 @@ done:
 #if CYTHON_COMPILING_IN_CPYTHON
 static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw) {
     PyObject *result;
-    ternaryfunc call = func->ob_type->tp_call;
+    ternaryfunc call = Py_TYPE(func)->tp_call;
     if (unlikely(!call))
         return PyObject_Call(func, arg, kw);
     if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
@@ -5269,7 +5423,7 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func) {
         return __Pyx_PyFunction_FastCall(func, NULL, 0);
     }
 #endif
-#ifdef __Pyx_CyFunction_USED
+#if defined(__Pyx_CyFunction_USED) && defined(NDEBUG)
     if (likely(PyCFunction_Check(func) || __Pyx_CyFunction_Check(func)))
 #else
     if (likely(PyCFunction_Check(func)))
@@ -5328,7 +5482,7 @@ static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObjec
         if (likely(PyCFunction_GET_FLAGS(func) & METH_O)) {
             return __Pyx_PyObject_CallMethO(func, arg);
 #if CYTHON_FAST_PYCCALL
-        } else if (PyCFunction_GET_FLAGS(func) & METH_FASTCALL) {
+        } else if (__Pyx_PyFastCFunction_Check(func)) {
             return __Pyx_PyCFunction_FastCall(func, &arg, 1);
 #endif
         }
@@ -5400,10 +5554,8 @@ static int __Pyx_IternextUnpackEndCheck(PyObject *retval, Py_ssize_t expected) {
         Py_DECREF(retval);
         __Pyx_RaiseTooManyValuesError(expected);
         return -1;
-    } else {
-        return __Pyx_IterFinish();
     }
-    return 0;
+    return __Pyx_IterFinish();
 }
 
 /* PyObjectGetAttrStr */
@@ -5524,6 +5676,104 @@ done:
     return result;
 }
 
+/* SliceObject */
+static CYTHON_INLINE int __Pyx_PyObject_SetSlice(PyObject* obj, PyObject* value,
+        Py_ssize_t cstart, Py_ssize_t cstop,
+        PyObject** _py_start, PyObject** _py_stop, PyObject** _py_slice,
+        int has_cstart, int has_cstop, CYTHON_UNUSED int wraparound) {
+#if CYTHON_USE_TYPE_SLOTS
+    PyMappingMethods* mp;
+#if PY_MAJOR_VERSION < 3
+    PySequenceMethods* ms = Py_TYPE(obj)->tp_as_sequence;
+    if (likely(ms && ms->sq_ass_slice)) {
+        if (!has_cstart) {
+            if (_py_start && (*_py_start != Py_None)) {
+                cstart = __Pyx_PyIndex_AsSsize_t(*_py_start);
+                if ((cstart == (Py_ssize_t)-1) && PyErr_Occurred()) goto bad;
+            } else
+                cstart = 0;
+        }
+        if (!has_cstop) {
+            if (_py_stop && (*_py_stop != Py_None)) {
+                cstop = __Pyx_PyIndex_AsSsize_t(*_py_stop);
+                if ((cstop == (Py_ssize_t)-1) && PyErr_Occurred()) goto bad;
+            } else
+                cstop = PY_SSIZE_T_MAX;
+        }
+        if (wraparound && unlikely((cstart < 0) | (cstop < 0)) && likely(ms->sq_length)) {
+            Py_ssize_t l = ms->sq_length(obj);
+            if (likely(l >= 0)) {
+                if (cstop < 0) {
+                    cstop += l;
+                    if (cstop < 0) cstop = 0;
+                }
+                if (cstart < 0) {
+                    cstart += l;
+                    if (cstart < 0) cstart = 0;
+                }
+            } else {
+                if (!PyErr_ExceptionMatches(PyExc_OverflowError))
+                    goto bad;
+                PyErr_Clear();
+            }
+        }
+        return ms->sq_ass_slice(obj, cstart, cstop, value);
+    }
+#endif
+    mp = Py_TYPE(obj)->tp_as_mapping;
+    if (likely(mp && mp->mp_ass_subscript))
+#endif
+    {
+        int result;
+        PyObject *py_slice, *py_start, *py_stop;
+        if (_py_slice) {
+            py_slice = *_py_slice;
+        } else {
+            PyObject* owned_start = NULL;
+            PyObject* owned_stop = NULL;
+            if (_py_start) {
+                py_start = *_py_start;
+            } else {
+                if (has_cstart) {
+                    owned_start = py_start = PyInt_FromSsize_t(cstart);
+                    if (unlikely(!py_start)) goto bad;
+                } else
+                    py_start = Py_None;
+            }
+            if (_py_stop) {
+                py_stop = *_py_stop;
+            } else {
+                if (has_cstop) {
+                    owned_stop = py_stop = PyInt_FromSsize_t(cstop);
+                    if (unlikely(!py_stop)) {
+                        Py_XDECREF(owned_start);
+                        goto bad;
+                    }
+                } else
+                    py_stop = Py_None;
+            }
+            py_slice = PySlice_New(py_start, py_stop, Py_None);
+            Py_XDECREF(owned_start);
+            Py_XDECREF(owned_stop);
+            if (unlikely(!py_slice)) goto bad;
+        }
+#if CYTHON_USE_TYPE_SLOTS
+        result = mp->mp_ass_subscript(obj, py_slice, value);
+#else
+        result = value ? PyObject_SetItem(obj, py_slice, value) : PyObject_DelItem(obj, py_slice);
+#endif
+        if (!_py_slice) {
+            Py_DECREF(py_slice);
+        }
+        return result;
+    }
+    PyErr_Format(PyExc_TypeError,
+        "'%.200s' object does not support slice %.10s",
+        Py_TYPE(obj)->tp_name, value ? "assignment" : "deletion");
+bad:
+    return -1;
+}
+
 /* GetTopmostException */
 #if CYTHON_USE_EXC_INFO_STACK
 static _PyErr_StackItem *
@@ -5915,13 +6165,7 @@ static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject
     }
     PyErr_SetObject(type, value);
     if (tb) {
-#if CYTHON_COMPILING_IN_PYPY
-        PyObject *tmp_type, *tmp_value, *tmp_tb;
-        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
-        Py_INCREF(tb);
-        PyErr_Restore(tmp_type, tmp_value, tb);
-        Py_XDECREF(tmp_tb);
-#else
+#if CYTHON_FAST_THREAD_STATE
         PyThreadState *tstate = __Pyx_PyThreadState_Current;
         PyObject* tmp_tb = tstate->curexc_traceback;
         if (tb != tmp_tb) {
@@ -5929,6 +6173,12 @@ static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject
             tstate->curexc_traceback = tb;
             Py_XDECREF(tmp_tb);
         }
+#else
+        PyObject *tmp_type, *tmp_value, *tmp_tb;
+        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
+        Py_INCREF(tb);
+        PyErr_Restore(tmp_type, tmp_value, tb);
+        Py_XDECREF(tmp_tb);
 #endif
     }
 bad:
@@ -6153,11 +6403,11 @@ static CYTHON_INLINE PyObject* __Pyx_CallUnboundCMethod1(__Pyx_CachedCFunction*
         if (flag == METH_O) {
             return (*(cfunc->func))(self, arg);
         } else if (PY_VERSION_HEX >= 0x030600B1 && flag == METH_FASTCALL) {
-            if (PY_VERSION_HEX >= 0x030700A0) {
+            #if PY_VERSION_HEX >= 0x030700A0
                 return (*(__Pyx_PyCFunctionFast)(void*)(PyCFunction)cfunc->func)(self, &arg, 1);
-            } else {
+            #else
                 return (*(__Pyx_PyCFunctionFastWithKeywords)(void*)(PyCFunction)cfunc->func)(self, &arg, 1, NULL);
-            }
+            #endif
         } else if (PY_VERSION_HEX >= 0x030700A0 && flag == (METH_FASTCALL | METH_KEYWORDS)) {
             return (*(__Pyx_PyCFunctionFastWithKeywords)(void*)(PyCFunction)cfunc->func)(self, &arg, 1, NULL);
         }
@@ -6332,7 +6582,7 @@ static PyObject* __Pyx_ImportFrom(PyObject* module, PyObject* name) {
 
 /* CLineInTraceback */
 #ifndef CYTHON_CLINE_IN_TRACEBACK
-static int __Pyx_CLineForTraceback(CYTHON_NCP_UNUSED PyThreadState *tstate, int c_line) {
+static int __Pyx_CLineForTraceback(CYTHON_UNUSED PyThreadState *tstate, int c_line) {
     PyObject *use_cline;
     PyObject *ptype, *pvalue, *ptraceback;
 #if CYTHON_COMPILING_IN_CPYTHON
@@ -6362,7 +6612,7 @@ static int __Pyx_CLineForTraceback(CYTHON_NCP_UNUSED PyThreadState *tstate, int
     }
     if (!use_cline) {
         c_line = 0;
-        PyObject_SetAttr(__pyx_cython_runtime, __pyx_n_s_cline_in_traceback, Py_False);
+        (void) PyObject_SetAttr(__pyx_cython_runtime, __pyx_n_s_cline_in_traceback, Py_False);
     }
     else if (use_cline == Py_False || (use_cline != Py_True && PyObject_Not(use_cline) != 0)) {
         c_line = 0;
@@ -6456,33 +6706,40 @@ static void __pyx_insert_code_object(int code_line, PyCodeObject* code_object) {
 #include "compile.h"
 #include "frameobject.h"
 #include "traceback.h"
+#if PY_VERSION_HEX >= 0x030b00a6
+  #ifndef Py_BUILD_CORE
+    #define Py_BUILD_CORE 1
+  #endif
+  #include "internal/pycore_frame.h"
+#endif
 static PyCodeObject* __Pyx_CreateCodeObjectForTraceback(
             const char *funcname, int c_line,
             int py_line, const char *filename) {
-    PyCodeObject *py_code = 0;
-    PyObject *py_srcfile = 0;
-    PyObject *py_funcname = 0;
+    PyCodeObject *py_code = NULL;
+    PyObject *py_funcname = NULL;
     #if PY_MAJOR_VERSION < 3
+    PyObject *py_srcfile = NULL;
     py_srcfile = PyString_FromString(filename);
-    #else
-    py_srcfile = PyUnicode_FromString(filename);
-    #endif
     if (!py_srcfile) goto bad;
+    #endif
     if (c_line) {
         #if PY_MAJOR_VERSION < 3
         py_funcname = PyString_FromFormat( "%s (%s:%d)", funcname, __pyx_cfilenm, c_line);
+        if (!py_funcname) goto bad;
         #else
         py_funcname = PyUnicode_FromFormat( "%s (%s:%d)", funcname, __pyx_cfilenm, c_line);
+        if (!py_funcname) goto bad;
+        funcname = PyUnicode_AsUTF8(py_funcname);
+        if (!funcname) goto bad;
         #endif
     }
     else {
         #if PY_MAJOR_VERSION < 3
         py_funcname = PyString_FromString(funcname);
-        #else
-        py_funcname = PyUnicode_FromString(funcname);
+        if (!py_funcname) goto bad;
         #endif
     }
-    if (!py_funcname) goto bad;
+    #if PY_MAJOR_VERSION < 3
     py_code = __Pyx_PyCode_New(
         0,
         0,
@@ -6501,11 +6758,16 @@ static PyCodeObject* __Pyx_CreateCodeObjectForTraceback(
         __pyx_empty_bytes  /*PyObject *lnotab*/
     );
     Py_DECREF(py_srcfile);
-    Py_DECREF(py_funcname);
+    #else
+    py_code = PyCode_NewEmpty(filename, funcname, py_line);
+    #endif
+    Py_XDECREF(py_funcname);  // XDECREF since it's only set on Py3 if cline
     return py_code;
 bad:
-    Py_XDECREF(py_srcfile);
     Py_XDECREF(py_funcname);
+    #if PY_MAJOR_VERSION < 3
+    Py_XDECREF(py_srcfile);
+    #endif
     return NULL;
 }
 static void __Pyx_AddTraceback(const char *funcname, int c_line,
@@ -6513,14 +6775,24 @@ static void __Pyx_AddTraceback(const char *funcname, int c_line,
     PyCodeObject *py_code = 0;
     PyFrameObject *py_frame = 0;
     PyThreadState *tstate = __Pyx_PyThreadState_Current;
+    PyObject *ptype, *pvalue, *ptraceback;
     if (c_line) {
         c_line = __Pyx_CLineForTraceback(tstate, c_line);
     }
     py_code = __pyx_find_code_object(c_line ? -c_line : py_line);
     if (!py_code) {
+        __Pyx_ErrFetchInState(tstate, &ptype, &pvalue, &ptraceback);
         py_code = __Pyx_CreateCodeObjectForTraceback(
             funcname, c_line, py_line, filename);
-        if (!py_code) goto bad;
+        if (!py_code) {
+            /* If the code object creation fails, then we should clear the
+               fetched exception references and propagate the new exception */
+            Py_XDECREF(ptype);
+            Py_XDECREF(pvalue);
+            Py_XDECREF(ptraceback);
+            goto bad;
+        }
+        __Pyx_ErrRestoreInState(tstate, ptype, pvalue, ptraceback);
         __pyx_insert_code_object(c_line ? -c_line : py_line, py_code);
     }
     py_frame = PyFrame_New(
@@ -6559,40 +6831,16 @@ bad:
         return (target_type) value;\
     }
 
-/* CIntToPy */
-static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value) {
-    const int neg_one = (int) ((int) 0 - (int) 1), const_zero = (int) 0;
-    const int is_unsigned = neg_one > const_zero;
-    if (is_unsigned) {
-        if (sizeof(int) < sizeof(long)) {
-            return PyInt_FromLong((long) value);
-        } else if (sizeof(int) <= sizeof(unsigned long)) {
-            return PyLong_FromUnsignedLong((unsigned long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
-            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
-#endif
-        }
-    } else {
-        if (sizeof(int) <= sizeof(long)) {
-            return PyInt_FromLong((long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
-            return PyLong_FromLongLong((PY_LONG_LONG) value);
-#endif
-        }
-    }
-    {
-        int one = 1; int little = (int)*(unsigned char *)&one;
-        unsigned char *bytes = (unsigned char *)&value;
-        return _PyLong_FromByteArray(bytes, sizeof(int),
-                                     little, !is_unsigned);
-    }
-}
-
 /* CIntFromPy */
 static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
-    const int neg_one = (int) ((int) 0 - (int) 1), const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int neg_one = (int) -1, const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
 #if PY_MAJOR_VERSION < 3
     if (likely(PyInt_Check(x))) {
@@ -6643,7 +6891,7 @@ static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
                     break;
             }
 #endif
-#if CYTHON_COMPILING_IN_CPYTHON
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
             if (unlikely(Py_SIZE(x) < 0)) {
                 goto raise_neg_overflow;
             }
@@ -6779,9 +7027,54 @@ raise_neg_overflow:
     return (int) -1;
 }
 
+/* CIntToPy */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int neg_one = (int) -1, const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+    if (is_unsigned) {
+        if (sizeof(int) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(int) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(int) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(int),
+                                     little, !is_unsigned);
+    }
+}
+
 /* CIntFromPy */
 static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
-    const size_t neg_one = (size_t) ((size_t) 0 - (size_t) 1), const_zero = (size_t) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const size_t neg_one = (size_t) -1, const_zero = (size_t) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
 #if PY_MAJOR_VERSION < 3
     if (likely(PyInt_Check(x))) {
@@ -6832,7 +7125,7 @@ static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
                     break;
             }
 #endif
-#if CYTHON_COMPILING_IN_CPYTHON
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
             if (unlikely(Py_SIZE(x) < 0)) {
                 goto raise_neg_overflow;
             }
@@ -6970,7 +7263,14 @@ raise_neg_overflow:
 
 /* CIntToPy */
 static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value) {
-    const long neg_one = (long) ((long) 0 - (long) 1), const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const long neg_one = (long) -1, const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
     if (is_unsigned) {
         if (sizeof(long) < sizeof(long)) {
@@ -7001,7 +7301,14 @@ static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value) {
 
 /* CIntFromPy */
 static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *x) {
-    const long neg_one = (long) ((long) 0 - (long) 1), const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const long neg_one = (long) -1, const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
 #if PY_MAJOR_VERSION < 3
     if (likely(PyInt_Check(x))) {
@@ -7052,7 +7359,7 @@ static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *x) {
                     break;
             }
 #endif
-#if CYTHON_COMPILING_IN_CPYTHON
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
             if (unlikely(Py_SIZE(x) < 0)) {
                 goto raise_neg_overflow;
             }
@@ -7344,6 +7651,12 @@ static PyObject* __Pyx_PyObject_CallMethod1(PyObject* obj, PyObject* method_name
 /* CoroutineBase */
 #include <structmember.h>
 #include <frameobject.h>
+#if PY_VERSION_HEX >= 0x030b00a6
+  #ifndef Py_BUILD_CORE
+    #define Py_BUILD_CORE 1
+  #endif
+  #include "internal/pycore_frame.h"
+#endif
 #define __Pyx_Coroutine_Undelegate(gen) Py_CLEAR((gen)->yieldfrom)
 static int __Pyx_PyGen__FetchStopIterationValue(CYTHON_UNUSED PyThreadState *__pyx_tstate, PyObject **pvalue) {
     PyObject *et, *ev, *tb;
@@ -7515,9 +7828,13 @@ PyObject *__Pyx_Coroutine_SendEx(__pyx_CoroutineObject *self, PyObject *value, i
         if (exc_state->exc_traceback) {
             PyTracebackObject *tb = (PyTracebackObject *) exc_state->exc_traceback;
             PyFrameObject *f = tb->tb_frame;
-            Py_XINCREF(tstate->frame);
             assert(f->f_back == NULL);
+            #if PY_VERSION_HEX >= 0x030B00A1
+            f->f_back = PyThreadState_GetFrame(tstate);
+            #else
+            Py_XINCREF(tstate->frame);
             f->f_back = tstate->frame;
+            #endif
         }
         #endif
     }
@@ -7570,6 +7887,30 @@ PyObject *__Pyx_Coroutine_MethodReturn(CYTHON_UNUSED PyObject* gen, PyObject *re
     }
     return retval;
 }
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x03030000 && (defined(__linux__) || PY_VERSION_HEX >= 0x030600B3)
+static CYTHON_INLINE
+PyObject *__Pyx_PyGen_Send(PyGenObject *gen, PyObject *arg) {
+#if PY_VERSION_HEX <= 0x030A00A1
+    return _PyGen_Send(gen, arg);
+#else
+    PyObject *result;
+    if (PyIter_Send((PyObject*)gen, arg ? arg : Py_None, &result) == PYGEN_RETURN) {
+        if (PyAsyncGen_CheckExact(gen)) {
+            assert(result == Py_None);
+            PyErr_SetNone(PyExc_StopAsyncIteration);
+        }
+        else if (result == Py_None) {
+            PyErr_SetNone(PyExc_StopIteration);
+        }
+        else {
+            _PyGen_SetStopIterationValue(result);
+        }
+        Py_CLEAR(result);
+    }
+    return result;
+#endif
+}
+#endif
 static CYTHON_INLINE
 PyObject *__Pyx_Coroutine_FinishDelegation(__pyx_CoroutineObject *gen) {
     PyObject *ret;
@@ -7606,12 +7947,12 @@ static PyObject *__Pyx_Coroutine_Send(PyObject *self, PyObject *value) {
         #endif
         #if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x03030000 && (defined(__linux__) || PY_VERSION_HEX >= 0x030600B3)
         if (PyGen_CheckExact(yf)) {
-            ret = _PyGen_Send((PyGenObject*)yf, value == Py_None ? NULL : value);
+            ret = __Pyx_PyGen_Send((PyGenObject*)yf, value == Py_None ? NULL : value);
         } else
         #endif
         #if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x03050000 && defined(PyCoro_CheckExact) && (defined(__linux__) || PY_VERSION_HEX >= 0x030600B3)
         if (PyCoro_CheckExact(yf)) {
-            ret = _PyGen_Send((PyGenObject*)yf, value == Py_None ? NULL : value);
+            ret = __Pyx_PyGen_Send((PyGenObject*)yf, value == Py_None ? NULL : value);
         } else
         #endif
         {
@@ -7695,7 +8036,7 @@ static PyObject *__Pyx_Generator_Next(PyObject *self) {
         #endif
         #if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x03030000 && (defined(__linux__) || PY_VERSION_HEX >= 0x030600B3)
         if (PyGen_CheckExact(yf)) {
-            ret = _PyGen_Send((PyGenObject*)yf, NULL);
+            ret = __Pyx_PyGen_Send((PyGenObject*)yf, NULL);
         } else
         #endif
         #ifdef __Pyx_Coroutine_USED
@@ -7855,6 +8196,7 @@ static int __Pyx_Coroutine_clear(PyObject *self) {
     }
 #endif
     Py_CLEAR(gen->gi_code);
+    Py_CLEAR(gen->gi_frame);
     Py_CLEAR(gen->gi_name);
     Py_CLEAR(gen->gi_qualname);
     Py_CLEAR(gen->gi_modulename);
@@ -7871,7 +8213,7 @@ static void __Pyx_Coroutine_dealloc(PyObject *self) {
         if (PyObject_CallFinalizerFromDealloc(self))
 #else
         Py_TYPE(gen)->tp_del(self);
-        if (self->ob_refcnt > 0)
+        if (Py_REFCNT(self) > 0)
 #endif
         {
             return;
@@ -7898,7 +8240,7 @@ static void __Pyx_Coroutine_del(PyObject *self) {
     }
 #if !CYTHON_USE_TP_FINALIZE
     assert(self->ob_refcnt == 0);
-    self->ob_refcnt = 1;
+    __Pyx_SET_REFCNT(self, 1);
 #endif
     __Pyx_PyThreadState_assign
     __Pyx_ErrFetch(&error_type, &error_value, &error_traceback);
@@ -7965,17 +8307,17 @@ static void __Pyx_Coroutine_del(PyObject *self) {
     }
     __Pyx_ErrRestore(error_type, error_value, error_traceback);
 #if !CYTHON_USE_TP_FINALIZE
-    assert(self->ob_refcnt > 0);
+    assert(Py_REFCNT(self) > 0);
     if (--self->ob_refcnt == 0) {
         return;
     }
     {
-        Py_ssize_t refcnt = self->ob_refcnt;
+        Py_ssize_t refcnt = Py_REFCNT(self);
         _Py_NewReference(self);
-        self->ob_refcnt = refcnt;
+        __Pyx_SET_REFCNT(self, refcnt);
     }
 #if CYTHON_COMPILING_IN_CPYTHON
-    assert(PyType_IS_GC(self->ob_type) &&
+    assert(PyType_IS_GC(Py_TYPE(self)) &&
            _Py_AS_GC(self)->gc.gc_refs != _PyGC_REFS_UNTRACKED);
     _Py_DEC_REFTOTAL;
 #endif
@@ -8041,6 +8383,27 @@ __Pyx_Coroutine_set_qualname(__pyx_CoroutineObject *self, PyObject *value, CYTHO
     Py_XDECREF(tmp);
     return 0;
 }
+static PyObject *
+__Pyx_Coroutine_get_frame(__pyx_CoroutineObject *self, CYTHON_UNUSED void *context)
+{
+    PyObject *frame = self->gi_frame;
+    if (!frame) {
+        if (unlikely(!self->gi_code)) {
+            Py_RETURN_NONE;
+        }
+        frame = (PyObject *) PyFrame_New(
+            PyThreadState_Get(),            /*PyThreadState *tstate,*/
+            (PyCodeObject*) self->gi_code,  /*PyCodeObject *code,*/
+            __pyx_d,                 /*PyObject *globals,*/
+            0                               /*PyObject *locals*/
+        );
+        if (unlikely(!frame))
+            return NULL;
+        self->gi_frame = frame;
+    }
+    Py_INCREF(frame);
+    return frame;
+}
 static __pyx_CoroutineObject *__Pyx__Coroutine_New(
             PyTypeObject* type, __pyx_coroutine_body_t body, PyObject *code, PyObject *closure,
             PyObject *name, PyObject *qualname, PyObject *module_name) {
@@ -8074,6 +8437,7 @@ static __pyx_CoroutineObject *__Pyx__Coroutine_NewInit(
     gen->gi_modulename = module_name;
     Py_XINCREF(code);
     gen->gi_code = code;
+    gen->gi_frame = NULL;
     PyObject_GC_Track(gen);
     return gen;
 }
@@ -8197,6 +8561,8 @@ static PyGetSetDef __pyx_Generator_getsets[] = {
      (char*) PyDoc_STR("name of the generator"), 0},
     {(char *) "__qualname__", (getter)__Pyx_Coroutine_get_qualname, (setter)__Pyx_Coroutine_set_qualname,
      (char*) PyDoc_STR("qualified name of the generator"), 0},
+    {(char *) "gi_frame", (getter)__Pyx_Coroutine_get_frame, NULL,
+     (char*) PyDoc_STR("Frame of the generator"), 0},
     {0, 0, 0, 0, 0}
 };
 static PyTypeObject __pyx_GeneratorType_type = {
@@ -8256,12 +8622,18 @@ static PyTypeObject __pyx_GeneratorType_type = {
 #elif PY_VERSION_HEX >= 0x030400a1
     0,
 #endif
-#if PY_VERSION_HEX >= 0x030800b1
+#if PY_VERSION_HEX >= 0x030800b1 && (!CYTHON_COMPILING_IN_PYPY || PYPY_VERSION_NUM >= 0x07030800)
     0,
 #endif
 #if PY_VERSION_HEX >= 0x030800b4 && PY_VERSION_HEX < 0x03090000
     0,
 #endif
+#if PY_VERSION_HEX >= 0x030C0000
+    0,
+#endif
+#if CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX >= 0x03090000 && PY_VERSION_HEX < 0x030a0000
+    0,
+#endif
 };
 static int __pyx_Generator_init(void) {
     __pyx_GeneratorType_type.tp_getattro = __Pyx_PyObject_GenericGetAttrNoDict;
@@ -8275,11 +8647,33 @@ static int __pyx_Generator_init(void) {
 
 /* CheckBinaryVersion */
 static int __Pyx_check_binary_version(void) {
-    char ctversion[4], rtversion[4];
-    PyOS_snprintf(ctversion, 4, "%d.%d", PY_MAJOR_VERSION, PY_MINOR_VERSION);
-    PyOS_snprintf(rtversion, 4, "%s", Py_GetVersion());
-    if (ctversion[0] != rtversion[0] || ctversion[2] != rtversion[2]) {
+    char ctversion[5];
+    int same=1, i, found_dot;
+    const char* rt_from_call = Py_GetVersion();
+    PyOS_snprintf(ctversion, 5, "%d.%d", PY_MAJOR_VERSION, PY_MINOR_VERSION);
+    found_dot = 0;
+    for (i = 0; i < 4; i++) {
+        if (!ctversion[i]) {
+            same = (rt_from_call[i] < '0' || rt_from_call[i] > '9');
+            break;
+        }
+        if (rt_from_call[i] != ctversion[i]) {
+            same = 0;
+            break;
+        }
+    }
+    if (!same) {
+        char rtversion[5] = {'\0'};
         char message[200];
+        for (i=0; i<4; ++i) {
+            if (rt_from_call[i] == '.') {
+                if (found_dot) break;
+                found_dot = 1;
+            } else if (rt_from_call[i] < '0' || rt_from_call[i] > '9') {
+                break;
+            }
+            rtversion[i] = rt_from_call[i];
+        }
         PyOS_snprintf(message, sizeof(message),
                       "compiletime version %s of module '%.100s' "
                       "does not match runtime version %s",
@@ -8537,6 +8931,23 @@ static CYTHON_INLINE Py_ssize_t __Pyx_PyIndex_AsSsize_t(PyObject* b) {
   Py_DECREF(x);
   return ival;
 }
+static CYTHON_INLINE Py_hash_t __Pyx_PyIndex_AsHash_t(PyObject* o) {
+  if (sizeof(Py_hash_t) == sizeof(Py_ssize_t)) {
+    return (Py_hash_t) __Pyx_PyIndex_AsSsize_t(o);
+#if PY_MAJOR_VERSION < 3
+  } else if (likely(PyInt_CheckExact(o))) {
+    return PyInt_AS_LONG(o);
+#endif
+  } else {
+    Py_ssize_t ival;
+    PyObject *x;
+    x = PyNumber_Index(o);
+    if (!x) return -1;
+    ival = PyInt_AsLong(x);
+    Py_DECREF(x);
+    return ival;
+  }
+}
 static CYTHON_INLINE PyObject * __Pyx_PyBool_FromLong(long b) {
   return b ? __Pyx_NewRef(Py_True) : __Pyx_NewRef(Py_False);
 }
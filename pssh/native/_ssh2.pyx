@@ -17,6 +17,8 @@
 
 """Cython functions for interfacing with ssh2-python and ssh-python"""
 
+from libc.string cimport memchr
+
 from gevent.select import poll, POLLIN, POLLOUT
 from ssh2.session import LIBSSH2_SESSION_BLOCK_INBOUND, LIBSSH2_SESSION_BLOCK_OUTBOUND
 from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
@@ -27,7 +29,7 @@ from ..exceptions import Timeout
 from gevent import Timeout as GTimeout
 
 
-cdef bytes LINESEP = b'\n'
+cdef char LINESEP = b'\n'
 cdef int _LIBSSH2_ERROR_EAGAIN = LIBSSH2_ERROR_EAGAIN
 cdef int _LIBSSH2_SESSION_BLOCK_INBOUND = LIBSSH2_SESSION_BLOCK_INBOUND
 cdef int _LIBSSH2_SESSION_BLOCK_OUTBOUND = LIBSSH2_SESSION_BLOCK_OUTBOUND
@@ -38,13 +40,31 @@ cdef int _POLLIN = POLLIN
 cdef int _POLLOUT = POLLOUT
 
 
+cdef inline Py_ssize_t _rstrip_end(const char *data, Py_ssize_t start,
+                                   Py_ssize_t end) nogil:
+    """End of data between start and end without trailing whitespace, as
+    per ``bytes.rstrip``"""
+    while end > start and (data[end - 1] == 32 or 9 <= data[end - 1] <= 13):
+        end -= 1
+    return end
+
+
 def _read_output(session, read_func, timeout=None):
+    """Read from ``read_func`` and yield output line by line, without line
+    separator and trailing whitespace.
+
+    Line separators are found with ``memchr`` directly on data read and each
+    line is copied once, into the bytes object yielded. Lines spanning reads
+    are collected in a buffer that is reused for the whole output.
+    """
     cdef Py_ssize_t _size
     cdef bytes _data
-    cdef bytes remainder = b""
-    cdef Py_ssize_t remainder_len = 0
-    cdef size_t _pos = 0
-    cdef Py_ssize_t linesep
+    cdef const char *c_data
+    cdef const char *linesep
+    cdef const char *c_remainder
+    cdef bytearray remainder = bytearray()
+    cdef Py_ssize_t _pos
+    cdef Py_ssize_t line_end
     _size, _data = read_func()
     t = GTimeout(timeout)
     t.start()
@@ -54,25 +74,28 @@ def _read_output(session, read_func, timeout=None):
                 wait_select(session, timeout)
                 _size, _data = read_func()
             while _size > 0:
+                c_data = _data
+                _pos = 0
                 while _pos < _size:
-                    linesep = _data[:_size].find(LINESEP, _pos)
-                    if linesep >= 0:
-                        if remainder_len > 0:
-                            yield remainder + _data[_pos:linesep].rstrip()
-                            remainder = b""
-                            remainder_len = 0
-                        else:
-                            yield _data[_pos:linesep].rstrip()
-                        _pos = linesep + 1
-                    else:
-                        remainder += _data[_pos:]
-                        remainder_len = len(remainder)
+                    linesep = <const char *>memchr(
+                        c_data + _pos, LINESEP, _size - _pos)
+                    if linesep is NULL:
+                        remainder += c_data[_pos:_size]
                         break
+                    line_end = linesep - c_data
+                    if len(remainder) > 0:
+                        remainder += c_data[_pos:line_end]
+                        c_remainder = remainder
+                        yield c_remainder[:_rstrip_end(
+                            c_remainder, 0, len(remainder))]
+                        del remainder[:]
+                    else:
+                        yield c_data[_pos:_rstrip_end(c_data, _pos, line_end)]
+                    _pos = line_end + 1
                 _size, _data = read_func()
-                _pos = 0
-        if remainder_len > 0:
+        if len(remainder) > 0:
             # Finished reading without finding ending linesep
-            yield remainder
+            yield bytes(remainder)
     except GTimeout:
         raise Timeout
     finally:
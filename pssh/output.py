@@ -27,10 +27,10 @@ class HostOutput(dict):
     """Class to hold host output"""
 
     __slots__ = ('host', 'cmd', 'channel', 'stdout', 'stderr', 'stdin',
-                 'client', 'exception')
+                 'client', 'exception', '_exit_code')
 
     def __init__(self, host, cmd, channel, stdout, stderr, stdin,
-                 client, exception=None):
+                 client, exception=None, exit_code=None):
         """
         :param host: Host name output is for
         :type host: str
@@ -48,6 +48,9 @@ class HostOutput(dict):
         :type client: :py:class:`pssh.clients.base_ssh_client.SSHClient`
         :param exception: Exception from host if any
         :type exception: :py:class:`Exception` or ``None``
+        :param exit_code: (Optional) Exit code of already finished command,
+          used when there is no client to get exit code from.
+        :type exit_code: int or ``None``
         """
         super(HostOutput, self).__init__(
             (('host', host), ('cmd', cmd), ('channel', channel),
@@ -62,11 +65,12 @@ class HostOutput(dict):
         self.stdin = stdin
         self.client = client
         self.exception = exception
+        object.__setattr__(self, '_exit_code', exit_code)
 
     @property
     def exit_code(self):
         if not self.client:
-            return
+            return self._exit_code
         try:
             return self.client.get_exit_status(self.channel)
         except Exception as ex:
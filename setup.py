@@ -70,6 +70,11 @@ setup(name='parallel-ssh',
                         'tests', 'tests.*',
                         '*.tests', '*.tests.*')
       ),
+      entry_points={
+          'console_scripts': [
+              'pssh-broker = pssh.clients.native.broker:main',
+          ],
+      },
       install_requires=[
           'paramiko', gevent_req, 'ssh2-python>=0.17.0', 'ssh-python>=0.4.0'],
       classifiers=[
@@ -0,0 +1,142 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Unittests for :mod:`pssh.clients.native.broker`"""
+
+import unittest
+import os
+import shutil
+import socket
+import stat
+import tempfile
+
+from gevent import sleep, spawn
+
+from pssh.clients.native.broker import SessionBroker, BrokerClient
+from pssh.exceptions import ConnectionErrorException
+from pssh.output import HostOutput
+
+from .base_ssh2_case import PKEY_FILENAME
+from ..embedded_server.openssh import OpenSSHServer
+
+
+class SessionBrokerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.chmod(PKEY_FILENAME, 0o600)
+        cls.host = '127.0.0.1'
+        cls.port = 2226
+        cls.server = OpenSSHServer(listen_ip=cls.host, port=cls.port)
+        cls.server.start_server()
+        cls.cmd = 'echo me'
+        cls.resp = u'me'
+        cls.user_key = PKEY_FILENAME
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, 'broker.sock')
+        self.broker = SessionBroker(
+            self.socket_path, pkey=self.user_key, num_retries=1)
+        self.broker.start()
+
+    def tearDown(self):
+        self.broker.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_run_command(self):
+        hosts = [self.host, self.host]
+        client = BrokerClient(self.socket_path, hosts, port=self.port)
+        output = client.run_command(self.cmd)
+        self.assertEqual(len(output), len(hosts))
+        for host_out in output:
+            self.assertIsInstance(host_out, HostOutput)
+            self.assertEqual(host_out.host, self.host)
+            self.assertListEqual(host_out.stdout, [self.resp])
+            self.assertListEqual(host_out.stderr, [])
+            self.assertEqual(host_out.exit_code, 0)
+        output = client.run_command('echo err >&2; exit 2')
+        self.assertListEqual(output[0].stderr, [u'err'])
+        self.assertEqual(output[0].exit_code, 2)
+        # One session kept for host, port and user and reused
+        self.assertEqual(self.broker.session_pool.stats()['size'], 1)
+        self.assertEqual(self.broker.session_pool.misses, 1)
+
+    def test_reconnect_closed_session(self):
+        client = BrokerClient(self.socket_path, [self.host], port=self.port)
+        client.run_command(self.cmd)
+        host_client = self.broker.session_pool.values()[0]
+        host_client.session.disconnect()
+        output = client.run_command(self.cmd)
+        self.assertListEqual(output[0].stdout, [self.resp])
+        self.assertIsNot(self.broker.session_pool.values()[0], host_client)
+
+    def test_running_client_not_evicted(self):
+        self.broker.stop()
+        self.broker = SessionBroker(
+            self.socket_path, max_sessions=1, session_idle_timeout=.5,
+            pkey=self.user_key, num_retries=1)
+        self.broker.start()
+        client = BrokerClient(self.socket_path, [self.host], port=self.port)
+        running = spawn(client.run_command, 'sleep 1; echo me')
+        sleep(.5)
+        other_client = BrokerClient(
+            self.socket_path, ['localhost'], port=self.port)
+        output = other_client.run_command(self.cmd)
+        self.assertListEqual(output[0].stdout, [self.resp])
+        output = running.get()
+        self.assertListEqual(output[0].stdout, [self.resp])
+        self.assertEqual(output[0].exit_code, 0)
+        self.assertEqual(len(self.broker.session_pool), 1)
+
+    def test_socket_permissions(self):
+        mode = stat.S_IMODE(os.stat(self.socket_path).st_mode)
+        self.assertEqual(mode, 0o600)
+
+    def test_connection_errors(self):
+        hosts = [self.host, '127.0.0.100']
+        client = BrokerClient(self.socket_path, hosts, port=self.port)
+        self.assertRaises(ConnectionErrorException, client.run_command,
+                          self.cmd)
+        output = client.run_command(self.cmd, stop_on_errors=False)
+        self.assertIsNone(output[0].exception)
+        self.assertIsInstance(output[1].exception, ConnectionErrorException)
+        self.assertEqual(output[1].exception.host, '127.0.0.100')
+
+    def test_broker_not_running(self):
+        self.broker.stop()
+        client = BrokerClient(self.socket_path, [self.host], port=self.port)
+        output = client.run_command(self.cmd, stop_on_errors=False)
+        self.assertIsNotNone(output[0].exception)
+
+    def test_stale_socket(self):
+        self.broker.stop()
+        # Socket left behind by broker no longer running is removed
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.socket_path)
+        sock.close()
+        self.broker.start()
+        self.broker.stop()
+        # Paths that are not sockets are not removed
+        with open(self.socket_path, 'w') as fh:
+            fh.write('data')
+        self.assertRaises(ValueError, self.broker.start)
+        self.assertTrue(os.path.isfile(self.socket_path))
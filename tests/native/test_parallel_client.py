@@ -20,6 +20,7 @@
 """Unittests for :mod:`pssh.ParallelSSHClient` class"""
 
 import unittest
+import gc
 import pwd
 import logging
 import os
@@ -34,11 +35,15 @@ import time
 from pytest import mark
 from gevent import joinall, spawn, socket, Greenlet, sleep
 from pssh import logger as pssh_logger
-from pssh.clients.native import ParallelSSHClient
-from pssh.exceptions import UnknownHostException, \
+from pssh.clients.native import ParallelSSHClient, SSHClient
+from pssh.clients.base.retry import ExponentialBackoff
+from pssh.clients.base.circuit import CircuitBreaker
+from pssh.clients.base.registry import SessionRegistry
+from pssh.clients.base.concurrency import ConnectRateLimiter
+from pssh.exceptions import UnknownHostException, CircuitOpenError, \
     AuthenticationException, ConnectionErrorException, SessionError, \
     HostArgumentException, SFTPError, SFTPIOError, Timeout, SCPError, \
-    ProxyError, PKeyFileError
+    ProxyError, PKeyFileError, RollingAbortError
 from pssh.output import HostOutput
 
 from .base_ssh2_case import PKEY_FILENAME, PUB_FILE
@@ -1673,6 +1678,509 @@ class ParallelSSHClientTest(unittest.TestCase):
             self.assertFalse(timed_out)
             self.assertTrue(dt.total_seconds() < read_timeout)
 
+    def test_imap_run_command(self):
+        host2 = '127.0.0.2'
+        server2 = OpenSSHServer(host2, port=self.port)
+        server2.start_server()
+        hosts = [self.host, host2]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key,
+                                   num_retries=1)
+        output = client.imap_run_command(self.cmd)
+        self.assertFalse(isinstance(output, list))
+        _hosts = []
+        for host_out in output:
+            self.assertIsInstance(host_out, HostOutput)
+            _hosts.append(host_out.host)
+            stdout = list(host_out.stdout)
+            self.assertListEqual(stdout, [self.resp])
+            client.join([host_out])
+            self.assertEqual(host_out.exit_code, 0)
+        self.assertListEqual(sorted(_hosts), sorted(hosts))
+        server2.stop()
+
+    def test_imap_run_command_stop_on_errors(self):
+        hosts = [self.host, '127.0.0.100']
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key,
+                                   num_retries=1)
+        self.assertRaises(ConnectionErrorException, list,
+                          client.imap_run_command(self.cmd))
+        output = list(client.imap_run_command(
+            self.cmd, stop_on_errors=False))
+        self.assertEqual(len(output), len(hosts))
+        output = dict((host_out.host, host_out) for host_out in output)
+        self.assertIsNone(output[self.host].exception)
+        self.assertIsInstance(output['127.0.0.100'].exception,
+                              ConnectionErrorException)
+
+    def test_imap_run_command_host_args(self):
+        client = ParallelSSHClient([self.host], port=self.port,
+                                   pkey=self.user_key,
+                                   num_retries=1)
+        output = list(client.imap_run_command('echo %s', host_args=('me',)))
+        self.assertListEqual(list(output[0].stdout), ['me'])
+        self.assertRaises(HostArgumentException, list,
+                          client.imap_run_command('echo %s', host_args=[]))
+
+    def test_imap_run_command_lazy_hosts(self):
+        client = ParallelSSHClient([], port=self.port,
+                                   pkey=self.user_key,
+                                   num_retries=1, pool_size=2)
+        dispatched = []
+        def _hosts():
+            for _ in range(10):
+                dispatched.append(self.host)
+                yield self.host
+        output = client.imap_run_command(self.cmd, hosts=_hosts())
+        host_out = next(output)
+        self.assertTrue(len(dispatched) < 10)
+        self.assertListEqual(list(host_out.stdout), [self.resp])
+        num_outputs = 1
+        for host_out in output:
+            self.assertListEqual(list(host_out.stdout), [self.resp])
+            num_outputs += 1
+        self.assertEqual(num_outputs, 10)
+        self.assertEqual(len(dispatched), 10)
+        # Clients of hosts not in client's hosts are not kept
+        self.assertEqual(len(client._host_clients), 0)
+        self.assertEqual(client.host_clients, {})
+        # Clients are kept connected while their output is referenced
+        output = list(client.imap_run_command(self.cmd, hosts=[self.host]))
+        self.assertEqual(len(client._host_clients), 0)
+        self.assertListEqual(list(output[0].stdout), [self.resp])
+        self.assertEqual(output[0].exit_code, 0)
+
+    def test_imap_run_command_stopped_early(self):
+        client = ParallelSSHClient([], port=self.port,
+                                   pkey=self.user_key,
+                                   num_retries=1, pool_size=4)
+        dispatched = []
+        def _hosts():
+            dispatched.append('127.0.0.100')
+            yield '127.0.0.100'
+            for _ in range(20):
+                dispatched.append(self.host)
+                yield self.host
+        output = client.imap_run_command(self.cmd, hosts=_hosts())
+        self.assertRaises(ConnectionErrorException, list, output)
+        # Hosts already dispatched are stopped
+        self.assertEqual(client.pool.free_count(), 4)
+        num_dispatched = len(dispatched)
+        self.assertTrue(num_dispatched < 21)
+        sleep(1)
+        # No more hosts are dispatched once stopped
+        self.assertEqual(len(dispatched), num_dispatched)
+        output = client.imap_run_command(self.cmd, hosts=_hosts())
+        next(output)
+        output.close()
+        self.assertEqual(client.pool.free_count(), 4)
+        num_dispatched = len(dispatched)
+        sleep(1)
+        self.assertEqual(len(dispatched), num_dispatched)
+
+    def test_adaptive_concurrency(self):
+        hosts = [self.host, self.host]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key,
+                                   pool_size=2, adaptive_concurrency=True)
+        self.assertEqual(client.connect_limiter.limit, 2)
+        output = client.run_command(self.cmd, return_list=True)
+        client.join(output)
+        for host_out in output:
+            self.assertEqual(list(host_out.stdout), [self.resp])
+        self.assertEqual(client.connect_limiter.successes, 2)
+        self.assertEqual(client.connect_limiter.in_flight, 0)
+
+    def test_stage_limits(self):
+        hosts = [self.host, self.host, self.host]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key,
+                                   connect_concurrency=2, auth_concurrency=1,
+                                   exec_concurrency=1)
+        output = client.run_command(self.cmd, return_list=True)
+        client.join(output)
+        for host_out in output:
+            self.assertEqual(list(host_out.stdout), [self.resp])
+        for _client in client._host_clients.values():
+            self.assertEqual(_client._stage_limits.auth.counter, 1)
+
+    def test_rolling_run_command(self):
+        hosts = [self.host for _ in range(5)]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key)
+        output = client.rolling_run_command(
+            self.cmd, batch_size=2, canary_size=1)
+        self.assertEqual(len(output), len(hosts))
+        for host_out in output:
+            self.assertIsNone(host_out.exception)
+            self.assertEqual(host_out.exit_code, 0)
+            self.assertEqual(list(host_out.stdout), [self.resp])
+
+    def test_rolling_run_command_large_output(self):
+        hosts = [self.host, self.host]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key)
+        # Output larger than channel window
+        output = client.rolling_run_command(
+            'seq 1 1000000; seq 1 1000 >&2', batch_size=1, timeout=60)
+        for host_out in output:
+            self.assertIsNone(host_out.exception)
+            self.assertEqual(host_out.exit_code, 0)
+            self.assertEqual(len(host_out.stdout), 1000000)
+            self.assertEqual(host_out.stdout[-1], '1000000')
+            self.assertEqual(len(host_out.stderr), 1000)
+
+    def test_rolling_run_command_abort(self):
+        hosts = [self.host for _ in range(5)]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key)
+        output = client.rolling_run_command(
+            'exit 1', batch_size=2, max_failure_rate=0.5)
+        self.assertEqual(len(output), len(hosts))
+        for host_out in output[:2]:
+            self.assertIsNone(host_out.exception)
+            self.assertEqual(host_out.exit_code, 1)
+        for host_out in output[2:]:
+            self.assertIsInstance(host_out.exception, RollingAbortError)
+            self.assertEqual(host_out.exception.host, self.host)
+
+    def test_rolling_run_command_no_hosts(self):
+        client = ParallelSSHClient([], port=self.port, pkey=self.user_key)
+        self.assertEqual(client.rolling_run_command(
+            self.cmd, canary_size=1), [])
+
+    def test_connect_all(self):
+        hosts = [self.host, self.host]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key)
+        progress = []
+        clients = client.connect_all(
+            callback=lambda host_i, host, result: progress.append(host_i))
+        self.assertEqual(sorted(progress), [0, 1])
+        self.assertEqual(clients, [client._host_clients[(0, self.host)],
+                                   client._host_clients[(1, self.host)]])
+        for _client in clients:
+            self.assertIsInstance(_client, SSHClient)
+        output = client.run_command(self.cmd, return_list=True)
+        for host_i, host_out in enumerate(output):
+            self.assertEqual(host_out.client, clients[host_i])
+            self.assertEqual(list(host_out.stdout), [self.resp])
+
+    def test_connect_all_errors(self):
+        hosts = [self.host, '127.0.0.100']
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key, num_retries=1)
+        self.assertRaises(ConnectionErrorException, client.connect_all)
+        results = client.connect_all(stop_on_errors=False)
+        self.assertIsInstance(results[0], SSHClient)
+        self.assertIsInstance(results[1], ConnectionErrorException)
+        self.assertEqual(results[1].host, hosts[1])
+
+    def test_run_commands(self):
+        client = ParallelSSHClient([self.host], port=self.port,
+                                   pkey=self.user_key)
+        commands = ['echo %s; sleep .2; exit %s' % (i, i) for i in range(4)]
+        output = client.run_commands(commands, max_channels=2)
+        self.assertEqual(len(output), len(commands))
+        self.assertEqual(len(client._host_clients), 1)
+        for cmd_i, host_out in enumerate(output):
+            self.assertEqual(host_out.host, self.host)
+            self.assertIsNone(host_out.exception)
+            self.assertEqual(host_out.stdout, [str(cmd_i)])
+            self.assertEqual(host_out.exit_code, cmd_i)
+
+    def test_run_shell_command(self):
+        hosts = [self.host, self.host]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key)
+        output = client.run_shell_command('cd /tmp; %s' % (self.cmd,))
+        shells = dict(client._shells)
+        self.assertEqual(len(shells), len(hosts))
+        for host_out in output:
+            self.assertIsNone(host_out.exception)
+            self.assertEqual(host_out.stdout, [self.resp])
+            self.assertEqual(host_out.exit_code, 0)
+        output = client.run_shell_command('pwd; (exit %s)', host_args=(1, 2))
+        self.assertEqual(client._shells, shells)
+        for host_i, host_out in enumerate(output):
+            self.assertEqual(host_out.stdout, ['/tmp'])
+            self.assertEqual(host_out.exit_code, host_i + 1)
+
+    def test_run_shell_command_max_sessions(self):
+        hosts = [self.host for _ in range(4)]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key, pool_size=2,
+                                   max_sessions=2)
+        # Shells in use are not closed by eviction of their clients
+        output = client.run_shell_command('sleep .5; %s' % (self.cmd,))
+        for host_out in output:
+            self.assertIsNone(host_out.exception)
+            self.assertEqual(host_out.stdout, [self.resp])
+            self.assertEqual(host_out.exit_code, 0)
+        self.assertTrue(client.session_pool.evictions >= 2)
+        self.assertEqual(len(client._shells), 2)
+
+    def test_run_command_deadline(self):
+        # Listening socket that never accepts - handshakes never complete
+        host = '127.0.0.12'
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind((host, self.port))
+        sock.listen(10)
+        try:
+            hosts = [host, host, host]
+            client = ParallelSSHClient(hosts, port=self.port,
+                                       pkey=self.user_key, pool_size=1,
+                                       num_retries=1)
+            start = datetime.now()
+            output = client.run_command(self.cmd, return_list=True,
+                                        deadline=1)
+            self.assertTrue((datetime.now() - start).total_seconds() < 3)
+            self.assertEqual(len(output), len(hosts))
+            for host_out in output:
+                self.assertIsInstance(host_out.exception, Timeout)
+                self.assertEqual(host_out.host, host)
+            self.assertEqual(client.pool.free_count(), 1)
+        finally:
+            sock.close()
+
+    def test_run_command_deadline_host_args(self):
+        client = ParallelSSHClient([self.host, self.host], port=self.port,
+                                   pkey=self.user_key, num_retries=1)
+        # No host is started on missing host arguments
+        self.assertRaises(HostArgumentException, client.run_command,
+                          'sleep %s', host_args=(5,), deadline=1)
+        self.assertEqual(client.pool.free_count(), client.pool_size)
+        self.assertEqual(client.host_clients, {})
+
+    def test_join_deadline(self):
+        client = ParallelSSHClient([self.host, self.host], port=self.port,
+                                   pkey=self.user_key)
+        output = client.run_command('sleep %s', host_args=(0, 5),
+                                    return_list=True)
+        client.join(output, deadline=1)
+        self.assertIsNone(output[0].exception)
+        self.assertEqual(output[0].exit_code, 0)
+        self.assertIsInstance(output[1].exception, Timeout)
+
+    def test_max_sessions(self):
+        hosts = [self.host, self.host]
+        self.assertRaises(ValueError, ParallelSSHClient, hosts,
+                          pool_size=2, max_sessions=1)
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key, pool_size=1,
+                                   max_sessions=1)
+        self.assertRaises(ValueError, client.connect_all)
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key, pool_size=1,
+                                   max_sessions=2)
+        clients = client.connect_all()
+        self.assertEqual(client.session_pool.evictions, 0)
+        for _client in clients:
+            self.assertIsNotNone(_client.session)
+        output = list(client.imap_run_command(self.cmd, hosts=[self.host]))
+        self.assertEqual(list(output[0].stdout), [self.resp])
+        self.assertEqual(client.session_pool.stats(),
+                         {'size': 2, 'hits': 0, 'misses': 3, 'evictions': 0})
+
+    def test_max_sessions_output_readable(self):
+        hosts = [self.host for _ in range(4)]
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key, pool_size=2,
+                                   max_sessions=2)
+        # Clients with output not yet read are not evicted
+        for output in (list(client.imap_run_command(self.cmd)),
+                       client.run_command(self.cmd, return_list=True)):
+            client.join(output)
+            for host_out in output:
+                self.assertEqual(list(host_out.stdout), [self.resp])
+                self.assertEqual(host_out.exit_code, 0)
+        self.assertEqual(client.session_pool.evictions, 0)
+        # Released output unpins clients on next run
+        del output, host_out
+        client.cmds = None
+        for host_out in client.imap_run_command(self.cmd):
+            self.assertEqual(list(host_out.stdout), [self.resp])
+        self.assertTrue(client.session_pool.evictions >= 2)
+
+    def test_host_lock(self):
+        client = ParallelSSHClient([self.host], port=self.port,
+                                   pkey=self.user_key)
+        locked = []
+        def _lock(wait):
+            with client._host_lock(0, self.host):
+                locked.append(wait)
+                sleep(wait)
+        client.connect_all()
+        first = spawn(_lock, .2)
+        sleep(0)
+        # Lock is kept while held or waited on, including over eviction
+        client._evict_client(
+            (0, self.host), client._host_clients.pop((0, self.host)))
+        waiting = [spawn(_lock, 0) for _ in range(2)]
+        sleep(.1)
+        self.assertEqual(locked, [.2])
+        self.assertEqual(len(client._host_locks), 1)
+        joinall([first] + waiting, raise_error=True)
+        self.assertEqual(locked, [.2, 0, 0])
+        self.assertEqual(client._host_locks, {})
+
+    def test_dns_cache(self):
+        hosts = [self.host, 'no.such.host.invalid']
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key, dns_cache_ttl=60,
+                                   num_retries=2, retry_delay=5)
+        start = datetime.now()
+        output = client.run_command(self.cmd, stop_on_errors=False,
+                                    return_list=True)
+        self.assertTrue((datetime.now() - start).total_seconds() < 5)
+        self.assertEqual(list(output[0].stdout), [self.resp])
+        self.assertIsInstance(output[1].exception, UnknownHostException)
+        self.assertEqual(client.dns_cache.stats()['misses'], 2)
+        client.run_command(self.cmd, stop_on_errors=False)
+        self.assertEqual(client.dns_cache.stats()['misses'], 2)
+
+    def test_retry_policy_budget(self):
+        hosts = ['127.0.0.100', '127.0.0.101', self.host]
+        policy = ExponentialBackoff(base_delay=.1, budget=2)
+        client = ParallelSSHClient(hosts, port=self.port,
+                                   pkey=self.user_key, num_retries=3,
+                                   retry_policy=policy)
+        output = client.run_command(self.cmd, stop_on_errors=False,
+                                    return_list=True)
+        self.assertIsInstance(output[0].exception, ConnectionErrorException)
+        self.assertIsInstance(output[1].exception, ConnectionErrorException)
+        self.assertEqual(list(output[2].stdout), [self.resp])
+        stats = client.retry_policy.stats()
+        self.assertEqual(sum(host_stats['retries']
+                             for host_stats in stats.values()), 2)
+        self.assertNotIn(self.host, stats)
+        client.run_command(self.cmd, stop_on_errors=False)
+        self.assertEqual(sum(host_stats['retries'] for host_stats in
+                             client.retry_policy.stats().values()), 2)
+
+    def test_circuit_breaker(self):
+        hosts = ['127.0.0.100', self.host]
+        client = ParallelSSHClient(
+            hosts, port=self.port, pkey=self.user_key, num_retries=2,
+            retry_delay=1,
+            circuit_breaker=CircuitBreaker(failure_threshold=1, cooldown=60))
+        output = client.run_command(self.cmd, stop_on_errors=False,
+                                    return_list=True)
+        self.assertIsInstance(output[0].exception, ConnectionErrorException)
+        start = datetime.now()
+        output = client.run_command(self.cmd, stop_on_errors=False,
+                                    return_list=True)
+        self.assertTrue((datetime.now() - start).total_seconds() < 1)
+        self.assertIsInstance(output[0].exception, CircuitOpenError)
+        self.assertEqual(list(output[1].stdout), [self.resp])
+
+    def test_session_registry(self):
+        registry = SessionRegistry()
+        client1 = ParallelSSHClient(
+            [self.host], port=self.port, pkey=self.user_key, num_retries=1,
+            session_registry=registry)
+        client2 = ParallelSSHClient(
+            [self.host], port=self.port, pkey=self.user_key, num_retries=1,
+            session_registry=registry)
+        output1 = client1.run_command(self.cmd, return_list=True)
+        output2 = client2.run_command(self.cmd, return_list=True)
+        self.assertIs(client1.host_clients[self.host],
+                      client2.host_clients[self.host])
+        self.assertEqual(list(output1[0].stdout), [self.resp])
+        self.assertEqual(list(output2[0].stdout), [self.resp])
+        self.assertEqual(registry.stats(), {'size': 1, 'references': 2})
+        host_client = client1.host_clients[self.host]
+        del client1, output1
+        gc.collect()
+        self.assertEqual(registry.stats(), {'size': 1, 'references': 1})
+        self.assertIsNotNone(host_client.session)
+        del client2, output2
+        gc.collect()
+        self.assertEqual(len(registry), 0)
+        self.assertIsNone(host_client.session)
+
+    def test_reconnect_dead_session(self):
+        client = ParallelSSHClient(
+            [self.host], port=self.port, pkey=self.user_key, num_retries=1)
+        output = client.run_command(self.cmd, return_list=True)
+        self.assertEqual(list(output[0].stdout), [self.resp])
+        host_client = client.host_clients[self.host]
+        # Session reset by remote end
+        host_client.sock.shutdown(socket.SHUT_RDWR)
+        output = client.run_command(self.cmd, return_list=True)
+        self.assertIsNone(output[0].exception)
+        self.assertEqual(list(output[0].stdout), [self.resp])
+        self.assertIsNot(client.host_clients[self.host], host_client)
+        self.assertIsNone(host_client.session)
+
+    def test_reconnect_dead_session_shell(self):
+        client = ParallelSSHClient(
+            [self.host], port=self.port, pkey=self.user_key, num_retries=1)
+        client.run_shell_command(self.cmd)
+        shell = client._shells[(0, self.host)]
+        shell.client.sock.shutdown(socket.SHUT_RDWR)
+        output = client.run_shell_command(self.cmd)
+        self.assertIsNone(output[0].exception)
+        self.assertEqual(output[0].stdout, [self.resp])
+        self.assertTrue(shell.closed)
+        self.assertIsNot(client._shells[(0, self.host)], shell)
+        # Shell of dead client is closed when client is reconnected
+        shell = client._shells[(0, self.host)]
+        shell.client.sock.shutdown(socket.SHUT_RDWR)
+        output = client.run_command(self.cmd, return_list=True)
+        self.assertEqual(list(output[0].stdout), [self.resp])
+        self.assertTrue(shell.closed)
+        self.assertEqual(client._shells, {})
+
+    def test_connect_rate_limiter(self):
+        hosts = [self.host for _ in range(5)]
+        limiter = ConnectRateLimiter(rate=10, burst=1)
+        client = ParallelSSHClient(
+            hosts, port=self.port, pkey=self.user_key, num_retries=1,
+            connect_rate_limiter=limiter)
+        start = datetime.now()
+        client.connect_all()
+        self.assertTrue((datetime.now() - start).total_seconds() >= .4)
+        stats = limiter.stats()
+        self.assertEqual(stats['attempts'], 5)
+        self.assertEqual(stats['delayed'], 4)
+
+    def test_probe(self):
+        hosts = [self.host, '127.0.0.100', 'no.such.host.invalid']
+        client = ParallelSSHClient(
+            hosts, port=self.port, pkey=self.user_key, num_retries=1)
+        reachable, unreachable = client.probe(timeout=1, read_banner=True)
+        self.assertEqual(reachable, set([self.host]))
+        self.assertEqual(unreachable,
+                         set(['127.0.0.100', 'no.such.host.invalid']))
+        self.assertEqual(client.hosts, hosts)
+        client.probe(timeout=1, exclude_unreachable=True)
+        self.assertEqual(client.hosts, [self.host])
+        output = client.run_command(self.cmd, return_list=True)
+        self.assertEqual(len(output), 1)
+        self.assertEqual(list(output[0].stdout), [self.resp])
+        proxy_client = ParallelSSHClient(
+            [self.host], port=self.port, pkey=self.user_key,
+            proxy_host=self.host)
+        self.assertRaises(ProxyError, proxy_client.probe)
+
+    def test_probe_connected(self):
+        hosts = ['no.such.host.invalid', self.host, self.host]
+        client = ParallelSSHClient(
+            hosts, port=self.port, pkey=self.user_key, num_retries=1)
+        clients = client.connect_all(stop_on_errors=False)
+        client.probe(timeout=1, exclude_unreachable=True)
+        self.assertEqual(client.hosts, [self.host, self.host])
+        # Clients are kept by new position of their host
+        self.assertIs(client._host_clients[(0, self.host)], clients[1])
+        self.assertIs(client._host_clients[(1, self.host)], clients[2])
+        self.assertNotIn((2, self.host), client._host_clients)
+        output = client.run_command(self.cmd, return_list=True)
+        self.assertEqual([host_out.client for host_out in output],
+                         clients[1:])
+        self.assertEqual(list(output[0].stdout), [self.resp])
+
     # TODO:
     # * forward agent enabled
     # * password auth
@@ -0,0 +1,85 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Unittests for :mod:`pssh.clients.native.sharded.ShardedParallelSSHClient`
+class"""
+
+import unittest
+import os
+
+from pssh.clients.native.sharded import ShardedParallelSSHClient
+from pssh.exceptions import ConnectionErrorException, HostArgumentException
+from pssh.output import HostOutput
+
+from .base_ssh2_case import PKEY_FILENAME
+from ..embedded_server.openssh import OpenSSHServer
+
+
+class ShardedParallelSSHClientTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.chmod(PKEY_FILENAME, 0o600)
+        cls.host = '127.0.0.1'
+        cls.port = 2224
+        cls.server = OpenSSHServer(listen_ip=cls.host, port=cls.port)
+        cls.server.start_server()
+        cls.cmd = 'echo me'
+        cls.resp = u'me'
+        cls.user_key = PKEY_FILENAME
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_run_command(self):
+        hosts = [self.host for _ in range(5)]
+        client = ShardedParallelSSHClient(
+            hosts, processes=2, port=self.port, pkey=self.user_key,
+            num_retries=1)
+        output = client.run_command(self.cmd)
+        self.assertEqual(len(output), len(hosts))
+        for host_out in output:
+            self.assertIsInstance(host_out, HostOutput)
+            self.assertEqual(host_out.host, self.host)
+            self.assertListEqual(host_out.stdout, [self.resp])
+            self.assertListEqual(host_out.stderr, [])
+            self.assertEqual(host_out.exit_code, 0)
+            self.assertIsNone(host_out.exception)
+
+    def test_exit_code_host_args(self):
+        hosts = [self.host, self.host, self.host]
+        client = ShardedParallelSSHClient(
+            hosts, processes=2, port=self.port, pkey=self.user_key,
+            num_retries=1)
+        output = client.run_command('exit %s', host_args=(0, 1, 2))
+        self.assertListEqual([host_out.exit_code for host_out in output],
+                             [0, 1, 2])
+        self.assertRaises(HostArgumentException, client.run_command,
+                          'exit %s', host_args=(0,))
+
+    def test_connection_errors(self):
+        hosts = [self.host, '127.0.0.100']
+        client = ShardedParallelSSHClient(
+            hosts, processes=2, port=self.port, pkey=self.user_key,
+            num_retries=1)
+        self.assertRaises(ConnectionErrorException, client.run_command,
+                          self.cmd)
+        output = client.run_command(self.cmd, stop_on_errors=False)
+        self.assertIsNone(output[0].exception)
+        self.assertIsInstance(output[1].exception, ConnectionErrorException)
+        self.assertEqual(output[1].exception.host, '127.0.0.100')
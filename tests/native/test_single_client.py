@@ -23,9 +23,11 @@ import subprocess
 import shutil
 from hashlib import sha256
 
-from gevent import socket, sleep, spawn
+from gevent import socket, sleep, spawn, Timeout as GTimeout
 
 from pssh.clients.native import SSHClient, logger as ssh_logger
+from pssh.clients.base.auth import AuthCache
+from pssh.clients.common import SourceAddressPool
 from ssh2.session import Session
 from ssh2.channel import Channel
 from ssh2.exceptions import SocketDisconnectError, BannerRecvError, SocketRecvError, \
@@ -516,3 +518,87 @@ class SSH2ClientTest(SSH2TestCase):
                     os.unlink(_path)
                 except OSError:
                     pass
+
+    def test_open_shell(self):
+        shell = self.client.open_shell()
+        try:
+            self.assertEqual(shell.run(self.cmd), ([self.resp], [], 0))
+            self.assertEqual(shell.run('cd /tmp; echo err >&2; (exit 2)'),
+                             ([], ['err'], 2))
+            self.assertEqual(shell.run('pwd; printf no-newline'),
+                             (['/tmp', 'no-newline'], [], 0))
+            self.assertRaises(Timeout, shell.run, 'sleep 2', timeout=.5)
+            self.assertTrue(shell.closed)
+            self.assertRaises(SessionError, shell.run, self.cmd)
+        finally:
+            shell.close()
+
+    def test_connect_addresses(self):
+        # First address refuses connections, second does not respond
+        addresses = [(socket.AF_INET, ('127.0.0.1', 1)),
+                     (socket.AF_INET, ('10.255.255.1', self.port)),
+                     (socket.AF_INET, (self.host, self.port))]
+        start = time.time()
+        sock = self.client._connect_addresses(addresses)
+        try:
+            self.assertTrue(time.time() - start < 1)
+            self.assertEqual(sock.getpeername(), (self.host, self.port))
+        finally:
+            sock.close()
+        self.assertRaises(socket.error, self.client._connect_addresses,
+                          addresses[:1])
+        self.assertRaises(socket.error, self.client._connect_addresses, [])
+        # Errors other than socket errors are raised rather than waited on
+        self.client._socket_options = [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 'x')]
+        try:
+            with GTimeout(5):
+                self.assertRaises(TypeError, self.client._connect_addresses,
+                                  addresses[2:])
+        finally:
+            self.client._socket_options = None
+
+    def test_auth_cache(self):
+        class _SSHClient(SSHClient):
+            IDENTITIES = ('/no/such/key', self.user_key)
+        cache = AuthCache()
+        client = _SSHClient(self.host, port=self.port, num_retries=1,
+                            allow_agent=False, _auth_cache=cache)
+        self.assertEqual(cache.get(client.user, self.host),
+                         ('identity', self.user_key))
+        # Wrong cached identity falls back to trying all identities
+        cache.set(client.user, self.host, 'identity', identity='/no/such/key')
+        _SSHClient(self.host, port=self.port, num_retries=1,
+                   allow_agent=False, _auth_cache=cache)
+        self.assertEqual(cache.get(client.user, self.host),
+                         ('identity', self.user_key))
+
+    def test_is_alive(self):
+        client = SSHClient(self.host, port=self.port,
+                           pkey=self.user_key,
+                           num_retries=1)
+        self.assertTrue(client.is_alive())
+        self.assertIsNone(client.last_activity)
+        channel, host, stdout, stderr, stdin = client.run_command(self.cmd)
+        self.assertEqual(list(stdout), [self.resp])
+        client.wait_finished(channel)
+        self.assertIsNotNone(client.last_activity)
+        self.assertTrue(client.is_alive())
+        client._keepalive_error = Exception()
+        self.assertFalse(client.is_alive())
+        client._keepalive_error = None
+        # Reads return EOF as if remote end closed connection
+        client.sock.shutdown(socket.SHUT_RD)
+        self.assertFalse(client.is_alive())
+        client.disconnect()
+        self.assertFalse(client.is_alive())
+
+    def test_socket_options_source_addresses(self):
+        client = SSHClient(
+            self.host, port=self.port, pkey=self.user_key, num_retries=1,
+            _socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+            _source_addresses=SourceAddressPool(['127.0.0.2']))
+        self.assertEqual(client.sock.getsockname()[0], '127.0.0.2')
+        self.assertTrue(client.sock.getsockopt(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY))
+        client.disconnect()
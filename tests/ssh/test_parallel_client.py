@@ -16,6 +16,7 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 
 import unittest
+import gc
 import os
 import pwd
 import logging
@@ -30,6 +31,7 @@ from pssh.exceptions import UnknownHostException, \
     ProxyError, PKeyFileError
 from pssh import logger as pssh_logger
 from pssh.clients.ssh.parallel import ParallelSSHClient
+from pssh.clients.base.registry import SessionRegistry
 
 from .base_ssh_case import PKEY_FILENAME, PUB_FILE
 from ..embedded_server.openssh import OpenSSHServer
@@ -472,6 +474,31 @@ class LibSSHParallelTest(unittest.TestCase):
         for host_out in output:
             self.assertFalse(host_out.client.finished(host_out.channel))
 
+    def test_session_registry(self):
+        registry = SessionRegistry()
+        client1 = ParallelSSHClient(
+            [self.host], port=self.port, pkey=self.user_key, num_retries=1,
+            session_registry=registry)
+        client2 = ParallelSSHClient(
+            [self.host], port=self.port, pkey=self.user_key, num_retries=1,
+            session_registry=registry)
+        output1 = client1.run_command(self.cmd, return_list=True)
+        output2 = client2.run_command(self.cmd, return_list=True)
+        self.assertIs(client1.host_clients[self.host],
+                      client2.host_clients[self.host])
+        self.assertEqual(list(output1[0].stdout), [self.resp])
+        self.assertEqual(list(output2[0].stdout), [self.resp])
+        self.assertEqual(registry.stats(), {'size': 1, 'references': 2})
+        host_client = client1.host_clients[self.host]
+        del client1, output1
+        gc.collect()
+        self.assertEqual(registry.stats(), {'size': 1, 'references': 1})
+        self.assertFalse(host_client.sock.closed)
+        del client2, output2
+        gc.collect()
+        self.assertEqual(len(registry), 0)
+        self.assertTrue(host_client.sock.closed)
+
     # def test_multiple_run_command_timeout(self):
     #     client = ParallelSSHClient([self.host], port=self.port,
     #                                pkey=self.user_key)
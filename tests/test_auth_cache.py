@@ -0,0 +1,148 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Unittests for :mod:`pssh.clients.base.auth`"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pssh.clients.base.auth import AuthCache
+from pssh.clients.base.single import BaseSSHClient
+
+
+class _AuthClient(BaseSSHClient):
+    """Client recording authentication methods tried without connecting"""
+
+    def __init__(self, auth_cache, allow_agent=True, identity_auth=True,
+                 password=None):
+        self.host = 'host1'
+        self.user = 'user'
+        self.allow_agent = allow_agent
+        self.identity_auth = identity_auth
+        self.password = password
+        self._auth_cache = auth_cache
+        self.tried = []
+
+    def disconnect(self):
+        pass
+
+    def _agent_auth(self):
+        self.tried.append('agent')
+
+    def _pkey_auth(self, pkey, password=None):
+        self.tried.append('identity')
+
+    def _password_auth(self):
+        self.tried.append('password')
+
+
+class AuthCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'auth_cache.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_set(self):
+        cache = AuthCache()
+        self.assertIsNone(cache.get('user', 'host1'))
+        cache.set('user', 'host1', 'agent')
+        cache.set('user', 'host2', 'identity', identity='/id_rsa')
+        self.assertEqual(cache.get('user', 'host1'), ('agent', None))
+        self.assertEqual(cache.get('user', 'host2'), ('identity', '/id_rsa'))
+        self.assertIsNone(cache.get('other_user', 'host1'))
+        cache.remove('user', 'host1')
+        self.assertIsNone(cache.get('user', 'host1'))
+        self.assertRaises(ValueError, cache.set, 'user', 'host1', 'blah')
+
+    def test_host_pattern(self):
+        cache = AuthCache()
+        cache.set('user', 'web*.example.com', 'identity',
+                  identity='~/.ssh/web_key')
+        cache.set('user', 'web1.example.com', 'password')
+        self.assertEqual(cache.get('user', 'web1.example.com'),
+                         ('password', None))
+        self.assertEqual(cache.get('user', 'web2.example.com'),
+                         ('identity', os.path.expanduser('~/.ssh/web_key')))
+        self.assertIsNone(cache.get('user', 'db1.example.com'))
+        self.assertEqual(list(cache._patterns), ['user@web*.example.com'])
+        cache.remove('user', 'web*.example.com')
+        self.assertIsNone(cache.get('user', 'web2.example.com'))
+        self.assertEqual(cache._patterns, {})
+
+    def test_persistence(self):
+        cache = AuthCache(path=self.path)
+        cache.set('user', 'host1', 'identity', identity='/id_rsa')
+        cache.set('user', 'host2', 'agent')
+        cache.remove('user', 'host2')
+        # Entries are only written on save
+        self.assertFalse(os.path.exists(self.path))
+        cache.save()
+        mtime = os.stat(self.path).st_mtime
+        cache.save()
+        self.assertEqual(os.stat(self.path).st_mtime, mtime)
+        cache = AuthCache(path=self.path)
+        self.assertEqual(cache.get('user', 'host1'), ('identity', '/id_rsa'))
+        self.assertIsNone(cache.get('user', 'host2'))
+        cache.set('user', 'host[0-9]', 'agent')
+        cache.save()
+        cache = AuthCache(path=self.path)
+        self.assertEqual(cache.get('user', 'host3'), ('agent', None))
+
+    def test_save_on_collection(self):
+        cache = AuthCache(path=self.path)
+        cache.set('user', 'host1', 'agent')
+        del cache
+        self.assertEqual(AuthCache(path=self.path).get('user', 'host1'),
+                         ('agent', None))
+
+    def test_invalid_file(self):
+        with open(self.path, 'w') as fh:
+            fh.write('not json')
+        cache = AuthCache(path=self.path)
+        self.assertIsNone(cache.get('user', 'host1'))
+        cache.set('user', 'host1', 'agent')
+        cache.save()
+        self.assertEqual(AuthCache(path=self.path).get('user', 'host1'),
+                         ('agent', None))
+
+    def test_cached_auth_client_settings(self):
+        cache = AuthCache()
+        cache.set('user', 'host1', 'agent')
+        client = _AuthClient(cache, allow_agent=False)
+        self.assertFalse(client._cached_auth())
+        self.assertEqual(client.tried, [])
+        # Entry is kept for clients allowing the method
+        client = _AuthClient(cache)
+        self.assertTrue(client._cached_auth())
+        self.assertEqual(client.tried, ['agent'])
+        cache.set('user', 'host1', 'identity', identity='/id_rsa')
+        client = _AuthClient(cache, identity_auth=False)
+        self.assertFalse(client._cached_auth())
+        self.assertEqual(client.tried, [])
+        cache.set('user', 'host1', 'password')
+        client = _AuthClient(cache)
+        self.assertFalse(client._cached_auth())
+        client = _AuthClient(cache, password='pass')
+        self.assertTrue(client._cached_auth())
+        self.assertEqual(client.tried, ['password'])
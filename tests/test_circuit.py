@@ -0,0 +1,102 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Unittests for :mod:`pssh.clients.base.circuit`"""
+
+
+import unittest
+
+from gevent import sleep
+
+from pssh.clients.base.circuit import CircuitBreaker
+from pssh.exceptions import CircuitOpenError, ConnectionErrorException, \
+    Timeout, DeadlineTimeout
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, cooldown=.2)
+
+    def _fail(self, host, exc=ConnectionErrorException):
+        try:
+            with self.breaker.guard(host):
+                raise exc()
+        except exc:
+            pass
+
+    def _succeed(self, host):
+        with self.breaker.guard(host):
+            pass
+
+    def test_open_after_threshold(self):
+        self._fail('host1')
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.CLOSED)
+        self._succeed('host1')
+        self._fail('host1')
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.CLOSED)
+        self._fail('host1')
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.OPEN)
+        self.assertRaises(CircuitOpenError, self._succeed, 'host1')
+        self._succeed('host2')
+        self.assertEqual(self.breaker.stats(),
+                         {'host1': {'failures': 2, 'state': 'open'}})
+
+    def test_half_open_probe(self):
+        self._fail('host1')
+        self._fail('host1')
+        sleep(.3)
+        self.assertEqual(self.breaker.state('host1'),
+                         CircuitBreaker.HALF_OPEN)
+        self.breaker.check('host1')
+        # Only one probe at a time
+        self.assertRaises(CircuitOpenError, self.breaker.check, 'host1')
+        self.breaker.failure('host1')
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.OPEN)
+        sleep(.3)
+        self._succeed('host1')
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.stats(), {})
+
+    def test_deadline_not_failure(self):
+        self._fail('host1')
+        self._fail('host1', exc=DeadlineTimeout)
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.CLOSED)
+        self._fail('host1')
+        sleep(.3)
+        self._fail('host1', exc=DeadlineTimeout)
+        self.assertEqual(self.breaker.state('host1'),
+                         CircuitBreaker.HALF_OPEN)
+        self._succeed('host1')
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.CLOSED)
+
+    def test_timeout_failure(self):
+        # Timeouts other than deadlines, like handshake timeouts, are failures
+        self._fail('host1', exc=Timeout)
+        self._fail('host1', exc=Timeout)
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.OPEN)
+
+    def test_reset(self):
+        for _ in range(2):
+            self._fail('host1')
+            self._fail('host2')
+        self.breaker.reset('host1')
+        self.assertEqual(self.breaker.state('host1'), CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.state('host2'), CircuitBreaker.OPEN)
+        self.breaker.reset()
+        self.assertEqual(self.breaker.state('host2'), CircuitBreaker.CLOSED)
@@ -0,0 +1,291 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Unittests for :mod:`pssh.clients.base.concurrency`"""
+
+
+import threading
+import time
+import unittest
+
+from gevent import sleep, spawn, joinall, socket, Timeout
+
+from pssh.clients.base.concurrency import AdaptiveLimiter, StageLimits, \
+    AuthExecutor, TokenBucket, ConnectRateLimiter
+from pssh.clients.base.parallel import BaseParallelSSHClient
+from pssh.clients.base.single import BaseSSHClient
+from pssh.exceptions import ConnectionErrorException, \
+    AuthenticationException, DeadlineTimeout
+
+
+class AdaptiveLimiterTest(unittest.TestCase):
+
+    def test_increase(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=4)
+        for _ in range(3):
+            limiter.run(lambda: None)
+        self.assertEqual(limiter.limit, 3)
+        for _ in range(20):
+            limiter.run(lambda: None)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.stats()['successes'], 23)
+
+    def test_backoff(self):
+        limiter = AdaptiveLimiter(initial_limit=8, backoff_interval=0)
+        limiter.acquire()
+        limiter.release(exception=ConnectionErrorException("error"))
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.failures, 1)
+        limiter.acquire()
+        limiter.release(latency=1)
+        self.assertEqual(limiter.limit, 4)
+        limiter.latency_threshold = 0.5
+        limiter.acquire()
+        limiter.release(latency=1)
+        self.assertEqual(limiter.limit, 2)
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(exception=ConnectionErrorException("error"))
+        self.assertEqual(limiter.limit, limiter.min_limit)
+
+    def test_backoff_interval(self):
+        limiter = AdaptiveLimiter(initial_limit=8, backoff_interval=60)
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(exception=ConnectionErrorException("error"))
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.failures, 3)
+
+    def test_non_congestion_errors(self):
+        limiter = AdaptiveLimiter(initial_limit=8, backoff_interval=0)
+
+        def _auth_fail():
+            raise AuthenticationException("auth failed")
+        self.assertRaises(AuthenticationException, limiter.run, _auth_fail)
+        self.assertEqual(limiter.limit, 8)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.failures, 0)
+
+    def test_limit_concurrency(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+        running = []
+        max_running = []
+
+        def _attempt():
+            running.append(None)
+            max_running.append(len(running))
+            sleep(.1)
+            running.pop()
+        joinall([spawn(limiter.run, _attempt) for _ in range(6)])
+        self.assertEqual(max(max_running), 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_interrupted(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=10)
+        for _ in range(20):
+            attempt = spawn(limiter.run, sleep, 10)
+            sleep(0)
+            self.assertEqual(limiter.in_flight, 1)
+            attempt.kill()
+            self.assertEqual(limiter.in_flight, 0)
+        with Timeout(.01):
+            self.assertRaises(Timeout, limiter.run, sleep, 10)
+        self.assertEqual(limiter.in_flight, 0)
+        # Interrupted attempts are neither successes nor failures
+        self.assertEqual(limiter.stats(), {
+            'limit': 2, 'in_flight': 0, 'successes': 0, 'failures': 0})
+        # Slots remain usable
+        self.assertEqual(limiter.run(lambda: 1), 1)
+
+    def test_deadline(self):
+        limiter = AdaptiveLimiter(initial_limit=4, backoff_interval=0)
+        attempts = [spawn(limiter.run, sleep, 10) for _ in range(4)]
+        sleep(0)
+        self.assertEqual(limiter.in_flight, 4)
+        for attempt in attempts:
+            attempt.kill(DeadlineTimeout)
+        # Stopped at deadline, not failed - no back off
+        self.assertEqual(limiter.stats(), {
+            'limit': 4, 'in_flight': 0, 'successes': 0, 'failures': 0})
+
+    def test_fd_limit(self):
+        limiter = AdaptiveLimiter(initial_limit=10, max_limit=10 ** 9)
+        self.assertTrue(limiter.max_limit < 10 ** 9)
+
+
+class StageLimitsTest(unittest.TestCase):
+
+    def test_stages(self):
+        limits = StageLimits(connect=3, auth=1)
+        running = {'connect': [], 'auth': []}
+        max_running = {'connect': [], 'auth': []}
+
+        def _stage(name):
+            running[name].append(None)
+            max_running[name].append(len(running[name]))
+            sleep(.05)
+            running[name].pop()
+
+        def _host():
+            with limits.connect:
+                _stage('connect')
+            with limits.auth:
+                _stage('auth')
+            with limits.execute:
+                pass
+        joinall([spawn(_host) for _ in range(6)])
+        self.assertEqual(max(max_running['connect']), 3)
+        self.assertEqual(max(max_running['auth']), 1)
+
+
+class AuthExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = AuthExecutor(2)
+
+    def tearDown(self):
+        self.executor.close()
+
+    def test_apply(self):
+        self.assertEqual(self.executor.apply(lambda a, b=0: a + b, 1, b=2), 3)
+        self.assertRaises(ValueError, self.executor.apply, int, 'a')
+        stats = self.executor.stats()
+        self.assertEqual(stats['completed'], 2)
+        self.assertEqual(stats['queued'], 0)
+        self.assertEqual(stats['running'], 0)
+
+    def test_spawn(self):
+        result = self.executor.spawn(lambda a, b=0: a + b, 1, b=2)
+        self.assertEqual(result.get(), 3)
+        self.assertRaises(ValueError, self.executor.spawn(int, 'a').get)
+        self.assertEqual(self.executor.stats()['completed'], 2)
+
+    def test_queueing(self):
+        cmds = [spawn(self.executor.apply, time.sleep, .2) for _ in range(4)]
+        sleep(.1)
+        stats = self.executor.stats()
+        self.assertEqual(stats['running'], 2)
+        self.assertEqual(stats['queued'], 2)
+        joinall(cmds, raise_error=True)
+        stats = self.executor.stats()
+        self.assertEqual(stats['completed'], 4)
+        self.assertTrue(stats['max_wait_time'] >= .1)
+
+    def test_parallel_client_close(self):
+        client = BaseParallelSSHClient(['host'], auth_threads=2)
+        client.auth_executor.apply(time.sleep, 0)
+        workers = client.auth_executor._pool._worker_greenlets
+        self.assertTrue(len(workers) > 0)
+        # Executor threads exit once parallel client is deleted
+        client.__del__()
+        for _ in range(100):
+            if not workers:
+                break
+            sleep(.01)
+        self.assertEqual(len(workers), 0)
+
+    def test_killed_during_init(self):
+        in_init = threading.Event()
+        finish_init = threading.Event()
+        socks = []
+
+        class _Client(BaseSSHClient):
+            def _connect(self, host, port, retries=1, addresses=None):
+                self.sock, peer = socket.socketpair()
+                socks.extend((self.sock, peer))
+
+            def _init(self, retries=1):
+                in_init.set()
+                finish_init.wait(5)
+
+            def disconnect(self):
+                pass
+
+        connect = spawn(_Client, 'host', user='user',
+                        _auth_executor=self.executor)
+        while not in_init.is_set():
+            sleep(.01)
+        connect.kill(DeadlineTimeout)
+        self.assertIsInstance(connect.exception, DeadlineTimeout)
+        sock, peer = socks
+        # Still in use by auth thread, shut down but not closed
+        self.assertFalse(sock.closed)
+        self.assertEqual(peer.recv(1), b'')
+        finish_init.set()
+        for _ in range(100):
+            if sock.closed:
+                break
+            sleep(.01)
+        self.assertTrue(sock.closed)
+        peer.close()
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_reserve(self):
+        bucket = TokenBucket(10, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        # Tokens are reserved in turn
+        self.assertAlmostEqual(bucket.reserve(), .1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), .2, places=2)
+        sleep(.3)
+        self.assertEqual(bucket.reserve(), 0)
+
+
+class ConnectRateLimiterTest(unittest.TestCase):
+
+    def test_rate(self):
+        limiter = ConnectRateLimiter(rate=20, burst=1)
+        start = time.time()
+        joinall([spawn(limiter.acquire, '127.0.0.1') for _ in range(5)],
+                raise_error=True)
+        self.assertTrue(time.time() - start >= .19)
+        stats = limiter.stats()
+        self.assertEqual(stats['attempts'], 5)
+        self.assertEqual(stats['delayed'], 4)
+
+    def test_subnet_rate(self):
+        limiter = ConnectRateLimiter(subnet_rate=1, ipv4_prefix=24)
+        limiter.acquire('10.0.0.1')
+        start = time.time()
+        # Other subnets and host names are not delayed
+        limiter.acquire('10.0.1.1')
+        limiter.acquire('fd00::1')
+        limiter.acquire('fd00:0:0:1::1')
+        limiter.acquire('host.example.com')
+        self.assertTrue(time.time() - start < .1)
+        self.assertEqual(limiter.stats()['delayed'], 0)
+        limiter.subnet_rate = 20
+        limiter.subnet_burst = 1
+        limiter._subnet_buckets.clear()
+        limiter.acquire('10.0.0.1')
+        limiter.acquire('10.0.0.2')
+        self.assertEqual(limiter.stats()['delayed'], 1)
+
+    def test_subnet(self):
+        limiter = ConnectRateLimiter(ipv4_prefix=20, ipv6_prefix=60)
+        self.assertEqual(limiter._subnet('10.0.15.1'),
+                         limiter._subnet('10.0.0.1'))
+        self.assertNotEqual(limiter._subnet('10.0.16.1'),
+                            limiter._subnet('10.0.0.1'))
+        self.assertEqual(limiter._subnet('fd00:0:0:f::1'),
+                         limiter._subnet('fd00::1'))
+        self.assertNotEqual(limiter._subnet('fd00:0:0:10::1'),
+                            limiter._subnet('fd00::1'))
+        self.assertEqual(limiter._subnet('host'), 'host')
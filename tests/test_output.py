@@ -75,3 +75,9 @@ class TestHostOutput(unittest.TestCase):
             'host', None, None, None, None, None, exc_client, None)
         exit_code = host_out.exit_code
         self.assertEqual(exit_code, None)
+
+    def test_exit_code_no_client(self):
+        host_out = HostOutput(
+            'host', None, None, [], [], None, None, exit_code=2)
+        self.assertEqual(host_out.exit_code, 2)
+        self.assertFalse('_exit_code' in host_out)
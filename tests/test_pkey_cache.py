@@ -0,0 +1,53 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Unittests for :class:`pssh.clients.common.PKeyCache`"""
+
+
+import os
+import unittest
+
+from pssh.clients.common import PKeyCache
+
+
+PKEY_FILENAME = os.path.sep.join([os.path.dirname(__file__), 'client_pkey'])
+
+
+class PKeyCacheTest(unittest.TestCase):
+
+    def test_read_once(self):
+        loaded = []
+
+        def _loader(pkey, passphrase):
+            loaded.append((pkey, passphrase))
+            return object()
+        cache = PKeyCache(loader=_loader)
+        key = cache.get(PKEY_FILENAME)
+        self.assertIs(cache.get(PKEY_FILENAME), key)
+        self.assertIsNot(cache.get(PKEY_FILENAME, passphrase='pass'), key)
+        self.assertEqual(loaded, [(PKEY_FILENAME, None),
+                                  (PKEY_FILENAME, 'pass')])
+        cache.clear()
+        cache.get(PKEY_FILENAME)
+        self.assertEqual(len(loaded), 3)
+
+    def test_default_loader(self):
+        cache = PKeyCache()
+        with open(PKEY_FILENAME, 'rb') as fh:
+            self.assertEqual(cache.get(PKEY_FILENAME), fh.read())
+        self.assertRaises(IOError, cache.get, '/no/such/key')
@@ -0,0 +1,80 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Unittests for :func:`pssh.native._ssh2._read_output`"""
+
+
+import unittest
+
+from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
+
+from pssh.native._ssh2 import _read_output
+
+
+class FakeSession(object):
+
+    def block_directions(self):
+        return 0
+
+
+def _reader(chunks):
+    chunks = iter(list(chunks) + [b''])
+
+    def read_func():
+        data = next(chunks)
+        if data is LIBSSH2_ERROR_EAGAIN:
+            return LIBSSH2_ERROR_EAGAIN, b''
+        return len(data), data
+    return read_func
+
+
+class ReadOutputTest(unittest.TestCase):
+
+    def read(self, chunks):
+        return list(_read_output(FakeSession(), _reader(chunks)))
+
+    def test_lines(self):
+        self.assertEqual(self.read([b'line1\nline2\n']), [b'line1', b'line2'])
+        self.assertEqual(self.read([b'\n\nline\n']), [b'', b'', b'line'])
+        self.assertEqual(self.read([]), [])
+
+    def test_trailing_whitespace(self):
+        self.assertEqual(self.read([b'line1 \t\r\nline2\r\n']),
+                         [b'line1', b'line2'])
+        self.assertEqual(self.read([b'  line\n']), [b'  line'])
+
+    def test_lines_across_reads(self):
+        self.assertEqual(self.read([b'li', b'ne1\nli', b'ne', b'2\n']),
+                         [b'line1', b'line2'])
+        self.assertEqual(self.read([b'line1\r', b'\n', b'line2 ', b'\n']),
+                         [b'line1', b'line2'])
+
+    def test_no_ending_linesep(self):
+        self.assertEqual(self.read([b'line1\nli', b'ne2']),
+                         [b'line1', b'line2'])
+
+    def test_eagain(self):
+        self.assertEqual(
+            self.read([LIBSSH2_ERROR_EAGAIN, b'line1\nli',
+                       LIBSSH2_ERROR_EAGAIN, b'ne2\n']),
+            [b'line1', b'line2'])
+
+    def test_long_line(self):
+        chunk = b'x' * 32768
+        self.assertEqual(self.read([chunk] * 100 + [b'\n', b'y\n']),
+                         [chunk * 100, b'y'])
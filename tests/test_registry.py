@@ -0,0 +1,130 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Unittests for :mod:`pssh.clients.base.registry`"""
+
+
+import unittest
+
+from gevent import sleep, spawn, joinall
+
+from pssh.clients.base.parallel import BaseParallelSSHClient
+from pssh.clients.base.registry import SessionRegistry
+
+
+class FakeClient(object):
+
+    def __init__(self):
+        self.disconnected = False
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+class SessionRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = SessionRegistry()
+        self.made = []
+
+    def make_client(self):
+        client = FakeClient()
+        self.made.append(client)
+        return client
+
+    def test_shared_client(self):
+        key = ('host', 22, 'user', None)
+        client = self.registry.acquire(key, self.make_client)
+        self.assertIs(self.registry.acquire(key, self.make_client), client)
+        other = self.registry.acquire(
+            ('host', 22, 'other', None), self.make_client)
+        self.assertIsNot(other, client)
+        self.assertEqual(len(self.made), 2)
+        self.assertEqual(self.registry.stats(),
+                         {'size': 2, 'references': 3})
+        self.registry.release(client)
+        self.assertFalse(client.disconnected)
+        self.assertIn(client, self.registry)
+        self.registry.release(client)
+        self.assertTrue(client.disconnected)
+        self.assertNotIn(client, self.registry)
+        self.assertEqual(len(self.registry), 1)
+        # New client made once released by all
+        self.assertIsNot(self.registry.acquire(key, self.make_client), client)
+
+    def test_concurrent_acquire(self):
+        key = ('host', 22, 'user', None)
+
+        def make_client():
+            sleep(.1)
+            return self.make_client()
+        cmds = [spawn(self.registry.acquire, key, make_client)
+                for _ in range(5)]
+        joinall(cmds, raise_error=True)
+        self.assertEqual(len(self.made), 1)
+        self.assertEqual(self.registry.stats(),
+                         {'size': 1, 'references': 5})
+
+    def test_make_client_failure(self):
+        key = ('host', 22, 'user', None)
+
+        def make_client():
+            raise ValueError
+        self.assertRaises(ValueError, self.registry.acquire, key, make_client)
+        self.assertEqual(len(self.registry), 0)
+        self.registry.release(FakeClient())
+
+    def test_discard(self):
+        key = ('host', 22, 'user', None)
+        client = self.registry.acquire(key, self.make_client)
+        self.registry.acquire(key, self.make_client)
+        self.registry.discard(client)
+        self.assertNotIn(client, self.registry)
+        self.assertIsNot(self.registry.acquire(key, self.make_client), client)
+        self.assertEqual(self.registry.stats(),
+                         {'size': 1, 'references': 1})
+
+    def test_drop(self):
+        key = ('host', 22, 'user', None)
+        client = self.registry.acquire(key, self.make_client)
+        self.registry.acquire(key, self.make_client)
+        self.registry.drop(client)
+        self.assertIn(client, self.registry)
+        self.registry.drop(client)
+        self.assertNotIn(client, self.registry)
+        # Left to be disconnected by last user
+        self.assertFalse(client.disconnected)
+
+    def test_parallel_client_drop(self):
+        key = ('host', 22, 'user', None)
+        parallel_clients = [
+            BaseParallelSSHClient(['host'], session_registry=self.registry)
+            for _ in range(3)]
+        for parallel_client in parallel_clients:
+            parallel_client._host_clients[(None, 'host')] = \
+                self.registry.acquire(key, self.make_client)
+        client = self.made[0]
+        first, second, third = parallel_clients
+        first._drop_client((None, 'host'))
+        self.assertEqual(self.registry.stats(),
+                         {'size': 1, 'references': 2})
+        second.__del__()
+        # Still used by third client
+        self.assertFalse(client.disconnected)
+        third.__del__()
+        self.assertTrue(client.disconnected)
+        self.assertEqual(len(self.registry), 0)
@@ -0,0 +1,78 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Unittests for :mod:`pssh.clients.base.resolver`"""
+
+
+import unittest
+from socket import AF_INET, gaierror
+
+from gevent import sleep
+
+from pssh.clients.base.resolver import DNSCache
+
+
+class DNSCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = DNSCache(ttl=1, negative_ttl=.1)
+
+    def test_resolve(self):
+        addresses = self.cache.resolve('127.0.0.1', 2222)
+        self.assertEqual(addresses, [(AF_INET, ('127.0.0.1', 2222))])
+        self.assertEqual(self.cache.resolve('127.0.0.1', 22),
+                         [(AF_INET, ('127.0.0.1', 22))])
+        self.assertEqual(self.cache.stats(),
+                         {'size': 1, 'hits': 1, 'misses': 1})
+
+    def test_ttl_expiry(self):
+        self.cache.ttl = .1
+        self.cache.resolve('127.0.0.1', 22)
+        sleep(.2)
+        self.cache.resolve('127.0.0.1', 22)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_negative_cache(self):
+        host = 'no.such.host.invalid'
+        self.assertRaises(gaierror, self.cache.resolve, host, 22)
+        self.assertRaises(gaierror, self.cache.resolve, host, 22)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+        sleep(.2)
+        self.assertRaises(gaierror, self.cache.resolve, host, 22)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_prefetch(self):
+        hosts = ['127.0.0.1', '127.0.0.2', 'no.such.host.invalid',
+                 '127.0.0.1']
+        self.assertEqual(self.cache.prefetch(hosts),
+                         ['no.such.host.invalid'])
+        self.assertEqual(self.cache.misses, 3)
+        self.cache.resolve('127.0.0.2', 22)
+        self.assertEqual(self.cache.misses, 3)
+        self.assertEqual(self.cache.prefetch(hosts),
+                         ['no.such.host.invalid'])
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_invalidate(self):
+        self.cache.resolve('127.0.0.1', 22)
+        self.cache.resolve('127.0.0.2', 22)
+        self.cache.invalidate('127.0.0.1')
+        self.assertEqual(self.cache.stats()['size'], 1)
+        self.cache.invalidate()
+        self.assertEqual(self.cache.stats()['size'], 0)
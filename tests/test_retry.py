@@ -0,0 +1,169 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Unittests for :mod:`pssh.clients.base.retry`"""
+
+
+import unittest
+from time import time
+
+from gevent import getcurrent, joinall, sleep, spawn
+from gevent.pool import Pool
+
+from pssh.clients.base.concurrency import AdaptiveLimiter, StageLimits
+from pssh.clients.base.parallel import BaseParallelSSHClient
+from pssh.clients.base.retry import RetryPolicy, ExponentialBackoff
+from pssh.clients.base.single import BaseSSHClient
+from pssh.exceptions import ConnectionErrorException
+
+
+class _FailingClient(BaseSSHClient):
+    """Client failing to connect ``failures`` number of times"""
+
+    def __init__(self, host, failures, **kwargs):
+        self.failures = failures
+        BaseSSHClient.__init__(self, host, user='user',
+                               _auth_thread_pool=False, **kwargs)
+
+    def _connect(self, host, port, retries=1, addresses=None):
+        sleep(.05)
+        if self.failures:
+            self.failures -= 1
+            raise self._retryable(
+                ConnectionErrorException("Connection refused"), retries)
+
+    def _init(self, retries=1):
+        pass
+
+    def run_command(self, command, **kwargs):
+        return None, self.host, iter(()), iter(()), None
+
+    def disconnect(self):
+        pass
+
+
+class _FailingParallelClient(BaseParallelSSHClient):
+    """Parallel client of hosts failing to connect number of times from
+    ``failures``"""
+
+    def __init__(self, hosts, failures, **kwargs):
+        self.failures = failures
+        BaseParallelSSHClient.__init__(self, hosts, **kwargs)
+
+    def _make_ssh_client(self, host_i, host):
+        client = self._host_clients.get((host_i, host))
+        if client is None:
+            client = _FailingClient(
+                host, self.failures.get(host, 0), num_retries=2,
+                _retry_policy=self.retry_policy, _pool_slot=self._pool_slot())
+            self._host_clients[(host_i, host)] = client
+        return client
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_fixed_delay(self):
+        policy = RetryPolicy(retry_delay=2)
+        self.assertEqual(policy.delay(1), 2)
+        self.assertEqual(policy.delay(5), 2)
+
+    def test_exponential_backoff(self):
+        policy = ExponentialBackoff(base_delay=1, max_delay=5)
+        for retries, max_delay in ((1, 1), (2, 2), (3, 4), (4, 5), (10, 5)):
+            for _ in range(20):
+                delay = policy.delay(retries)
+                self.assertTrue(0 <= delay <= max_delay)
+
+    def test_budget(self):
+        policy = RetryPolicy(budget=3)
+        self.assertTrue(policy.allow('host1'))
+        self.assertTrue(policy.allow('host1'))
+        self.assertTrue(policy.allow('host2'))
+        self.assertFalse(policy.allow('host2'))
+        self.assertEqual(policy.stats()['host1']['retries'], 2)
+        self.assertEqual(policy.stats()['host2']['retries'], 1)
+        policy.reset()
+        self.assertEqual(policy.stats(), {})
+        self.assertTrue(policy.allow('host2'))
+
+    def test_wait_stats(self):
+        policy = RetryPolicy(retry_delay=.1)
+        policy.allow('host')
+        policy.wait('host', 1)
+        stats = policy.stats()['host']
+        self.assertEqual(stats['retries'], 1)
+        self.assertTrue(stats['wait_time'] >= .1)
+
+    def test_wait_releases_pool_slot(self):
+        pool = Pool(size=1)
+        policy = RetryPolicy(retry_delay=.5)
+        finished = []
+
+        def _retry():
+            policy.wait('host1', 1, pool_slot=(pool, getcurrent()))
+            finished.append(('host1', time()))
+
+        def _run():
+            finished.append(('host2', time()))
+
+        start = time()
+        greenlets = [pool.spawn(_retry), pool.spawn(_run)]
+        joinall(greenlets, raise_error=True)
+        pool.join()
+        self.assertEqual([host for host, _ in finished], ['host2', 'host1'])
+        self.assertTrue(finished[0][1] - start < .5)
+        self.assertEqual(pool.free_count(), 1)
+
+    def test_retry_outside_limits(self):
+        policy = RetryPolicy(retry_delay=.5)
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        limits = StageLimits(connect=1, auth=1)
+        finished = {}
+
+        def _connect(host, failures):
+            _FailingClient(host, failures, num_retries=2,
+                           _retry_policy=policy, _connect_limiter=limiter,
+                           _stage_limits=limits)
+            finished[host] = time()
+        start = time()
+        joinall([spawn(_connect, 'host1', 1), spawn(_connect, 'host2', 0)],
+                raise_error=True)
+        # Host waiting to retry does not hold up other host
+        self.assertTrue(finished['host2'] - start < .5)
+        self.assertTrue(finished['host1'] - start >= .5)
+        self.assertEqual(policy.stats()['host1']['retries'], 1)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertRaises(ConnectionErrorException, _FailingClient, 'host3',
+                          2, num_retries=2, _retry_policy=policy)
+        self.assertEqual(policy.stats()['host3']['retries'], 1)
+
+    def test_imap_wait_releases_pool_slot(self):
+        policy = RetryPolicy(retry_delay=.5)
+        client = _FailingParallelClient(
+            ['host1', 'host2'], {'host1': 1}, pool_size=1,
+            retry_policy=policy)
+        # Policy shared with another client
+        _FailingParallelClient(['host3'], {}, retry_policy=policy)
+        start = time()
+        finished = [(host_out.host, time() - start)
+                    for host_out in client.imap_run_command('cmd')]
+        self.assertEqual([host for host, _ in finished], ['host2', 'host1'])
+        self.assertTrue(finished[0][1] < .5)
+        self.assertTrue(finished[1][1] >= .5)
+        self.assertEqual(policy.stats()['host1']['retries'], 1)
+        self.assertEqual(client.pool.free_count(), 1)
@@ -0,0 +1,124 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+
+"""Unittests for :mod:`pssh.clients.base.sessions`"""
+
+
+import unittest
+
+from gevent import sleep
+
+from pssh.clients.base.sessions import SessionPool
+
+
+class SessionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.evicted = []
+        self.pool = SessionPool(
+            max_size=2,
+            on_evict=lambda key, client: self.evicted.append((key, client)))
+
+    def test_lru_eviction(self):
+        self.pool['a'] = 1
+        self.pool['b'] = 2
+        self.assertEqual(self.pool.get('a'), 1)
+        self.pool['c'] = 3
+        self.assertEqual(self.evicted, [('b', 2)])
+        self.assertNotIn('b', self.pool)
+        self.assertIsNone(self.pool.get('b'))
+        self.assertEqual(sorted(self.pool.keys()), ['a', 'c'])
+        self.assertEqual(self.pool.stats(),
+                         {'size': 2, 'hits': 1, 'misses': 1, 'evictions': 1})
+
+    def test_idle_eviction(self):
+        self.pool.idle_timeout = .1
+        self.pool['a'] = 1
+        sleep(.15)
+        self.pool['b'] = 2
+        self.assertEqual(self.evicted, [('a', 1)])
+        self.assertEqual(self.pool.get('b'), 2)
+        sleep(.15)
+        self.assertIsNone(self.pool.get('b'))
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(self.pool.evictions, 2)
+
+    def test_evict_error(self):
+        def _fail(key, client):
+            raise Exception("error")
+        pool = SessionPool(max_size=1, on_evict=_fail)
+        pool['a'] = 1
+        pool['b'] = 2
+        self.assertEqual(pool.values(), [2])
+        self.assertEqual(pool.evictions, 1)
+
+    def test_unbounded(self):
+        pool = SessionPool()
+        for i in range(100):
+            pool[i] = i
+        self.assertEqual(len(pool), 100)
+        self.assertEqual(pool[0], 0)
+        self.assertEqual(pool.pop(0), 0)
+        self.assertEqual(pool.evictions, 0)
+
+    def test_pinned(self):
+        self.pool.idle_timeout = .1
+        self.pool.pin('a')
+        self.pool['a'] = 1
+        self.pool['b'] = 2
+        self.pool['c'] = 3
+        # Least recently used unpinned client is evicted instead
+        self.assertEqual(self.evicted, [('b', 2)])
+        self.pool.pin('c')
+        self.pool.pin('d')
+        self.pool['d'] = 4
+        # Pool grows over max size while all clients are pinned
+        self.assertEqual(self.evicted, [('b', 2)])
+        self.assertEqual(len(self.pool), 3)
+        self.pool.unpin('d')
+        self.assertEqual(self.evicted, [('b', 2), ('d', 4)])
+        sleep(.15)
+        # Pinned clients are not idle
+        self.assertEqual(self.pool.get('a'), 1)
+        self.assertEqual(len(self.pool), 2)
+        self.pool.pin('a')
+        self.pool.unpin('a')
+        self.assertIn('a', self.pool)
+        self.pool.unpin('a')
+        self.pool.unpin('c')
+        # Idle time starts on unpin
+        self.assertEqual(sorted(self.pool.keys()), ['a', 'c'])
+        sleep(.15)
+        self.assertIsNone(self.pool.get('a'))
+        self.assertEqual(len(self.pool), 0)
+
+    def test_rekey(self):
+        pool = SessionPool(max_size=3)
+        pool['a'] = 1
+        pool['b'] = 2
+        pool['c'] = 3
+        pool.pin('c')
+        pool.rekey({'b': 'a', 'c': 'b', 'a': 'x'})
+        self.assertEqual(pool.items(), [('x', 1), ('a', 2), ('b', 3)])
+        pool['d'] = 4
+        # Least recently used and pinned status are kept
+        self.assertEqual(pool.items(), [('a', 2), ('b', 3), ('d', 4)])
+        pool['e'] = 5
+        self.assertEqual(pool.keys(), ['b', 'd', 'e'])
+        pool['f'] = 6
+        self.assertEqual(pool.keys(), ['b', 'e', 'f'])
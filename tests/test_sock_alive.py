@@ -0,0 +1,76 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Unittests for socket liveness checks of
+:mod:`pssh.clients.base.single`"""
+
+
+import os
+import unittest
+
+from gevent import socket
+
+from pssh.clients.base.single import _sock_alive
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class SockAliveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sock, self.remote = socket.socketpair()
+
+    def tearDown(self):
+        self.sock.close()
+        self.remote.close()
+
+    def test_alive(self):
+        self.assertTrue(_sock_alive(self.sock))
+
+    def test_pending_data(self):
+        self.remote.sendall(b'data')
+        self.assertTrue(_sock_alive(self.sock))
+        # Data is not consumed
+        self.assertEqual(self.sock.recv(4), b'data')
+
+    def test_remote_closed(self):
+        self.remote.close()
+        self.assertFalse(_sock_alive(self.sock))
+
+    def test_closed(self):
+        self.sock.close()
+        self.assertFalse(_sock_alive(self.sock))
+
+    @unittest.skipIf(resource is None, "Needs resource module")
+    def test_high_fd(self):
+        high_fd = 2000
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft <= high_fd:
+            if hard != resource.RLIM_INFINITY and hard <= high_fd:
+                raise unittest.SkipTest("File descriptor limit too low")
+            resource.setrlimit(resource.RLIMIT_NOFILE, (high_fd + 1, hard))
+            self.addCleanup(resource.setrlimit, resource.RLIMIT_NOFILE,
+                            (soft, hard))
+        os.dup2(self.sock.fileno(), high_fd)
+        sock = socket.socket(fileno=high_fd)
+        self.addCleanup(sock.close)
+        self.assertTrue(_sock_alive(sock))
+        self.remote.close()
+        self.assertFalse(_sock_alive(sock))
@@ -0,0 +1,38 @@
+# This file is part of parallel-ssh.
+#
+# Copyright (C) 2014-2020 Panos Kittenis
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, version 2.1.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Unittests for :class:`pssh.clients.common.SourceAddressPool`"""
+
+
+import socket
+import unittest
+
+from pssh.clients.common import SourceAddressPool
+
+
+class SourceAddressPoolTest(unittest.TestCase):
+
+    def test_round_robin(self):
+        pool = SourceAddressPool(['10.0.0.1', 'fd00::1', '10.0.0.2'])
+        self.assertEqual([pool.get(socket.AF_INET) for _ in range(3)],
+                         ['10.0.0.1', '10.0.0.2', '10.0.0.1'])
+        self.assertEqual(pool.get(socket.AF_INET6), 'fd00::1')
+        self.assertEqual(pool.get(socket.AF_INET6), 'fd00::1')
+
+    def test_no_family_addresses(self):
+        pool = SourceAddressPool(['10.0.0.1'])
+        self.assertIsNone(pool.get(socket.AF_INET6))